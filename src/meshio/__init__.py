@@ -1,47 +1,60 @@
-from . import (
-    _cli,
-    abaqus,
-    ansys,
-    avsucd,
-    cgns,
-    dolfin,
-    exodus,
-    flac3d,
-    gmsh,
-    h5m,
-    hmf,
-    mdpa,
-    med,
-    medit,
-    nastran,
-    netgen,
-    neuroglancer,
-    obj,
-    off,
-    permas,
-    ply,
-    stl,
-    su2,
-    svg,
-    tecplot,
-    tetgen,
-    ugrid,
-    vtk,
-    vtu,
-    wkt,
-    xdmf,
-)
-from .__about__ import __version__
+import importlib
+
 from ._exceptions import ReadError, WriteError
 from ._helpers import (
+    aread,
+    awrite,
+    convert_many,
     deregister_format,
     extension_to_filetypes,
+    iter_blocks,
+    open_writer,
+    probe,
     read,
+    read_many,
     register_format,
     write,
+    write_bytes,
     write_points_cells,
 )
-from ._mesh import CellBlock, Mesh
+from ._mesh import CellBlock, CSRCells, Mesh
+from ._profile import profile, set_profiler
+
+# The format subpackages are only imported when they are first accessed (PEP 562); the
+# formats themselves are registered in _helpers from the table in _formats.
+_submodules = [
+    "_cli",
+    "abaqus",
+    "ansys",
+    "avsucd",
+    "cgns",
+    "dolfin",
+    "exodus",
+    "flac3d",
+    "gmsh",
+    "h5m",
+    "hmf",
+    "mdpa",
+    "med",
+    "medit",
+    "nastran",
+    "netgen",
+    "neuroglancer",
+    "obj",
+    "off",
+    "permas",
+    "ply",
+    "stl",
+    "su2",
+    "svg",
+    "tecplot",
+    "tetgen",
+    "ugrid",
+    "vtk",
+    "vtu",
+    "wkt",
+    "xdmf",
+]
 
 __all__ = [
     "abaqus",
@@ -76,15 +89,41 @@ __all__ = [
     "xdmf",
     "_cli",
     "read",
+    "read_many",
+    "convert_many",
+    "aread",
+    "awrite",
+    "iter_blocks",
+    "probe",
     "write",
+    "write_bytes",
+    "open_writer",
     "register_format",
     "deregister_format",
+    "set_profiler",
+    "profile",
     "write_points_cells",
     "extension_to_filetypes",
     "Mesh",
     "CellBlock",
+    "CSRCells",
     "ReadError",
     "WriteError",
     "topological_dimension",
     "__version__",
 ]
+
+
+def __getattr__(name):
+    # importlib.metadata, which determines the version, is slow to import, too
+    if name == "__version__":
+        from .__about__ import __version__
+
+        return __version__
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | {"__version__"})
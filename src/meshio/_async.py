@@ -0,0 +1,77 @@
+"""
+Helpers for meshio.aread() and meshio.awrite(): running reads and writes in an
+executor, and async file objects and byte streams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from ._files import _CHUNK_SIZE
+from ._profile import cancellable
+
+
+async def run_in_executor(executor, fun, *args, **kwargs):
+    """Run `fun(*args, **kwargs)` in `executor` (default: the loop's default
+    executor). If the awaiting task is cancelled, the call stops at the start of its
+    next phase (e.g., the next Gmsh section or VTU array), which frees its memory.
+    Calls in a process pool run to completion.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, partial(fun, *args, **kwargs))
+
+    cancelled = threading.Event()
+
+    def call():
+        with cancellable(cancelled):
+            return fun(*args, **kwargs)
+
+    try:
+        return await loop.run_in_executor(executor, call)
+    except asyncio.CancelledError:
+        cancelled.set()
+        raise
+
+
+def is_async_reader(obj) -> bool:
+    # aiofiles, asyncio.StreamReader, ..., or an async iterator of bytes
+    read = getattr(obj, "read", None)
+    return inspect.iscoroutinefunction(read) or hasattr(obj, "__aiter__")
+
+
+def is_async_writer(obj) -> bool:
+    # aiofiles or asyncio.StreamWriter, whose write() is sync, but drain() is not
+    write = getattr(obj, "write", None)
+    return inspect.iscoroutinefunction(write) or inspect.iscoroutinefunction(
+        getattr(obj, "drain", None)
+    )
+
+
+async def copy_to_file(obj, filename) -> None:
+    """Copy the async stream `obj` into the file `filename` chunk by chunk."""
+    with open(filename, "wb") as f:
+        if inspect.iscoroutinefunction(getattr(obj, "read", None)):
+            while True:
+                chunk = await obj.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        else:
+            async for chunk in obj:
+                f.write(chunk)
+
+
+async def send_bytes(data: bytes, obj) -> None:
+    """Write `data` to the async stream `obj` chunk by chunk."""
+    view = memoryview(data)
+    for k in range(0, len(view), _CHUNK_SIZE):
+        result = obj.write(bytes(view[k : k + _CHUNK_SIZE]))
+        if inspect.isawaitable(result):
+            await result
+        if inspect.iscoroutinefunction(getattr(obj, "drain", None)):
+            await obj.drain()
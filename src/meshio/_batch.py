@@ -0,0 +1,115 @@
+"""
+Concurrent reading and conversion of many files, see meshio.read_many() and
+meshio.convert_many(), and a thread pool map for the (de)compression of blocks.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+
+
+def map_unordered(fun, items, jobs: int | None = None, processes: bool = False):
+    """Apply `fun` to all `items` in a thread or process pool and yield
+    `(item, result, error)` in the order of completion; `error` is the exception
+    `fun(item)` raised, if any, and `result` is None then.
+
+    At most `jobs` items are in flight at any time, so the memory use is bounded by
+    the results that haven't been consumed.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"jobs must be positive (got {jobs})")
+
+    items = iter(items)
+    executor = (ProcessPoolExecutor if processes else ThreadPoolExecutor)(jobs)
+    in_flight = {}
+    try:
+        while True:
+            for item in items:
+                in_flight[executor.submit(fun, item)] = item
+                if len(in_flight) >= jobs:
+                    break
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                error = future.exception()
+                yield item, None if error else future.result(), error
+    finally:
+        # The consumer may stop early. (shutdown(cancel_futures=True) needs Python 3.9.)
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def map_threads(fun, items, jobs: int | None = 1):
+    """Like `map(fun, items)`, but in a pool of `jobs` threads (default: one thread,
+    None: the number of CPUs); the results are yielded in the order of `items`. This
+    only pays off if `fun` releases the GIL, as zlib and lzma do.
+
+    At most `2 * jobs` items are in flight at any time, so `items` may be generated
+    lazily and the memory use is bounded by the results that haven't been consumed.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"jobs must be positive (got {jobs})")
+    if jobs == 1:
+        yield from map(fun, items)
+        return
+
+    with ThreadPoolExecutor(jobs) as executor:
+        in_flight = deque()
+        for item in items:
+            in_flight.append(executor.submit(fun, item))
+            if len(in_flight) >= 2 * jobs:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def output_filename(template, infile) -> str:
+    """The output file for `infile`: `template` formatted with the fields `name`
+    (file name of the input), `stem` (file name without the extension and the
+    compression suffix), `suffix` (extension), and `parent` (directory of the input),
+    or `template(infile)` if it is callable.
+    """
+    if callable(template):
+        return str(template(infile))
+
+    from ._helpers import _split_compression
+
+    path = Path(infile)
+    format_path, _ = _split_compression(path)
+    return template.format(
+        name=path.name,
+        stem=format_path.stem,
+        suffix=format_path.suffix,
+        parent=path.parent,
+    )
+
+
+def read_file(filename, file_format, kwargs):
+    from ._helpers import read
+
+    return read(filename, file_format=file_format, **kwargs)
+
+
+def convert_file(filenames, input_format, output_format, transform, kwargs):
+    from ._helpers import read, write
+
+    infile, outfile = filenames
+    mesh = read(infile, file_format=input_format)
+    if transform is not None:
+        mesh = transform(mesh)
+    write(outfile, mesh, file_format=output_format, **kwargs)
@@ -0,0 +1,90 @@
+"""
+Helpers for meshio.iter_blocks(), which reads a mesh file piece by piece.
+
+Block readers are generators of `(kind, name, data)` tuples:
+
+  * ("points", None, array): the next chunk of points,
+  * ("cells", None, CellBlock): the next chunk of cells; consecutive chunks may be of
+    the same type,
+  * ("point_data", name, array): the next chunk of the point data `name`, in the
+    order of the points,
+  * ("cell_data", name, array): the next chunk of the cell data `name`, in the order
+    of the cells.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from ._exceptions import ReadError
+from ._mesh import CellBlock
+
+# default number of rows per chunk
+BLOCK_SIZE = 2**16
+
+
+def chunk_ranges(n: int, chunk_size: int):
+    """(start, stop) of the chunks of `n` items."""
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+
+def blocks_from_mesh(mesh, chunk_size: int = BLOCK_SIZE):
+    """Blocks of a mesh that has been read into memory, for formats without a block
+    reader.
+    """
+    for start, stop in chunk_ranges(len(mesh.points), chunk_size):
+        yield "points", None, mesh.points[start:stop]
+    for cell_block in mesh.cells:
+        for start, stop in chunk_ranges(len(cell_block), chunk_size):
+            yield "cells", None, CellBlock(cell_block.type, cell_block.data[start:stop])
+    for name, data in mesh.point_data.items():
+        for start, stop in chunk_ranges(len(data), chunk_size):
+            yield "point_data", name, data[start:stop]
+    for name, data in mesh.cell_data.items():
+        for block_data in data:
+            for start, stop in chunk_ranges(len(block_data), chunk_size):
+                yield "cell_data", name, block_data[start:stop]
+
+
+class IndexMap:
+    """Maps the IDs (tags) of points in a file to their index, i.e., their position in
+    the file. As long as the IDs are `offset`, `offset + 1`, ..., nothing is stored;
+    otherwise, the IDs are kept for lookup.
+    """
+
+    def __init__(self, offset: int = 0):
+        self.offset = offset
+        self.size = 0
+        self._ids = None
+        self._sorted = None
+
+    def append(self, ids) -> None:
+        ids = np.asarray(ids)
+        if self._ids is None:
+            start = self.offset + self.size
+            if np.array_equal(ids, np.arange(start, start + len(ids))):
+                self.size += len(ids)
+                return
+            self._ids = [np.arange(self.offset, start)]
+        self._ids.append(ids)
+        self.size += len(ids)
+        self._sorted = None
+
+    def __call__(self, ids) -> np.ndarray:
+        ids = np.asarray(ids).astype(int)
+        if self._ids is None:
+            idx = ids - self.offset
+            if np.any(idx < 0) or np.any(idx >= self.size):
+                raise ReadError("Unknown point ID")
+            return idx
+
+        if self._sorted is None:
+            self._ids = [np.concatenate(self._ids)]
+            order = np.argsort(self._ids[0], kind="stable")
+            self._sorted = (self._ids[0][order], order)
+        sorted_ids, order = self._sorted
+        pos = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        if ids.size > 0 and not np.array_equal(sorted_ids[pos], ids):
+            raise ReadError("Unknown point ID")
+        return order[pos]
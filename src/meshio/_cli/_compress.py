@@ -1,9 +1,8 @@
 import os
 import pathlib
 
-from .. import ansys, cgns, gmsh, h5m, mdpa, ply, stl, vtk, vtu, xdmf
 from .._common import error
-from .._helpers import _filetypes_from_path, read, reader_map
+from .._helpers import _filetype_from_file, read, reader_map
 
 
 def add_args(parser):
@@ -26,16 +25,16 @@ def add_args(parser):
 
 
 def compress(args):
+    from .. import ansys, cgns, gmsh, h5m, mdpa, ply, stl, vtk, vtu, xdmf
+
     if args.input_format:
-        fmts = [args.input_format]
+        fmt = args.input_format
     else:
-        fmts = _filetypes_from_path(pathlib.Path(args.infile))
-    # pick the first
-    fmt = fmts[0]
+        fmt = _filetype_from_file(pathlib.Path(args.infile))
 
     size = os.stat(args.infile).st_size
     print(f"File size before: {size / 1024 ** 2:.2f} MB")
-    mesh = read(args.infile, file_format=args.input_format)
+    mesh = read(args.infile, file_format=fmt)
 
     # # Some converters (like VTK) require `points` to be contiguous.
     # mesh.points = np.ascontiguousarray(mesh.points)
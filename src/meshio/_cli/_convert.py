@@ -1,10 +1,19 @@
+import glob
+import sys
+from functools import partial
+
 import numpy as np
 
-from .._helpers import _writer_map, read, reader_map, write
+from .._helpers import _writer_map, convert_many, read, reader_map, write
 
 
 def add_args(parser):
-    parser.add_argument("infile", type=str, help="mesh file to be read from")
+    parser.add_argument(
+        "infile",
+        type=str,
+        nargs="+",
+        help="mesh file(s) or glob pattern(s) to be read from",
+    )
     parser.add_argument(
         "--input-format",
         "-i",
@@ -27,7 +36,15 @@ def add_args(parser):
         action="store_true",
         help="write in ASCII format variant (where applicable, default: binary)",
     )
-    parser.add_argument("outfile", type=str, help="mesh file to be written to")
+    parser.add_argument(
+        "outfile",
+        type=str,
+        help=(
+            "mesh file to be written to; for more than one input file, a template "
+            "with the fields {stem}, {name}, {suffix}, and {parent} of the input file "
+            "(e.g., out/{stem}.vtu)"
+        ),
+    )
     parser.add_argument(
         "--float-format",
         "-f",
@@ -47,29 +64,94 @@ def add_args(parser):
         help="if possible, convert integer data to sets (useful if the output type does not support integer data)",
     )
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="number of files converted in parallel (default: the number of CPUs)",
+    )
 
-def convert(args):
-    # read mesh data
-    mesh = read(args.infile, file_format=args.input_format)
 
+def _prepare(mesh, sets_to_int_data: bool, int_data_to_sets: bool):
     # Some converters (like VTK) require `points` to be contiguous.
     mesh.points = np.ascontiguousarray(mesh.points)
 
-    if args.sets_to_int_data:
+    if sets_to_int_data:
         mesh.point_sets_to_data()
         mesh.cell_sets_to_data()
 
-    if args.int_data_to_sets:
-        for key in mesh.point_data:
+    if int_data_to_sets:
+        # the conversion removes the data
+        for key in list(mesh.point_data):
             mesh.point_data_to_sets(key)
-        for key in mesh.cell_data:
+        for key in list(mesh.cell_data):
             mesh.cell_data_to_sets(key)
+    return mesh
 
-    # write it out
-    kwargs = {"file_format": args.output_format}
+
+def convert(args):
+    kwargs = {}
     if args.float_format is not None:
         kwargs["float_fmt"] = args.float_format
     if args.ascii:
         kwargs["binary"] = False
 
-    write(args.outfile, mesh, **kwargs)
+    infiles = []
+    num_unmatched = 0
+    for pattern in args.infile:
+        if not glob.has_magic(pattern):
+            infiles.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern))
+        if len(matches) == 0:
+            num_unmatched += 1
+            print(f"no input files match {pattern}", file=sys.stderr)
+        infiles += matches
+
+    if len(args.infile) > 1 or infiles != args.infile or args.jobs is not None:
+        # convert what there is, like cp does
+        ret = _convert_many(args, infiles, kwargs) if len(infiles) > 0 else 0
+        return 1 if num_unmatched > 0 else ret
+
+    # read mesh data
+    mesh = read(infiles[0], file_format=args.input_format)
+    mesh = _prepare(mesh, args.sets_to_int_data, args.int_data_to_sets)
+
+    # write it out
+    write(args.outfile, mesh, file_format=args.output_format, **kwargs)
+
+
+def _convert_many(args, infiles, kwargs):
+    if len(infiles) > 1 and "{" not in args.outfile:
+        print(
+            "For more than one input file, the output file must be a template, "
+            "e.g., out/{stem}.vtu",
+            file=sys.stderr,
+        )
+        return 1
+
+    num_failed = 0
+    for infile, outfile, error in convert_many(
+        infiles,
+        args.outfile,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        jobs=args.jobs,
+        transform=partial(
+            _prepare,
+            sets_to_int_data=args.sets_to_int_data,
+            int_data_to_sets=args.int_data_to_sets,
+        ),
+        **kwargs,
+    ):
+        if error is None:
+            print(f"{infile} -> {outfile}")
+        else:
+            num_failed += 1
+            print(f"{infile}: {type(error).__name__}: {error}", file=sys.stderr)
+
+    if num_failed > 0:
+        print(f"{num_failed} of {len(infiles)} files failed", file=sys.stderr)
+        return 1
+    return 0
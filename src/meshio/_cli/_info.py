@@ -1,7 +1,7 @@
 import numpy as np
 
 from .._common import warn
-from .._helpers import read, reader_map
+from .._helpers import probe, read, reader_map
 
 
 def add_args(parser):
@@ -14,9 +14,19 @@ def add_args(parser):
         help="input file format",
         default=None,
     )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="read the entire mesh and check it for consistency "
+        "(default: only read the file headers where possible)",
+    )
 
 
 def info(args):
+    if not args.validate:
+        print(probe(args.infile, file_format=args.input_format))
+        return 0
+
     # read mesh data
     mesh = read(args.infile, file_format=args.input_format)
     print(mesh)
@@ -24,7 +34,7 @@ def info(args):
     # check if the cell arrays are consistent with the points
     is_consistent = True
     for cells in mesh.cells:
-        if np.any(cells.data > mesh.points.shape[0]):
+        if np.any(cells.data >= mesh.points.shape[0]):
             warn("Inconsistent mesh. Cells refer to nonexistent points.")
             is_consistent = False
             break
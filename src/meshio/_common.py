@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import io
 from xml.etree import ElementTree as ET
 
 import numpy as np
-from rich.console import Console
+
+from ._exceptions import ReadError
+from ._files import _CHUNK_SIZE
 
 # See <https://github.com/nschloe/meshio/wiki/Node-ordering-in-cells> for the node
 # ordering.
@@ -88,8 +91,281 @@ num_nodes_per_cell = {
 
 
 def cell_data_from_raw(cells, cell_data_raw):
-    cs = np.cumsum([len(c) for c in cells])[:-1]
-    return {name: np.split(d, cs) for name, d in cell_data_raw.items()}
+    # Slice instead of np.split() to keep lazily read arrays lazy.
+    cs = np.cumsum([0] + [len(c) for c in cells])
+    return {
+        name: [d[start:end] for start, end in zip(cs[:-1], cs[1:])]
+        for name, d in cell_data_raw.items()
+    }
+
+
+def concat_ranges(starts, stops):
+    """Concatenation of np.arange(start, stop) for all start, stop pairs, vectorized."""
+    starts = np.asarray(starts)
+    lengths = np.asarray(stops) - starts
+    # position k of the output lies in range i: starts[i] + k - (start of range i)
+    range_starts = np.cumsum(lengths) - lengths
+    return np.repeat(starts - range_starts, lengths) + np.arange(lengths.sum())
+
+
+def _join_lines(lines) -> str:
+    return lines if isinstance(lines, str) else "\n".join(lines)
+
+
+def parse_numbers(lines, dtype=float, delimiter: str | None = None) -> np.ndarray:
+    """All numbers in `lines` (a string or a list of lines) as a flat array, parsed in
+    bulk. The numbers are separated by whitespace and, if given, `delimiter` (e.g.,
+    "," for Abaqus); empty fields between delimiters are skipped.
+    """
+    text = _join_lines(lines)
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+    dtype = np.dtype(dtype)
+    if text.isspace() or not text:
+        return np.empty(0, dtype=dtype)
+    try:
+        return np.fromstring(text, dtype=dtype, sep=" ")
+    except ValueError:
+        raise ReadError(f"Could not parse the data as {dtype.name} numbers")
+
+
+def parse_table(
+    lines, num_columns: int, dtype=float, delimiter: str | None = None
+) -> np.ndarray:
+    """Parse `lines` with `num_columns` numbers per row into a 2D array (see
+    parse_numbers). Rows may span several lines.
+    """
+    data = parse_numbers(lines, dtype, delimiter)
+    if len(data) % num_columns != 0:
+        raise ReadError(
+            f"Expected {num_columns} numbers per row, "
+            f"but got {len(data)} numbers in total"
+        )
+    return data.reshape(-1, num_columns)
+
+
+def parse_ragged(
+    lines, dtype=int, delimiter: str | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Parse a list of lines with varying numbers of numbers (e.g., polygon faces).
+    Returns the numbers of all lines concatenated and the offsets, the start of each
+    line in the numbers plus the total number at the end, so that line `i` is
+    `values[offsets[i]:offsets[i + 1]]`.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    # one newline per line, whether or not the lines end in one
+    text = "\n".join(line.rstrip("\r\n") for line in lines)
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+    values = parse_numbers(text, dtype)
+
+    # count the starts of tokens per line
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    space = np.isin(chars, np.frombuffer(b" \t\r\n\v\f", dtype=np.uint8))
+    newline = chars == ord("\n")
+    is_start = ~space
+    is_start[1:] &= space[:-1]
+    line_index = np.cumsum(newline) - newline
+    counts = np.bincount(line_index[is_start], minlength=len(lines))
+    offsets = np.zeros(len(counts) + 1, dtype=int)
+    np.cumsum(counts, out=offsets[1:])
+    return values, offsets
+
+
+def format_numbers(values, fmt: str) -> list[str]:
+    """Format all `values` with the printf-style `fmt` (e.g., "%.11E") in one go."""
+    values = np.asarray(values).reshape(-1).tolist()
+    if not values:
+        return []
+    return ((fmt + "\n") * len(values) % tuple(values)).split("\n")[:-1]
+
+
+def write_table(f, data, fmt: str) -> None:
+    """Write the rows of `data` to the text or binary file `f`, each formatted with
+    the printf-style row format `fmt` including the newline, e.g., "v %r %r %r\n".
+    `data` is a 1D or 2D array, or a list of columns of different types. Chunks of
+    about _CHUNK_SIZE bytes are formatted with one `%` each and written right away,
+    so no Python code runs per number and the memory use doesn't grow with the
+    output.
+    """
+    if isinstance(data, (list, tuple)):
+        columns = [np.asarray(column) for column in data]
+        num_rows = len(columns[0]) if columns else 0
+
+        def values(start, stop):
+            chunk = np.empty((stop - start, len(columns)), dtype=object)
+            for j, column in enumerate(columns):
+                chunk[:, j] = column[start:stop]
+            return chunk.reshape(-1).tolist()
+
+    else:
+        data = np.asarray(data)
+        num_rows = len(data)
+
+        def values(start, stop):
+            return data[start:stop].reshape(-1).tolist()
+
+    if num_rows == 0:
+        return
+    binary = isinstance(f, (io.RawIOBase, io.BufferedIOBase))
+
+    row_size = len(fmt % tuple(values(0, 1)))
+    chunk_size = max(1, _CHUNK_SIZE // max(1, row_size))
+    for start in range(0, num_rows, chunk_size):
+        stop = min(start + chunk_size, num_rows)
+        text = (fmt * (stop - start)) % tuple(values(start, stop))
+        f.write(text.encode() if binary else text)
+
+
+def _unique_rows(a):
+    # Like np.unique(a, axis=0), but only the inverse. Integer rows are packed into one
+    # int64 key (re-enumerating the keys in between if they would overflow); other rows
+    # are compared via a one-dimensional void view. Both sort much faster than the
+    # structured array unique() creates.
+    a = np.ascontiguousarray(a)
+    if a.dtype.kind != "i":
+        rows = a.view(np.dtype((np.void, a.dtype.itemsize * a.shape[1]))).reshape(-1)
+        _, inverse = np.unique(rows, return_inverse=True)
+        return inverse.reshape(-1)
+
+    a = a - a.min(axis=0)
+    keys = np.zeros(len(a), dtype=np.int64)
+    num_keys = 1
+    for column in a.T:
+        extent = int(column.max()) + 1 if len(column) > 0 else 1
+        if num_keys * extent >= 2**62:
+            _, keys = np.unique(keys, return_inverse=True)
+            num_keys = int(keys.max()) + 1
+        keys = keys * extent + column
+        num_keys *= extent
+    _, inverse = np.unique(keys, return_inverse=True)
+    return inverse.reshape(-1)
+
+
+def weld_points(points, atol: float = 0.0, rtol: float = 0.0):
+    """Identify coincident points.
+
+    With a tolerance `tol = atol + rtol * (bounding box diagonal)`, all points whose
+    coordinates differ by less than `tol` are merged; points up to `2 * tol` apart may
+    be merged, too. Without tolerance, only exactly equal points are merged.
+
+    The points are binned into a grid of width `2 * tol`, and, to catch neighbors on
+    opposite sides of a grid line, into all copies of the grid shifted by `tol` in any
+    of the coordinate directions. The points of each grid cell are found by sorting
+    the cell keys, which takes O(2**dim * n log n) time, not the expected linear time
+    of a hash table; each merging pass over the grids then takes linear time.
+
+    Merging is transitive: a chain of points, each closer than `tol` to the next, is
+    merged into one point however far apart its ends are, and a point cloud that is
+    denser than `tol` collapses into a single point. The passes are repeated until
+    no more points are merged, so long chains take more passes. Choose `tol` well
+    below the smallest distance of points that are meant to stay apart.
+
+    Returns the indices of the representative points (the first of each merged group,
+    in order of appearance) and, for each input point, the index of its representative
+    in that list.
+    """
+    points = np.asarray(points)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    # adding 0.0 turns -0.0 into 0.0, which would otherwise differ bitwise
+    points = points.reshape(n, -1) + 0.0
+
+    tol = atol
+    if rtol > 0.0:
+        tol += rtol * np.linalg.norm(np.ptp(points, axis=0))
+
+    if tol == 0.0:
+        grids = [points]
+    else:
+        dim = points.shape[1]
+        # integer grid coordinates with respect to grid width 2 * tol; the shifted grids
+        # are obtained by shifting the coordinates by one half grid width
+        scaled = (points - points.min(axis=0)) / tol
+        shifts = np.array(np.meshgrid(*(dim * [[0, 1]]), indexing="ij")).reshape(
+            dim, -1
+        )
+        grids = [
+            np.floor_divide(scaled + shift, 2).astype(np.int64) for shift in shifts.T
+        ]
+
+    # grid cell index of each point, for each grid
+    cell_ids = [_unique_rows(grid) for grid in grids]
+
+    labels = np.arange(n)
+    while True:
+        old_labels = labels
+        for ids in cell_ids:
+            # merge all points in the same grid cell: label with the smallest label
+            min_labels = np.full(ids.max() + 1, n)
+            np.minimum.at(min_labels, ids, labels)
+            labels = min_labels[ids]
+        # pointer jumping for faster convergence of chains
+        labels = labels[labels]
+        if np.array_equal(labels, old_labels) or tol == 0.0:
+            break
+
+    representatives, inverse = np.unique(labels, return_inverse=True)
+    return representatives, inverse.reshape(-1)
+
+
+def hdf5_sniffer(check):
+    """Create a file format sniffer (see `register_format`) for an HDF5-based format;
+    `check` gets the opened `h5py.File`.
+    """
+
+    def sniffer(head: bytes, filename: str | None) -> bool:
+        if filename is None or not head.startswith(b"\x89HDF\r\n\x1a\n"):
+            return False
+        import h5py
+
+        with h5py.File(filename, "r") as f:
+            return check(f)
+
+    return sniffer
+
+
+def _name_predicate(selector):
+    if selector is None:
+        return lambda name: True
+    if callable(selector):
+        return selector
+    if isinstance(selector, str):
+        selector = [selector]
+    names = set(selector)
+    return names.__contains__
+
+
+class Selection:
+    """The point data, cell data, field data, and sets (point and cell sets) that
+    meshio.read() is asked for. Each selector is None (everything), a name, a
+    collection of names, or a predicate that gets a name and tells if it's wanted.
+
+    Readers which support it skip unselected arrays without decoding them;
+    `apply()` drops what's left over.
+    """
+
+    def __init__(self, point_data=None, cell_data=None, field_data=None, sets=None):
+        self.point_data = _name_predicate(point_data)
+        self.cell_data = _name_predicate(cell_data)
+        self.field_data = _name_predicate(field_data)
+        self.sets = _name_predicate(sets)
+
+    def apply(self, mesh):
+        for dct, predicate in [
+            (mesh.point_data, self.point_data),
+            (mesh.cell_data, self.cell_data),
+            (mesh.field_data, self.field_data),
+            (mesh.point_sets, self.sets),
+            (mesh.cell_sets, self.sets),
+        ]:
+            # iterating over the names doesn't load lazy arrays
+            for name in [name for name in dct if not predicate(name)]:
+                del dct[name]
+        return mesh
 
 
 def raw_from_cell_data(cell_data):
@@ -123,16 +399,22 @@ def _pick_first_int_data(data):
 
 
 def info(string, highlight: bool = True) -> None:
+    from rich.console import Console
+
     Console(stderr=True).print(f"[bold]Info:[/bold] {string}", highlight=highlight)
 
 
 def warn(string, highlight: bool = True) -> None:
+    from rich.console import Console
+
     Console(stderr=True).print(
         f"[yellow][bold]Warning:[/bold] {string}[/yellow]", highlight=highlight
     )
 
 
 def error(string, highlight: bool = True) -> None:
+    from rich.console import Console
+
     Console(stderr=True).print(
         f"[red][bold]Error:[/bold] {string}[/red]", highlight=highlight
     )
@@ -1,4 +1,32 @@
+from __future__ import annotations
+
+import io
+import os
+import queue
+import shutil
+import tempfile
+import threading
 from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from ._exceptions import ReadError
+from ._profile import span
+
+compression_suffixes = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+_compression_magic = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+# size of the chunks that are (de)compressed in a background thread
+_CHUNK_SIZE = 1024**2
+# size up to which decompressed files are held in memory, see decompressed_buffer()
+_SPILL_SIZE = 64 * 1024**2
 
 
 def is_buffer(obj, mode):
@@ -7,10 +35,300 @@ def is_buffer(obj, mode):
     )
 
 
+def is_binary_buffer(obj) -> bool:
+    return isinstance(obj, (io.RawIOBase, io.BufferedIOBase))
+
+
+def compression_from_path(path) -> str | None:
+    return compression_suffixes.get(Path(path).suffix.lower())
+
+
+def compression_from_head(head: bytes) -> str | None:
+    for magic, compression in _compression_magic.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
 @contextmanager
 def open_file(path_or_buf, mode="r"):
+    """Open a file, or pass through a buffer. Files with a compression suffix (.gz,
+    .bz2, .xz, .zst) are (de)compressed on the fly.
+    """
     if is_buffer(path_or_buf, mode):
-        yield path_or_buf
-    else:
+        if "b" in mode or not is_binary_buffer(path_or_buf):
+            yield path_or_buf
+            return
+        # text format on a binary buffer, e.g., io.BytesIO
+        f = io.TextIOWrapper(path_or_buf)
+        try:
+            yield f
+        finally:
+            f.flush()
+            f.detach()
+        return
+
+    compression = compression_from_path(path_or_buf)
+    if compression is None:
         with open(path_or_buf, mode) as f:
             yield f
+    else:
+        with open_compressed(path_or_buf, mode, compression) as f:
+            yield f
+
+
+def _open_codec(path, mode: str, compression: str):
+    if compression == "gzip":
+        import gzip
+
+        # compression level of the gzip command line tool, much faster than the
+        # default 9
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == "bz2":
+        import bz2
+
+        return bz2.open(path, mode)
+    if compression == "xz":
+        import lzma
+
+        return lzma.open(path, mode)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression requires the zstandard package")
+        return zstandard.open(path, mode)
+    raise ValueError(f"Unknown compression '{compression}'")
+
+
+def open_compressed(path, mode: str, compression: str):
+    """Open a compressed file. The (de)compression runs in a background thread, so it
+    overlaps with parsing or formatting the data.
+    """
+    if "r" in mode:
+        raw = _ThreadedReader(_open_codec(path, "rb", compression), str(path))
+        f = io.BufferedReader(raw, _CHUNK_SIZE)
+    else:
+        raw = _ThreadedWriter(_open_codec(path, "wb", compression), str(path))
+        f = io.BufferedWriter(raw, _CHUNK_SIZE)
+    return f if "b" in mode else io.TextIOWrapper(f)
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Reads a stream in a background thread, a few chunks ahead of the consumer."""
+
+    def __init__(self, stream, name: str, max_chunks: int = 4):
+        self.name = name
+        self._stream = stream
+        self._queue = queue.Queue(max_chunks)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                chunk = self._stream.read(_CHUNK_SIZE)
+                self._queue.put(chunk)
+                if not chunk:
+                    break
+        except Exception as e:
+            self._queue.put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._chunk and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            self._eof = not item
+            self._chunk = memoryview(item)
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self):
+        if self.closed:
+            return
+        # unblock the thread if the consumer stopped early
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                self._thread.join(0.01)
+        self._stream.close()
+        super().close()
+
+
+class _ThreadedWriter(io.RawIOBase):
+    """Writes to a stream in a background thread."""
+
+    def __init__(self, stream, name: str, max_chunks: int = 4):
+        self.name = name
+        self._stream = stream
+        self._queue = queue.Queue(max_chunks)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            if self._error is None:
+                try:
+                    self._stream.write(chunk)
+                except Exception as e:
+                    self._error = e
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(b))
+        return len(b)
+
+    def close(self):
+        if self.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._stream.close()
+        super().close()
+        if self._error is not None:
+            raise self._error
+
+
+def fromfile(f, dtype, count: int, mmap: bool = False) -> np.ndarray:
+    """Read `count` binary items of type `dtype` from the current position of the open
+    file `f`, like np.fromfile.
+
+    With `mmap`, the data is memory-mapped instead of read: the returned np.memmap is a
+    view into the file and only the pages that are accessed are loaded. In both cases,
+    the file position is advanced past the data. Streams without a file descriptor
+    (e.g., decompressed files) are always read.
+    """
+    dtype = np.dtype(dtype)
+    count = int(count)
+    if not mmap:
+        return np.fromfile(f, dtype=dtype, count=count)
+
+    try:
+        f.fileno()
+    except (AttributeError, OSError):
+        return np.fromfile(f, dtype=dtype, count=count)
+
+    offset = f.tell()
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    size = count * dtype.itemsize
+    if offset + size > os.fstat(f.fileno()).st_size:
+        raise ReadError("Unexpected end of file")
+    out = np.memmap(f, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    f.seek(offset + size)
+    return out
+
+
+@contextmanager
+def decompressed_copy(path, compression: str, name: str, dir=None):
+    """Decompress `path` into a temporary file `name`, for readers which cannot work on
+    a stream. Only one chunk at a time is held in memory.
+
+    If `dir` is given, the copy is a hidden file in `dir` instead, e.g., next to `path`
+    for formats which refer to other files relative to the file.
+    """
+    if dir is None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = os.path.join(tmpdir, name)
+            _decompress(path, compression, tmp)
+            yield tmp
+        return
+
+    stem, suffix = os.path.splitext(name)
+    fd, tmp = tempfile.mkstemp(suffix, f".{stem}-", dir)
+    os.close(fd)
+    try:
+        _decompress(path, compression, tmp)
+        yield tmp
+    finally:
+        os.remove(tmp)
+
+
+def _decompress(path, compression: str, tmp: str) -> None:
+    with span("decompress", compression=compression) as s:
+        with open_compressed(path, "rb", compression) as src:
+            with open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+        s.add(nbytes=os.path.getsize(tmp))
+
+
+@contextmanager
+def decompressed_buffer(path, compression: str):
+    """Decompress `path` into a seekable buffer, for readers which take file objects
+    but need to seek. Files of up to _SPILL_SIZE bytes are held in memory; larger ones
+    spill into an anonymous temporary file.
+    """
+    with span("decompress", compression=compression) as s:
+        with open_compressed(path, "rb", compression) as src:
+            data = src.read(_SPILL_SIZE + 1)
+            if len(data) <= _SPILL_SIZE:
+                buf = io.BytesIO(data)
+            else:
+                buf = tempfile.TemporaryFile()
+                buf.write(data)
+                del data
+                shutil.copyfileobj(src, buf, _CHUNK_SIZE)
+        s.add(nbytes=buf.tell())
+    with buf:
+        buf.seek(0)
+        yield buf
+
+
+@contextmanager
+def compressed_output(path, compression: str, name: str):
+    """Provide a temporary file `name` for writers which cannot write to a stream, and
+    compress it into `path` afterwards.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = os.path.join(tmpdir, name)
+        yield tmp
+        with span("compress", compression=compression, nbytes=os.path.getsize(tmp)):
+            with open(tmp, "rb") as src:
+                with open_compressed(path, "wb", compression) as dst:
+                    shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+
+
+@contextmanager
+def memory_file(name: str, data: bytes | None = None):
+    """Provide a file for readers and writers which need a path, e.g., to read or write
+    a buffer. The file has the content `data`, if given; the caller reads what was
+    written from the path. On Linux, the file is an anonymous file in memory (memfd),
+    so nothing touches the disk; elsewhere, it is a temporary file `name`.
+    """
+    if hasattr(os, "memfd_create") and os.path.isdir("/proc/self/fd"):
+        fd = os.memfd_create(name)
+        try:
+            path = f"/proc/self/fd/{fd}"
+            if data is not None:
+                with open(path, "wb") as f:
+                    f.write(data)
+            yield path
+        finally:
+            os.close(fd)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, name)
+        if data is not None:
+            with open(path, "wb") as f:
+                f.write(data)
+        yield path
@@ -0,0 +1,188 @@
+"""
+Table of the built-in formats. It lets meshio register all formats without importing
+them; a format module is only imported when one of its readers, writers, or sniffers
+is first used.
+
+For each format:
+
+  * module: subpackage of meshio that implements the format,
+  * extensions: file extensions,
+  * writers: names of the writers the module registers (default: the format name),
+  * reader: whether the module registers a reader (default: True),
+  * stream_writers: names of the writers for open_writer() the module registers
+    (default: none),
+  * block_reader: whether the module registers a block reader for iter_blocks()
+    (default: False),
+  * prober: whether the module registers a prober for probe() which reads the file
+    headers only (default: False),
+  * select: whether the reader takes a `select` argument (a _common.Selection) and
+    skips the point data, cell data etc. that aren't asked for (default: False),
+  * magic: regular expression that the head of a file of this format matches,
+  * sniffer: whether the module registers a sniffer which checks the file beyond
+    `magic` (default: False),
+  * stream: whether reader and writer only read/write sequentially via
+    `_files.open_file`, so compressed files can be (de)compressed on the fly; for
+    all other formats, compressed files are spilled to a temporary file (default:
+    False),
+  * buffer: whether reader and writer work on binary buffers (file objects), e.g.,
+    for read(bytes) and write_bytes(); for all other formats, buffers are copied to
+    or from an in-memory file, see `_files.memory_file` (default: False),
+  * csr: whether the writer takes polygons and polyhedra in CSR format
+    (`_mesh.CSRCells`); for all other formats, CSR polygon blocks are split into
+    blocks with a fixed number of nodes, see `_mesh.fixed_size_cells` (default:
+    False).
+"""
+
+_hdf5_magic = rb"\A\x89HDF\r\n\x1a\n"
+
+builtin_formats = {
+    "abaqus": {
+        "module": "abaqus",
+        "extensions": [".inp"],
+        "magic": rb"(?im)^\*(HEADING|NODE|PART)\b",
+        "stream": True,
+        "block_reader": True,
+        "buffer": True,
+    },
+    "ansys": {
+        "module": "ansys",
+        "extensions": [".msh"],
+        # ANSYS files consist of parenthesized sections only
+        "magic": rb"\A\s*\(",
+    },
+    "avsucd": {
+        "module": "avsucd",
+        "extensions": [".avs"],
+        "stream": True,
+        "buffer": True,
+    },
+    "cgns": {
+        "module": "cgns",
+        "extensions": [".cgns"],
+        "magic": _hdf5_magic,
+        "sniffer": True,
+        "buffer": True,
+    },
+    "dolfin-xml": {"module": "dolfin", "extensions": [".xml"], "magic": rb"<dolfin"},
+    "exodus": {
+        "module": "exodus",
+        "extensions": [".e", ".exo", ".ex2"],
+        # netCDF 3 or netCDF 4 (HDF5)
+        "magic": rb"\A(CDF|\x89HDF\r\n\x1a\n)",
+        "sniffer": True,
+        "select": True,
+        "buffer": True,
+    },
+    "flac3d": {"module": "flac3d", "extensions": [".f3grid"]},
+    "gmsh": {
+        "module": "gmsh",
+        "extensions": [".msh"],
+        "writers": ["gmsh22", "gmsh"],
+        "stream_writers": ["gmsh"],
+        "block_reader": True,
+        "prober": True,
+        "magic": rb"\A\s*\$(MeshFormat|Comments)",
+    },
+    "h5m": {
+        "module": "h5m",
+        "extensions": [".h5m"],
+        "magic": _hdf5_magic,
+        "sniffer": True,
+        "buffer": True,
+    },
+    "hmf": {
+        "module": "hmf",
+        "extensions": [".hmf"],
+        "magic": _hdf5_magic,
+        "sniffer": True,
+        "buffer": True,
+    },
+    "mdpa": {
+        "module": "mdpa",
+        "extensions": [".mdpa"],
+        "magic": rb"(?m)^Begin (ModelPartData|Properties|Nodes)\b",
+    },
+    "med": {
+        "module": "med",
+        "extensions": [".med"],
+        "magic": _hdf5_magic,
+        "sniffer": True,
+        "buffer": True,
+    },
+    "medit": {
+        "module": "medit",
+        "extensions": [".mesh", ".meshb"],
+        # Only ASCII files can be recognized; binary files are identified by their
+        # extension.
+        "magic": rb"\A(\s*#.*\n)*\s*MeshVersionFormatted\b",
+    },
+    "nastran": {
+        "module": "nastran",
+        "extensions": [".bdf", ".fem", ".nas"],
+        "magic": rb"(?m)^BEGIN BULK\b",
+        "stream": True,
+        "buffer": True,
+    },
+    "netgen": {
+        "module": "netgen",
+        "extensions": [".vol", ".vol.gz"],
+        "magic": rb"\A(\s*#.*\n)*\s*mesh3d\s",
+        "buffer": True,
+    },
+    "neuroglancer": {
+        "module": "neuroglancer",
+        "extensions": [],
+        "stream": True,
+        "buffer": True,
+    },
+    "obj": {"module": "obj", "extensions": [".obj"], "stream": True, "buffer": True},
+    "off": {"module": "off", "extensions": [".off"], "magic": rb"\AOFF\s"},
+    "permas": {
+        "module": "permas",
+        "extensions": [".post", ".dato"],
+        "magic": rb"(?m)^\$ENTER COMPONENT\b",
+        "buffer": True,
+    },
+    "ply": {
+        "module": "ply",
+        "extensions": [".ply"],
+        "magic": rb"\Aply\r?\n",
+        "stream": True,
+        "buffer": True,
+    },
+    "stl": {"module": "stl", "extensions": [".stl"], "sniffer": True},
+    "su2": {"module": "su2", "extensions": [".su2"], "magic": rb"(?m)^\s*NDIME\s*="},
+    "svg": {"module": "svg", "extensions": [".svg"], "reader": False, "buffer": True},
+    "tecplot": {"module": "tecplot", "extensions": [".dat", ".tec"], "buffer": True},
+    "tetgen": {"module": "tetgen", "extensions": [".ele", ".node"]},
+    "ugrid": {"module": "ugrid", "extensions": [".ugrid"]},
+    "vtk": {
+        "module": "vtk",
+        "extensions": [".vtk"],
+        "writers": ["vtk42", "vtk51", "vtk"],
+        "stream_writers": ["vtk"],
+        "block_reader": True,
+        "prober": True,
+        "magic": rb"\A# vtk DataFile Version",
+        "csr": True,
+    },
+    "vtu": {
+        "module": "vtu",
+        "extensions": [".vtu"],
+        "magic": rb"<VTKFile[^>]*\stype=\"UnstructuredGrid\"",
+        "stream_writers": ["vtu"],
+        "prober": True,
+        "select": True,
+        "csr": True,
+    },
+    "wkt": {"module": "wkt", "extensions": [".wkt"], "stream": True, "buffer": True},
+    "xdmf": {
+        "module": "xdmf",
+        "extensions": [".xdmf", ".xmf"],
+        "magic": rb"<Xdmf",
+        "stream_writers": ["xdmf"],
+        "prober": True,
+        "select": True,
+        "buffer": True,
+    },
+}
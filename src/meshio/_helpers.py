@@ -1,34 +1,100 @@
 from __future__ import annotations
 
-import sys
+import importlib
+import io
+import os
+import re
+import tempfile
+from functools import partial
+from contextlib import contextmanager
 from pathlib import Path
 
 import numpy as np
 from numpy.typing import ArrayLike
 
-from ._common import error, num_nodes_per_cell
+from ._common import Selection, num_nodes_per_cell
 from ._exceptions import ReadError, WriteError
-from ._files import is_buffer
-from ._mesh import CellBlock, Mesh
+from ._files import (
+    compressed_output,
+    compression_from_head,
+    compression_from_path,
+    decompressed_buffer,
+    decompressed_copy,
+    is_binary_buffer,
+    is_buffer,
+    memory_file,
+    open_compressed,
+)
+from ._formats import builtin_formats
+from ._mesh import CellBlock, Mesh, fixed_size_cells
+from ._profile import span
 
 extension_to_filetypes = {}
 reader_map = {}
 _writer_map = {}
+_sniffer_map = {}
+_stream_writer_map = {}
+_block_reader_map = {}
+_prober_map = {}
+
+# keyword arguments of read() that select the data to read, see _common.Selection
+_SELECTORS = ("point_data", "cell_data", "field_data", "sets")
+
+# number of bytes at the beginning of a file that sniffers get to see
+_SNIFF_SIZE = 4096
 
 
 def register_format(
-    format_name: str, extensions: list[str], reader, writer_map
+    format_name: str,
+    extensions: list[str],
+    reader,
+    writer_map,
+    sniffer=None,
+    stream_writer_map=None,
+    block_reader=None,
+    prober=None,
 ) -> None:
+    """Register a file format.
+
+    `sniffer(head, filename)`, if given, must tell from the first few kilobytes of a
+    file (`head`, bytes) if it is of the given format. It is used to pick a reader if
+    the file extension is ambiguous or unknown. `filename` can be used for checks
+    beyond the head, e.g., on the HDF5 structure; it is a binary buffer when reading
+    from one, and None if the file is compressed.
+
+    `stream_writer_map` maps writer names to subclasses of `meshio._stream.StreamWriter`
+    for open_writer().
+
+    `block_reader(filename, chunk_size)`, if given, is a generator for iter_blocks()
+    that reads the file piece by piece, see `meshio._blocks`.
+
+    `prober(filename)`, if given, returns a `meshio._probe.MeshInfo` for probe() from
+    the headers of the file, without reading the arrays.
+    """
     for ext in extensions:
         if ext not in extension_to_filetypes:
             extension_to_filetypes[ext] = []
-        extension_to_filetypes[ext].append(format_name)
+        # built-in formats are registered twice, see _register_builtin_formats()
+        if format_name not in extension_to_filetypes[ext]:
+            extension_to_filetypes[ext].append(format_name)
 
     if reader is not None:
         reader_map[format_name] = reader
 
+    if sniffer is not None:
+        _sniffer_map[format_name] = sniffer
+
     _writer_map.update(writer_map)
 
+    if stream_writer_map is not None:
+        _stream_writer_map.update(stream_writer_map)
+
+    if block_reader is not None:
+        _block_reader_map[format_name] = block_reader
+
+    if prober is not None:
+        _prober_map[format_name] = prober
+
 
 def deregister_format(format_name: str):
     for value in extension_to_filetypes.values():
@@ -41,6 +107,113 @@ def deregister_format(format_name: str):
     if format_name in _writer_map:
         _writer_map.pop(format_name)
 
+    if format_name in _sniffer_map:
+        _sniffer_map.pop(format_name)
+
+    if format_name in _stream_writer_map:
+        _stream_writer_map.pop(format_name)
+
+    if format_name in _block_reader_map:
+        _block_reader_map.pop(format_name)
+
+    if format_name in _prober_map:
+        _prober_map.pop(format_name)
+
+
+def _import_format(module: str) -> None:
+    # On import, the format module registers its reader, writers, and sniffer, which
+    # replace the placeholders from _register_builtin_formats().
+    importlib.import_module(f"meshio.{module}")
+
+
+def _lazy_reader(format_name: str, module: str):
+    def read(*args, **kwargs):
+        _import_format(module)
+        return reader_map[format_name](*args, **kwargs)
+
+    return read
+
+
+def _lazy_writer(writer_name: str, module: str):
+    def write(*args, **kwargs):
+        _import_format(module)
+        return _writer_map[writer_name](*args, **kwargs)
+
+    return write
+
+
+def _lazy_stream_writer(writer_name: str, module: str):
+    def open_writer(*args, **kwargs):
+        _import_format(module)
+        return _stream_writer_map[writer_name](*args, **kwargs)
+
+    return open_writer
+
+
+def _lazy_block_reader(format_name: str, module: str):
+    def iter_blocks(*args, **kwargs):
+        _import_format(module)
+        return _block_reader_map[format_name](*args, **kwargs)
+
+    return iter_blocks
+
+
+def _lazy_prober(format_name: str, module: str):
+    def probe(*args, **kwargs):
+        _import_format(module)
+        return _prober_map[format_name](*args, **kwargs)
+
+    return probe
+
+
+def _lazy_sniffer(format_name: str, module: str, magic: bytes | None, refine: bool):
+    def sniffer(head: bytes, filename: str) -> bool:
+        if magic is not None and re.search(magic, head) is None:
+            return False
+        if not refine:
+            return True
+        _import_format(module)
+        return _sniffer_map[format_name](head, filename)
+
+    return sniffer
+
+
+def _register_builtin_formats() -> None:
+    """Register all formats from the table in _formats without importing them."""
+    for format_name, spec in builtin_formats.items():
+        module = spec["module"]
+        reader = None
+        if spec.get("reader", True):
+            reader = _lazy_reader(format_name, module)
+        writers = {
+            name: _lazy_writer(name, module)
+            for name in spec.get("writers", [format_name])
+        }
+        stream_writers = {
+            name: _lazy_stream_writer(name, module)
+            for name in spec.get("stream_writers", [])
+        }
+        sniffer = None
+        refine = spec.get("sniffer", False)
+        if spec.get("magic") is not None or refine:
+            sniffer = _lazy_sniffer(format_name, module, spec.get("magic"), refine)
+        block_reader = None
+        if spec.get("block_reader", False):
+            block_reader = _lazy_block_reader(format_name, module)
+        prober = None
+        if spec.get("prober", False):
+            prober = _lazy_prober(format_name, module)
+        register_format(
+            format_name,
+            spec["extensions"],
+            reader,
+            writers,
+            sniffer,
+            stream_writers,
+            block_reader,
+            prober,
+        )
+
 
 def _filetypes_from_path(path: Path) -> list[str]:
     ext = ""
@@ -57,23 +230,64 @@ def _filetypes_from_path(path: Path) -> list[str]:
     return out
 
 
-def read(filename, file_format: str | None = None):
+def read(filename, file_format: str | None = None, **kwargs):
     """Reads an unstructured mesh with added data.
 
-    :param filenames: The files/PathLikes to read from.
+    :param filenames: The file/PathLike to read from, or a buffer or bytes with the
+        file content. For buffers and bytes, the format is deduced from the content if
+        not given.
     :type filenames: str
 
+    :param lazy: If supported by the format (VTU, XDMF), don't read points, cells and
+        data arrays right away, but only when they are first accessed.
+    :type lazy: bool
+
+    :param mmap: If supported by the format (binary STL, VTK, Gmsh, UGRID, Medit,
+        VTU with uncompressed raw appended data), memory-map the data arrays of the
+        file instead of reading them. Arrays which don't need to be transformed are
+        views into the file.
+    :type mmap: bool
+
+    :param point_data, cell_data, field_data, sets: Only read the given point data,
+        cell data, field data, and point/cell sets. Each is a name, a list of names,
+        or a function that gets a name and returns whether to read it; default: all.
+        VTU, XDMF, and Exodus skip the other arrays in the file without decoding
+        them; for all other formats, they are dropped after reading.
+
     :returns mesh{2,3}d: The mesh data.
     """
-    if is_buffer(filename, "r"):
-        return _read_buffer(filename, file_format)
+    select = None
+    if any(key in kwargs for key in _SELECTORS):
+        select = Selection(**{key: kwargs.pop(key, None) for key in _SELECTORS})
+
+    if isinstance(filename, (bytes, bytearray, memoryview)):
+        filename = io.BytesIO(filename)
+
+    with span("read") as s:
+        if is_buffer(filename, "r"):
+            mesh = _read_buffer(filename, file_format, select, **kwargs)
+        else:
+            s.add(filename=str(filename))
+            mesh = _read_file(Path(filename), file_format, select, **kwargs)
+
+        if select is not None:
+            mesh = select.apply(mesh)
+    return mesh
 
-    return _read_file(Path(filename), file_format)
 
+def _call_reader(file_format: str, filename, select: Selection | None, **kwargs):
+    if select is not None and builtin_formats.get(file_format, {}).get("select"):
+        # the reader skips unselected arrays itself
+        kwargs["select"] = select
+    with span("reader", file_format=file_format) as s:
+        if not is_buffer(filename, "r"):
+            s.add(nbytes=os.path.getsize(filename))
+        return reader_map[file_format](filename, **kwargs)
 
-def _read_buffer(filename, file_format: str | None):
+
+def _read_buffer(filename, file_format: str | None, select=None, **kwargs):
     if file_format is None:
-        raise ReadError("File format must be given if buffer is used")
+        file_format = _filetype_from_buffer(filename)
     if file_format == "tetgen":
         raise ReadError(
             "tetgen format is spread across multiple files "
@@ -82,36 +296,370 @@ def _read_buffer(filename, file_format: str | None):
     if file_format not in reader_map:
         raise ReadError(f"Unknown file format '{file_format}'")
 
-    return reader_map[file_format](filename)
+    if _supports_buffers(file_format):
+        return _call_reader(file_format, filename, select, **kwargs)
+
+    data = filename.read()
+    if isinstance(data, str):
+        data = data.encode()
+    with memory_file("in" + _extension(file_format), data) as path:
+        return _call_reader(file_format, path, select, **kwargs)
+
+
+def _filetype_from_buffer(buf) -> str:
+    if not (hasattr(buf, "seekable") and buf.seekable()):
+        raise ReadError("File format must be given if buffer is used")
+    pos = buf.tell()
+    head = buf.read(_SNIFF_SIZE)
+    buf.seek(pos)
+    if isinstance(head, str):
+        head = head.encode()
+
+    # sniffers which look beyond the head, e.g., into HDF5 files, get the buffer
+    source = buf if is_binary_buffer(buf) else None
+    for file_format, sniffer in _sniffer_map.items():
+        try:
+            if sniffer(head, source):
+                return file_format
+        finally:
+            buf.seek(pos)
+    raise ReadError("Could not deduce file format from the content of the buffer.")
+
+
+def _supports_buffers(name: str) -> bool:
+    # whether the reader or writer `name` takes buffers, see _formats; formats
+    # registered with register_format() get the buffers
+    for format_name, spec in builtin_formats.items():
+        if name == format_name or name in spec.get("writers", []):
+            return spec.get("buffer", False)
+    return True
+
+
+def _supports_csr(name: str) -> bool:
+    # whether the writer `name` takes CSR cell blocks, see _formats; formats
+    # registered with register_format() get them
+    for format_name, spec in builtin_formats.items():
+        if name == format_name or name in spec.get("writers", []):
+            return spec.get("csr", False)
+    return True
+
+
+def _split_compression(path: Path) -> tuple[Path, str | None]:
+    """Split off the compression suffix (.gz, .bz2, .xz, .zst) unless it belongs to a
+    format's extension (e.g., .vol.gz).
+    """
+    compression = compression_from_path(path)
+    if compression is None:
+        return path, None
+    ext = ""
+    for suffix in reversed(path.suffixes):
+        ext = (suffix + ext).lower()
+        if ext in extension_to_filetypes:
+            return path, None
+    return path.with_suffix(""), compression
+
+
+def _is_streamable(file_format: str) -> bool:
+    # formats whose reader and writer work on compressed streams, see _formats
+    return builtin_formats.get(file_format, {}).get("stream", False)
+
+
+def _filetype_from_file(path: Path, head: bytes | None = None) -> str:
+    """Deduce the file format from the extension and, if that is ambiguous or
+    unknown, from the file content. `head` is the beginning of the (decompressed)
+    content; it is read from `path` if not given.
+    """
+    try:
+        possible_file_formats = _filetypes_from_path(path)
+    except ReadError:
+        possible_file_formats = []
+
+    if len(possible_file_formats) == 1:
+        return possible_file_formats[0]
+
+    filename = None
+    if head is None:
+        filename = str(path)
+        with open(path, "rb") as f:
+            head = f.read(_SNIFF_SIZE)
+
+    for file_format in possible_file_formats or list(_sniffer_map):
+        sniffer = _sniffer_map.get(file_format)
+        if sniffer is not None and sniffer(head, filename):
+            return file_format
+
+    if not possible_file_formats:
+        raise ReadError(
+            f"Could not deduce file format from path or content of '{path}'."
+        )
 
+    # None of the sniffers recognized the file. Take the first format and let its
+    # reader tell what's wrong.
+    return possible_file_formats[0]
 
-def _read_file(path: Path, file_format: str | None):
+
+def _file_format_and_compression(path: Path, file_format: str | None):
+    """Deduce the format and the compression (if any) of the file `path`."""
     if not path.exists():
         raise ReadError(f"File {path} not found.")
 
-    if file_format:
-        possible_file_formats = [file_format]
-    else:
-        # deduce possible file formats from extension
-        possible_file_formats = _filetypes_from_path(path)
+    format_path, compression = _split_compression(path)
+    if compression is None and compression_from_path(path) is None:
+        # compressed files without a compression suffix
+        with open(path, "rb") as f:
+            compression = compression_from_head(f.read(8))
+
+    if not file_format:
+        if compression is None:
+            file_format = _filetype_from_file(path)
+        else:
+            with open_compressed(path, "rb", compression) as f:
+                head = f.read(_SNIFF_SIZE)
+            file_format = _filetype_from_file(format_path, head)
+    if file_format not in reader_map:
+        raise ReadError(f"Unknown file format '{file_format}' of '{path}'.")
 
-    for file_format in possible_file_formats:
-        if file_format not in reader_map:
-            raise ReadError(f"Unknown file format '{file_format}' of '{path}'.")
+    # the reader's open_file() decompresses on the fly
+    if compression is not None and format_path != path and _is_streamable(file_format):
+        compression = None
+    return file_format, compression, format_path
 
-        try:
-            return reader_map[file_format](str(path))
-        except ReadError as e:
-            print(e)
 
-    if len(possible_file_formats) == 1:
-        msg = f"Couldn't read file {path} as {possible_file_formats[0]}"
-    else:
-        lst = ", ".join(possible_file_formats)
-        msg = f"Couldn't read file {path} as either of {lst}"
+def _read_file(path: Path, file_format: str | None, select=None, **kwargs):
+    file_format, compression, format_path = _file_format_and_compression(
+        path, file_format
+    )
+    if compression is None:
+        return _call_reader(file_format, str(path), select, **kwargs)
+
+    if kwargs.get("mmap"):
+        # the decompressed data is removed right after reading
+        kwargs["mmap"] = False
+    # XDMF refers to its data files relative to the file, see _decompressed()
+    if _supports_buffers(file_format) and file_format != "xdmf":
+        with decompressed_buffer(path, compression) as buf:
+            return _call_reader(file_format, buf, select, **kwargs)
+    with _decompressed(path, compression, file_format, format_path) as tmp:
+        return _call_reader(file_format, tmp, select, **kwargs)
+
+
+@contextmanager
+def _decompressed(path: Path, compression: str, file_format: str, format_path: Path):
+    """A decompressed copy of `path`, for readers which need a real file (for seeking,
+    np.fromfile, h5py etc.).
+    """
+    # the names of the other files follow from the file name
+    cell_data_files = path.parent.glob(f"{format_path.stem}_*.xml")
+    if file_format == "tetgen" or (
+        file_format == "dolfin-xml" and any(cell_data_files)
+    ):
+        raise ReadError(
+            f"{file_format} format is spread across multiple files "
+            "and so cannot be read compressed"
+        )
+    # XDMF refers to its HDF5 and binary files relative to the XDMF file
+    tmpdir = path.parent if file_format == "xdmf" else None
+    with decompressed_copy(path, compression, format_path.name, tmpdir) as tmp:
+        yield tmp
+
+
+def iter_blocks(
+    filename, file_format: str | None = None, chunk_size: int | None = None
+):
+    """Iterate over the points, cells, and data of a mesh file without building a Mesh,
+    e.g., for statistics over meshes which don't fit into memory:
+
+        for kind, name, data in meshio.iter_blocks("in.msh"):
+            if kind == "points":
+                bbox_min = np.minimum(bbox_min, data.min(axis=0))
+            elif kind == "cells":
+                counts[data.type] += len(data)
+
+    `kind` is one of "points" (`data` is an array of at most `chunk_size` points),
+    "cells" (a CellBlock of at most `chunk_size` cells), "point_data" and "cell_data"
+    (`name` and an array). The chunks of each kind come in the order of the mesh;
+    cell data chunks follow the order of the cells.
+
+    Gmsh 4.1, binary VTK 5.1, and Abaqus files are read chunk by chunk, so the memory
+    use doesn't depend on the file size. Other formats are read as a whole first.
+    """
+    from ._blocks import BLOCK_SIZE, blocks_from_mesh
+
+    if chunk_size is None:
+        chunk_size = BLOCK_SIZE
+    path = Path(filename)
+    file_format, compression, format_path = _file_format_and_compression(
+        path, file_format
+    )
+
+    def blocks(filename):
+        if file_format in _block_reader_map:
+            return _block_reader_map[file_format](filename, chunk_size)
+        return blocks_from_mesh(reader_map[file_format](filename), chunk_size)
+
+    if compression is None:
+        yield from blocks(str(path))
+        return
+    with _decompressed(path, compression, file_format, format_path) as tmp:
+        yield from blocks(tmp)
+
+
+def probe(filename, file_format: str | None = None):
+    """Summary of a mesh file: the number of points, the cell types and counts per
+    cell block, names, shapes, and data types of the point, cell, and field data, the
+    names of the sets, and the format version. Returns a `MeshInfo`.
+
+    VTU, XDMF, Gmsh 4.1, and binary VTK files are probed from their headers only, which
+    is fast even for huge files; other formats are read as a whole.
+    """
+    from ._probe import MeshInfo
+
+    path = Path(filename)
+    file_format, compression, format_path = _file_format_and_compression(
+        path, file_format
+    )
+
+    def _probe(filename):
+        if file_format in _prober_map:
+            return _prober_map[file_format](filename)
+        return MeshInfo.from_mesh(reader_map[file_format](filename), file_format)
+
+    if compression is None:
+        return _probe(str(path))
+    with _decompressed(path, compression, file_format, format_path) as tmp:
+        return _probe(tmp)
+
+
+async def aread(filename, file_format: str | None = None, executor=None, **kwargs):
+    """Like read(), but runs in `executor` (default: the event loop's default
+    executor) so it doesn't block the event loop:
+
+        mesh = await meshio.aread("in.vtu")
+
+    `filename` can also be an async file object (e.g., from aiofiles), an
+    asyncio.StreamReader, or an async iterator of bytes; it's copied into a temporary
+    file first. If the awaiting task is cancelled, the read stops at the start of the
+    next phase (e.g., a Gmsh section or a VTU array) and frees its memory; reads in a
+    ProcessPoolExecutor run to completion.
+    """
+    from ._async import copy_to_file, is_async_reader, run_in_executor
+
+    if not is_async_reader(filename):
+        return await run_in_executor(executor, read, filename, file_format, **kwargs)
+
+    # some readers tell variants apart by the extension (e.g., Medit)
+    ext = "" if file_format is None else _extension(file_format)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = os.path.join(tmpdir, "in" + ext)
+        await copy_to_file(filename, tmp)
+        return await run_in_executor(executor, read, tmp, file_format, **kwargs)
+
+
+async def awrite(
+    filename, mesh: Mesh, file_format: str | None = None, executor=None, **kwargs
+):
+    """Like write(), but runs in `executor` (default: the event loop's default
+    executor) so it doesn't block the event loop:
+
+        await meshio.awrite("out.vtu", mesh)
+
+    `filename` can also be an async file object opened in binary mode (e.g., from
+    aiofiles) or an asyncio.StreamWriter; `file_format` must be given then. The mesh
+    is written to memory first, like with write_bytes(), so XDMF has its data inline;
+    formats that spread over several files raise a WriteError.
+    """
+    from ._async import is_async_writer, run_in_executor, send_bytes
+
+    if not is_async_writer(filename):
+        await run_in_executor(executor, write, filename, mesh, file_format, **kwargs)
+        return
+
+    if file_format is None:
+        raise WriteError("File format must be supplied if an async stream is used")
+    data = await run_in_executor(executor, write_bytes, mesh, file_format, **kwargs)
+    await send_bytes(data, filename)
+
+
+def _extension(file_format: str) -> str:
+    for ext, file_formats in extension_to_filetypes.items():
+        if file_format in file_formats:
+            return ext
+    return ""
+
+
+def read_many(
+    filenames,
+    file_format: str | None = None,
+    jobs: int | None = None,
+    processes: bool = False,
+    **kwargs,
+):
+    """Read many mesh files concurrently, e.g.:
+
+        for filename, mesh, error in meshio.read_many(glob.glob("*.vtu"), jobs=8):
+            ...
+
+    Yields `(filename, mesh, error)` in the order in which the files have been read.
+    If reading a file fails, `mesh` is None and `error` is the exception; the other
+    files are read nonetheless. At most `jobs` (default: the number of CPUs) files
+    are read at the same time, so the memory use is bounded by `jobs` meshes plus the
+    ones the caller holds on to.
 
-    error(msg)
-    sys.exit(1)
+    The files are read in threads, which helps for compressed and binary files; for
+    ASCII formats, `processes=True` is faster. Formats registered with
+    register_format() aren't available in other processes. The other keyword
+    arguments are passed on to read().
+    """
+    from ._batch import map_unordered, read_file
+
+    fun = partial(read_file, file_format=file_format, kwargs=kwargs)
+    yield from map_unordered(fun, filenames, jobs, processes)
+
+
+def convert_many(
+    filenames,
+    outfile,
+    input_format: str | None = None,
+    output_format: str | None = None,
+    jobs: int | None = None,
+    processes: bool = True,
+    transform=None,
+    **kwargs,
+):
+    """Convert many mesh files concurrently, e.g.:
+
+        for infile, outfile, error in meshio.convert_many(
+            glob.glob("in/*.msh"), "out/{stem}.vtu", jobs=8
+        ):
+            ...
+
+    `outfile` is a template for the output file names with the fields `name`,
+    `stem`, `suffix`, and `parent` of the input file (see `_batch.output_filename`),
+    or a function that gets the input file name and returns the output file name.
+    `transform`, if given, is applied to each mesh between reading and writing; with
+    `processes=True` (default), it must be picklable, e.g., a module-level function.
+    The other keyword arguments are passed on to write().
+
+    Yields `(infile, outfile, error)` in the order of completion; `error` is the
+    exception if the conversion of a file failed, which doesn't stop the others. At
+    most `jobs` (default: the number of CPUs) files are converted at the same time.
+    """
+    from ._batch import convert_file, map_unordered, output_filename
+
+    pairs = [(str(infile), output_filename(outfile, infile)) for infile in filenames]
+    outfiles = [out for _, out in pairs]
+    if len(set(outfiles)) < len(outfiles):
+        raise ValueError(f"Output file template '{outfile}' gives duplicate names")
+
+    fun = partial(
+        convert_file,
+        input_format=input_format,
+        output_format=output_format,
+        transform=transform,
+        kwargs=kwargs,
+    )
+    for (infile, out), _, error in map_unordered(fun, pairs, jobs, processes):
+        yield infile, out, error
 
 
 def write_points_cells(
@@ -142,21 +690,24 @@ def write_points_cells(
 def write(filename, mesh: Mesh, file_format: str | None = None, **kwargs):
     """Writes mesh together with data to a file.
 
-    :params filename: File to write to.
+    :params filename: File or buffer to write to. For buffers, the format must be
+        given; see also write_bytes().
     :type filename: str
 
     :params point_data: Named additional point data to write to the file.
     :type point_data: dict
     """
-    if is_buffer(filename, "r"):
+    if is_buffer(filename, "w"):
         if file_format is None:
             raise WriteError("File format must be supplied if `filename` is a buffer")
-        if file_format == "tetgen":
+        if _writes_other_files(file_format, mesh, kwargs):
             raise WriteError(
-                "tetgen format is spread across multiple files, and so cannot be written to a buffer"
+                f"{file_format} format is spread across multiple files, "
+                "and so cannot be written to a buffer"
             )
+        compression = None
     else:
-        path = Path(filename)
+        path, compression = _split_compression(Path(filename))
         if not file_format:
             # deduce possible file formats from extension
             file_formats = _filetypes_from_path(path)
@@ -169,6 +720,19 @@ def write(filename, mesh: Mesh, file_format: str | None = None, **kwargs):
         formats = sorted(list(_writer_map.keys()))
         raise WriteError(f"Unknown format '{file_format}'. Pick one of {formats}")
 
+    if compression is not None and not _is_streamable(file_format):
+        if file_format == "xdmf":
+            # only inline data goes into the compressed file
+            kwargs.setdefault("data_format", "XML")
+        if _writes_other_files(file_format, mesh, kwargs):
+            raise WriteError(
+                f"{file_format} format is spread across multiple files, "
+                "and so cannot be compressed"
+            )
+
+    if not _supports_csr(file_format):
+        mesh = fixed_size_cells(mesh, file_format)
+
     # check cells for sanity
     for cell_block in mesh.cells:
         key = cell_block.type
@@ -185,4 +749,86 @@ def write(filename, mesh: Mesh, file_format: str | None = None, **kwargs):
             pass
 
     # Write
-    return writer(filename, mesh, **kwargs)
+    with span(
+        "write",
+        file_format=file_format,
+        num_points=len(mesh.points),
+        num_cells=sum(len(c) for c in mesh.cells),
+    ):
+        if is_buffer(filename, "w") and not _supports_buffers(file_format):
+            with memory_file("out", None) as tmp:
+                writer(tmp, mesh, **kwargs)
+                with open(tmp, "rb") as f:
+                    data = f.read()
+            filename.write(
+                data.decode() if isinstance(filename, io.TextIOBase) else data
+            )
+            return
+
+        if compression is None or _is_streamable(file_format):
+            # the writer's open_file() compresses on the fly
+            return writer(filename, mesh, **kwargs)
+
+        with compressed_output(filename, compression, path.name) as tmp:
+            return writer(tmp, mesh, **kwargs)
+
+
+def _writes_other_files(file_format: str, mesh: Mesh, kwargs) -> bool:
+    # Tetgen writes the cells to an .ele file, DOLFIN XML the cell data to separate
+    # files, and XDMF the data to an HDF5 or binary file unless it's inline XML
+    return (
+        file_format == "tetgen"
+        or (file_format == "dolfin-xml" and bool(mesh.cell_data))
+        or (file_format == "xdmf" and kwargs.get("data_format") not in [None, "XML"])
+    )
+
+
+def write_bytes(mesh: Mesh, file_format: str, **kwargs) -> bytes:
+    """Write the mesh to memory and return the file content, e.g., to send it over
+    the network. The keyword arguments are passed on to write().
+
+    The container formats use the in-memory modes of HDF5 and netCDF; formats whose
+    writers need a path write to an anonymous in-memory file on Linux and to a
+    temporary file elsewhere.
+    """
+    buf = io.BytesIO()
+    write(buf, mesh, file_format=file_format, **kwargs)
+    return buf.getvalue()
+
+
+def open_writer(filename, file_format: str | None = None, **kwargs):
+    """Open a writer to which the mesh is passed in chunks, for meshes which don't fit
+    into memory. Use it as a context manager, e.g.,
+
+        with meshio.open_writer("out.vtu") as writer:
+            for points, cells in chunks:
+                writer.add_points(points)
+                writer.add_cells("tetra", cells)
+            writer.add_point_data("u", u)
+
+    Point indices in the cells refer to all points of the mesh. Consecutive cell
+    chunks of the same type form one cell block. See `meshio._stream.StreamWriter` for
+    details.
+
+    Supported formats: VTU, VTK, Gmsh 4.1, and XDMF (HDF5).
+    """
+    path = Path(filename)
+    if not file_format:
+        # deduce possible file formats from extension
+        file_formats = _filetypes_from_path(path)
+        # take the first one that can be written in chunks (.msh is ANSYS or Gmsh)
+        streamable = [f for f in file_formats if f in _stream_writer_map]
+        file_format = streamable[0] if streamable else file_formats[0]
+
+    try:
+        writer = _stream_writer_map[file_format]
+    except KeyError:
+        formats = sorted(_stream_writer_map.keys())
+        raise WriteError(
+            f"Format '{file_format}' can't be written in chunks. "
+            f"Pick one of {formats}"
+        )
+    return writer(filename, **kwargs)
+
+
+_register_builtin_formats()
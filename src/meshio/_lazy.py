@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+class LazyArray:
+    """Placeholder for an array that is only read from the file when it is first
+    accessed. `shape` (and, if known, `dtype`) are available without loading.
+    """
+
+    def __init__(self, loader, shape, dtype=None):
+        self._loader = loader
+        self._data = None
+        self._read_only = False
+        self.shape = tuple(int(s) for s in shape)
+        self.dtype = None if dtype is None else np.dtype(dtype)
+
+    def __repr__(self):
+        dtype = "unknown" if self.dtype is None else self.dtype
+        return f"<meshio LazyArray, shape: {self.shape}, dtype: {dtype}>"
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.load()
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __getitem__(self, idx):
+        # Slicing is lazy, too; the parent array is loaded (once) when the first slice
+        # is accessed.
+        shape = np.broadcast_to(np.empty((), dtype=np.int8), self.shape)[idx].shape
+        return LazyArray(lambda: self.load()[idx], shape, self.dtype)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    def load(self) -> np.ndarray:
+        if self._data is None:
+            self._data = np.asarray(self._loader())
+            # release everything the loader holds on to
+            self._loader = None
+            if self._read_only:
+                self._data.flags.writeable = False
+        return self._data
+
+    def freeze(self) -> None:
+        """Make the data read-only, also if it's only loaded later."""
+        self._read_only = True
+        if self._data is not None:
+            self._data.flags.writeable = False
+
+
+def load(value):
+    """Materialize `value` if it is a LazyArray, or a list of LazyArrays (cell data,
+    cell sets), in place.
+    """
+    if isinstance(value, LazyArray):
+        return value.load()
+    if isinstance(value, list):
+        for k, item in enumerate(value):
+            if isinstance(item, LazyArray):
+                value[k] = item.load()
+    return value
+
+
+def raw_items(dct):
+    """Items of a (possibly lazy) dictionary without loading lazy values."""
+    if isinstance(dct, LazyDict):
+        return dct.raw_items()
+    return dct.items()
+
+
+def concatenate(arrays):
+    """Lazy version of np.concatenate. A single array is returned as is, so, e.g.,
+    memory-mapped arrays stay views into the file.
+    """
+    if len(arrays) == 1:
+        return arrays[0]
+    if not any(isinstance(a, LazyArray) for a in arrays):
+        return np.concatenate(arrays)
+    shape = (sum(a.shape[0] for a in arrays),) + tuple(arrays[0].shape[1:])
+    return LazyArray(
+        lambda: np.concatenate([np.asarray(a) for a in arrays]),
+        shape,
+        arrays[0].dtype,
+    )
+
+
+class LazyDict(MutableMapping):
+    """Dictionary for point_data, cell_data etc. that loads its LazyArray values only
+    when they are looked up.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._dict = dict(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = load(self._dict[key])
+        self._dict[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._dict[key] = value
+
+    def __delitem__(self, key):
+        del self._dict[key]
+
+    def __iter__(self):
+        return iter(self._dict)
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __repr__(self):
+        return repr(self._dict)
+
+    def raw_items(self):
+        """Items without loading lazy values."""
+        return self._dict.items()
@@ -5,7 +5,10 @@ import copy
 import numpy as np
 from numpy.typing import ArrayLike
 
-from ._common import num_nodes_per_cell, warn
+from ._common import concat_ranges, num_nodes_per_cell, warn
+from ._exceptions import WriteError
+from ._lazy import LazyArray, LazyDict, raw_items
+from ._profile import span
 
 topological_dimension = {
     "line": 1,
@@ -82,6 +85,263 @@ topological_dimension = {
 }
 
 
+class CSRCells:
+    """Cells with a varying number of nodes (polygons) or faces (polyhedra), stored in
+    compressed sparse row format.
+
+    Polygon k consists of the nodes `connectivity[offsets[k]:offsets[k + 1]]`.
+    Polyhedron k consists of the faces `offsets[k]:offsets[k + 1]`, and face j consists
+    of the nodes `connectivity[face_offsets[j]:face_offsets[j + 1]]`.
+
+    Iterating over the object gives the node arrays of the polygons, or the lists of
+    face node arrays of the polyhedra.
+    """
+
+    def __init__(self, offsets, connectivity, face_offsets=None):
+        self.offsets = np.asarray(offsets)
+        self.connectivity = np.asarray(connectivity)
+        self.face_offsets = None if face_offsets is None else np.asarray(face_offsets)
+
+    @classmethod
+    def from_list(cls, cells, polyhedron: bool = False):
+        """Create from a list of node lists (polygons), or a list of lists of face node
+        lists (polyhedra).
+        """
+        if polyhedron:
+            items = [np.asarray(face) for cell in cells for face in cell]
+        else:
+            items = [np.asarray(cell) for cell in cells]
+
+        item_offsets = np.cumsum([0] + [len(item) for item in items])
+        if len(items) > 0:
+            connectivity = np.concatenate(items)
+        else:
+            connectivity = np.empty(0, dtype=int)
+
+        if polyhedron:
+            offsets = np.cumsum([0] + [len(cell) for cell in cells])
+            return cls(offsets, connectivity, item_offsets)
+        return cls(item_offsets, connectivity)
+
+    @classmethod
+    def from_array(cls, data):
+        """Create from an array of polygons with the same number of nodes."""
+        data = np.asarray(data)
+        return cls(data.shape[1] * np.arange(len(data) + 1), data.reshape(-1))
+
+    @classmethod
+    def concatenate(cls, blocks):
+        """Concatenate CSRCells of the same kind."""
+        blocks = list(blocks)
+        is_polyhedron = blocks[0].is_polyhedron
+
+        def _concatenate_offsets(offsets_list):
+            out = [offsets_list[0]]
+            for offsets in offsets_list[1:]:
+                out.append(offsets[1:] + out[-1][-1])
+            return np.concatenate(out)
+
+        offsets = _concatenate_offsets([b.offsets for b in blocks])
+        connectivity = np.concatenate([b.connectivity for b in blocks])
+        if is_polyhedron:
+            face_offsets = _concatenate_offsets([b.face_offsets for b in blocks])
+            return cls(offsets, connectivity, face_offsets)
+        return cls(offsets, connectivity)
+
+    @property
+    def is_polyhedron(self) -> bool:
+        return self.face_offsets is not None
+
+    def __repr__(self):
+        kind = "polyhedra" if self.is_polyhedron else "polygons"
+        return f"<meshio CSRCells, {len(self)} {kind}>"
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return self.take(np.arange(len(self))[k])
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(f"Index {k} out of range for {len(self)} cells.")
+        if not self.is_polyhedron:
+            return self.connectivity[self.offsets[k] : self.offsets[k + 1]]
+        fo = self.face_offsets
+        return [
+            self.connectivity[fo[j] : fo[j + 1]]
+            for j in range(self.offsets[k], self.offsets[k + 1])
+        ]
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def tolist(self):
+        if not self.is_polyhedron:
+            return [cell.tolist() for cell in self]
+        return [[face.tolist() for face in cell] for cell in self]
+
+    def to_list(self):
+        """The cells as a list of node arrays (polygons), or of lists of face node
+        arrays (polyhedra), the way meshio stored polyhedra before CSRCells.
+        """
+        return list(self)
+
+    def take(self, indices):
+        """The subset of cells given by `indices`."""
+        indices = np.asarray(indices, dtype=int)
+        starts = self.offsets[indices]
+        stops = self.offsets[indices + 1]
+        offsets = np.concatenate([[0], np.cumsum(stops - starts)])
+        items = concat_ranges(starts, stops)
+        if not self.is_polyhedron:
+            return CSRCells(offsets, self.connectivity[items])
+
+        fo = self.face_offsets
+        face_starts = fo[items]
+        face_stops = fo[items + 1]
+        face_offsets = np.concatenate([[0], np.cumsum(face_stops - face_starts)])
+        connectivity = self.connectivity[concat_ranges(face_starts, face_stops)]
+        return CSRCells(offsets, connectivity, face_offsets)
+
+    def cell_nodes(self):
+        """Offsets and connectivity of the sorted unique nodes of each cell. For
+        polyhedra, this is the union of the face nodes.
+        """
+        if not self.is_polyhedron:
+            return self.offsets, self.connectivity
+
+        num_cells = len(self)
+        cell_of_face = np.repeat(np.arange(num_cells), np.diff(self.offsets))
+        cell_of_node = np.repeat(cell_of_face, np.diff(self.face_offsets))
+        order = np.lexsort((self.connectivity, cell_of_node))
+        cell_of_node = cell_of_node[order]
+        nodes = self.connectivity[order]
+        is_new = np.ones(len(nodes), dtype=bool)
+        is_new[1:] = (cell_of_node[1:] != cell_of_node[:-1]) | (nodes[1:] != nodes[:-1])
+        counts = np.bincount(cell_of_node[is_new], minlength=num_cells)
+        return np.concatenate([[0], np.cumsum(counts)]), nodes[is_new]
+
+
+def _concatenate_cells(blocks: list):
+    # Concatenate the data of cell blocks of one type. If any of them is in CSR
+    # format, or if the number of nodes per cell differs (polygons), the result is in
+    # CSR format.
+    if not any(isinstance(block, CSRCells) for block in blocks):
+        if len({block.shape[1:] for block in blocks}) == 1:
+            return np.concatenate(blocks)
+    return CSRCells.concatenate(
+        [
+            block if isinstance(block, CSRCells) else CSRCells.from_array(block)
+            for block in blocks
+        ]
+    )
+
+
+def fixed_size_cells(mesh: Mesh, file_format: str) -> Mesh:
+    """The mesh with each block of polygons in CSR format split into blocks of
+    consecutive polygons with the same number of nodes, the way the readers return
+    them, for writers which take rectangular cell arrays only. Cell data and cell sets
+    are split accordingly; the order of the cells is kept.
+    """
+    if not any(isinstance(block.data, CSRCells) for block in mesh.cells):
+        return mesh
+
+    cells = []
+    # for each original cell block, the (start, stop) ranges of the new blocks, or
+    # None if it is kept as it is
+    block_ranges = []
+    for block in mesh.cells:
+        if not isinstance(block.data, CSRCells):
+            cells.append(block)
+            block_ranges.append(None)
+            continue
+        if block.data.is_polyhedron:
+            raise WriteError(
+                f"{file_format} cannot write polyhedra with a varying number of faces."
+            )
+        offsets = block.data.offsets
+        sizes = np.diff(offsets)
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(sizes)) + 1, [len(sizes)]])
+        ranges = list(zip(bounds[:-1], bounds[1:])) if len(sizes) > 0 else []
+        for start, stop in ranges:
+            data = block.data.connectivity[offsets[start] : offsets[stop]]
+            cells.append(CellBlock(block.type, data.reshape(stop - start, -1)))
+        block_ranges.append(ranges)
+
+    def split_data(values):
+        out = []
+        for value, ranges in zip(values, block_ranges):
+            if ranges is None:
+                out.append(value)
+                continue
+            value = np.asarray(value)
+            out += [value[start:stop] for start, stop in ranges]
+        return out
+
+    def split_members(member_list):
+        out = []
+        for members, ranges in zip(member_list, block_ranges):
+            if ranges is None:
+                out.append(members)
+            elif members is None:
+                out += [None] * len(ranges)
+            else:
+                members = np.asarray(members)
+                out += [
+                    members[(start <= members) & (members < stop)] - start
+                    for start, stop in ranges
+                ]
+        return out
+
+    return Mesh(
+        mesh.points,
+        cells,
+        point_data=mesh.point_data,
+        cell_data={key: split_data(value) for key, value in mesh.cell_data.items()},
+        field_data=mesh.field_data,
+        point_sets=mesh.point_sets,
+        cell_sets={key: split_members(value) for key, value in mesh.cell_sets.items()},
+        gmsh_periodic=mesh.gmsh_periodic,
+        info=mesh.info,
+    )
+
+
+def _freeze(data):
+    """Make an array, or the arrays in a (nested) list, read-only in place."""
+    if isinstance(data, np.ndarray):
+        data.flags.writeable = False
+    elif isinstance(data, LazyArray):
+        data.freeze()
+    elif isinstance(data, CSRCells):
+        for array in [data.offsets, data.connectivity, data.face_offsets]:
+            _freeze(array)
+    elif isinstance(data, list):
+        for item in data:
+            _freeze(item)
+
+
+def _read_only(data):
+    """Read-only view of an array, or of the arrays in a (nested) list."""
+    if isinstance(data, np.ndarray):
+        view = data.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(data, LazyArray):
+        return LazyArray(lambda: _read_only(data.load()), data.shape, data.dtype)
+    if isinstance(data, CSRCells):
+        return CSRCells(
+            _read_only(data.offsets),
+            _read_only(data.connectivity),
+            _read_only(data.face_offsets),
+        )
+    if isinstance(data, list):
+        return [_read_only(item) for item in data]
+    return data
+
+
 class CellBlock:
     def __init__(
         self,
@@ -93,9 +353,13 @@ class CellBlock:
         self.data = data
 
         if cell_type.startswith("polyhedron"):
+            # nested lists of faces are stored in compact form
+            if not isinstance(data, CSRCells):
+                self.data = CSRCells.from_list(data, polyhedron=True)
             self.dim = 3
         else:
-            self.data = np.asarray(self.data)
+            if not isinstance(data, (LazyArray, CSRCells)):
+                self.data = np.asarray(self.data)
             self.dim = topological_dimension[cell_type]
 
         self.tags = [] if tags is None else tags
@@ -104,13 +368,24 @@ class CellBlock:
         items = [
             "meshio CellBlock",
             f"type: {self.type}",
-            f"num cells: {len(self.data)}",
+            f"num cells: {len(self)}",
             f"tags: {self.tags}",
         ]
         return "<" + ", ".join(items) + ">"
 
     def __len__(self):
-        return len(self.data)
+        return len(self._data)
+
+    @property
+    def data(self):
+        # lazily read data is loaded on first access
+        if isinstance(self._data, LazyArray):
+            self._data = self._data.load()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
 
 
 class Mesh:
@@ -126,7 +401,7 @@ class Mesh:
         gmsh_periodic=None,
         info=None,
     ):
-        self.points = np.asarray(points)
+        self.points = points if isinstance(points, LazyArray) else np.asarray(points)
         if isinstance(cells, dict):
             # Let's not deprecate this for now.
             # warn(
@@ -143,12 +418,7 @@ class Mesh:
         for cell_block in cells:
             if isinstance(cell_block, tuple):
                 cell_type, data = cell_block
-                cell_block = CellBlock(
-                    cell_type,
-                    # polyhedron data cannot be converted to numpy arrays
-                    # because the sublists don't all have the same length
-                    data if cell_type.startswith("polyhedron") else np.asarray(data),
-                )
+                cell_block = CellBlock(cell_type, data)
             self.cells.append(cell_block)
 
         self.point_data = {} if point_data is None else point_data
@@ -159,35 +429,43 @@ class Mesh:
         self.gmsh_periodic = gmsh_periodic
         self.info = info
 
-        # assert point data consistency and convert to numpy arrays
-        for key, item in self.point_data.items():
-            self.point_data[key] = np.asarray(item)
-            if len(self.point_data[key]) != len(self.points):
-                raise ValueError(
-                    f"len(points) = {len(self.points)}, "
-                    f'but len(point_data["{key}"]) = {len(self.point_data[key])}'
-                )
-
-        # assert cell data consistency and convert to numpy arrays
-        for key, data in self.cell_data.items():
-            if len(data) != len(cells):
-                raise ValueError(
-                    f"Incompatible cell data '{key}'. "
-                    f"{len(cells)} cell blocks, but '{key}' has {len(data)} blocks."
-                )
+        # cache for cells_dict etc.
+        self._cache = {}
+
+        with span("mesh:validate", num_points=len(self._points)):
+            # assert point data consistency and convert to numpy arrays
+            # (lazily read data is only checked for its length)
+            for key, item in list(raw_items(self.point_data)):
+                if not isinstance(item, LazyArray):
+                    item = np.asarray(item)
+                    self.point_data[key] = item
+                if len(item) != len(self._points):
+                    raise ValueError(
+                        f"len(points) = {len(self._points)}, "
+                        f'but len(point_data["{key}"]) = {len(item)}'
+                    )
 
-            for k in range(len(data)):
-                data[k] = np.asarray(data[k])
-                if len(data[k]) != len(self.cells[k]):
+            # assert cell data consistency and convert to numpy arrays
+            for key, data in raw_items(self.cell_data):
+                if len(data) != len(cells):
                     raise ValueError(
-                        "Incompatible cell data. "
-                        + f"Cell block {k} ('{self.cells[k].type}') "
-                        + f"has length {len(self.cells[k])}, but "
-                        + f"corresponding cell data item has length {len(data[k])}."
+                        f"Incompatible cell data '{key}'. "
+                        f"{len(cells)} cell blocks, but '{key}' has {len(data)} blocks."
                     )
 
+                for k in range(len(data)):
+                    if not isinstance(data[k], LazyArray):
+                        data[k] = np.asarray(data[k])
+                    if len(data[k]) != len(self.cells[k]):
+                        raise ValueError(
+                            "Incompatible cell data. "
+                            + f"Cell block {k} ('{self.cells[k].type}') "
+                            + f"has length {len(self.cells[k])}, but "
+                            + f"corresponding cell data item has length {len(data[k])}."
+                        )
+
     def __repr__(self):
-        lines = ["<meshio mesh object>", f"  Number of points: {len(self.points)}"]
+        lines = ["<meshio mesh object>", f"  Number of points: {len(self._points)}"]
         special_cells = [
             "polygon",
             "polyhedron",
@@ -203,7 +481,9 @@ class Mesh:
             lines.append("  Number of cells:")
             for cell_block in self.cells:
                 string = cell_block.type
-                if cell_block.type in special_cells:
+                if cell_block.type in special_cells and not isinstance(
+                    cell_block.data, CSRCells
+                ):
                     string += f"({cell_block.data.shape[1]})"
                 lines.append(f"    {string}: {len(cell_block)}")
         else:
@@ -231,8 +511,65 @@ class Mesh:
 
         return "\n".join(lines)
 
-    def copy(self):
-        return copy.deepcopy(self)
+    @property
+    def points(self):
+        # lazily read points are loaded on first access
+        if isinstance(self._points, LazyArray):
+            self._points = self._points.load()
+        return self._points
+
+    @points.setter
+    def points(self, value):
+        self._points = value
+
+    def copy(self, deep: bool = True):
+        """Copy the mesh.
+
+        With `deep=False`, only the cell blocks and the data dictionaries and lists are
+        copied; the arrays are shared between the two meshes. This is cheap, and so
+        that neither mesh changes the other, the shared arrays become read-only in
+        *both* meshes: in-place writes (`mesh.points[0] = ...`) raise a ValueError.
+        Assign new arrays instead (`mesh.points = ...`, `mesh.point_data["a"] = ...`),
+        which only affects the mesh they are assigned to. Views of the arrays taken
+        before the copy stay writeable.
+        """
+        if deep:
+            return copy.deepcopy(self)
+
+        _freeze(self._points)
+        for c in self.cells:
+            _freeze(c._data)
+        for dct in [
+            self.point_data,
+            self.cell_data,
+            self.field_data,
+            self.point_sets,
+            self.cell_sets,
+        ]:
+            for _, value in raw_items(dct):
+                _freeze(value)
+
+        def _dict(dct, fun):
+            out = {key: fun(value) for key, value in raw_items(dct)}
+            return LazyDict(out) if isinstance(dct, LazyDict) else out
+
+        def _list(lst):
+            return [_read_only(item) for item in lst]
+
+        return Mesh(
+            _read_only(self._points),
+            [
+                CellBlock(c.type, _read_only(c._data), tags=list(c.tags))
+                for c in self.cells
+            ],
+            point_data=_dict(self.point_data, _read_only),
+            cell_data=_dict(self.cell_data, _list),
+            field_data=_dict(self.field_data, _read_only),
+            point_sets=_dict(self.point_sets, _read_only),
+            cell_sets=_dict(self.cell_sets, _list),
+            gmsh_periodic=copy.deepcopy(self.gmsh_periodic),
+            info=copy.copy(self.info),
+        )
 
     def write(self, path_or_buf, file_format: str | None = None, **kwargs):
         # avoid circular import
@@ -243,66 +580,121 @@ class Mesh:
     def get_cells_type(self, cell_type: str):
         if not any(c.type == cell_type for c in self.cells):
             return np.empty((0, num_nodes_per_cell[cell_type]), dtype=int)
-        return np.concatenate([c.data for c in self.cells if c.type == cell_type])
+        return _concatenate_cells([c.data for c in self.cells if c.type == cell_type])
 
     def get_cell_data(self, name: str, cell_type: str):
         return np.concatenate(
             [d for c, d in zip(self.cells, self.cell_data[name]) if c.type == cell_type]
         )
 
+    def _cached(self, name: str, sources: list, build):
+        # The views are cached together with the objects they were built from. If any
+        # of these objects was replaced (e.g., a cell block appended, a data array
+        # reassigned), the view is rebuilt.
+        entry = self._cache.get(name)
+        if entry is not None:
+            old_sources, value = entry
+            if len(old_sources) == len(sources) and all(
+                a is b for a, b in zip(old_sources, sources)
+            ):
+                return value
+        value = build()
+        self._cache[name] = (sources, value)
+        return value
+
+    def _cells_sources(self) -> list:
+        return [self.cells] + [obj for c in self.cells for obj in (c, c.type, c.data)]
+
+    def refresh(self) -> None:
+        """Discard cached views like `cells_dict`. Only necessary if arrays have been
+        modified in place; replacing arrays, cell blocks etc. is detected
+        automatically. The arrays of the views themselves are read-only.
+        """
+        self._cache = {}
+
     @property
     def cells_dict(self):
-        cells_dict = {}
-        for cell_block in self.cells:
-            if cell_block.type not in cells_dict:
-                cells_dict[cell_block.type] = []
-            cells_dict[cell_block.type].append(cell_block.data)
-        # concatenate
-        for key, value in cells_dict.items():
-            cells_dict[key] = np.concatenate(value)
-        return cells_dict
+        def build():
+            cells_dict = {}
+            for cell_block in self.cells:
+                if cell_block.type not in cells_dict:
+                    cells_dict[cell_block.type] = []
+                cells_dict[cell_block.type].append(cell_block.data)
+            # concatenate; no copy if there is only one block of the type, so the
+            # arrays are read-only to avoid writing to the cell blocks by accident
+            return {
+                key: _read_only(
+                    value[0] if len(value) == 1 else _concatenate_cells(value)
+                )
+                for key, value in cells_dict.items()
+            }
+
+        return dict(self._cached("cells_dict", self._cells_sources(), build))
 
     @property
     def cell_data_dict(self):
-        cell_data_dict = {}
+        def build():
+            cell_data_dict = {}
+            for key, value_list in self.cell_data.items():
+                cell_data_dict[key] = {}
+                for value, cell_block in zip(value_list, self.cells):
+                    if cell_block.type not in cell_data_dict[key]:
+                        cell_data_dict[key][cell_block.type] = []
+                    cell_data_dict[key][cell_block.type].append(value)
+
+                for cell_type, val in cell_data_dict[key].items():
+                    cell_data_dict[key][cell_type] = _read_only(
+                        val[0] if len(val) == 1 else np.concatenate(val)
+                    )
+            return cell_data_dict
+
+        sources = self._cells_sources() + [self.cell_data]
         for key, value_list in self.cell_data.items():
-            cell_data_dict[key] = {}
-            for value, cell_block in zip(value_list, self.cells):
-                if cell_block.type not in cell_data_dict[key]:
-                    cell_data_dict[key][cell_block.type] = []
-                cell_data_dict[key][cell_block.type].append(value)
+            sources += [key, value_list] + list(value_list)
 
-            for cell_type, val in cell_data_dict[key].items():
-                cell_data_dict[key][cell_type] = np.concatenate(val)
-        return cell_data_dict
+        value = self._cached("cell_data_dict", sources, build)
+        return {key: dict(val) for key, val in value.items()}
 
     @property
     def cell_sets_dict(self):
-        sets_dict = {}
-        for key, member_list in self.cell_sets.items():
-            sets_dict[key] = {}
-            offsets = {}
-            for members, cells in zip(member_list, self.cells):
-                if members is None:
-                    continue
-                if cells.type in offsets:
-                    offset = offsets[cells.type]
-                    offsets[cells.type] += cells.data.shape[0]
-                else:
-                    offset = 0
-                    offsets[cells.type] = cells.data.shape[0]
-                if cells.type in sets_dict[key]:
-                    sets_dict[key][cells.type].append(members + offset)
-                else:
-                    sets_dict[key][cells.type] = [members + offset]
-        return {
-            key: {
-                cell_type: np.concatenate(members)
-                for cell_type, members in sets.items()
-                if sum(map(np.size, members))
+        def build():
+            sets_dict = {}
+            for key, member_list in self.cell_sets.items():
+                sets_dict[key] = {}
+                offsets = {}
+                for members, cells in zip(member_list, self.cells):
+                    if members is None:
+                        continue
+                    if cells.type in offsets:
+                        offset = offsets[cells.type]
+                        offsets[cells.type] += len(cells)
+                    else:
+                        offset = 0
+                        offsets[cells.type] = len(cells)
+                    members = np.asarray(members)
+                    if offset != 0:
+                        members = members + offset
+                    if cells.type in sets_dict[key]:
+                        sets_dict[key][cells.type].append(members)
+                    else:
+                        sets_dict[key][cells.type] = [members]
+            return {
+                key: {
+                    cell_type: _read_only(
+                        members[0] if len(members) == 1 else np.concatenate(members)
+                    )
+                    for cell_type, members in sets.items()
+                    if sum(map(np.size, members))
+                }
+                for key, sets in sets_dict.items()
             }
-            for key, sets in sets_dict.items()
-        }
+
+        sources = self._cells_sources() + [self.cell_sets]
+        for key, member_list in self.cell_sets.items():
+            sources += [key, member_list] + list(member_list)
+
+        value = self._cached("cell_sets_dict", sources, build)
+        return {key: dict(val) for key, val in value.items()}
 
     @classmethod
     def read(cls, path_or_buf, file_format=None):
@@ -322,10 +714,13 @@ class Mesh:
             for k, c in enumerate(zip(*self.cell_sets.values())):
                 # Go for -1 as the default value. (NaN is not int.)
                 arr = np.full(len(self.cells[k]), default_value, dtype=int)
-                for i, cc in enumerate(c):
-                    if cc is None:
-                        continue
-                    arr[cc] = i
+                # Assign all sets at once. For cells in more than one set, the last
+                # set wins.
+                set_ids = [i for i, cc in enumerate(c) if cc is not None]
+                members = [np.asarray(c[i]) for i in set_ids]
+                if len(members) > 0:
+                    idx, ids = _last_set_wins(members, set_ids)
+                    arr[idx] = ids
                 intfun.append(arr)
 
             for item in intfun:
@@ -348,8 +743,10 @@ class Mesh:
         default_value = -1
         if len(self.point_sets) > 0:
             intfun = np.full(len(self.points), default_value, dtype=int)
-            for i, cc in enumerate(self.point_sets.values()):
-                intfun[cc] = i
+            members = [np.asarray(cc) for cc in self.point_sets.values()]
+            # for points in more than one set, the last set wins
+            idx, ids = _last_set_wins(members, np.arange(len(members)))
+            intfun[idx] = ids
 
             if np.any(intfun == default_value):
                 warn(
@@ -384,10 +781,11 @@ class Mesh:
             # alternative names
             names = [f"set-{key}-{tag}" for tag in tags]
 
-        # TODO there's probably a better way besides np.where, something from
-        # np.unique or np.sort
-        for name, tag in zip(names, tags):
-            self.cell_sets[name] = [np.where(d == tag)[0] for d in data]
+        sets = {name: [] for name in names}
+        for d in data:
+            for name, members in zip(names, _group_by_tag(d, tags)):
+                sets[name].append(members)
+        self.cell_sets.update(sets)
 
         # remove the cell data
         del self.cell_data[key]
@@ -397,7 +795,7 @@ class Mesh:
         data = self.point_data[key]
 
         # handle all int and uint data
-        if not all(v.dtype.kind in ["i", "u"] for v in data):
+        if data.dtype.kind not in ["i", "u"]:
             raise RuntimeError(f"point_data['{key}'] is not int data.")
 
         tags = np.unique(data)
@@ -412,10 +810,31 @@ class Mesh:
             # alternative names
             names = [f"set-key-{tag}" for tag in tags]
 
-        # TODO there's probably a better way besides np.where, something from
-        # np.unique or np.sort
-        for name, tag in zip(names, tags):
-            self.point_sets[name] = np.where(data == tag)[0]
+        for name, members in zip(names, _group_by_tag(data, tags)):
+            self.point_sets[name] = members
 
         # remove the cell data
         del self.point_data[key]
+
+
+def _group_by_tag(data, tags):
+    """For each tag, the (sorted) indices where `data` equals the tag. One sort of the
+    data instead of one comparison per tag.
+    """
+    order = np.argsort(data, kind="stable")
+    sorted_data = data[order]
+    starts = np.searchsorted(sorted_data, tags, side="left")
+    ends = np.searchsorted(sorted_data, tags, side="right")
+    return [order[start:end] for start, end in zip(starts, ends)]
+
+
+def _last_set_wins(members, set_ids):
+    """The indices in the sets `members` and, for each, the id of the last set which
+    contains it. NumPy leaves open which value an index assignment with repeated
+    indices stores, so the repetitions are dropped explicitly.
+    """
+    idx = np.concatenate(members).astype(int)
+    ids = np.repeat(set_ids, [len(m) for m in members])
+    # np.unique picks the first occurrence, which is the last one in reverse
+    idx, first = np.unique(idx[::-1], return_index=True)
+    return idx, ids[::-1][first]
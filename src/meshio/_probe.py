@@ -0,0 +1,108 @@
+"""
+Summary of a mesh file for meshio.probe(), read from the file headers where possible.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from ._lazy import raw_items
+
+
+class MeshInfo:
+    """What's in a mesh file, without the arrays.
+
+    `cells` is a list of (cell type, number of cells) per cell block. `point_data`,
+    `cell_data`, and `field_data` map names to (shape, dtype) of the arrays; the shape
+    of cell data is that of the data of all cell blocks concatenated. The dtype is None
+    if the header doesn't tell.
+    """
+
+    def __init__(
+        self,
+        file_format: str,
+        num_points: int,
+        cells: list[tuple[str, int]],
+        point_data: dict | None = None,
+        cell_data: dict | None = None,
+        field_data: dict | None = None,
+        point_sets: list[str] | None = None,
+        cell_sets: list[str] | None = None,
+        version: str | None = None,
+    ):
+        self.file_format = file_format
+        self.version = version
+        self.num_points = int(num_points)
+        self.cells = [(cell_type, int(n)) for cell_type, n in cells]
+        self.point_data = {} if point_data is None else point_data
+        self.cell_data = {} if cell_data is None else cell_data
+        self.field_data = {} if field_data is None else field_data
+        self.point_sets = [] if point_sets is None else list(point_sets)
+        self.cell_sets = [] if cell_sets is None else list(cell_sets)
+
+    @classmethod
+    def from_mesh(cls, mesh, file_format: str, version: str | None = None):
+        """Summary of a mesh that has been read, for formats without a prober."""
+
+        def summary(data):
+            # lazy arrays know their shape
+            if not hasattr(data, "shape"):
+                data = np.asarray(data)
+            return tuple(data.shape), data.dtype
+
+        def concatenated_summary(data):
+            shapes = [summary(d)[0] for d in data]
+            return (sum(s[0] for s in shapes),) + shapes[0][1:], summary(data[0])[1]
+
+        return cls(
+            file_format,
+            len(mesh.points),
+            [(cell_block.type, len(cell_block)) for cell_block in mesh.cells],
+            point_data={name: summary(d) for name, d in raw_items(mesh.point_data)},
+            cell_data={
+                name: concatenated_summary(d)
+                for name, d in raw_items(mesh.cell_data)
+                if len(d) > 0
+            },
+            field_data={name: summary(d) for name, d in mesh.field_data.items()},
+            point_sets=list(mesh.point_sets),
+            cell_sets=list(mesh.cell_sets),
+            version=version,
+        )
+
+    @property
+    def num_cells(self) -> int:
+        return sum(n for _, n in self.cells)
+
+    def __repr__(self):
+        version = "" if self.version is None else f" (version {self.version})"
+        lines = [
+            "<meshio mesh info>",
+            f"  Format: {self.file_format}{version}",
+            f"  Number of points: {self.num_points}",
+        ]
+        if len(self.cells) > 0:
+            lines.append("  Number of cells:")
+            for cell_type, n in self.cells:
+                lines.append(f"    {cell_type}: {n}")
+        else:
+            lines.append("  No cells.")
+
+        if self.point_sets:
+            lines.append(f"  Point sets: {', '.join(self.point_sets)}")
+
+        if self.cell_sets:
+            lines.append(f"  Cell sets: {', '.join(self.cell_sets)}")
+
+        for title, arrays in [
+            ("Point data", self.point_data),
+            ("Cell data", self.cell_data),
+            ("Field data", self.field_data),
+        ]:
+            if arrays:
+                lines.append(f"  {title}:")
+                for name, (shape, dtype) in arrays.items():
+                    dtype = "" if dtype is None else f", {dtype}"
+                    lines.append(f"    {name}: {shape}{dtype}")
+
+        return "\n".join(lines)
@@ -0,0 +1,193 @@
+"""
+Instrumentation of the readers and writers, see meshio.set_profiler().
+
+The phases of reading and writing (e.g., reading a Gmsh section, decompressing VTU
+data) are wrapped in `span(name, **info)`. Without a profiler, span() returns a no-op
+context manager, so the instrumentation costs next to nothing.
+
+The start of each phase is also where reads and writes of meshio.aread() and
+meshio.awrite() stop once they have been cancelled, see `cancellable`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# called with every finished Span; None disables profiling
+_profiler = None
+
+# per thread: the threading.Event which cancels the read or write running in it
+_local = threading.local()
+
+
+class Cancelled(Exception):
+    """Raised at the start of a phase in a thread whose read or write has been
+    cancelled.
+    """
+
+
+class Span:
+    """A finished phase: `name`, `start` (time.perf_counter(), in seconds),
+    `duration` (in seconds), the thread it ran in, and `info`, a dictionary of the
+    sizes etc. involved (e.g., `nbytes`, `num_points`).
+    """
+
+    def __init__(self, name: str, start: float, duration: float, thread_id: int, info):
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.thread_id = thread_id
+        self.info = info
+
+    def __repr__(self):
+        info = "".join(f", {key}={value}" for key, value in self.info.items())
+        return f"<meshio span {self.name}: {self.duration * 1e3:.3f} ms{info}>"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def add(self, **info) -> None:
+        pass
+
+
+_null_span = _NullSpan()
+
+
+class _ActiveSpan:
+    def __init__(self, profiler, name: str, info):
+        self.profiler = profiler
+        self.name = name
+        self.info = info
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        duration = time.perf_counter() - self.start
+        self.profiler(
+            Span(self.name, self.start, duration, threading.get_ident(), self.info)
+        )
+        return False
+
+    def add(self, **info) -> None:
+        """Add info that is only known at the end of the phase."""
+        self.info.update(info)
+
+
+def span(name: str, **info):
+    """Context manager that reports the phase `name` to the profiler, if any. Use
+    `.add(**info)` on the returned object for info known only at the end.
+    """
+    cancelled = getattr(_local, "cancelled", None)
+    if cancelled is not None and cancelled.is_set():
+        raise Cancelled(name)
+    if _profiler is None:
+        return _null_span
+    return _ActiveSpan(_profiler, name, info)
+
+
+@contextmanager
+def cancellable(cancelled: threading.Event):
+    """Have all phases started in this thread within the `with` block raise
+    `Cancelled` once `cancelled` is set.
+    """
+    previous = getattr(_local, "cancelled", None)
+    _local.cancelled = cancelled
+    try:
+        yield
+    finally:
+        _local.cancelled = previous
+
+
+def set_profiler(callback: Callable[[Span], None] | None):
+    """Have `callback` called with a `Span` for each phase of reading and writing
+    meshes, or disable profiling with None. Returns the previous profiler.
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = callback
+    return previous
+
+
+class Recorder:
+    """Profiler that collects the spans, for export as JSON or Chrome trace."""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [
+                {
+                    "name": s.name,
+                    "start": s.start,
+                    "duration": s.duration,
+                    "thread_id": s.thread_id,
+                    "info": s.info,
+                }
+                for s in self.spans
+            ],
+            default=_to_builtin,
+        )
+
+    def to_chrome_trace(self) -> str:
+        """The spans in the Chrome trace event format, for chrome://tracing and
+        Perfetto.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": s.start * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": s.info,
+            }
+            for s in self.spans
+        ]
+        return json.dumps({"traceEvents": events}, default=_to_builtin)
+
+    def write_chrome_trace(self, filename) -> None:
+        with open(filename, "w") as f:
+            f.write(self.to_chrome_trace())
+
+
+def _to_builtin(value):
+    # numpy scalars, shapes etc. in the span info
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+@contextmanager
+def profile():
+    """Record the spans of the reads and writes in the `with` block:
+
+    with meshio.profile() as recorder:
+        mesh = meshio.read("in.vtu")
+    recorder.write_chrome_trace("trace.json")
+    """
+    recorder = Recorder()
+    previous = set_profiler(recorder)
+    try:
+        yield recorder
+    finally:
+        set_profiler(previous)
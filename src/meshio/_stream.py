@@ -0,0 +1,357 @@
+"""
+Base class for the writers of meshio.open_writer(), which receive a mesh chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ._common import num_nodes_per_cell
+from ._exceptions import WriteError
+from ._files import _CHUNK_SIZE
+
+
+class _Spill:
+    """A temporary file to which the chunks of an array are appended. It may begin
+    with data that was moved out of the output file, already in the output format; see
+    StreamWriter._move_runs().
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        # rows and bytes of the moved data at the beginning of the file
+        self.prefix_rows = 0
+        self.prefix_size = 0
+        self._file = open(filename, "wb")
+
+    def add_prefix(self, f, start: int, end: int, num_rows: int) -> None:
+        """Copy the bytes `start`...`end` of the file `f`."""
+        f.seek(start)
+        for k in range(start, end, _CHUNK_SIZE):
+            self._file.write(f.read(min(_CHUNK_SIZE, end - k)))
+        self.prefix_rows += num_rows
+        self.prefix_size += end - start
+
+    def append(self, data: np.ndarray) -> None:
+        data.tofile(self._file)
+
+    def copy_prefix(self, f) -> None:
+        with open(self.filename, "rb") as src:
+            for k in range(0, self.prefix_size, _CHUNK_SIZE):
+                f.write(src.read(min(_CHUNK_SIZE, self.prefix_size - k)))
+
+    def chunks(self, dtype: np.dtype, shape: tuple[int, ...]):
+        """Read the appended array of `shape` back in chunks of about _CHUNK_SIZE
+        bytes.
+        """
+        num_rows = shape[0] - self.prefix_rows
+        row_size = int(np.prod(shape[1:]))
+        rows_per_chunk = max(1, _CHUNK_SIZE // max(1, dtype.itemsize * row_size))
+        with open(self.filename, "rb") as f:
+            f.seek(self.prefix_size)
+            for k in range(0, num_rows, rows_per_chunk):
+                n = min(rows_per_chunk, num_rows - k)
+                yield np.fromfile(f, dtype, n * row_size).reshape((n,) + shape[1:])
+
+    def close(self):
+        self._file.close()
+
+
+class _Run:
+    """The bytes `start`...`end` of the output file, to which the chunks of an array are
+    written as they come.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.start = None
+        self.end = None
+        self.num_rows = 0
+        # positions of the counts etc. which are filled in on close()
+        self.positions = []
+
+
+class StreamWriter:
+    """Writer for meshes which are too large to be held in memory.
+
+    Points, cells, and data are added in chunks. Consecutive cell chunks of the same
+    type form one cell block; point and cell data chunks are appended in the order of
+    the points and cells, respectively. Later chunks of an array are converted to the
+    data type of its first chunk. The file is completed on close().
+
+    Formats which give an array a position in the file, see `_layout()`, get its
+    chunks written into the output file right away, in a _Run, as long as the chunks
+    come in the order of the file. If a chunk comes for an array that comes before
+    others in the file, those are moved to temporary files; all chunks of arrays without
+    a position, or after an array in a temporary file, go to temporary files, too.
+    These arrays are written after the others on close(). The counts etc. in the
+    headers of the sections are filled in by `_finish()`.
+
+    Formats without positions for the arrays override `_write()`, which assembles the
+    output from the temporary files, or `_append()`.
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        self.num_points = 0
+        # [cell_type, number of cells] for each cell block
+        self.cell_blocks = []
+        self.point_data_names = []
+        self.cell_data_names = []
+        self._dtypes = {}
+        self._shapes = {}
+        self._spills = {}
+        self._runs = []
+        self._file = None
+        # where the runs begin, after the header written by _begin_output()
+        self._data_start = None
+        self._tmpdir = None
+        # whether the output file has been (partially) written
+        self._output_started = False
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+
+    @property
+    def num_cells(self) -> int:
+        return sum(n for _, n in self.cell_blocks)
+
+    def add_points(self, points: ArrayLike) -> None:
+        points = np.asarray(points)
+        if points.ndim != 2:
+            raise WriteError(f"Points must be a 2D array (got shape {points.shape}).")
+        self._append("points", points)
+        self.num_points += len(points)
+
+    def add_cells(self, cell_type: str, data: ArrayLike) -> None:
+        """Add cells of type `cell_type`. The point indices refer to all points of the
+        mesh, not only those added so far.
+        """
+        data = np.asarray(data)
+        if cell_type in num_nodes_per_cell and (
+            data.ndim != 2 or data.shape[1] != num_nodes_per_cell[cell_type]
+        ):
+            raise WriteError(
+                f"Unexpected cells array shape {data.shape} for {cell_type} cells. "
+                + f"Expected shape [:, {num_nodes_per_cell[cell_type]}]."
+            )
+        if len(self.cell_blocks) == 0 or self.cell_blocks[-1][0] != cell_type:
+            self.cell_blocks.append([cell_type, 0])
+        self._append(("cells", len(self.cell_blocks) - 1), data)
+        self.cell_blocks[-1][1] += len(data)
+
+    def add_point_data(self, name: str, data: ArrayLike) -> None:
+        if name not in self.point_data_names:
+            self.point_data_names.append(name)
+        self._append(("point_data", name), np.asarray(data))
+
+    def add_cell_data(self, name: str, data: ArrayLike) -> None:
+        """Add data for the cells, in the order in which the cells are added."""
+        if name not in self.cell_data_names:
+            self.cell_data_names.append(name)
+        self._append(("cell_data", name), np.asarray(data))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self._check_data()
+            for spill in self._spills.values():
+                spill.close()
+            self._write()
+        except BaseException:
+            self._abort()
+            raise
+        self._cleanup()
+
+    def _check_data(self) -> None:
+        for name in self.point_data_names:
+            n = self._length(("point_data", name))
+            if n != self.num_points:
+                raise WriteError(
+                    f"Point data '{name}' has {n} entries, "
+                    f"but there are {self.num_points} points."
+                )
+        for name in self.cell_data_names:
+            n = self._length(("cell_data", name))
+            if n != self.num_cells:
+                raise WriteError(
+                    f"Cell data '{name}' has {n} entries, "
+                    f"but there are {self.num_cells} cells."
+                )
+
+    def _append(self, key, data: np.ndarray) -> None:
+        if key not in self._shapes:
+            self._dtypes[key] = data.dtype
+            self._shapes[key] = (0,) + data.shape[1:]
+        elif data.shape[1:] != self._shapes[key][1:]:
+            raise WriteError(
+                f"Inconsistent chunk shape {data.shape} "
+                f"(expected (:, {', '.join(map(str, self._shapes[key][1:]))}))."
+            )
+        data = np.ascontiguousarray(data, dtype=self._dtypes[key])
+
+        layout = self._layout(key)
+        if key in self._spills or layout is None or self._comes_after_spill(layout):
+            self._spill(key).append(data)
+        else:
+            self._write_in_place(key, layout, data)
+        shape = self._shapes[key]
+        self._shapes[key] = (shape[0] + len(data),) + shape[1:]
+
+    def _layout(self, key) -> tuple | None:
+        """The position of the array `key` in the output file, as a tuple which sorts
+        in file order, or None if its chunks have to be kept in a temporary file until
+        close().
+        """
+        return None
+
+    def _file_order(self, key) -> tuple:
+        # points, cells, point data, cell data, which is the order of most formats
+        if key == "points":
+            return (0,)
+        kind, name = key
+        if kind == "cells":
+            return (1, name)
+        if kind == "point_data":
+            return (2, self.point_data_names.index(name))
+        return (3, self.cell_data_names.index(name))
+
+    def _comes_after_spill(self, layout: tuple) -> bool:
+        return any(
+            self._layout(key) is not None and self._layout(key) < layout
+            for key in self._spills
+        )
+
+    def _spill(self, key) -> _Spill:
+        if key not in self._spills:
+            if self._tmpdir is None:
+                # next to the output, where there's room for the output, too
+                self._tmpdir = tempfile.TemporaryDirectory(dir=self.filename.parent)
+            filename = os.path.join(self._tmpdir.name, f"{len(self._spills)}.bin")
+            self._spills[key] = _Spill(filename)
+        return self._spills[key]
+
+    def _write_in_place(self, key, layout: tuple, data: np.ndarray) -> None:
+        keys = [run.key for run in self._runs]
+        if key in keys:
+            self._move_runs(keys.index(key) + 1)
+        else:
+            # the runs of arrays which come later in the file make room
+            later = [self._layout(k) > layout for k in keys]
+            self._move_runs(later.index(True) if any(later) else len(keys))
+            self._start_run(key)
+        run = self._runs[-1]
+        self._write_rows(self._file, run, data)
+        run.num_rows += len(data)
+        run.end = self._file.tell()
+
+    def _start_run(self, key) -> _Run:
+        f = self._output()
+        run = _Run(key)
+        self._begin_run(f, run, self._runs[-1] if self._runs else None)
+        run.start = run.end = f.tell()
+        self._runs.append(run)
+        return run
+
+    def _move_runs(self, i: int) -> None:
+        """Move the runs from the `i`-th on into temporary files, and cut them (and the
+        headers between them) off the output file.
+        """
+        if i >= len(self._runs):
+            return
+        for run in self._runs[i:]:
+            self._spill(run.key).add_prefix(
+                self._file, run.start, run.end, run.num_rows
+            )
+        end = self._runs[i - 1].end if i > 0 else self._data_start
+        self._file.truncate(end)
+        self._file.seek(end)
+        del self._runs[i:]
+
+    def _output(self):
+        if self._file is None:
+            self._output_started = True
+            self._file = open(self.filename, "wb+")
+            self._begin_output(self._file)
+            self._data_start = self._file.tell()
+        return self._file
+
+    def _patch(self, position: int, data: bytes) -> None:
+        """Overwrite the output file at `position`, e.g., to fill in a count."""
+        end = self._file.tell()
+        self._file.seek(position)
+        self._file.write(data)
+        self._file.seek(end)
+
+    def _length(self, key) -> int:
+        return self._shapes[key][0] if key in self._shapes else 0
+
+    def _dtype(self, key) -> np.dtype:
+        return self._dtypes[key]
+
+    def _shape(self, key) -> tuple[int, ...]:
+        return self._shapes[key]
+
+    def _chunks(self, key):
+        if key in self._spills:
+            yield from self._spills[key].chunks(self._dtypes[key], self._shapes[key])
+
+    def _begin_output(self, f) -> None:
+        """Write what comes before the runs."""
+
+    def _begin_run(self, f, run: _Run, prev: _Run | None) -> None:
+        """Write what comes between the run `prev` (None for the first one) and the
+        data of `run`.
+        """
+        raise NotImplementedError
+
+    def _write_rows(self, f, run: _Run, data: np.ndarray) -> None:
+        """Write the next chunk of the run, which has `run.num_rows` rows so far."""
+        raise NotImplementedError
+
+    def _finish(self, f) -> None:
+        """Complete the file after the last run."""
+        raise NotImplementedError
+
+    def _write(self) -> None:
+        f = self._output()
+        # the arrays in temporary files follow the runs
+        keys = [key for key in self._spills if self._layout(key) is not None]
+        for key in sorted(keys, key=self._layout):
+            run = self._start_run(key)
+            self._spills[key].copy_prefix(f)
+            run.num_rows = self._spills[key].prefix_rows
+            for chunk in self._chunks(key):
+                self._write_rows(f, run, chunk)
+                run.num_rows += len(chunk)
+            run.end = f.tell()
+        self._finish(f)
+
+    def _abort(self) -> None:
+        # don't leave a half-written file
+        self._cleanup()
+        if self._output_started and self.filename.exists():
+            self.filename.unlink()
+
+    def _cleanup(self) -> None:
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+        for spill in self._spills.values():
+            spill.close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
@@ -1,8 +1,8 @@
 import numpy as np
 
-from ._common import num_nodes_per_cell, warn
+from ._common import concat_ranges, num_nodes_per_cell, warn
 from ._exceptions import ReadError
-from ._mesh import CellBlock
+from ._mesh import CellBlock, CSRCells
 
 # https://vtk.org/doc/nightly/html/vtkCellType_8h_source.html
 vtk_to_meshio_type = {
@@ -86,6 +86,52 @@ def meshio_to_vtk_order(meshio_type, dtype=int):
     return None
 
 
+# cells with varying number of points
+_varying_size_cells = [
+    "polygon",
+    "VTK_LAGRANGE_CURVE",
+    "VTK_LAGRANGE_TRIANGLE",
+    "VTK_LAGRANGE_QUADRILATERAL",
+    "VTK_LAGRANGE_TETRAHEDRON",
+    "VTK_LAGRANGE_HEXAHEDRON",
+    "VTK_LAGRANGE_WEDGE",
+    "VTK_LAGRANGE_PYRAMID",
+]
+
+
+def _type_ranges(types):
+    # all cells with indices between start[k] and end[k] have the same type
+    breaks = np.where(types[:-1] != types[1:])[0] + 1
+    return list(
+        zip(
+            np.concatenate([[0], breaks]),
+            np.concatenate([breaks, [len(types)]]),
+        )
+    )
+
+
+def vtk_cell_block_sizes(offsets, types):
+    """Types and numbers of cells of the cell blocks that vtk_cells_from_data() creates,
+    without looking at the connectivity.
+    """
+    out = []
+    for start, end in _type_ranges(types):
+        meshio_type = vtk_to_meshio_type.get(types[start])
+        if meshio_type is None:
+            continue
+        if meshio_type in _varying_size_cells:
+            # one block per run of cells with the same number of nodes
+            first_node = 0 if start == 0 else offsets[start - 1]
+            sizes = np.diff(np.hstack((first_node, offsets[start:end])))
+            c = np.concatenate(
+                [[0], np.where(np.diff(sizes) != 0)[0] + 1, [len(sizes)]]
+            )
+            out += [(meshio_type, n) for n in np.diff(c)]
+        else:
+            out.append((meshio_type, end - start))
+    return out
+
+
 def vtk_cells_from_data(connectivity, offsets, types, cell_data_raw):
     # Translate it into the cells array.
     # `connectivity` is a one-dimensional vector with
@@ -95,14 +141,7 @@ def vtk_cells_from_data(connectivity, offsets, types, cell_data_raw):
         raise ReadError(f"len(offsets) != len(types) ({len(offsets)} != {len(types)})")
 
     # identify cell blocks
-    breaks = np.where(types[:-1] != types[1:])[0] + 1
-    # all cells with indices between start[k] and end[k] have the same type
-    start_end = list(
-        zip(
-            np.concatenate([[0], breaks]),
-            np.concatenate([breaks, [len(types)]]),
-        )
-    )
+    start_end = _type_ranges(types)
 
     cells = []
     cell_data = {}
@@ -116,18 +155,22 @@ def vtk_cells_from_data(connectivity, offsets, types, cell_data_raw):
             )
             continue
 
-        # cells with varying number of points
-        special_cells = [
-            "polygon",
-            "VTK_LAGRANGE_CURVE",
-            "VTK_LAGRANGE_TRIANGLE",
-            "VTK_LAGRANGE_QUADRILATERAL",
-            "VTK_LAGRANGE_TETRAHEDRON",
-            "VTK_LAGRANGE_HEXAHEDRON",
-            "VTK_LAGRANGE_WEDGE",
-            "VTK_LAGRANGE_PYRAMID",
-        ]
-        if meshio_type in special_cells:
+        if meshio_type == "polyhedron":
+            # The face stream of each polyhedron takes the place of its connectivity,
+            # see vtk_polyhedron_faces().
+            first_node = 0 if start == 0 else offsets[start - 1]
+            blocks, block_data = vtk_polyhedron_cells_from_data(
+                connectivity[first_node : offsets[end - 1]],
+                offsets[start:end] - first_node,
+                {name: d[start:end] for name, d in cell_data_raw.items()},
+            )
+            for tp, c in blocks.items():
+                cells.append(CellBlock(tp, c))
+            for name, d in block_data.items():
+                if name not in cell_data:
+                    cell_data[name] = []
+                cell_data[name] += d
+        elif meshio_type in _varying_size_cells:
             # Polygons have unknown and varying number of nodes per cell.
 
             # Index where the previous block of cells stopped. Needed to know the number
@@ -167,12 +210,22 @@ def vtk_cells_from_data(connectivity, offsets, types, cell_data_raw):
             n = num_nodes_per_cell[meshio_type]
 
             new_order = vtk_to_meshio_order(types[start], dtype=offsets.dtype)
-            if new_order is None:
-                new_order = np.arange(n, dtype=offsets.dtype)
-            new_order -= n
-
-            indices = np.add.outer(offsets[start:end], new_order)
-            cells.append(CellBlock(meshio_type, connectivity[indices]))
+            block_offsets = offsets[start:end]
+            if (
+                new_order is None
+                and block_offsets[0] >= n
+                and np.all(np.diff(block_offsets) == n)
+            ):
+                # The cells are stored contiguously in the right order; take a view
+                # instead of a copy (which matters for memory-mapped connectivity).
+                data = connectivity[block_offsets[0] - n : block_offsets[-1]]
+                cells.append(CellBlock(meshio_type, data.reshape(-1, n)))
+            else:
+                if new_order is None:
+                    new_order = np.arange(n, dtype=offsets.dtype)
+                new_order -= n
+                indices = np.add.outer(block_offsets, new_order)
+                cells.append(CellBlock(meshio_type, connectivity[indices]))
             for name, d in cell_data_raw.items():
                 if name not in cell_data:
                     cell_data[name] = []
@@ -181,6 +234,106 @@ def vtk_cells_from_data(connectivity, offsets, types, cell_data_raw):
     return cells, cell_data
 
 
+def vtk_polyhedron_cells_from_data(faces, faceoffsets, cell_data_raw):
+    # In general the number of faces will vary between cells, and the
+    # number of nodes vary between faces for each cell. The information
+    # is stored as CSRCells, one block per number of nodes per cell.
+
+    # The data format for face-cells is:
+    # num_faces_cell_0,
+    #   num_nodes_face_0, node_ind_0, node_ind_1, ..
+    #   num_nodes_face_1, node_ind_0, node_ind_1, ..
+    #   ...
+    # num_faces_cell_1,
+    #   ...
+    # See https://vtk.org/Wiki/VTK/Polyhedron_Support for more.
+
+    # The faceoffsets describes the end of the face description for each
+    # cell. Switch faceoffsets to give start points, not end points
+    cell_starts = np.concatenate([[0], faceoffsets[:-1]]).astype(int)
+    num_faces = faces[cell_starts].astype(int)
+    cell_face_offsets = np.concatenate([[0], np.cumsum(num_faces)])
+
+    # Walk through the faces of all cells simultaneously. The number of iterations is
+    # the maximum number of faces per cell.
+    face_starts = np.empty(cell_face_offsets[-1], dtype=int)
+    pos = cell_starts + 1
+    for j in range(np.max(num_faces, initial=0)):
+        active = np.where(j < num_faces)[0]
+        face_starts[cell_face_offsets[active] + j] = pos[active]
+        pos[active] += faces[pos[active]] + 1
+
+    face_sizes = faces[face_starts].astype(int)
+    connectivity = faces[concat_ranges(face_starts + 1, face_starts + 1 + face_sizes)]
+    polyhedra = CSRCells(
+        cell_face_offsets, connectivity, np.concatenate([[0], np.cumsum(face_sizes)])
+    )
+
+    # The cells will be assigned to blocks according to their number of nodes.
+    # This is potentially a reordering, compared to the ordering in faces.
+    # Cell data must be reorganized accordingly.
+    num_nodes = np.diff(polyhedra.cell_nodes()[0])
+    _, first, inverse = np.unique(num_nodes, return_index=True, return_inverse=True)
+
+    cells = {}
+    cell_data = {}
+    # blocks in the order of their first appearance
+    for k in np.argsort(first):
+        items = np.where(inverse.reshape(-1) == k)[0]
+        cells[f"polyhedron{num_nodes[items[0]]}"] = polyhedra.take(items)
+
+        # Store cell data for this set of cells
+        for name, d in cell_data_raw.items():
+            if name not in cell_data:
+                cell_data[name] = []
+            cell_data[name].append(d[items])
+
+    return cells, cell_data
+
+
+def vtk_polyhedron_faces(polyhedra):
+    # Define the faces of each cell on the format specified for VTK Polyhedron
+    # cells, see <https://vtk.org/Wiki/VTK/Polyhedron_Support>:
+    # num_faces_cell_0,
+    #   num_nodes_face_0, node_ind_0, node_ind_1, ..
+    #   num_nodes_face_1, node_ind_0, node_ind_1, ..
+    #   ...
+    # num_faces_cell_1,
+    #   ...
+    offsets = polyhedra.offsets
+    face_offsets = polyhedra.face_offsets
+    num_faces = np.diff(offsets)
+    face_sizes = np.diff(face_offsets)
+
+    # size of the data for each cell
+    num_face_nodes = face_offsets[offsets[1:]] - face_offsets[offsets[:-1]]
+    data_size_per_cell = 1 + num_faces + num_face_nodes
+    cell_ends = np.cumsum(data_size_per_cell)
+    cell_starts = cell_ends - data_size_per_cell
+
+    # position of the num_nodes item of each face
+    cell_of_face = np.repeat(np.arange(len(polyhedra)), num_faces)
+    first_face = offsets[:-1][cell_of_face]
+    face_starts = (
+        cell_starts[cell_of_face]
+        + 1
+        + (face_offsets[:-1] - face_offsets[first_face])
+        + (np.arange(len(face_sizes)) - first_face)
+    )
+
+    data = np.empty(cell_ends[-1] if len(cell_ends) > 0 else 0, dtype=int)
+    data[cell_starts] = num_faces
+    data[face_starts] = face_sizes
+    data[concat_ranges(face_starts + 1, face_starts + 1 + face_sizes)] = (
+        polyhedra.connectivity
+    )
+
+    # The returned data corresponds to the faces and faceoffsets fields in the
+    # vtu polyhedron data format; legacy VTK files store it in place of the
+    # connectivity and offsets of the polyhedra
+    return data, cell_ends
+
+
 class Info:
     """Info Container for the VTK reader."""
 
@@ -195,6 +348,10 @@ class Info:
         self.types = None
         self.active = None
         self.is_ascii = False
+        # memory-map binary data arrays instead of reading them
+        self.mmap = False
+        # skip the numbers of ASCII data arrays, only their shapes are kept
+        self.skip_ascii = False
         self.split = []
         self.num_items = 0
         # One of the problem in reading VTK files are POINT_DATA and CELL_DATA fields.
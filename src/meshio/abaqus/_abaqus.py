@@ -8,7 +8,8 @@ from itertools import count
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import num_nodes_per_cell
+from .._blocks import IndexMap
+from .._common import num_nodes_per_cell, parse_numbers, parse_ragged
 from .._exceptions import ReadError
 from .._files import open_file
 from .._helpers import register_format
@@ -151,9 +152,7 @@ def read_buffer(f):
             params_map = get_param_map(line, required_keys=["NSET"])
             set_ids, _, line = _read_set(f, params_map)
             name = params_map["NSET"]
-            point_sets[name] = np.array(
-                [point_ids[point_id] for point_id in set_ids], dtype="int32"
-            )
+            point_sets[name] = point_ids(set_ids).astype("int32")
         elif keyword == "ELSET":
             params_map = get_param_map(line, required_keys=["ELSET"])
             set_ids, set_names, line = _read_set(f, params_map)
@@ -229,24 +228,40 @@ def read_buffer(f):
     )
 
 
-def _read_nodes(f):
-    points = []
-    point_ids = {}
-    counter = 0
+def _read_data_lines(f, max_lines=None):
+    # the non-empty lines up to the next keyword, and the keyword line
+    lines = []
     while True:
         line = f.readline()
         if not line or line.startswith("*"):
             break
         if line.strip() == "":
             continue
+        lines.append(line)
+        if len(lines) == max_lines:
+            line = None
+            break
+    return lines, line
 
-        line = line.strip().split(",")
-        point_id, coords = line[0], line[1:]
-        point_ids[int(point_id)] = counter
-        points.append([float(x) for x in coords])
-        counter += 1
 
-    return np.array(points, dtype=float), point_ids, line
+def _parse_nodes(lines):
+    # node ID and coordinates; all numbers are parsed as floats in one go
+    if not lines:
+        return np.empty(0, dtype=int), np.empty(0, dtype=float)
+    values, offsets = parse_ragged(lines, float, delimiter=",")
+    row_lengths = np.diff(offsets)
+    if np.any(row_lengths != row_lengths[0]):
+        raise ReadError("Nodes have different numbers of coordinates")
+    data = values.reshape(len(lines), -1)
+    return data[:, 0].astype(int), data[:, 1:]
+
+
+def _read_nodes(f):
+    lines, line = _read_data_lines(f)
+    ids, points = _parse_nodes(lines)
+    point_ids = IndexMap(offset=1)
+    point_ids.append(ids)
+    return points, point_ids, line
 
 
 def _read_cells(f, params_map, point_ids):
@@ -258,23 +273,17 @@ def _read_cells(f, params_map, point_ids):
     # ElementID + NodesIDs
     num_data = num_nodes_per_cell[cell_type] + 1
 
-    idx = []
-    while True:
-        line = f.readline()
-        if not line or line.startswith("*"):
-            break
-        line = line.strip()
-        if line == "":
-            continue
-        idx += [int(k) for k in filter(None, line.split(","))]
+    lines, line = _read_data_lines(f)
+    idx = parse_numbers(lines, int, delimiter=",")
 
     # Check for expected number of data
     if len(idx) % num_data != 0:
         raise ReadError("Expected number of data items does not match element type")
 
-    idx = np.array(idx).reshape((-1, num_data))
-    cell_ids = dict(zip(idx[:, 0], count(0)))
-    cells = np.array([[point_ids[node] for node in elem] for elem in idx[:, 1:]])
+    idx = idx.reshape((-1, num_data))
+    cell_ids = dict(zip(idx[:, 0].tolist(), count(0)))
+    nodes = idx[:, 1:]
+    cells = point_ids(nodes)
 
     cell_sets = (
         {params_map["ELSET"]: np.arange(len(cells), dtype="int32")}
@@ -285,6 +294,97 @@ def _read_cells(f, params_map, point_ids):
     return cell_type, cells, cell_ids, cell_sets, line
 
 
+def iter_blocks(filename, chunk_size: int):
+    """Read the nodes and elements of an Abaqus inp file chunk by chunk, see
+    meshio.iter_blocks(). Node and element sets are skipped.
+    """
+    with open_file(filename, "r") as f:
+        yield from _iter_blocks(f, chunk_size)
+
+
+def _iter_blocks(f, chunk_size):
+    # Abaqus node IDs typically are 1, 2, 3, ...
+    point_ids = IndexMap(offset=1)
+    num_points = 0
+
+    line = f.readline()
+    while True:
+        if not line:  # EOF
+            break
+
+        # Comments
+        if line.startswith("**"):
+            line = f.readline()
+            continue
+
+        keyword = line.partition(",")[0].strip().replace("*", "").upper()
+        if keyword == "NODE":
+            line = yield from _iter_nodes(f, point_ids, chunk_size)
+            num_points = point_ids.size
+        elif keyword == "ELEMENT":
+            params_map = get_param_map(line, required_keys=["TYPE"])
+            line = yield from _iter_cells(f, params_map, point_ids, chunk_size)
+        elif keyword == "INCLUDE":
+            ext_input_file = pathlib.Path(line.split("=")[-1].strip())
+            if ext_input_file.exists() is False:
+                cd = pathlib.Path(f.name).parent
+                ext_input_file = cd / ext_input_file
+
+            # as in merge(), the cells of the external file refer to its own points,
+            # which are appended
+            offset = num_points
+            for kind, name, data in iter_blocks(ext_input_file, chunk_size):
+                if kind == "points":
+                    num_points += len(data)
+                elif kind == "cells":
+                    data = CellBlock(data.type, data.data + offset)
+                yield kind, name, data
+
+            line = f.readline()
+        else:
+            line = f.readline()
+
+
+def _iter_nodes(f, point_ids, chunk_size):
+    while True:
+        lines, line = _read_data_lines(f, chunk_size)
+        if lines:
+            ids, points = _parse_nodes(lines)
+            point_ids.append(ids)
+            yield "points", None, points
+        if line is not None:
+            return line
+
+
+def _iter_cells(f, params_map, point_ids, chunk_size):
+    etype = params_map["TYPE"]
+    if etype not in abaqus_to_meshio_type.keys():
+        raise ReadError(f"Element type not available: {etype}")
+
+    cell_type = abaqus_to_meshio_type[etype]
+    # ElementID + NodesIDs
+    num_data = num_nodes_per_cell[cell_type] + 1
+
+    # elements may span several lines, so carry the numbers of incomplete elements
+    # over to the next chunk
+    idx = np.empty(0, dtype=int)
+    while True:
+        lines, line = _read_data_lines(f, chunk_size)
+        idx = np.concatenate([idx, parse_numbers(lines, int, delimiter=",")])
+        n = len(idx) // num_data * num_data
+        if n > 0:
+            cells = idx[:n].reshape((-1, num_data))[:, 1:]
+            yield "cells", None, CellBlock(cell_type, point_ids(cells))
+            idx = idx[n:]
+        if line is not None:
+            break
+
+    # Check for expected number of data
+    if len(idx) != 0:
+        raise ReadError("Expected number of data items does not match element type")
+    return line
+
+
 def merge(
     mesh, points, cells, point_data, cell_data, field_data, point_sets, cell_sets
 ):
@@ -450,4 +550,4 @@ def write(
         # f.write("*END")
 
 
-register_format("abaqus", [".inp"], read, {"abaqus": write})
+register_format("abaqus", [".inp"], read, {"abaqus": write}, block_reader=iter_blocks)
@@ -6,7 +6,15 @@ I/O for AVS-UCD format, cf.
 import numpy as np
 
 from ..__about__ import __version__ as version
-from .._common import _pick_first_int_data, warn
+from .._blocks import IndexMap
+from .._common import (
+    _pick_first_int_data,
+    parse_ragged,
+    parse_table,
+    warn,
+    write_table,
+)
+from .._exceptions import ReadError
 from .._files import open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
@@ -76,43 +84,41 @@ def read_buffer(f):
     return Mesh(points, cells, point_data=point_data, cell_data=cell_data)
 
 
+def _read_lines(f, num_lines):
+    return [f.readline() for _ in range(num_lines)]
+
+
 def _read_nodes(f, num_nodes):
-    if num_nodes > 0:
-        data = np.genfromtxt(f, max_rows=num_nodes)
-    else:
-        data = np.empty((0, 3))
-    points_ids = {int(pid): i for i, pid in enumerate(data[:, 0])}
-    return points_ids, data[:, 1:]
+    data = parse_table(_read_lines(f, num_nodes), 4)
+    point_ids = IndexMap(offset=1)
+    point_ids.append(data[:, 0].astype(int))
+    return point_ids, data[:, 1:]
 
 
 def _read_cells(f, num_cells, point_ids):
+    # cell ID, material, cell type, and the point IDs
+    lines = [line.split(None, 3) for line in _read_lines(f, num_cells)]
+    if any(len(line) < 4 for line in lines):
+        raise ReadError("Expected cell ID, material, type, and points")
+    ids = parse_table([f"{line[0]} {line[1]}" for line in lines], 2, int)
+    corners, offsets = parse_ragged([line[3] for line in lines], int)
+    corners = point_ids(corners)
+    cell_types = [avsucd_to_meshio_type[line[2]] for line in lines]
+
+    # split into blocks of consecutive cells of the same type
+    starts = [
+        k for k in range(num_cells) if k == 0 or cell_types[k] != cell_types[k - 1]
+    ]
     cells = []
-    cell_ids = {}
     cell_data = {"avsucd:material": []}
-    count = 0
-    for _ in range(num_cells):
-        line = f.readline().strip().split()
-        cell_id = int(line[0])
-        cell_mat = int(line[1])
-        cell_type = avsucd_to_meshio_type[line[2]]
-        corner = [point_ids[int(pid)] for pid in line[3:]]
-
-        if len(cells) > 0 and cells[-1][0] == cell_type:
-            cells[-1][1].append(corner)
-            cell_data["avsucd:material"][-1].append(cell_mat)
-        else:
-            cells.append((cell_type, [corner]))
-            cell_data["avsucd:material"].append([cell_mat])
-
-        cell_ids[cell_id] = count
-        count += 1
-
-    # Convert to numpy arrays
-    for k, (cell_type, cdata) in enumerate(cells):
-        cells[k] = CellBlock(
-            cell_type, np.array(cdata)[:, avsucd_to_meshio_order[cell_type]]
-        )
-        cell_data["avsucd:material"][k] = np.array(cell_data["avsucd:material"][k])
+    for start, end in zip(starts, starts[1:] + [num_cells]):
+        cell_type = cell_types[start]
+        data = corners[offsets[start] : offsets[end]].reshape(end - start, -1)
+        cells.append(CellBlock(cell_type, data[:, avsucd_to_meshio_order[cell_type]]))
+        cell_data["avsucd:material"].append(ids[start:end, 1])
+
+    cell_ids = IndexMap(offset=1)
+    cell_ids.append(ids[:, 0])
     return cell_ids, cells, cell_data
 
 
@@ -120,27 +126,20 @@ def _read_data(f, num_entities, entity_ids):
     line = f.readline().strip().split()
     data_size = [int(i) for i in line[1:]]
 
-    labels = {}
-    data = {}
-    for i, dsize in enumerate(data_size):
+    labels = []
+    for _ in data_size:
         line = f.readline().strip().split(",")
-        labels[i] = line[0].strip().replace(" ", "_")
-        data[labels[i]] = (
-            np.empty(num_entities) if dsize == 1 else np.empty((num_entities, dsize))
-        )
+        labels.append(line[0].strip().replace(" ", "_"))
 
-    for _ in range(num_entities):
-        line = f.readline().strip().split()
-        eid = entity_ids[int(line[0])]
-        j = 0
-        for i, dsize in enumerate(data_size):
-            if dsize == 1:
-                data[labels[i]][eid] = float(line[j + 1])
-            else:
-                data[labels[i]][eid] = [
-                    float(val) for val in line[j + 1 : j + 1 + dsize]
-                ]
-            j += dsize
+    table = parse_table(_read_lines(f, num_entities), 1 + sum(data_size))
+    eid = entity_ids(table[:, 0])
+    data = {}
+    j = 1
+    for label, dsize in zip(labels, data_size):
+        values = np.empty((num_entities, dsize))
+        values[eid] = table[:, j : j + dsize]
+        data[label] = values[:, 0] if dsize == 1 else values
+        j += dsize
     return data
 
 
@@ -212,21 +211,18 @@ def write(filename, mesh):
 
 
 def _write_nodes(f, points):
-    for i, (x, y, z) in enumerate(points):
-        f.write(f"{i + 1} {x} {y} {z}\n")
+    write_table(f, [np.arange(1, len(points) + 1), *points.T], "%d %r %r %r\n")
 
 
 def _write_cells(f, cells, material):
     i = 0
     for cell_block in cells:
         cell_type = cell_block.type
-        v = cell_block.data
-        for cell in v[:, meshio_to_avsucd_order[cell_type]]:
-            cell_str = " ".join(str(c) for c in cell + 1)
-            f.write(
-                f"{i + 1} {material[i]} {meshio_to_avsucd_type[cell_type]} {cell_str}\n"
-            )
-            i += 1
+        v = cell_block.data[:, meshio_to_avsucd_order[cell_type]] + 1
+        ids = np.arange(i + 1, i + len(v) + 1)
+        fmt = f"%d %s {meshio_to_avsucd_type[cell_type]}" + " %d" * v.shape[1] + "\n"
+        write_table(f, [ids, material[i : i + len(v)], *v.T], fmt)
+        i += len(v)
 
 
 def _write_data(f, labels, data_array, num_entities, num_data, num_data_sum):
@@ -236,8 +232,8 @@ def _write_data(f, labels, data_array, num_entities, num_data, num_data_sum):
     for label in labels:
         f.write(f"{label}, real\n")
 
-    data_array = np.column_stack((np.arange(1, num_entities + 1), data_array))
-    np.savetxt(f, data_array, delimiter=" ", fmt=["%d"] + ["%.14e"] * num_data_sum)
+    fmt = "%d" + " %.14e" * num_data_sum + "\n"
+    write_table(f, [np.arange(1, num_entities + 1), *data_array.T], fmt)
 
 
 register_format("avsucd", [".avs"], read, {"avsucd": write})
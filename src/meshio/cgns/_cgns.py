@@ -6,6 +6,7 @@ TODO link to specification?
 
 import numpy as np
 
+from .._common import hdf5_sniffer
 from .._exceptions import ReadError
 from .._helpers import register_format
 from .._mesh import Mesh
@@ -98,4 +99,7 @@ def write(filename, mesh, compression="gzip", compression_opts=4):
             )
 
 
-register_format("cgns", [".cgns"], read, {"cgns": write})
+_sniff = hdf5_sniffer(lambda f: "CGNSLibraryVersion" in f or "Base" in f)
+
+
+register_format("cgns", [".cgns"], read, {"cgns": write}, sniffer=_sniff)
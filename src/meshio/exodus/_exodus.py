@@ -6,14 +6,17 @@ See
 in particular Appendix A (page 171, Implementation of EXODUS II with netCDF).
 """
 
+from __future__ import annotations
+
 import datetime
 import re
 
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import warn
+from .._common import Selection, hdf5_sniffer, warn
 from .._exceptions import ReadError
+from .._files import is_buffer
 from .._helpers import register_format
 from .._mesh import Mesh
 
@@ -66,10 +69,27 @@ exodus_to_meshio_type = {
 meshio_to_exodus_type = {v: k for k, v in exodus_to_meshio_type.items()}
 
 
-def read(filename):  # noqa: C901
+def _read_names(nc, key):
+    if key not in nc.variables:
+        return []
+    value = nc.variables[key]
+    value.set_auto_mask(False)
+    return [b"".join(c).decode("UTF-8") for c in value[:]]
+
+
+def read(filename, select=None):  # noqa: C901
     import netCDF4
 
-    with netCDF4.Dataset(filename) as nc:
+    if select is None:
+        select = Selection()
+
+    if is_buffer(filename, "r"):
+        # netCDF's in-memory mode
+        nc = netCDF4.Dataset("meshio.e", memory=filename.read())
+    else:
+        nc = netCDF4.Dataset(filename)
+
+    with nc:
         # assert nc.version == np.float32(5.1)
         # assert nc.api_version == np.float32(5.1)
         # assert nc.floating_point_word_size == 8
@@ -79,12 +99,21 @@ def read(filename):  # noqa: C901
         # assert b''.join(nc.variables['coor_names'][2]) == b'Z'
 
         points = np.zeros((len(nc.dimensions["num_nodes"]), 3))
-        point_data_names = []
-        cell_data_names = []
+        # The names come first so that the values of unselected variables and sets
+        # needn't be read.
+        point_data_names = _read_names(nc, "name_nod_var")
+        cell_data_names = _read_names(nc, "name_elem_var")
+        ns_names = _read_names(nc, "ns_names")
+        # <name>R, <name>Z tuples or <name>X, <name>Y, <name>Z triplets in the point
+        # data belong together
+        single, double, triple = categorize(point_data_names)
+        single = [item for item in single if select.point_data(item[0])]
+        double = [item for item in double if select.point_data(item[0])]
+        triple = [item for item in triple if select.point_data(item[0])]
+        pd_idx = {idx for item in single + double + triple for idx in item[1:]}
         pd = {}
         cd = {}
         cells = []
-        ns_names = []
         # eb_names = []
         ns = []
         point_sets = {}
@@ -114,24 +143,24 @@ def read(filename):  # noqa: C901
                 points[:, 1] = value[:]
             elif key == "coordz":
                 points[:, 2] = value[:]
-            elif key == "name_nod_var":
-                value.set_auto_mask(False)
-                point_data_names = [b"".join(c).decode("UTF-8") for c in value[:]]
             elif key[:12] == "vals_nod_var":
                 idx = 0 if len(key) == 12 else int(key[12:]) - 1
+                if idx not in pd_idx:
+                    continue
                 value.set_auto_mask(False)
                 # For now only take the first value
                 pd[idx] = value[0]
                 if len(value) > 1:
                     warn("Skipping some time data")
-            elif key == "name_elem_var":
-                value.set_auto_mask(False)
-                cell_data_names = [b"".join(c).decode("UTF-8") for c in value[:]]
             elif key[:13] == "vals_elem_var":
                 # eb: element block
                 m = re.match("vals_elem_var(\\d+)?(?:eb(\\d+))?", key)
                 idx = 0 if m.group(1) is None else int(m.group(1)) - 1
                 block = 0 if m.group(2) is None else int(m.group(2)) - 1
+                if idx < len(cell_data_names) and not select.cell_data(
+                    cell_data_names[idx]
+                ):
+                    continue
 
                 value.set_auto_mask(False)
                 # For now only take the first value
@@ -141,23 +170,21 @@ def read(filename):  # noqa: C901
 
                 if len(value) > 1:
                     warn("Skipping some time data")
-            elif key == "ns_names":
-                value.set_auto_mask(False)
-                ns_names = [b"".join(c).decode("UTF-8") for c in value[:]]
             # elif key == "eb_names":
             #     value.set_auto_mask(False)
             #     eb_names = [b"".join(c).decode("UTF-8") for c in value[:]]
             elif key.startswith("node_ns"):  # Expected keys: node_ns1, node_ns2
-                ns.append(value[:] - 1)  # Exodus is 1-based
+                k = len(ns)
+                if k < len(ns_names) and not select.sets(ns_names[k]):
+                    # keep the position of the set
+                    ns.append(None)
+                else:
+                    ns.append(value[:] - 1)  # Exodus is 1-based
 
         # merge element block data; can't handle blocks yet
         for k, value in cd.items():
             cd[k] = np.concatenate(list(value.values()))
 
-        # Check if there are any <name>R, <name>Z tuples or <name>X, <name>Y, <name>Z
-        # triplets in the point data. If yes, they belong together.
-        single, double, triple = categorize(point_data_names)
-
         point_data = {}
         for name, idx in single:
             point_data[name] = pd[idx]
@@ -170,13 +197,17 @@ def read(filename):  # noqa: C901
         k = 0
         for _, cell in cells:
             n = len(cell)
-            for name, data in zip(cell_data_names, cd.values()):
+            for idx, name in enumerate(cell_data_names):
+                if idx not in cd:
+                    # not selected
+                    continue
+                data = cd[idx]
                 if name not in cell_data:
                     cell_data[name] = []
                 cell_data[name].append(data[k : k + n])
             k += n
 
-        point_sets = {name: dat for name, dat in zip(ns_names, ns)}
+        point_sets = {name: dat for name, dat in zip(ns_names, ns) if dat is not None}
 
     return Mesh(
         points,
@@ -262,112 +293,134 @@ numpy_to_exodus_dtype = {
 def write(filename, mesh):
     import netCDF4
 
+    if is_buffer(filename, "w"):
+        # netCDF's in-memory mode; close() returns the file content
+        rootgrp = netCDF4.Dataset("meshio.e", "w", memory=0)
+        try:
+            _write_dataset(rootgrp, mesh)
+        finally:
+            data = rootgrp.close()
+        filename.write(data)
+        return
+
     with netCDF4.Dataset(filename, "w") as rootgrp:
-        # set global data
-        now = datetime.datetime.now().isoformat()
-        rootgrp.title = f"Created by meshio v{__version__}, {now}"
-        rootgrp.version = np.float32(5.1)
-        rootgrp.api_version = np.float32(5.1)
-        rootgrp.floating_point_word_size = 8
-
-        # set dimensions
-        total_num_elems = sum(c.data.shape[0] for c in mesh.cells)
-        rootgrp.createDimension("num_nodes", len(mesh.points))
-        rootgrp.createDimension("num_dim", mesh.points.shape[1])
-        rootgrp.createDimension("num_elem", total_num_elems)
-        rootgrp.createDimension("num_el_blk", len(mesh.cells))
-        rootgrp.createDimension("num_node_sets", len(mesh.point_sets))
-        rootgrp.createDimension("len_string", 33)
-        rootgrp.createDimension("len_line", 81)
-        rootgrp.createDimension("four", 4)
-        rootgrp.createDimension("time_step", None)
-
-        # dummy time step
-        data = rootgrp.createVariable("time_whole", "f4", ("time_step",))
-        data[:] = 0.0
-
-        # points
-        coor_names = rootgrp.createVariable(
-            "coor_names", "S1", ("num_dim", "len_string")
+        _write_dataset(rootgrp, mesh)
+
+
+def _write_dataset(rootgrp, mesh):
+    # set global data
+    now = datetime.datetime.now().isoformat()
+    rootgrp.title = f"Created by meshio v{__version__}, {now}"
+    rootgrp.version = np.float32(5.1)
+    rootgrp.api_version = np.float32(5.1)
+    rootgrp.floating_point_word_size = 8
+
+    # set dimensions
+    total_num_elems = sum(c.data.shape[0] for c in mesh.cells)
+    rootgrp.createDimension("num_nodes", len(mesh.points))
+    rootgrp.createDimension("num_dim", mesh.points.shape[1])
+    rootgrp.createDimension("num_elem", total_num_elems)
+    rootgrp.createDimension("num_el_blk", len(mesh.cells))
+    rootgrp.createDimension("num_node_sets", len(mesh.point_sets))
+    rootgrp.createDimension("len_string", 33)
+    rootgrp.createDimension("len_line", 81)
+    rootgrp.createDimension("four", 4)
+    rootgrp.createDimension("time_step", None)
+
+    # dummy time step
+    data = rootgrp.createVariable("time_whole", "f4", ("time_step",))
+    data[:] = 0.0
+
+    # points
+    coor_names = rootgrp.createVariable("coor_names", "S1", ("num_dim", "len_string"))
+    coor_names.set_auto_mask(False)
+    coor_names[0, 0] = b"X"
+    coor_names[1, 0] = b"Y"
+    if mesh.points.shape[1] == 3:
+        coor_names[2, 0] = b"Z"
+    data = rootgrp.createVariable(
+        "coord",
+        numpy_to_exodus_dtype[mesh.points.dtype.name],
+        ("num_dim", "num_nodes"),
+    )
+    data[:] = mesh.points.T
+
+    # cells
+    # ParaView needs eb_prop1 -- some ID. The values don't seem to matter as
+    # long as they are different for the for different blocks.
+    data = rootgrp.createVariable("eb_prop1", "i4", "num_el_blk")
+    for k in range(len(mesh.cells)):
+        data[k] = k
+    for k, cell_block in enumerate(mesh.cells):
+        dim1 = f"num_el_in_blk{k + 1}"
+        dim2 = f"num_nod_per_el{k + 1}"
+        rootgrp.createDimension(dim1, cell_block.data.shape[0])
+        rootgrp.createDimension(dim2, cell_block.data.shape[1])
+        dtype = numpy_to_exodus_dtype[cell_block.data.dtype.name]
+        data = rootgrp.createVariable(f"connect{k + 1}", dtype, (dim1, dim2))
+        data.elem_type = meshio_to_exodus_type[cell_block.type]
+        # Exodus is 1-based
+        data[:] = cell_block.data + 1
+
+    # point data
+    # The variable `name_nod_var` holds the names and indices of the node variables, the
+    # variables `vals_nod_var{1,2,...}` hold the actual data.
+    num_nod_var = len(mesh.point_data)
+    if num_nod_var > 0:
+        rootgrp.createDimension("num_nod_var", num_nod_var)
+        # set names
+        point_data_names = rootgrp.createVariable(
+            "name_nod_var", "S1", ("num_nod_var", "len_string")
         )
-        coor_names.set_auto_mask(False)
-        coor_names[0, 0] = b"X"
-        coor_names[1, 0] = b"Y"
-        if mesh.points.shape[1] == 3:
-            coor_names[2, 0] = b"Z"
-        data = rootgrp.createVariable(
-            "coord",
-            numpy_to_exodus_dtype[mesh.points.dtype.name],
-            ("num_dim", "num_nodes"),
+        point_data_names.set_auto_mask(False)
+        for k, name in enumerate(mesh.point_data.keys()):
+            for i, letter in enumerate(name):
+                point_data_names[k, i] = letter.encode()
+
+        # Set data. ParaView might have some problems here, see
+        # <https://gitlab.kitware.com/paraview/paraview/-/issues/18403>.
+        for k, (name, data) in enumerate(mesh.point_data.items()):
+            for i, s in enumerate(data.shape):
+                rootgrp.createDimension(f"dim_nod_var{k}{i}", s)
+            dims = ["time_step"] + [
+                f"dim_nod_var{k}{i}" for i in range(len(data.shape))
+            ]
+            node_data = rootgrp.createVariable(
+                f"vals_nod_var{k + 1}",
+                numpy_to_exodus_dtype[data.dtype.name],
+                tuple(dims),
+                fill_value=False,
+            )
+            node_data[0] = data
+
+    # node sets
+    num_point_sets = len(mesh.point_sets)
+    if num_point_sets > 0:
+        data = rootgrp.createVariable("ns_prop1", "i4", "num_node_sets")
+        data_names = rootgrp.createVariable(
+            "ns_names", "S1", ("num_node_sets", "len_string")
         )
-        data[:] = mesh.points.T
-
-        # cells
-        # ParaView needs eb_prop1 -- some ID. The values don't seem to matter as
-        # long as they are different for the for different blocks.
-        data = rootgrp.createVariable("eb_prop1", "i4", "num_el_blk")
-        for k in range(len(mesh.cells)):
+        for k, name in enumerate(mesh.point_sets.keys()):
             data[k] = k
-        for k, cell_block in enumerate(mesh.cells):
-            dim1 = f"num_el_in_blk{k + 1}"
-            dim2 = f"num_nod_per_el{k + 1}"
-            rootgrp.createDimension(dim1, cell_block.data.shape[0])
-            rootgrp.createDimension(dim2, cell_block.data.shape[1])
-            dtype = numpy_to_exodus_dtype[cell_block.data.dtype.name]
-            data = rootgrp.createVariable(f"connect{k + 1}", dtype, (dim1, dim2))
-            data.elem_type = meshio_to_exodus_type[cell_block.type]
+            for i, letter in enumerate(name):
+                data_names[k, i] = letter.encode()
+        for k, (key, values) in enumerate(mesh.point_sets.items()):
+            dim1 = f"num_nod_ns{k + 1}"
+            rootgrp.createDimension(dim1, values.shape[0])
+            dtype = numpy_to_exodus_dtype[values.dtype.name]
+            data = rootgrp.createVariable(f"node_ns{k + 1}", dtype, (dim1,))
             # Exodus is 1-based
-            data[:] = cell_block.data + 1
-
-        # point data
-        # The variable `name_nod_var` holds the names and indices of the node variables, the
-        # variables `vals_nod_var{1,2,...}` hold the actual data.
-        num_nod_var = len(mesh.point_data)
-        if num_nod_var > 0:
-            rootgrp.createDimension("num_nod_var", num_nod_var)
-            # set names
-            point_data_names = rootgrp.createVariable(
-                "name_nod_var", "S1", ("num_nod_var", "len_string")
-            )
-            point_data_names.set_auto_mask(False)
-            for k, name in enumerate(mesh.point_data.keys()):
-                for i, letter in enumerate(name):
-                    point_data_names[k, i] = letter.encode()
-
-            # Set data. ParaView might have some problems here, see
-            # <https://gitlab.kitware.com/paraview/paraview/-/issues/18403>.
-            for k, (name, data) in enumerate(mesh.point_data.items()):
-                for i, s in enumerate(data.shape):
-                    rootgrp.createDimension(f"dim_nod_var{k}{i}", s)
-                dims = ["time_step"] + [
-                    f"dim_nod_var{k}{i}" for i in range(len(data.shape))
-                ]
-                node_data = rootgrp.createVariable(
-                    f"vals_nod_var{k + 1}",
-                    numpy_to_exodus_dtype[data.dtype.name],
-                    tuple(dims),
-                    fill_value=False,
-                )
-                node_data[0] = data
-
-        # node sets
-        num_point_sets = len(mesh.point_sets)
-        if num_point_sets > 0:
-            data = rootgrp.createVariable("ns_prop1", "i4", "num_node_sets")
-            data_names = rootgrp.createVariable(
-                "ns_names", "S1", ("num_node_sets", "len_string")
-            )
-            for k, name in enumerate(mesh.point_sets.keys()):
-                data[k] = k
-                for i, letter in enumerate(name):
-                    data_names[k, i] = letter.encode()
-            for k, (key, values) in enumerate(mesh.point_sets.items()):
-                dim1 = f"num_nod_ns{k + 1}"
-                rootgrp.createDimension(dim1, values.shape[0])
-                dtype = numpy_to_exodus_dtype[values.dtype.name]
-                data = rootgrp.createVariable(f"node_ns{k + 1}", dtype, (dim1,))
-                # Exodus is 1-based
-                data[:] = values + 1
-
-
-register_format("exodus", [".e", ".exo", ".ex2"], read, {"exodus": write})
+            data[:] = values + 1
+
+
+_sniff_hdf5 = hdf5_sniffer(lambda f: "api_version" in f.attrs)
+
+
+def _sniff(head: bytes, filename: str | None) -> bool:
+    # netCDF 3 (classic, 64-bit offset, or 64-bit data) or netCDF 4 (HDF5)
+    return head.startswith(b"CDF") or _sniff_hdf5(head, filename)
+
+
+register_format(
+    "exodus", [".e", ".exo", ".ex2"], read, {"exodus": write}, sniffer=_sniff
+)
@@ -11,7 +11,8 @@ import time
 import numpy as np
 
 from ..__about__ import __version__ as version
-from .._common import warn
+from .._blocks import IndexMap
+from .._common import parse_numbers, parse_ragged, parse_table, warn
 from .._exceptions import ReadError
 from .._files import open_file
 from .._helpers import register_format
@@ -158,6 +159,8 @@ def read_buffer(f, binary):
                 name, slot, data = _read_cell_group_binary(f)
                 cell_sets[f"{flag}:{name}:{slot}"] = np.array(data)
     else:
+        # collect the point and cell lines, and parse them in bulk at the end
+        lines = {"G": [], "Z": [], "F": []}
         while True:
             line = f.readline()
 
@@ -167,23 +170,10 @@ def read_buffer(f, binary):
             if line.strip() == "":
                 continue
 
-            split = line.rstrip().split()
+            split = line.split(None, 1)
 
-            if split[0] == "G":
-                pid, point = _read_point_ascii(split)
-                points.append(point)
-                point_ids[pid] = pidx
-                pidx += 1
-
-            elif split[0] == "Z":
-                cell_id, cell = _read_cell_ascii(split, point_ids)
-                z_cell_ids.append(cell_id)
-                _update_cells(z_cells, cell, "zone")
-
-            elif split[0] == "F":
-                cell_id, cell = _read_cell_ascii(split, point_ids)
-                f_cell_ids.append(cell_id)
-                _update_cells(f_cells, cell, "face")
+            if split[0] in lines:
+                lines[split[0]].append(split[1] if len(split) > 1 else "")
 
             elif split[0] == "ZGROUP":
                 # ZGROUP "Region 2" SLOT 1
@@ -198,6 +188,13 @@ def read_buffer(f, binary):
                 # adapt this later.
                 f_cell_sets[f"face:{name}:{slot}"] = np.asarray(data)
 
+        data = parse_table(lines["G"], 4)
+        points = data[:, 1:]
+        point_ids = IndexMap(offset=1)
+        point_ids.append(data[:, 0].astype(int))
+        z_cell_ids, z_cells = _read_cells_ascii(lines["Z"], point_ids, "zone")
+        f_cell_ids, f_cells = _read_cells_ascii(lines["F"], point_ids, "face")
+
     cells = f_cells + z_cells
 
     # enforce int type, empty numpy arrays have type float64
@@ -259,28 +256,39 @@ def read_buffer(f, binary):
     )
 
 
-def _read_point_ascii(buf_or_line):
-    """Read point coordinates."""
-    pid = int(buf_or_line[1])
-    point = [float(l) for l in buf_or_line[2:]]
-    return pid, point
-
-
 def _read_point_binary(buf_or_line):
     """Read point coordinates."""
     pid, x, y, z = struct.unpack("<I3d", buf_or_line.read(28))
     return pid, [x, y, z]
 
 
-def _read_cell_ascii(buf_or_line, point_ids):
-    """Read cell connectivity."""
-    cid = int(buf_or_line[2])
-    cell = buf_or_line[3:]
-    is_b7 = buf_or_line[1] == "B7"
-    cell = [point_ids[int(l)] for l in cell]
-    if is_b7:
-        cell.append(cell[-1])
-    return cid, cell
+def _read_cells_ascii(lines, point_ids, flag):
+    """Read the IDs and connectivity of cells from lines of the form `B8 cid p1 ...`,
+    split into blocks of consecutive cells of the same type.
+    """
+    split = [line.split(None, 1) for line in lines]
+    if any(len(s) < 2 for s in split):
+        raise ReadError("Expected cell type, ID, and points")
+    values, offsets = parse_ragged([s[1] for s in split], int)
+    cell_ids = values[offsets[:-1]]
+    cells = point_ids(np.delete(values, offsets[:-1]))
+    sizes = np.diff(offsets) - 1
+
+    # B7 bricks are hexahedra with the last point repeated
+    is_b7 = np.array([s[0] == "B7" for s in split], dtype=bool)
+    ends = np.cumsum(sizes)[is_b7]
+    cells = np.insert(cells, ends, cells[ends - 1])
+    sizes[is_b7] += 1
+
+    offsets = np.zeros(len(sizes) + 1, dtype=int)
+    np.cumsum(sizes, out=offsets[1:])
+    starts = np.flatnonzero(np.diff(sizes, prepend=-1))
+    blocks = []
+    for start, end in zip(starts, np.append(starts[1:], len(sizes))):
+        cell_type = numnodes_to_meshio_type[flag][sizes[start]]
+        data = cells[offsets[start] : offsets[end]].reshape(end - start, -1)
+        blocks.append((cell_type, data))
+    return cell_ids, blocks
 
 
 def _read_cell_binary(buf_or_line, point_ids):
@@ -329,18 +337,18 @@ def _read_cell_group_ascii(buf_or_line, line: str):
 
     i = buf_or_line.tell()
     line = buf_or_line.readline()
-    data = []
+    lines = []
     while True:
-        line = line.rstrip().split()
-        if line and (line[0] not in {"*", "ZGROUP", "FGROUP"}):
-            data += [int(l) for l in line]
+        split = line.split(None, 1)
+        if split and (split[0] not in {"*", "ZGROUP", "FGROUP"}):
+            lines.append(line)
         else:
             buf_or_line.seek(i)
             break
         i = buf_or_line.tell()
         line = buf_or_line.readline()
 
-    return name, slot, data
+    return name, slot, parse_numbers(lines, int)
 
 
 def _update_cells(cells, cell, flag):
@@ -7,9 +7,17 @@ from __future__ import annotations
 
 import numpy as np
 
-from .._common import cell_data_from_raw, num_nodes_per_cell, raw_from_cell_data, warn
+from .._common import (
+    cell_data_from_raw,
+    num_nodes_per_cell,
+    parse_ragged,
+    raw_from_cell_data,
+    warn,
+)
 from .._exceptions import ReadError
+from .._files import fromfile
 from .._mesh import CellBlock, Mesh
+from .._profile import span
 from .common import (
     _fast_forward_over_blank_lines,
     _fast_forward_to_end_block,
@@ -27,7 +35,7 @@ c_int = np.dtype("i")
 c_double = np.dtype("d")
 
 
-def read_buffer(f, is_ascii, data_size):
+def read_buffer(f, is_ascii, data_size, mmap=False):
     # The format is specified at
     # <http://gmsh.info//doc/texinfo/gmsh.html#MSH-ASCII-file-format>.
 
@@ -52,22 +60,25 @@ def read_buffer(f, is_ascii, data_size):
 
         environ = line[1:].strip()
 
-        if environ == "PhysicalNames":
-            _read_physical_names(f, field_data)
-        elif environ == "Nodes":
-            points, point_tags = _read_nodes(f, is_ascii)
-        elif environ == "Elements":
-            has_additional_tag_data, cell_tags = _read_cells(
-                f, cells, point_tags, is_ascii
-            )
-        elif environ == "Periodic":
-            periodic = _read_periodic(f)
-        elif environ == "NodeData":
-            _read_data(f, "NodeData", point_data, data_size, is_ascii)
-        elif environ == "ElementData":
-            _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii)
-        else:
-            _fast_forward_to_end_block(f, environ)
+        start = f.tell()
+        with span(f"gmsh:{environ}") as s:
+            if environ == "PhysicalNames":
+                _read_physical_names(f, field_data)
+            elif environ == "Nodes":
+                points, point_tags = _read_nodes(f, is_ascii, mmap)
+            elif environ == "Elements":
+                has_additional_tag_data, cell_tags = _read_cells(
+                    f, cells, point_tags, is_ascii, mmap
+                )
+            elif environ == "Periodic":
+                periodic = _read_periodic(f)
+            elif environ == "NodeData":
+                _read_data(f, "NodeData", point_data, data_size, is_ascii, mmap)
+            elif environ == "ElementData":
+                _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii, mmap)
+            else:
+                _fast_forward_to_end_block(f, environ)
+            s.add(nbytes=f.tell() - start)
 
     if has_additional_tag_data:
         warn("The file contains tag data that couldn't be processed.")
@@ -97,7 +108,7 @@ def read_buffer(f, is_ascii, data_size):
     )
 
 
-def _read_nodes(f, is_ascii):
+def _read_nodes(f, is_ascii, mmap=False):
     # The first line is the number of nodes
     line = f.readline().decode()
     num_nodes = int(line)
@@ -109,7 +120,7 @@ def _read_nodes(f, is_ascii):
     else:
         # binary
         dtype = [("index", c_int), ("x", c_double, (3,))]
-        data = np.fromfile(f, count=num_nodes, dtype=dtype)
+        data = fromfile(f, dtype, num_nodes, mmap)
         if not (data["index"] == range(1, num_nodes + 1)).all():
             raise ReadError()
         points = np.ascontiguousarray(data["x"])
@@ -119,7 +130,7 @@ def _read_nodes(f, is_ascii):
     return points, point_tags
 
 
-def _read_cells(f, cells, point_tags, is_ascii):
+def _read_cells(f, cells, point_tags, is_ascii, mmap=False):
     # The first line is the number of elements
     line = f.readline().decode()
     total_num_cells = int(line)
@@ -128,7 +139,7 @@ def _read_cells(f, cells, point_tags, is_ascii):
     if is_ascii:
         _read_cells_ascii(f, cells, cell_tags, total_num_cells)
     else:
-        _read_cells_binary(f, cells, cell_tags, total_num_cells)
+        _read_cells_binary(f, cells, cell_tags, total_num_cells, mmap)
 
     # override cells in-place
     cells[:] = [(key, _gmsh_to_meshio_order(key, values)) for key, values in cells]
@@ -144,16 +155,23 @@ def _read_cells(f, cells, point_tags, is_ascii):
 
     # restrict to the standard two data items (physical, geometrical)
     output_cell_tags = {}
-    for cell_type in cell_tags:
-        physical = []
-        geometrical = []
-        for item in cell_tags[cell_type]:
-            if len(item) > 0:
-                physical.append(item[0])
-            if len(item) > 1:
-                geometrical.append(item[1])
-            if len(item) > 2:
+    for cell_type, tags in cell_tags.items():
+        if isinstance(tags, np.ndarray):
+            # the same number of tags for all cells
+            physical = tags[:, 0] if tags.shape[1] > 0 else []
+            geometrical = tags[:, 1] if tags.shape[1] > 1 else []
+            if tags.shape[1] > 2:
                 has_additional_tag_data = True
+        else:
+            physical = []
+            geometrical = []
+            for item in tags:
+                if len(item) > 0:
+                    physical.append(item[0])
+                if len(item) > 1:
+                    geometrical.append(item[1])
+                if len(item) > 2:
+                    has_additional_tag_data = True
         physical = np.array(physical, dtype=c_int)
         geometrical = np.array(geometrical, dtype=c_int)
         if len(physical) > 0:
@@ -169,17 +187,26 @@ def _read_cells(f, cells, point_tags, is_ascii):
 
 
 def _read_cells_ascii(f, cells, cell_tags, total_num_cells: int) -> None:
-    for _ in range(total_num_cells):
-        line = f.readline().decode()
-        data = [int(k) for k in filter(None, line.split())]
-        t = _gmsh_to_meshio_type[data[1]]
+    # Each line is `index type num_tags tag1 ... node1 ...`; parse all lines in one go.
+    lines = [f.readline() for _ in range(total_num_cells)]
+    values, offsets = parse_ragged(b"".join(lines).decode(), int)
+    starts, ends = offsets[:-1], offsets[1:]
+    if np.any(ends - starts < 3):
+        raise ReadError("Expected element index, type, and number of tags")
+    types = values[starts + 1]
+    num_tags = values[starts + 2]
+
+    # split into blocks of consecutive cells of the same type
+    block_starts = np.flatnonzero(np.diff(types, prepend=-1))
+    block_ends = np.append(block_starts[1:], total_num_cells)
+    for b, e in zip(block_starts, block_ends):
+        t = _gmsh_to_meshio_type[types[b]]
         num_nodes_per_elem = num_nodes_per_cell[t]
+        idx = ends[b:e, None] - num_nodes_per_elem + np.arange(num_nodes_per_elem)
+        # Subtract one to account for the fact that python indices are 0-based.
+        cells.append((t, values[idx].astype(c_int) - 1))
 
-        if len(cells) == 0 or t != cells[-1][0]:
-            cells.append((t, []))
-        cells[-1][1].append(data[-num_nodes_per_elem:])
-
-        # data[2] gives the number of tags. The gmsh manual
+        # num_tags gives the number of tags. The gmsh manual
         # <http://gmsh.info/doc/texinfo/gmsh.html#MSH-ASCII-file-format>
         # says:
         # >>>
@@ -191,20 +218,27 @@ def _read_cells_ascii(f, cells, cell_tags, total_num_cells: int) -> None:
         # codes using the MSH 2 format require at least the first two tags (physical and
         # elementary tags).
         # <<<
-        num_tags = data[2]
         if t not in cell_tags:
             cell_tags[t] = []
-        cell_tags[t].append(data[3 : 3 + num_tags])
+        if np.all(num_tags[b:e] == num_tags[b]):
+            idx = starts[b:e, None] + 3 + np.arange(num_tags[b])
+            cell_tags[t].append(values[idx])
+        else:
+            # There may be a different number of tags for each cell.
+            cell_tags[t].append(
+                [values[k + 3 : k + 3 + n] for k, n in zip(starts[b:e], num_tags[b:e])]
+            )
 
-    # convert to numpy arrays
-    # Subtract one to account for the fact that python indices are 0-based.
-    for k, c in enumerate(cells):
-        cells[k] = (c[0], np.array(c[1], dtype=c_int) - 1)
-    # Cannot convert cell_tags[key] to numpy array: There may be a different number of
-    # tags for each cell.
+    for key, tags in cell_tags.items():
+        if all(
+            isinstance(a, np.ndarray) and a.shape[1] == tags[0].shape[1] for a in tags
+        ):
+            cell_tags[key] = np.vstack(tags)
+        else:
+            cell_tags[key] = [item for part in tags for item in part]
 
 
-def _read_cells_binary(f, cells, cell_tags, total_num_cells):
+def _read_cells_binary(f, cells, cell_tags, total_num_cells, mmap=False):
     num_elems = 0
     while num_elems < total_num_cells:
         # read element header
@@ -215,7 +249,7 @@ def _read_cells_binary(f, cells, cell_tags, total_num_cells):
         # read element data
         shape = (num_elems0, 1 + num_tags + num_nodes_per_elem)
         count = shape[0] * shape[1]
-        data = np.fromfile(f, count=count, dtype=c_int).reshape(shape)
+        data = fromfile(f, c_int, count, mmap).reshape(shape)
 
         if len(cells) == 0 or t != cells[-1][0]:
             cells.append((t, []))
@@ -11,7 +11,9 @@ import numpy as np
 
 from .._common import cell_data_from_raw, num_nodes_per_cell, raw_from_cell_data
 from .._exceptions import ReadError
+from .._files import fromfile as _fromfile
 from .._mesh import CellBlock, Mesh
+from .._profile import span
 from .common import (
     _fast_forward_to_end_block,
     _gmsh_to_meshio_order,
@@ -30,7 +32,7 @@ c_ulong = np.dtype("L")
 c_double = np.dtype("d")
 
 
-def read_buffer(f, is_ascii: bool, data_size) -> Mesh:
+def read_buffer(f, is_ascii: bool, data_size, mmap: bool = False) -> Mesh:
     # Initialize the optional data fields
     points = []
     field_data = {}
@@ -48,30 +50,35 @@ def read_buffer(f, is_ascii: bool, data_size) -> Mesh:
             raise ReadError
         environ = line[1:].strip()
 
-        if environ == "PhysicalNames":
-            _read_physical_names(f, field_data)
-        elif environ == "Entities":
-            physical_tags = _read_entities(f, is_ascii)
-        elif environ == "Nodes":
-            points, point_tags = _read_nodes(f, is_ascii)
-        elif environ == "Elements":
-            cells, cell_tags = _read_elements(f, point_tags, physical_tags, is_ascii)
-        elif environ == "Periodic":
-            periodic = _read_periodic(f, is_ascii)
-        elif environ == "NodeData":
-            _read_data(f, "NodeData", point_data, data_size, is_ascii)
-        elif environ == "ElementData":
-            _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii)
-        else:
-            # From
-            # <http://gmsh.info//doc/texinfo/gmsh.html#MSH-file-format-_0028version-4_0029>:
-            # ```
-            # Any section with an unrecognized header is simply ignored: you can thus
-            # add comments in a .msh file by putting them e.g. inside a
-            # $Comments/$EndComments section.
-            # ```
-            # skip environment
-            _fast_forward_to_end_block(f, environ)
+        start = f.tell()
+        with span(f"gmsh:{environ}") as s:
+            if environ == "PhysicalNames":
+                _read_physical_names(f, field_data)
+            elif environ == "Entities":
+                physical_tags = _read_entities(f, is_ascii)
+            elif environ == "Nodes":
+                points, point_tags = _read_nodes(f, is_ascii, mmap)
+            elif environ == "Elements":
+                cells, cell_tags = _read_elements(
+                    f, point_tags, physical_tags, is_ascii, mmap
+                )
+            elif environ == "Periodic":
+                periodic = _read_periodic(f, is_ascii)
+            elif environ == "NodeData":
+                _read_data(f, "NodeData", point_data, data_size, is_ascii, mmap)
+            elif environ == "ElementData":
+                _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii, mmap)
+            else:
+                # From
+                # <http://gmsh.info//doc/texinfo/gmsh.html#MSH-file-format-_0028version-4_0029>:
+                # ```
+                # Any section with an unrecognized header is simply ignored: you can thus
+                # add comments in a .msh file by putting them e.g. inside a
+                # $Comments/$EndComments section.
+                # ```
+                # skip environment
+                _fast_forward_to_end_block(f, environ)
+            s.add(nbytes=f.tell() - start)
 
     cell_data = cell_data_from_raw(cells, cell_data_raw)
     cell_data.update(cell_tags)
@@ -104,7 +111,7 @@ def _read_entities(f, is_ascii: bool):
     return physical_tags
 
 
-def _read_nodes(f, is_ascii):
+def _read_nodes(f, is_ascii, mmap=False):
     if is_ascii:
         # first line: numEntityBlocks(unsigned long) numNodes(unsigned long)
         line = f.readline().decode()
@@ -137,7 +144,7 @@ def _read_nodes(f, is_ascii):
             np.fromfile(f, count=3, dtype=c_int)
             num_nodes = np.fromfile(f, count=1, dtype=c_ulong)[0]
             dtype = [("tag", c_int), ("x", c_double, (3,))]
-            data = np.fromfile(f, count=num_nodes, dtype=dtype)
+            data = _fromfile(f, dtype, int(num_nodes), mmap)
             tags.append(data["tag"])
             points.append(data["x"])
 
@@ -152,8 +159,10 @@ def _read_nodes(f, is_ascii):
     return points, tags
 
 
-def _read_elements(f, point_tags, physical_tags, is_ascii):
+def _read_elements(f, point_tags, physical_tags, is_ascii, mmap=False):
     fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    # the element blocks of binary files may be memory-mapped
+    fromfile_bulk = fromfile if is_ascii else partial(_fromfile, mmap=mmap)
 
     # numEntityBlocks(unsigned long) numElements(unsigned long)
     num_entity_blocks, _ = fromfile(f, c_ulong, 2)
@@ -166,7 +175,7 @@ def _read_elements(f, point_tags, physical_tags, is_ascii):
         (num_ele,) = fromfile(f, c_ulong, 1)
         tpe = _gmsh_to_meshio_type[type_ele]
         num_nodes_per_ele = num_nodes_per_cell[tpe]
-        d = fromfile(f, c_int, int(num_ele * (1 + num_nodes_per_ele))).reshape(
+        d = fromfile_bulk(f, c_int, int(num_ele * (1 + num_nodes_per_ele))).reshape(
             (num_ele, -1)
         )
         if physical_tags is None:
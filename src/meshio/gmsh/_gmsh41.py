@@ -7,19 +7,27 @@ from functools import partial
 
 import numpy as np
 
+from .._blocks import IndexMap
 from .._common import cell_data_from_raw, num_nodes_per_cell, raw_from_cell_data, warn
 from .._exceptions import ReadError, WriteError
-from .._mesh import CellBlock, Mesh
+from .._files import fromfile as _fromfile
+from .._mesh import CellBlock, Mesh, topological_dimension
+from .._probe import MeshInfo
+from .._profile import span
+from .._stream import StreamWriter
 from .common import (
     _fast_forward_over_blank_lines,
     _fast_forward_to_end_block,
     _gmsh_to_meshio_order,
     _gmsh_to_meshio_type,
+    _iter_data,
     _meshio_to_gmsh_order,
     _meshio_to_gmsh_type,
     _read_data,
+    _read_data_header,
     _read_physical_names,
     _write_data,
+    _write_data_header,
     _write_physical_names,
 )
 
@@ -27,12 +35,15 @@ c_int = np.dtype("i")
 c_size_t = np.dtype("P")
 c_double = np.dtype("d")
 
+# width of the counts in ASCII headers which are filled in on close()
+_COUNT_WIDTH = 20
+
 
 def _size_type(data_size):
     return np.dtype(f"u{data_size}")
 
 
-def read_buffer(f, is_ascii: bool, data_size):
+def read_buffer(f, is_ascii: bool, data_size, mmap: bool = False):
     # The format is specified at
     # <http://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format>.
 
@@ -58,40 +69,48 @@ def read_buffer(f, is_ascii: bool, data_size):
 
         environ = line[1:].strip()
 
-        if environ == "PhysicalNames":
-            _read_physical_names(f, field_data)
-        elif environ == "Entities":
-            # Read physical tags and information on bounding entities.
-            # The information is passed to the processing of elements.
-            physical_tags, bounding_entities = _read_entities(f, is_ascii, data_size)
-        elif environ == "Nodes":
-            points, point_tags, point_entities = _read_nodes(f, is_ascii, data_size)
-        elif environ == "Elements":
-            cells, cell_tags, cell_sets = _read_elements(
-                f,
-                point_tags,
-                physical_tags,
-                bounding_entities,
-                is_ascii,
-                data_size,
-                field_data,
-            )
-        elif environ == "Periodic":
-            periodic = _read_periodic(f, is_ascii, data_size)
-        elif environ == "NodeData":
-            _read_data(f, "NodeData", point_data, data_size, is_ascii)
-        elif environ == "ElementData":
-            _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii)
-        else:
-            # From
-            # <http://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format>:
-            # ```
-            # Any section with an unrecognized header is simply ignored: you can thus
-            # add comments in a .msh file by putting them e.g. inside a
-            # $Comments/$EndComments section.
-            # ```
-            # skip environment
-            _fast_forward_to_end_block(f, environ)
+        start = f.tell()
+        with span(f"gmsh:{environ}") as s:
+            if environ == "PhysicalNames":
+                _read_physical_names(f, field_data)
+            elif environ == "Entities":
+                # Read physical tags and information on bounding entities.
+                # The information is passed to the processing of elements.
+                physical_tags, bounding_entities = _read_entities(
+                    f, is_ascii, data_size
+                )
+            elif environ == "Nodes":
+                points, point_tags, point_entities = _read_nodes(
+                    f, is_ascii, data_size, mmap
+                )
+            elif environ == "Elements":
+                cells, cell_tags, cell_sets = _read_elements(
+                    f,
+                    point_tags,
+                    physical_tags,
+                    bounding_entities,
+                    is_ascii,
+                    data_size,
+                    field_data,
+                    mmap,
+                )
+            elif environ == "Periodic":
+                periodic = _read_periodic(f, is_ascii, data_size)
+            elif environ == "NodeData":
+                _read_data(f, "NodeData", point_data, data_size, is_ascii, mmap)
+            elif environ == "ElementData":
+                _read_data(f, "ElementData", cell_data_raw, data_size, is_ascii, mmap)
+            else:
+                # From
+                # <http://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format>:
+                # ```
+                # Any section with an unrecognized header is simply ignored: you can thus
+                # add comments in a .msh file by putting them e.g. inside a
+                # $Comments/$EndComments section.
+                # ```
+                # skip environment
+                _fast_forward_to_end_block(f, environ)
+            s.add(nbytes=f.tell() - start)
 
     if cells is None:
         raise ReadError("$Element section not found.")
@@ -112,6 +131,201 @@ def read_buffer(f, is_ascii: bool, data_size):
     )
 
 
+def iter_blocks(f, is_ascii: bool, data_size, chunk_size: int):
+    """Read the nodes, elements, and data chunk by chunk, see meshio.iter_blocks()."""
+    field_data = {}
+    physical_tags = None
+    # gmsh node tags are 1-based
+    point_tags = IndexMap(offset=1)
+    has_elements = False
+    while True:
+        line, is_eof = _fast_forward_over_blank_lines(f)
+        if is_eof:
+            break
+
+        if line[0] != "$":
+            raise ReadError(f"Unexpected line {repr(line)}")
+
+        environ = line[1:].strip()
+
+        if environ == "PhysicalNames":
+            _read_physical_names(f, field_data)
+        elif environ == "Entities":
+            physical_tags, _ = _read_entities(f, is_ascii, data_size)
+        elif environ == "Nodes":
+            yield from _iter_nodes(f, is_ascii, data_size, chunk_size, point_tags)
+        elif environ == "Elements":
+            has_elements = True
+            yield from _iter_elements(
+                f, point_tags, physical_tags, is_ascii, data_size, chunk_size
+            )
+        elif environ in ["NodeData", "ElementData"]:
+            kind = "point_data" if environ == "NodeData" else "cell_data"
+            for name, data in _iter_data(f, environ, is_ascii, chunk_size):
+                yield kind, name, data
+        else:
+            # $Periodic, $Comments, unknown sections
+            _fast_forward_to_end_block(f, environ)
+
+    if not has_elements:
+        raise ReadError("$Element section not found.")
+
+
+def _iter_nodes(f, is_ascii: bool, data_size, chunk_size: int, point_tags):
+    fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    c_size_t = _size_type(data_size)
+
+    num_entity_blocks, _, _, _ = fromfile(f, c_size_t, 4)
+    for _ in range(num_entity_blocks):
+        dim, entity_tag, parametric = fromfile(f, c_int, 3)
+        if parametric != 0:
+            raise ReadError("parametric nodes not implemented")
+        num_nodes = int(fromfile(f, c_size_t, 1)[0])
+
+        # all tags of the block come before its coordinates
+        for start in range(0, num_nodes, chunk_size):
+            point_tags.append(fromfile(f, c_size_t, min(chunk_size, num_nodes - start)))
+        for start in range(0, num_nodes, chunk_size):
+            n = min(chunk_size, num_nodes - start)
+            yield "points", None, fromfile(f, c_double, n * 3).reshape((n, 3))
+            yield "point_data", "gmsh:dim_tags", np.tile([dim, entity_tag], (n, 1))
+
+    _fast_forward_to_end_block(f, "Nodes")
+
+
+def _iter_elements(f, point_tags, physical_tags, is_ascii, data_size, chunk_size):
+    fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    c_size_t = _size_type(data_size)
+
+    num_entity_blocks, _, _, _ = fromfile(f, c_size_t, 4)
+    for _ in range(num_entity_blocks):
+        dim, tag, type_ele = fromfile(f, c_int, 3)
+        num_ele = int(fromfile(f, c_size_t, 1)[0])
+        tpe = _gmsh_to_meshio_type[type_ele]
+        num_nodes_per_ele = num_nodes_per_cell[tpe]
+        physical_tag = None if not physical_tags else physical_tags[dim][tag]
+        for start in range(0, num_ele, chunk_size):
+            n = min(chunk_size, num_ele - start)
+            d = fromfile(f, c_size_t, n * (1 + num_nodes_per_ele)).reshape((n, -1))
+            # The first column is the element tag; discard it.
+            values = point_tags(d[:, 1:])
+            yield "cells", None, CellBlock(tpe, _gmsh_to_meshio_order(tpe, values))
+            if physical_tag:
+                yield "cell_data", "gmsh:physical", np.full(n, physical_tag[0], int)
+            yield "cell_data", "gmsh:geometrical", np.full(n, tag, int)
+
+    _fast_forward_to_end_block(f, "Elements")
+
+
+def probe(f, is_ascii: bool, data_size, fmt_version: str):
+    """Summary of the file from the section headers; binary node, element, and data
+    blocks are skipped over, ASCII ones are skipped line by line.
+    """
+    field_data = {}
+    physical_tags = None
+    bounding_entities = None
+    num_points = 0
+    cells = []
+    point_data = {}
+    cell_data = {}
+    cell_sets = []
+    has_elements = False
+    while True:
+        line, is_eof = _fast_forward_over_blank_lines(f)
+        if is_eof:
+            break
+
+        if line[0] != "$":
+            raise ReadError(f"Unexpected line {repr(line)}")
+
+        environ = line[1:].strip()
+
+        if environ == "PhysicalNames":
+            _read_physical_names(f, field_data)
+        elif environ == "Entities":
+            physical_tags, bounding_entities = _read_entities(f, is_ascii, data_size)
+        elif environ == "Nodes":
+            num_points = _probe_nodes(f, is_ascii, data_size)
+            point_data["gmsh:dim_tags"] = ((num_points, 2), np.dtype(int))
+        elif environ == "Elements":
+            has_elements = True
+            # cell sets from the physical names, see _read_elements()
+            cell_sets = list(field_data)
+            num_physical = 0
+            for dim, tag, tpe, num_ele in _probe_elements(f, is_ascii, data_size):
+                cells.append((tpe, num_ele))
+                if physical_tags and physical_tags[dim][tag]:
+                    num_physical += num_ele
+            num_cells = sum(n for _, n in cells)
+            if num_physical > 0:
+                cell_data["gmsh:physical"] = ((num_physical,), np.dtype(int))
+            cell_data["gmsh:geometrical"] = ((num_cells,), np.dtype(int))
+            if bounding_entities and cells:
+                cell_sets.append("gmsh:bounding_entities")
+        elif environ in ["NodeData", "ElementData"]:
+            name, num_components, num_items = _read_data_header(f)
+            if not is_ascii:
+                f.seek(num_items * (c_int.itemsize + num_components * 8), 1)
+            _fast_forward_to_end_block(f, environ)
+            # see _read_data()
+            shape = (num_items,) if num_components == 1 else (num_items, num_components)
+            data = point_data if environ == "NodeData" else cell_data
+            data[name] = (shape, np.dtype(float))
+        else:
+            _fast_forward_to_end_block(f, environ)
+
+    if not has_elements:
+        raise ReadError("$Element section not found.")
+
+    return MeshInfo(
+        "gmsh",
+        num_points,
+        cells,
+        point_data=point_data,
+        cell_data=cell_data,
+        field_data={key: ((2,), np.dtype(int)) for key in field_data},
+        cell_sets=cell_sets,
+        version=fmt_version,
+    )
+
+
+def _probe_nodes(f, is_ascii: bool, data_size) -> int:
+    c_size_t = _size_type(data_size)
+    fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    num_entity_blocks, total_num_nodes, _, _ = fromfile(f, c_size_t, 4)
+    if not is_ascii:
+        for _ in range(num_entity_blocks):
+            _, _, parametric = fromfile(f, c_int, 3)
+            if parametric != 0:
+                raise ReadError("parametric nodes not implemented")
+            num_nodes = int(fromfile(f, c_size_t, 1)[0])
+            # tags and coordinates
+            f.seek(num_nodes * (data_size + 3 * c_double.itemsize), 1)
+    _fast_forward_to_end_block(f, "Nodes")
+    return int(total_num_nodes)
+
+
+def _probe_elements(f, is_ascii: bool, data_size):
+    """Yield dimension, entity tag, cell type, and number of cells of the element
+    blocks.
+    """
+    c_size_t = _size_type(data_size)
+    fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    num_entity_blocks, _, _, _ = fromfile(f, c_size_t, 4)
+    for _ in range(num_entity_blocks):
+        dim, tag, type_ele = fromfile(f, c_int, 3)
+        num_ele = int(fromfile(f, c_size_t, 1)[0])
+        tpe = _gmsh_to_meshio_type[type_ele]
+        if is_ascii:
+            # one line per element
+            for _ in range(num_ele):
+                f.readline()
+        else:
+            f.seek(num_ele * (1 + num_nodes_per_cell[tpe]) * data_size, 1)
+        yield dim, tag, tpe, num_ele
+    _fast_forward_to_end_block(f, "Elements")
+
+
 def _read_entities(f, is_ascii: bool, data_size):
     # Read the entity section. Return physical tags of the entities, and (for
     # entities of dimension > 0) the bounding entities (so points that form
@@ -141,13 +355,15 @@ def _read_entities(f, is_ascii: bool, data_size):
     return physical_tags, bounding_entities
 
 
-def _read_nodes(f, is_ascii: bool, data_size):
+def _read_nodes(f, is_ascii: bool, data_size, mmap: bool = False):
     # Read node data: Node coordinates and tags.
     # Also find the entities of the nodes, and store this as point_data.
     # Note that entity tags are 1-offset within each dimension, thus it is
     # necessary to keep track of both tag and dimension of the entity
 
     fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    # the node blocks of binary files may be memory-mapped
+    fromfile_bulk = fromfile if is_ascii else partial(_fromfile, mmap=mmap)
     c_size_t = _size_type(data_size)
 
     # numEntityBlocks numNodes minNodeTag maxNodeTag (all size_t)
@@ -175,11 +391,11 @@ def _read_nodes(f, is_ascii: bool, data_size):
         # populate the points array accordingly, thereby preserving the order of indices
         # of nodes/points.
         ixx = slice(idx, idx + num_nodes)
-        tags[ixx] = fromfile(f, c_size_t, num_nodes) - 1
+        tags[ixx] = fromfile_bulk(f, c_size_t, num_nodes) - 1
 
         # Store the point densely and in the order in which they appear in the file.
         # x(double) y(double) z(double) (* numNodes)
-        points[ixx] = fromfile(f, c_double, num_nodes * 3).reshape((num_nodes, 3))
+        points[ixx] = fromfile_bulk(f, c_double, num_nodes * 3).reshape((num_nodes, 3))
 
         # Entity tag and entity dimension of the nodes. Stored as point-data.
         dim_tags[ixx, 0] = dim
@@ -192,9 +408,18 @@ def _read_nodes(f, is_ascii: bool, data_size):
 
 
 def _read_elements(
-    f, point_tags, physical_tags, bounding_entities, is_ascii, data_size, field_data
+    f,
+    point_tags,
+    physical_tags,
+    bounding_entities,
+    is_ascii,
+    data_size,
+    field_data,
+    mmap=False,
 ):
     fromfile = partial(np.fromfile, sep=" " if is_ascii else "")
+    # the element blocks of binary files may be memory-mapped
+    fromfile_bulk = fromfile if is_ascii else partial(_fromfile, mmap=mmap)
     c_size_t = _size_type(data_size)
 
     # numEntityBlocks numElements minElementTag maxElementTag (all size_t)
@@ -223,7 +448,7 @@ def _read_elements(
             )
         tpe = _gmsh_to_meshio_type[type_ele]
         num_nodes_per_ele = num_nodes_per_cell[tpe]
-        d = fromfile(f, c_size_t, int(num_ele * (1 + num_nodes_per_ele))).reshape(
+        d = fromfile_bulk(f, c_size_t, int(num_ele * (1 + num_nodes_per_ele))).reshape(
             (num_ele, -1)
         )
 
@@ -766,3 +991,190 @@ def _write_periodic(fh, periodic, float_fmt: str, binary: bool) -> None:
     if binary:
         fh.write(b"\n")
     fh.write(b"$EndPeriodic\n")
+
+
+class GmshStreamWriter(StreamWriter):
+    """Writes a Gmsh 4.1 file from chunks, see meshio.open_writer().
+
+    Every chunk of points goes into a node entity block of its own, of the highest cell
+    dimension, and every cell block into an element entity block of its own. The counts
+    in the headers are filled in on close(); in ASCII files, they are padded with
+    spaces to make room for that.
+    """
+
+    def __init__(self, filename, binary=True, float_fmt=".16e"):
+        super().__init__(filename)
+        self.binary = binary
+        self.float_fmt = float_fmt
+        self._warned = False
+        # positions of the $Nodes and $Elements headers
+        self._headers = {}
+
+    def _layout(self, key):
+        return self._file_order(key)
+
+    def _header(self, values, dtype, padded=False):
+        if self.binary:
+            return np.array(values, dtype=dtype).tobytes()
+        width = _COUNT_WIDTH if padded else 0
+        return "".join(f"{v:<{width}} " for v in values).encode()
+
+    def _write_table(self, fh, data, fmt):
+        if self.binary:
+            data.tofile(fh)
+        else:
+            np.savetxt(fh, data, fmt, " ")
+
+    def _begin_output(self, fh):
+        fh.write(b"$MeshFormat\n")
+        fh.write(f"4.1 {1 if self.binary else 0} {c_size_t.itemsize}\n".encode())
+        if self.binary:
+            np.array([1], dtype=c_int).tofile(fh)
+            fh.write(b"\n")
+        fh.write(b"$EndMeshFormat\n")
+
+    def _begin_run(self, fh, run, prev):
+        section = _section(run.key)
+        if prev is None or _section(prev.key) != section:
+            self._end_section(fh, prev)
+            self._write_empty_sections(fh, prev, run.key)
+            if section in ["Nodes", "Elements"]:
+                fh.write(f"${section}\n".encode())
+                self._headers[section] = fh.tell()
+                fh.write(self._header([0, 0, 0, 0], c_size_t, padded=True))
+                if not self.binary:
+                    fh.write(b"\n")
+            else:
+                tag = "NodeData" if run.key[0] == "point_data" else "ElementData"
+                num_components = int(np.prod(self._shape(run.key)[1:]))
+                _write_data_header(
+                    fh, tag, run.key[1], num_components, " " * _COUNT_WIDTH
+                )
+                # the number of data items, filled in by _finish()
+                run.positions.append(fh.tell() - _COUNT_WIDTH - 1)
+
+        if section == "Elements":
+            cell_type = self.cell_blocks[run.key[1]][0]
+            dim = topological_dimension[cell_type]
+            fh.write(self._header([dim, 0, _meshio_to_gmsh_type[cell_type]], c_int))
+            # the number of cells, filled in by _finish()
+            run.positions.append(fh.tell())
+            fh.write(self._header([0], c_size_t, padded=True))
+            if not self.binary:
+                fh.write(b"\n")
+
+    def _end_section(self, fh, run):
+        if run is None:
+            return
+        if self.binary:
+            fh.write(b"\n")
+        section = _section(run.key)
+        if section not in ["Nodes", "Elements"]:
+            section = "NodeData" if run.key[0] == "point_data" else "ElementData"
+        fh.write(f"$End{section}\n".encode())
+
+    def _write_empty_sections(self, fh, prev, key):
+        # $Nodes and $Elements are mandatory, also between the runs `prev` and `key`
+        # (None for the beginning and the end of the file)
+        first = 0 if prev is None else self._file_order(prev.key)[0] + 1
+        last = 2 if key is None else self._file_order(key)[0]
+        for section in ["Nodes", "Elements"][first:last]:
+            fh.write(f"${section}\n".encode())
+            fh.write(self._header([0, 0, 1, 0], c_size_t))
+            fh.write(b"\n")
+            fh.write(f"$End{section}\n".encode())
+
+    def _write_rows(self, fh, run, data):
+        k = run.num_rows
+        m = len(data)
+        section = _section(run.key)
+        if section == "Nodes":
+            if data.shape[1] == 2:
+                data = np.column_stack([data, np.zeros_like(data[:, 0])])
+            if self.binary and data.dtype != c_double:
+                if not self._warned:
+                    warn(
+                        f"Binary Gmsh needs c_double points (got {data.dtype}). "
+                        "Converting."
+                    )
+                    self._warned = True
+                data = data.astype(c_double)
+            # the dimension of the block, filled in by _finish()
+            run.positions.append(fh.tell())
+            fh.write(self._header([0, 0, 0], c_int, padded=True))
+            fh.write(self._header([m], c_size_t))
+            if not self.binary:
+                fh.write(b"\n")
+            self._write_table(fh, np.arange(k + 1, k + m + 1, dtype=c_size_t), "%d")
+            self._write_table(fh, data, "%" + self.float_fmt)
+        elif section == "Elements":
+            cell_type = self.cell_blocks[run.key[1]][0]
+            tag0 = 1 + sum(n for _, n in self.cell_blocks[: run.key[1]]) + k
+            node_idcs = _meshio_to_gmsh_order(cell_type, data)
+            self._write_table(
+                fh,
+                np.column_stack(
+                    [
+                        np.arange(tag0, tag0 + m, dtype=c_size_t),
+                        # Gmsh indexes from 1 not 0
+                        node_idcs.astype(c_size_t) + 1,
+                    ]
+                ),
+                "%d",
+            )
+        else:
+            num_components = int(np.prod(data.shape[1:]))
+            data = data.reshape(m, num_components)
+            if self.binary:
+                tmp = np.empty(
+                    m, dtype=[("index", c_int), ("data", c_double, num_components)]
+                )
+                tmp["index"] = np.arange(k + 1, k + m + 1)
+                tmp["data"] = data
+                tmp.tofile(fh)
+            else:
+                np.savetxt(
+                    fh,
+                    np.column_stack([np.arange(k + 1, k + m + 1), data]),
+                    ["%d"] + ["%" + self.float_fmt] * num_components,
+                    " ",
+                )
+
+    def _finish(self, fh):
+        prev = self._runs[-1] if self._runs else None
+        self._end_section(fh, prev)
+        self._write_empty_sections(fh, prev, None)
+
+        dim = max((topological_dimension[t] for t, _ in self.cell_blocks), default=0)
+        n = self.num_points
+        m = self.num_cells
+        for run in self._runs:
+            section = _section(run.key)
+            if section == "Nodes":
+                header = [len(run.positions), n, 1, n]
+                self._patch(
+                    self._headers["Nodes"], self._header(header, c_size_t, True)
+                )
+                for position in run.positions:
+                    self._patch(position, self._header([dim, 0, 0], c_int, True))
+            elif section == "Elements":
+                if run.key[1] == 0:
+                    header = [len(self.cell_blocks), m, 1, m]
+                    self._patch(
+                        self._headers["Elements"], self._header(header, c_size_t, True)
+                    )
+                self._patch(
+                    run.positions[0], self._header([run.num_rows], c_size_t, True)
+                )
+            else:
+                self._patch(
+                    run.positions[0], f"{run.num_rows:<{_COUNT_WIDTH}}".encode()
+                )
+
+
+def _section(key):
+    if key == "points":
+        return "Nodes"
+    if key[0] == "cells":
+        return "Elements"
+    return key
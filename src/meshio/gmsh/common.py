@@ -7,6 +7,7 @@ from numpy.typing import ArrayLike
 
 from .._common import warn
 from .._exceptions import ReadError, WriteError
+from .._files import fromfile
 
 c_int = np.dtype("int32")
 c_double = np.dtype("float64")
@@ -50,7 +51,7 @@ def _read_physical_names(f, field_data):
     _fast_forward_to_end_block(f, "PhysicalNames")
 
 
-def _read_data(f, tag, data_dict, data_size, is_ascii):
+def _read_data_header(f):
     # Read string tags
     num_string_tags = int(f.readline().decode())
     string_tags = [
@@ -63,8 +64,12 @@ def _read_data(f, tag, data_dict, data_size, is_ascii):
         f.readline()
     num_integer_tags = int(f.readline().decode())
     integer_tags = [int(f.readline().decode()) for _ in range(num_integer_tags)]
-    num_components = integer_tags[1]
-    num_items = integer_tags[2]
+    # name, number of components, number of items
+    return string_tags[0], integer_tags[1], integer_tags[2]
+
+
+def _read_data(f, tag, data_dict, data_size, is_ascii, mmap=False):
+    name, num_components, num_items = _read_data_header(f)
     if is_ascii:
         data = np.fromfile(f, count=num_items * (1 + num_components), sep=" ").reshape(
             (num_items, 1 + num_components)
@@ -74,7 +79,7 @@ def _read_data(f, tag, data_dict, data_size, is_ascii):
     else:
         # binary
         dtype = [("index", c_int), ("values", c_double, (num_components,))]
-        data = np.fromfile(f, count=num_items, dtype=dtype)
+        data = fromfile(f, dtype, num_items, mmap)
         if not (data["index"] == range(1, num_items + 1)).all():
             raise ReadError()
         data = np.ascontiguousarray(data["values"])
@@ -86,7 +91,32 @@ def _read_data(f, tag, data_dict, data_size, is_ascii):
     if data.shape[1] == 1:
         data = data[:, 0]
 
-    data_dict[string_tags[0]] = data
+    data_dict[name] = data
+
+
+def _iter_data(f, tag, is_ascii, chunk_size):
+    """Read a $NodeData or $ElementData section in chunks of `chunk_size` items; yields
+    the name and the chunks of the data.
+    """
+    name, num_components, num_items = _read_data_header(f)
+    for start in range(0, num_items, chunk_size):
+        n = min(chunk_size, num_items - start)
+        if is_ascii:
+            data = np.fromfile(f, count=n * (1 + num_components), sep=" ").reshape(
+                (n, 1 + num_components)
+            )[:, 1:]
+        else:
+            dtype = [("index", c_int), ("values", c_double, (num_components,))]
+            data = np.fromfile(f, dtype, n)
+            if not (data["index"] == range(start + 1, start + n + 1)).all():
+                raise ReadError()
+            data = data["values"]
+        # see _read_data()
+        if data.shape[1] == 1:
+            data = data[:, 0]
+        yield name, data
+
+    _fast_forward_to_end_block(f, tag)
 
 
 # Translate meshio types to gmsh codes
@@ -232,7 +262,7 @@ def _write_physical_names(fh, field_data):
         fh.write(b"$EndPhysicalNames\n")
 
 
-def _write_data(fh, tag, name, data, binary):
+def _write_data_header(fh, tag, name, num_components, num_items):
     fh.write(f"${tag}\n".encode())
     # <http://gmsh.info/doc/texinfo/gmsh.html>:
     # > Number of string tags.
@@ -249,18 +279,22 @@ def _write_data(fh, tag, name, data, binary):
     # time step
     fh.write(f"{0}\n".encode())
     # number of components
-    num_components = data.shape[1] if len(data.shape) > 1 else 1
     if num_components not in [1, 3, 9]:
         raise WriteError("Gmsh only permits 1, 3, or 9 components per data field.")
+    fh.write(f"{num_components}\n".encode())
+    # num data items
+    fh.write(f"{num_items}\n".encode())
+
+
+def _write_data(fh, tag, name, data, binary):
+    num_components = data.shape[1] if len(data.shape) > 1 else 1
+    _write_data_header(fh, tag, name, num_components, data.shape[0])
 
     # Cut off the last dimension in case it's 1. This avoids problems with
     # writing the data.
     if len(data.shape) > 1 and data.shape[1] == 1:
         data = data[:, 0]
 
-    fh.write(f"{num_components}\n".encode())
-    # num data items
-    fh.write(f"{data.shape[0]}\n".encode())
     # actually write the data
     if binary:
         if num_components == 1:
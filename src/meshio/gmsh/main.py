@@ -1,8 +1,10 @@
 import pathlib
 import struct
 
+from .._blocks import blocks_from_mesh
 from .._exceptions import ReadError, WriteError
 from .._helpers import register_format
+from .._probe import MeshInfo
 from . import _gmsh22, _gmsh40, _gmsh41
 from .common import _fast_forward_to_end_block
 
@@ -12,40 +14,76 @@ _readers = {"2": _gmsh22, "2.2": _gmsh22, "4.0": _gmsh40, "4": _gmsh41, "4.1": _
 _writers = {"2.2": _gmsh22, "4.0": _gmsh40, "4.1": _gmsh41}
 
 
-def read(filename):
-    """Reads a Gmsh msh file."""
+def read(filename, mmap: bool = False):
+    """Reads a Gmsh msh file. With `mmap`, the node and element blocks of binary files
+    are memory-mapped instead of read, so they aren't held in memory in addition to the
+    resulting arrays.
+    """
     filename = pathlib.Path(filename)
     with open(filename.as_posix(), "rb") as f:
-        mesh = read_buffer(f)
+        mesh = read_buffer(f, mmap)
     return mesh
 
 
-def read_buffer(f):
+def read_buffer(f, mmap: bool = False):
     # The various versions of the format are specified at
     # <http://gmsh.info/doc/texinfo/gmsh.html#File-formats>.
-    line = f.readline().decode().strip()
+    fmt_version, data_size, is_ascii = _read_mesh_format(f)
+    reader = _pick_reader(fmt_version)
+    return reader.read_buffer(f, is_ascii, data_size, mmap)
 
-    # skip any $Comments/$EndComments sections
-    while line == "$Comments":
-        _fast_forward_to_end_block(f, "Comments")
-        line = f.readline().decode().strip()
 
-    if line != "$MeshFormat":
-        raise ReadError()
-    fmt_version, data_size, is_ascii = _read_header(f)
+def iter_blocks(filename, chunk_size: int):
+    """Read a Gmsh msh file chunk by chunk, see meshio.iter_blocks(). Files of format
+    versions other than 4.1 are read as a whole.
+    """
+    with open(filename, "rb") as f:
+        fmt_version, data_size, is_ascii = _read_mesh_format(f)
+        reader = _pick_reader(fmt_version)
+        if reader is _gmsh41:
+            yield from _gmsh41.iter_blocks(f, is_ascii, data_size, chunk_size)
+            return
+        mesh = reader.read_buffer(f, is_ascii, data_size)
+    yield from blocks_from_mesh(mesh, chunk_size)
+
+
+def probe(filename):
+    """Summary of a Gmsh msh file from its section headers, see meshio.probe(). Files
+    of format versions other than 4.1 are read as a whole.
+    """
+    with open(filename, "rb") as f:
+        fmt_version, data_size, is_ascii = _read_mesh_format(f)
+        reader = _pick_reader(fmt_version)
+        if reader is _gmsh41:
+            return _gmsh41.probe(f, is_ascii, data_size, fmt_version)
+        mesh = reader.read_buffer(f, is_ascii, data_size)
+    return MeshInfo.from_mesh(mesh, "gmsh", version=fmt_version)
+
 
+def _pick_reader(fmt_version: str):
     try:
-        reader = _readers[fmt_version]
+        return _readers[fmt_version]
     except KeyError:
         try:
-            reader = _readers[fmt_version.split(".")[0]]
+            return _readers[fmt_version.split(".")[0]]
         except KeyError:
             raise ValueError(
                 "Need mesh format in {} (got {})".format(
                     sorted(_readers.keys()), fmt_version
                 )
             )
-    return reader.read_buffer(f, is_ascii, data_size)
+
+
+def _read_mesh_format(f):
+    """Skip any $Comments/$EndComments sections and read the $MeshFormat block."""
+    line = f.readline().decode().strip()
+    while line == "$Comments":
+        _fast_forward_to_end_block(f, "Comments")
+        line = f.readline().decode().strip()
+
+    if line != "$MeshFormat":
+        raise ReadError()
+    return _read_header(f)
 
 
 def _read_header(f):
@@ -110,4 +148,7 @@ register_format(
         "gmsh22": lambda f, m, **kwargs: write(f, m, "2.2", **kwargs),
         "gmsh": lambda f, m, **kwargs: write(f, m, "4.1", **kwargs),
     },
+    stream_writer_map={"gmsh": _gmsh41.GmshStreamWriter},
+    block_reader=iter_blocks,
+    prober=probe,
 )
@@ -8,7 +8,7 @@ from datetime import datetime
 import numpy as np
 
 from .. import __about__
-from .._common import warn
+from .._common import hdf5_sniffer, warn
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
@@ -268,4 +268,7 @@ def write(filename, mesh, add_global_ids=True, compression="gzip", compression_o
     tstt.attrs.create("max_id", global_id, dtype="u8")
 
 
-register_format("h5m", [".h5m"], read, {"h5m": write})
+_sniff = hdf5_sniffer(lambda f: "tstt" in f)
+
+
+register_format("h5m", [".h5m"], read, {"h5m": write}, sniffer=_sniff)
@@ -1,6 +1,6 @@
 import meshio
 
-from .._common import cell_data_from_raw, raw_from_cell_data, warn
+from .._common import cell_data_from_raw, hdf5_sniffer, raw_from_cell_data, warn
 from .._helpers import register_format
 from ..xdmf.common import meshio_to_xdmf_type, xdmf_to_meshio_type
 
@@ -147,9 +147,13 @@ def _write_cell_data(cell_data, grid, compression, compression_opts):
         )
 
 
+_sniff = hdf5_sniffer(lambda f: f.attrs.get("type") == "hmf")
+
+
 register_format(
     "hmf",
     [".hmf"],
     read,
     {"hmf": write},
+    sniffer=_sniff,
 )
@@ -5,7 +5,7 @@ I/O for MED/Salome, cf.
 
 import numpy as np
 
-from .._common import num_nodes_per_cell
+from .._common import hdf5_sniffer, num_nodes_per_cell
 from .._exceptions import ReadError, WriteError
 from .._helpers import register_format
 from .._mesh import Mesh
@@ -457,4 +457,7 @@ def _write_families(fm_group, tags):
             dataset[i] = np.array([ord(x) for x in name_80])
 
 
-register_format("med", [".med"], read, {"med": write})
+_sniff = hdf5_sniffer(lambda f: "INFOS_GENERALES" in f)
+
+
+register_format("med", [".med"], read, {"med": write}, sniffer=_sniff)
@@ -11,17 +11,21 @@ import numpy as np
 
 from .._common import _pick_first_int_data, warn
 from .._exceptions import ReadError
-from .._files import open_file
+from .._files import fromfile, open_file
 from .._helpers import register_format
 from .._mesh import Mesh
 from ._medit_internal import medit_codes
 
 
-def read(filename):
-    with open_file(filename) as f:
-        if str(filename)[-1] == "b":
-            mesh = read_binary_buffer(f)
-        else:
+def read(filename, mmap: bool = False):
+    """Read a Medit file. With `mmap`, the points and the data of binary files (.meshb)
+    are memory-mapped views into the file instead of being read into memory.
+    """
+    if str(filename)[-1] == "b":
+        with open_file(filename, "rb") as f:
+            mesh = read_binary_buffer(f, mmap)
+    else:
+        with open_file(filename) as f:
             mesh = read_ascii_buffer(f)
     return mesh
 
@@ -50,7 +54,7 @@ def _produce_dtype(string_type, dim, itype, ftype):
     return res
 
 
-def read_binary_buffer(f):
+def read_binary_buffer(f, mmap: bool = False):
 
     meshio_from_medit = {
         "GmfVertices": ("point", None),
@@ -149,7 +153,7 @@ def read_binary_buffer(f):
 
         field_template = field_code[2]
         dtype = np.dtype(_produce_dtype(field_template, dim, itype, ftype))
-        out = np.asarray(np.fromfile(f, count=nitems, dtype=dtype))
+        out = np.asarray(fromfile(f, dtype, nitems, mmap))
         if field_code[0] not in meshio_from_medit.keys():
             warn(f"meshio doesn't know {field_code[0]} type. Skipping.")
             continue
@@ -4,12 +4,21 @@ I/O for Nastran bulk data.
 
 from __future__ import annotations
 
+import re
+
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import num_nodes_per_cell, warn
+from .._blocks import IndexMap
+from .._common import (
+    format_numbers,
+    num_nodes_per_cell,
+    parse_numbers,
+    warn,
+    write_table,
+)
 from .._exceptions import ReadError
-from .._files import open_file
+from .._files import _CHUNK_SIZE, open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
@@ -221,7 +230,8 @@ def read_buffer(f):
             if len(pref) > 0:
                 point_refs.append(int(pref))
             points_id.append(point_id)
-            points.append([_nastran_string_to_float(i) for i in chunks[3:6]])
+            # converted in bulk below
+            points += chunks[3:6]
 
         # CellBlock
         elif keyword in nastran_to_meshio_type:
@@ -249,18 +259,17 @@ def read_buffer(f):
                 add_cell(keyword, cell, cell_ref)
 
     # Convert to numpy arrays
-    points = np.array(points)
+    points = _nastran_strings_to_float(points).reshape(-1, 3)
     points_id = np.array(points_id, dtype=int)
-    for k, (c, cid) in enumerate(zip(cells, cells_id)):
-        cells[k] = CellBlock(c[0], np.array(c[1], dtype=int))
-        cells_id[k] = np.array(cid, dtype=int)
+    if len(points) != len(points_id):
+        raise ReadError("Expected three coordinates per GRID")
 
     # Convert to natural point ordering
-    # https://stackoverflow.com/questions/16992713/translate-every-element-in-numpy-array-according-to-key
-    points_id_dict = dict(zip(points_id, np.arange(len(points), dtype=int)))
-    points_id_get = np.vectorize(points_id_dict.__getitem__)
-    for k, c in enumerate(cells):
-        cells[k] = CellBlock(c.type, points_id_get(c.data))
+    point_index = IndexMap()
+    point_index.append(points_id)
+    for k, (c, cid) in enumerate(zip(cells, cells_id)):
+        cells[k] = CellBlock(c[0], point_index(np.array(c[1], dtype=int)))
+        cells_id[k] = np.array(cid, dtype=int)
 
     # Construct the mesh object
     mesh = Mesh(points, cells)
@@ -295,26 +304,28 @@ def read_buffer(f):
 
 def write(filename, mesh, point_format="fixed-large", cell_format="fixed-small"):
     if point_format == "free":
-        grid_fmt = "GRID,{:d},{:s},{:s},{:s},{:s}\n"
-        float_fmt = _float_to_nastran_string
+        grid_fmt = "GRID,%d,%s,%s,%s,%s\n"
+        float_fmt = _floats_to_nastran_strings
     elif point_format == "fixed-small":
-        grid_fmt = "GRID    {:<8d}{:<8s}{:>8s}{:>8s}{:>8s}\n"
-        float_fmt = _float_rstrip
+        # %8.8s cuts the coordinates to 8 characters
+        grid_fmt = "GRID    %-8d%-8s%8.8s%8.8s%8.8s\n"
+        float_fmt = _floats_rstrip
     elif point_format == "fixed-large":
-        grid_fmt = "GRID*   {:<16d}{:<16s}{:>16s}{:>16s}\n*       {:>16s}\n"
-        float_fmt = _float_to_nastran_string
+        grid_fmt = "GRID*   %-16d%-16s%16s%16s\n*       %16s\n"
+        float_fmt = _floats_to_nastran_strings
     else:
         raise RuntimeError(f'unknown "{format}" format')
 
     if cell_format == "free":
-        int_fmt, cell_info_fmt = "{:d}", "{:s},{:d},{:s},"
+        int_fmt, cell_info_fmt = "%d", "%s,%d,%s,"
         sjoin = ","
+        nipl1, nipl2 = 6, 14
     elif cell_format == "fixed-small":
-        int_fmt, cell_info_fmt = "{:<8d}", "{:<8s}{:<8d}{:<8s}"
+        int_fmt, cell_info_fmt = "%-8d", "%-8s%-8d%-8s"
         sjoin, cchar = "", "+"
         nipl1, nipl2 = 6, 14
     elif cell_format == "fixed-large":
-        int_fmt, cell_info_fmt = "{:<16d}", "{:<8s}{:<16d}{:<16s}"
+        int_fmt, cell_info_fmt = "%-16d", "%-8s%-16d%-16s"
         sjoin, cchar = "", "*"
         nipl1, nipl2 = 2, 6
     else:
@@ -333,127 +344,97 @@ def write(filename, mesh, point_format="fixed-large", cell_format="fixed-small")
         f.write(f"$ Nastran file written by meshio v{__version__}\n")
         f.write("BEGIN BULK\n")
 
-        # Points
+        # Points, formatted chunk by chunk
         point_refs = mesh.point_data.get("nastran:ref", None)
-        for point_id, x in enumerate(points):
-            fx = [float_fmt(k) for k in x]
-            pref = str(point_refs[point_id]) if point_refs is not None else ""
-            string = grid_fmt.format(point_id + 1, pref, fx[0], fx[1], fx[2])
-            f.write(string)
+        chunk_size = _CHUNK_SIZE // 64
+        for start in range(0, len(points), chunk_size):
+            stop = min(start + chunk_size, len(points))
+            fx = float_fmt(points[start:stop]).reshape(-1, 3)
+            if point_refs is None:
+                pref = [""] * (stop - start)
+            else:
+                pref = point_refs[start:stop]
+            columns = [np.arange(start + 1, stop + 1), pref, *fx.T]
+            write_table(f, columns, grid_fmt)
 
         # CellBlock
         cell_id = 0
         cell_refs = mesh.cell_data.get("nastran:ref", None)
         for ict, cell_block in enumerate(mesh.cells):
             cell_type = cell_block.type
-            cells = cell_block.data
             nastran_type = meshio_to_nastran_type[cell_type]
             if cell_format.endswith("-large"):
                 nastran_type += "*"
+            num_cells, num_nodes = cell_block.data.shape
+            cell_ids = np.arange(cell_id + 1, cell_id + num_cells + 1)
+            cell_id += num_cells
             if cell_refs is not None:
-                cell_refs_t = cell_refs[ict]
+                cell_ref = cell_refs[ict].astype(int)
             else:
-                cell_ref = ""
-            for ic, cell in enumerate(cells):
-                if cell_refs is not None:
-                    cell_ref = str(int(cell_refs_t[ic]))
-                cell_id += 1
-                cell_info = cell_info_fmt.format(nastran_type, cell_id, cell_ref)
-                cell1 = cell + 1
-                cell1 = _convert_to_nastran_ordering(cell1, nastran_type)
-                conn = sjoin.join(int_fmt.format(nid) for nid in cell1[:nipl1])
-
-                if len(cell1) > nipl1:
-                    if cell_format == "free":
-                        cflag1 = cflag3 = ""
-                        cflag2 = cflag4 = "+,"
-                    else:
-                        cflag1 = cflag2 = f"{cchar}1{cell_id:<6x}"
-                        cflag3 = cflag4 = f"{cchar}2{cell_id:<6x}"
-                    f.write(cell_info + conn + cflag1 + "\n")
-                    conn = sjoin.join(int_fmt.format(nid) for nid in cell1[nipl1:nipl2])
-                    if len(cell1) > nipl2:
-                        f.write(cflag2 + conn + cflag3 + "\n")
-                        conn = sjoin.join(int_fmt.format(nid) for nid in cell1[nipl2:])
-                        f.write(cflag4 + conn + "\n")
-                    else:
-                        f.write(cflag2 + conn + "\n")
+                cell_ref = [""] * num_cells
+            cells = cell_block.data + 1
+            cells = _convert_to_nastran_ordering(list(cells.T), nastran_type)
+
+            # one row format for all cards of the block, including the continuations
+            fmt = cell_info_fmt + sjoin.join([int_fmt] * min(num_nodes, nipl1))
+            columns = [[nastran_type] * num_cells, cell_ids, cell_ref, *cells[:nipl1]]
+            if num_nodes > nipl1:
+                if cell_format == "free":
+                    cflag1 = cflag3 = ""
+                    cflag2 = cflag4 = "+,"
+                    flag_columns = []
                 else:
-                    f.write(cell_info + conn + "\n")
+                    cflag1 = cflag2 = f"{cchar}1%-6x"
+                    cflag3 = cflag4 = f"{cchar}2%-6x"
+                    flag_columns = [cell_ids, cell_ids]
+                fmt += cflag1 + "\n" + cflag2
+                fmt += sjoin.join([int_fmt] * len(cells[nipl1:nipl2]))
+                columns += flag_columns + cells[nipl1:nipl2]
+                if num_nodes > nipl2:
+                    fmt += cflag3 + "\n" + cflag4
+                    fmt += sjoin.join([int_fmt] * len(cells[nipl2:]))
+                    columns += flag_columns + cells[nipl2:]
+            write_table(f, columns, fmt + "\n")
 
         f.write("ENDDATA\n")
 
 
-def _float_rstrip(x, n=8):
-    return f"{x:f}".rstrip("0")[:n]
+def _floats_rstrip(x) -> np.ndarray:
+    # f"{x:f}".rstrip("0") for all x
+    text = re.sub("0+$", "", "\n".join(format_numbers(x, "%f")), flags=re.MULTILINE)
+    return np.array(text.split("\n"))
 
 
-def _float_to_nastran_string(value, length=16):
-    """
-    From
-    <https://docs.plm.automation.siemens.com/data_services/resources/nxnastran/10/help/en_US/tdocExt/pdf/User.pdf>:
-
-    Real numbers, including zero, must contain a decimal point. You can enter
-    real numbers in a variety of formats. For example, the following are all
-    acceptable versions of the real number, seven:
-    ```
-    7.0   .7E1  0.7+1
-    .70+1 7.E+0 70.-1
-    ```
-
-    This methods converts a float value into the corresponding string. Choose
-    the variant with `E` to make the file less ambigious when edited by a
-    human. (`5.-1` looks like 4.0, not 5.0e-1 = 0.5.)
-
-    Examples:
-        1234.56789 --> "1.23456789E+3"
-        -0.1234 --> "-1.234E-1"
-        3.1415926535897932 --> "3.14159265359E+0"
+def _floats_to_nastran_strings(x) -> np.ndarray:
+    """Convert floats into Nastran real numbers with up to 16 characters.
+
+    Nastran accepts, e.g., "7.0", ".7E1", "0.7+1", and "70.-1" for seven; the variant
+    with "E" is less ambiguous when edited by a human ("5.-1" looks like 4.0, not
+    0.5). The strings are those of np.format_float_scientific(x, exp_digits=1,
+    precision=11), e.g., 1234.56789 -> "1.23456789E+3", -0.1234 -> "-1.234E-1".
+    That function rounds to 11 digits after the decimal point and removes trailing
+    zeros if they are not significant, i.e., if the rounded value reads back as the
+    value itself, or if the zeros come from rounding up.
     """
-    out = np.format_float_scientific(value, exp_digits=1, precision=11).replace(
-        "e", "E"
-    )
-    assert len(out) <= 16
+    x = np.asarray(x, dtype=float).reshape(-1)
+    text = re.sub(r"E([+-])0*(\d)", r"E\1\2", "\n".join(format_numbers(x, "%.11E")))
+    strip = np.abs(parse_numbers(text)) >= np.abs(x)
+    stripped = re.sub(r"\.(\d*?)0*E", r".\1E", text)
+    out = np.where(strip, stripped.split("\n"), text.split("\n"))
+    assert np.char.str_len(out).max(initial=0) <= 16
     return out
-    # The following is the manual float conversion. Keep it around for a while in case
-    # we still need it.
-
-    # aux = length - 2
-    # # sfmt = "{" + f":{length}s" + "}"
-    # sfmt = "{" + ":s" + "}"
-    # pv_fmt = "{" + f":{length}.{aux}e" + "}"
-
-    # if value == 0.0:
-    #     return sfmt.format("0.")
-
-    # python_value = pv_fmt.format(value)  # -1.e-2
-    # svalue, sexponent = python_value.strip().split("e")
-    # exponent = int(sexponent)  # removes 0s
 
-    # sign = "-" if abs(value) < 1.0 else "+"
 
-    # # the exponent will be added later...
-    # sexp2 = str(exponent).strip("-+")
-    # value2 = float(svalue)
-
-    # # the plus 1 is for the sign
-    # len_sexp = len(sexp2) + 1
-    # leftover = length - len_sexp
-    # leftover = leftover - 3 if value < 0 else leftover - 2
-    # fmt = "{" + f":1.{leftover:d}f" + "}"
-
-    # svalue3 = fmt.format(value2)
-    # svalue4 = svalue3.strip("0")
-    # field = sfmt.format(svalue4 + sign + sexp2)
-    # return field
+def _nastran_strings_to_float(strings: list[str]) -> np.ndarray:
+    text = " ".join(strings)
+    try:
+        return parse_numbers(text)
+    except ReadError:
+        # exponents without "e", e.g., 1.-3 or 2.5+4
+        return parse_numbers(_exponent_without_e.sub(r"\1e\2", text))
 
 
-def _nastran_string_to_float(string):
-    try:
-        return float(string)
-    except ValueError:
-        string = string.strip()
-        return float(string[0] + string[1:].replace("+", "e+").replace("-", "e-"))
+_exponent_without_e = re.compile(r"([0-9.])([+-])(?=[0-9])")
 
 
 def _chunk_line(line: str) -> tuple[list[str], bool]:
@@ -4,29 +4,40 @@ I/O for the Wavefront .obj file format, cf.
 """
 
 import datetime
+import re
 
 import numpy as np
 
 from ..__about__ import __version__
-from .._exceptions import WriteError
+from .._common import parse_ragged, weld_points, write_table
+from .._exceptions import ReadError, WriteError
 from .._files import open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
 
-def read(filename):
+def read(filename, weld_atol: float = 0.0, weld_rtol: float = 0.0):
+    """Read an OBJ file. If a tolerance is given, vertices which coincide up to the
+    tolerance (see `meshio._common.weld_points`) are merged.
+    """
     with open_file(filename, "r") as f:
         mesh = read_buffer(f)
+
+    if weld_atol > 0.0 or weld_rtol > 0.0:
+        idx, inv = weld_points(mesh.points, weld_atol, weld_rtol)
+        mesh.points = mesh.points[idx]
+        for cell_block in mesh.cells:
+            cell_block.data = inv[cell_block.data]
+        for key, value in mesh.point_data.items():
+            mesh.point_data[key] = value[idx]
     return mesh
 
 
 def read_buffer(f):
-    points = []
-    vertex_normals = []
-    texture_coords = []
-    face_groups = []
-    face_group_ids = []
-    face_group_id = -1
+    # Sort the lines by keyword and parse the numbers of each kind in bulk.
+    lines = {"v": [], "vn": [], "vt": [], "f": []}
+    # the index of the first face of each group
+    group_starts = []
     while True:
         line = f.readline()
 
@@ -34,71 +45,63 @@ def read_buffer(f):
             # EOF
             break
 
-        strip = line.strip()
-
-        if len(strip) == 0 or strip[0] == "#":
-            continue
+        split = line.strip().split(None, 1)
+        keyword = split[0] if split else ""
 
-        split = strip.split()
-
-        if split[0] == "v":
-            points.append([float(item) for item in split[1:]])
-        elif split[0] == "vn":
-            vertex_normals.append([float(item) for item in split[1:]])
-        elif split[0] == "vt":
-            texture_coords.append([float(item) for item in split[1:]])
-        elif split[0] == "s":
-            # "s 1" or "s off" controls smooth shading
-            pass
-        elif split[0] == "f":
-            dat = [int(item.split("/")[0]) for item in split[1:]]
-            if len(face_groups) == 0 or (
-                len(face_groups[-1]) > 0 and len(face_groups[-1][-1]) != len(dat)
-            ):
-                face_groups.append([])
-                face_group_ids.append([])
-
-            face_groups[-1].append(dat)
-            face_group_ids[-1].append(face_group_id)
-        elif split[0] == "g":
+        if keyword in lines:
+            lines[keyword].append(split[1] if len(split) > 1 else "")
+        elif keyword == "g":
             # new group
-            face_groups.append([])
-            face_group_ids.append([])
-            face_group_id += 1
+            group_starts.append(len(lines["f"]))
         else:
-            # who knows
+            # comments, "s 1" or "s off" for smooth shading, who knows
             pass
 
-    # There may be empty groups, too. <https://github.com/nschloe/meshio/issues/770>
-    # Remove them.
-    face_groups = [f for f in face_groups if len(f) > 0]
-    face_group_ids = [g for g in face_group_ids if len(g) > 0]
-
-    points = np.array(points)
-    texture_coords = np.array(texture_coords)
-    vertex_normals = np.array(vertex_normals)
+    points = _parse_rows(lines["v"])
+    texture_coords = _parse_rows(lines["vt"])
+    vertex_normals = _parse_rows(lines["vn"])
     point_data = {}
     if len(texture_coords) > 0:
         point_data["obj:vt"] = texture_coords
     if len(vertex_normals) > 0:
         point_data["obj:vn"] = vertex_normals
 
-    # convert to numpy arrays
-    face_groups = [np.array(f) for f in face_groups]
+    # Only keep the vertex indices of "v/vt/vn" and split the faces into blocks of
+    # equal size within each group. There may be empty groups, too.
+    # <https://github.com/nschloe/meshio/issues/770>
+    face_lines = re.sub(r"/\S*", "", "\n".join(lines["f"])).split("\n")
+    values, offsets = parse_ragged(face_lines if lines["f"] else [], int)
+    sizes = np.diff(offsets)
+    group_ids = np.searchsorted(group_starts, np.arange(len(sizes)), side="right") - 1
+    is_start = np.ones(len(sizes), dtype=bool)
+    is_start[1:] = (sizes[1:] != sizes[:-1]) | (group_ids[1:] != group_ids[:-1])
+    block_starts = np.append(np.flatnonzero(is_start), len(sizes))
+
     cell_data = {"obj:group_ids": []}
     cells = []
-    for f, gid in zip(face_groups, face_group_ids):
-        if f.shape[1] == 3:
-            cells.append(CellBlock("triangle", f - 1))
-        elif f.shape[1] == 4:
-            cells.append(CellBlock("quad", f - 1))
+    for start, end in zip(block_starts[:-1], block_starts[1:]):
+        data = values[offsets[start] : offsets[end]].reshape(end - start, -1) - 1
+        if data.shape[1] == 3:
+            cells.append(CellBlock("triangle", data))
+        elif data.shape[1] == 4:
+            cells.append(CellBlock("quad", data))
         else:
-            cells.append(CellBlock("polygon", f - 1))
-        cell_data["obj:group_ids"].append(gid)
+            cells.append(CellBlock("polygon", data))
+        cell_data["obj:group_ids"].append(np.full(end - start, group_ids[start]))
 
     return Mesh(points, cells, point_data=point_data, cell_data=cell_data)
 
 
+def _parse_rows(lines):
+    if not lines:
+        return np.array([])
+    values, offsets = parse_ragged(lines, float)
+    sizes = np.diff(offsets)
+    if np.any(sizes != sizes[0]):
+        raise ReadError("Rows of different lengths")
+    return values.reshape(len(lines), -1)
+
+
 def write(filename, mesh):
     for c in mesh.cells:
         if c.type not in ["triangle", "quad", "polygon"]:
@@ -112,25 +115,19 @@ def write(filename, mesh):
                 __version__, datetime.datetime.now().isoformat()
             )
         )
-        for p in mesh.points:
-            f.write(f"v {p[0]} {p[1]} {p[2]}\n")
+        write_table(f, mesh.points, "v %r %r %r\n")
 
         if "obj:vn" in mesh.point_data:
             dat = mesh.point_data["obj:vn"]
-            fmt = "vn " + " ".join(["{}"] * dat.shape[1]) + "\n"
-            for vn in dat:
-                f.write(fmt.format(*vn))
+            write_table(f, dat, "vn " + " ".join(["%r"] * dat.shape[1]) + "\n")
 
         if "obj:vt" in mesh.point_data:
             dat = mesh.point_data["obj:vt"]
-            fmt = "vt " + " ".join(["{}"] * dat.shape[1]) + "\n"
-            for vt in dat:
-                f.write(fmt.format(*vt))
+            write_table(f, dat, "vt " + " ".join(["%r"] * dat.shape[1]) + "\n")
 
         for cell_block in mesh.cells:
-            fmt = "f " + " ".join(["{}"] * cell_block.data.shape[1]) + "\n"
-            for c in cell_block.data:
-                f.write(fmt.format(*(c + 1)))
+            fmt = "f " + " ".join(["%d"] * cell_block.data.shape[1]) + "\n"
+            write_table(f, cell_block.data + 1, fmt)
 
 
 register_format("obj", [".obj"], read, {"obj": write})
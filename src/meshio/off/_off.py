@@ -6,16 +6,24 @@ I/O for the OFF surface format, cf.
 
 import numpy as np
 
-from .._common import warn
+from .._common import warn, weld_points, write_table
 from .._exceptions import ReadError
 from .._files import open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
 
-def read(filename):
+def read(filename, weld_atol: float = 0.0, weld_rtol: float = 0.0):
+    """Read an OFF file. If a tolerance is given, vertices which coincide up to the
+    tolerance (see `meshio._common.weld_points`) are merged.
+    """
     with open_file(filename) as f:
         points, cells = read_buffer(f)
+
+    if weld_atol > 0.0 or weld_rtol > 0.0:
+        idx, inv = weld_points(points, weld_atol, weld_rtol)
+        points = points[idx]
+        cells = [CellBlock(c.type, inv[c.data]) for c in cells]
     return Mesh(points, cells)
 
 
@@ -78,18 +86,10 @@ def write(filename, mesh):
         fh.write(c.encode())
 
         # vertices
-        # np.savetxt(fh, mesh.points, "%r")  # slower
-        fmt = " ".join(["{}"] * points.shape[1])
-        out = "\n".join([fmt.format(*row) for row in points]) + "\n"
-        fh.write(out.encode())
+        write_table(fh, points, " ".join(["%r"] * points.shape[1]) + "\n")
 
         # triangles
-        out = np.column_stack([np.full(tri.shape[0], 3, dtype=tri.dtype), tri])
-        # savetxt is slower
-        # np.savetxt(fh, out, "%d  %d %d %d")
-        fmt = " ".join(["{}"] * out.shape[1])
-        out = "\n".join([fmt.format(*row) for row in out]) + "\n"
-        fh.write(out.encode())
+        write_table(fh, tri, "3 %d %d %d\n")
 
 
 register_format("off", [".off"], read, {"off": write})
@@ -5,7 +5,8 @@ I/O for PERMAS dat files.
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import warn
+from .._blocks import IndexMap
+from .._common import num_nodes_per_cell, parse_numbers, parse_ragged, warn
 from .._exceptions import ReadError
 from .._files import open_file
 from .._helpers import register_format
@@ -113,24 +114,24 @@ def read_buffer(f):
 
 
 def _read_nodes(f):
-    points = []
-    point_gids = {}
-    index = 0
+    lines = []
     while True:
         last_pos = f.tell()
         line = f.readline()
-        if line.startswith("!"):
-            break
-        if line.startswith("$"):
+        if line.startswith(("!", "$")) or line == "":
             break
-        entries = line.strip().split(" ")
-        gid, x = entries[0], entries[1:]
-        point_gids[int(gid)] = index
-        points.append([float(xx) for xx in x])
-        index += 1
-
+        lines.append(line)
     f.seek(last_pos)
-    return np.array(points, dtype=float), point_gids
+
+    # global ID and coordinates
+    values, offsets = parse_ragged(lines, float)
+    row_lengths = np.diff(offsets)
+    if np.any(row_lengths != row_lengths[:1]):
+        raise ReadError("Nodes have different numbers of coordinates")
+    data = values.reshape(len(lines), -1) if lines else np.empty((0, 4))
+    point_gids = IndexMap(offset=1)
+    point_gids.append(data[:, 0].astype(int))
+    return data[:, 1:], point_gids
 
 
 def _read_cells(f, line0, point_gids):
@@ -142,20 +143,27 @@ def _read_cells(f, line0, point_gids):
     if etype not in permas_to_meshio_type:
         raise ReadError(f"Element type not available: {etype}")
     cell_type = permas_to_meshio_type[etype]
-    cells, idx = [], []
+    lines = []
+    num_cells = 0
     while True:
         last_pos = f.tell()
         line = f.readline()
         if line.startswith("$") or line == "":
             break
         line = line.strip()
-        # the first item is just a running index
-        idx += [point_gids[int(k)] for k in filter(None, line.split(" ")[1:])]
+        # the first item is just a running index, a trailing "!" continues the cell
+        # on the next line
+        split = line.split(None, 1)
+        lines.append(split[1].rstrip("!") if len(split) > 1 else "")
         if not line.endswith("!"):
-            cells.append(idx)
-            idx = []
+            num_cells += 1
     f.seek(last_pos)
-    return cell_type, np.array(cells)
+    idx = parse_numbers(lines, int)
+    if num_cells == 0:
+        return cell_type, np.empty((0, num_nodes_per_cell[cell_type]), dtype=int)
+    if len(idx) % num_cells != 0:
+        raise ReadError(f"Cells of type {etype} have different numbers of nodes")
+    return cell_type, point_gids(idx.reshape(num_cells, -1))
 
 
 def get_param_map(word, required_keys=None):
@@ -199,14 +207,15 @@ def get_param_map(word, required_keys=None):
 
 
 def read_set(f, params_map):
-    set_ids = []
+    set_lines = []
     while True:
         last_pos = f.tell()
         line = f.readline()
-        if line.startswith("$"):
+        if line.startswith("$") or line == "":
             break
-        set_ids += [int(k) for k in line.strip().strip(" ").split(" ")]
+        set_lines.append(line)
     f.seek(last_pos)
+    set_ids = parse_numbers(set_lines, int)
 
     if "generate" in params_map:
         if len(set_ids) != 3:
@@ -285,6 +294,4 @@ def write(filename, mesh):
         f.write("$FIN\n")
 
 
-register_format(
-    "permas", [".post", ".post.gz", ".dato", ".dato.gz"], read, {"permas": write}
-)
+register_format("permas", [".post", ".dato"], read, {"permas": write})
@@ -4,7 +4,6 @@ I/O for the PLY format, cf.
 <https://web.archive.org/web/20161221115231/http://www.cs.virginia.edu/~gfx/Courses/2001/Advanced.spring.01/plylib/Ply.txt>.
 """
 
-import collections
 import datetime
 import re
 import sys
@@ -12,7 +11,7 @@ import sys
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import warn
+from .._common import parse_ragged, warn, write_table
 from .._exceptions import ReadError, WriteError
 from .._files import open_file
 from .._helpers import register_format
@@ -206,49 +205,41 @@ def _read_ascii(
         for i in range(k, len(point_data_names))
     }
     cell_data = {}
-
     cell_blocks = []
+    if num_cells == 0 or "vertex_indices" not in cell_data_names:
+        return Mesh(verts, cell_blocks, point_data=point_data, cell_data=cell_data)
+    if cell_data_names[0] != "vertex_indices":
+        raise ReadError("Expected vertex_indices as the first face property")
+
+    # Each line is the number of vertices, the vertex indices, and the other face
+    # properties; parse all lines in one go.
+    lines = [f.readline() for _ in range(num_cells)]
+    is_int = all(
+        np.issubdtype(ply_to_numpy_dtype[dtype], np.integer)
+        for dtype in cell_dtypes[1:]
+    )
+    values, offsets = parse_ragged(b"".join(lines).decode(), int if is_int else float)
+    starts = offsets[:-1]
+    n = values[starts].astype(int)
+
+    # split into blocks of consecutive cells with the same number of vertices
+    _, value_dtype = cell_dtypes[0]
+    value_dtype = ply_to_numpy_dtype[value_dtype]
+    block_starts = np.flatnonzero(np.diff(n, prepend=-1))
+    block_ends = np.append(block_starts[1:], num_cells)
+    for b, e in zip(block_starts, block_ends):
+        idx = starts[b:e, None] + 1 + np.arange(n[b])
+        cell_blocks.append(
+            (cell_type_from_count(n[b]), values[idx].astype(value_dtype))
+        )
 
-    for k in range(num_cells):
-        line = f.readline().decode().strip()
-        data = line.split()
-
-        if k == 0:
-            # initialize the cell data arrays
-            i = 0
-            cell_data = {}
-            for name, dtype in zip(cell_data_names, cell_dtypes):
-                if name == "vertex_indices":
-                    n = int(data[i])
-                    i += n + 1
-                else:
-                    cell_data[name] = collections.defaultdict(list)
-                    i += 1
-
-        # go over the line
-        i = 0
-        n = None
-        for name, dtype in zip(cell_data_names, cell_dtypes):
-            if name == "vertex_indices":
-                idx_dtype, value_dtype = dtype
-                n = ply_to_numpy_dtype[idx_dtype](data[i])
-                dtype = ply_to_numpy_dtype[value_dtype]
-                idx = dtype(data[i + 1 : i + n + 1])
-                if len(cell_blocks) == 0 or len(cell_blocks[-1][1][-1]) != n:
-                    cell_blocks.append((cell_type_from_count(n), [idx]))
-                else:
-                    cell_blocks[-1][1].append(idx)
-                i += n + 1
-            else:
-                dtype = ply_to_numpy_dtype[dtype]
-                # use n from vertex_indices
-                assert n is not None
-                cell_data[name][n] += [dtype(data[j]) for j in range(i, i + 1)]
-                i += 1
-
-    cell_data = {
-        key: [np.array(v) for v in value.values()] for key, value in cell_data.items()
-    }
+    # The other properties are grouped by the number of vertices, in the order in
+    # which the numbers first appear.
+    _, first = np.unique(n, return_index=True)
+    sizes = n[np.sort(first)]
+    for j, (name, dtype) in enumerate(zip(cell_data_names[1:], cell_dtypes[1:])):
+        data = values[starts + 1 + n + j].astype(ply_to_numpy_dtype[dtype])
+        cell_data[name] = [data[n == size] for size in sizes]
 
     return Mesh(verts, cell_blocks, point_data=point_data, cell_data=cell_data)
 
@@ -500,12 +491,8 @@ def write(filename, mesh: Mesh, binary: bool = True):  # noqa: C901
                 fh.write(out.tobytes())
         else:
             # vertices
-            # np.savetxt(fh, mesh.points, "%r")  # slower
-            # out = np.column_stack([mesh.points] + list(mesh.point_data.values()))
-            out = np.rec.fromarrays([coord for coord in mesh.points.T] + pd)
-            fmt = " ".join(["{}"] * len(out[0]))
-            out = "\n".join([fmt.format(*row) for row in out]) + "\n"
-            fh.write(out.encode())
+            columns = list(mesh.points.T) + pd
+            write_table(fh, columns, " ".join(["%r"] * len(columns)) + "\n")
 
             # cells
             for cell_block in mesh.cells:
@@ -518,14 +505,7 @@ def write(filename, mesh: Mesh, binary: bool = True):  # noqa: C901
                 #                if cell_type not in cell_type_to_count.keys():
                 #                    continue
                 d = cell_block.data
-                out = np.column_stack(
-                    [np.full(d.shape[0], d.shape[1], dtype=d.dtype), d]
-                )
-                # savetxt is slower
-                # np.savetxt(fh, out, "%d  %d %d %d")
-                fmt = " ".join(["{}"] * out.shape[1])
-                out = "\n".join([fmt.format(*row) for row in out]) + "\n"
-                fh.write(out.encode())
+                write_table(fh, d, f"{d.shape[1]}" + " %d" * d.shape[1] + "\n")
 
 
 register_format("ply", [".ply"], read, {"ply": write})
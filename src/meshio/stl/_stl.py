@@ -10,14 +10,20 @@ import os
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import warn
+from .._common import warn, weld_points
 from .._exceptions import ReadError
-from .._files import open_file
+from .._files import fromfile, is_buffer, open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
 
-def read(filename):
+def read(filename, weld_atol: float = 0.0, weld_rtol: float = 0.0, mmap: bool = False):
+    """Read an STL file. The facets' corners are merged into points if they coincide
+    up to the (absolute or relative, see `meshio._common.weld_points`) tolerance.
+
+    With `mmap`, binary files are memory-mapped instead of read, so the facet normals
+    and attribute counts are never loaded.
+    """
     with open_file(filename, "rb") as f:
         # Checking if the file is ASCII format is normally done by checking if the
         # first 5 characters of the header is "solid".
@@ -31,19 +37,19 @@ def read(filename):
         # (https://stackoverflow.com/a/7394842/353337).
         filesize_bytes = os.path.getsize(filename)
         if filesize_bytes < 80:
-            return _read_ascii(f)
+            return _read_ascii(f, weld_atol, weld_rtol)
 
         f.read(80)
         num_triangles = np.fromfile(f, count=1, dtype="<u4")[0]
         # for each triangle, one has 3 float32 (facet normal), 9 float32 (facet),
         # and 1 int16 (attribute count), 50 bytes in total
         if 84 + num_triangles * 50 == filesize_bytes:
-            return _read_binary(f, num_triangles)
+            return _read_binary(f, num_triangles, weld_atol, weld_rtol, mmap)
 
         # rewind and skip header
         f.seek(0)
         f.readline()
-        return _read_ascii(f)
+        return _read_ascii(f, weld_atol, weld_rtol)
 
 
 # np.loadtxt is super slow
@@ -83,7 +89,7 @@ def iter_loadtxt(
     return data.reshape((-1, iter_loadtxt.rowlength))
 
 
-def _read_ascii(f):
+def _read_ascii(f, weld_atol: float = 0.0, weld_rtol: float = 0.0):
     # The file has the form
     # ```
     # solid foo
@@ -135,14 +141,14 @@ def _read_ascii(f):
         cells = {}
         cell_data = {}
     else:
-        facets = np.split(data, data.shape[0] // 3)
-        points, cells = data_from_facets(facets)
+        facets = data.reshape(-1, 3, 3)
+        points, cells = data_from_facets(facets, weld_atol, weld_rtol)
         cell_data = {"facet_normals": [facet_normals]}
 
     return Mesh(points, cells, cell_data=cell_data)
 
 
-def data_from_facets(facets):
+def data_from_facets(facets, atol: float = 0.0, rtol: float = 0.0):
     # Now, all facets contain the point coordinate. Try to identify individual points
     # and build the data arrays.
     if len(facets) == 0:
@@ -150,26 +156,29 @@ def data_from_facets(facets):
         cells = []
     else:
         pts = np.concatenate(facets)
-        # TODO equip `unique()` with a tolerance
-        # Use return_index so we can use sort on `idx` such that the order is
-        # preserved; see <https://stackoverflow.com/a/15637512/353337>.
-        _, idx, inv = np.unique(pts, axis=0, return_index=True, return_inverse=True)
-        k = np.argsort(idx)
-        points = pts[idx[k]]
-        inv_k = np.argsort(k)
-        cells = [CellBlock("triangle", inv_k[inv].reshape(-1, 3))]
+        # The point order is preserved, see weld_points().
+        idx, inv = weld_points(pts, atol, rtol)
+        points = pts[idx]
+        cells = [CellBlock("triangle", inv.reshape(-1, 3))]
     return points, cells
 
 
-def _read_binary(f, num_triangles: int):
+def _read_binary(
+    f,
+    num_triangles: int,
+    weld_atol: float = 0.0,
+    weld_rtol: float = 0.0,
+    mmap: bool = False,
+):
     # for each triangle, one has 3 float32 (facet normal), 9 float32 (facet), and 1
     # int16 (attribute count)
-    out = np.fromfile(
+    out = fromfile(
         f,
-        count=num_triangles,
-        dtype=np.dtype(
+        np.dtype(
             [("normal", "<f4", (3,)), ("facet", "<f4", (3, 3)), ("attr count", "<i2")]
         ),
+        int(num_triangles),
+        mmap,
     )
     # discard normals, attribute count
     facets = out["facet"]
@@ -177,7 +186,7 @@ def _read_binary(f, num_triangles: int):
     #     print(out["attr count"])
     #     raise ReadError("Nonzero attr count")
 
-    points, cells = data_from_facets(facets)
+    points, cells = data_from_facets(facets, weld_atol, weld_rtol)
     return Mesh(points, cells)
 
 
@@ -255,4 +264,18 @@ def _write_binary(filename, pts, normals):
         a.tofile(fh)
 
 
-register_format("stl", [".stl"], read, {"stl": write})
+def _sniff(head: bytes, filename: str | None) -> bool:
+    if head.lstrip().startswith(b"solid"):
+        return True
+    # binary STL: 80 bytes header, number of triangles, 50 bytes per triangle
+    if filename is None or len(head) < 84:
+        return False
+    num_triangles = int(np.frombuffer(head[80:84], dtype="<u4")[0])
+    if is_buffer(filename, "r"):
+        size = filename.seek(0, os.SEEK_END)
+    else:
+        size = os.path.getsize(filename)
+    return 84 + num_triangles * 50 == size
+
+
+register_format("stl", [".stl"], read, {"stl": write}, sniffer=_sniff)
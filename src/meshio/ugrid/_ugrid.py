@@ -12,7 +12,7 @@ import numpy as np
 
 from .._common import _pick_first_int_data, warn
 from .._exceptions import ReadError
-from .._files import open_file
+from .._files import fromfile, open_file
 from .._helpers import register_format
 from .._mesh import CellBlock, Mesh
 
@@ -47,20 +47,24 @@ def determine_file_type(filename):
     return file_type
 
 
-def read(filename):
+def read(filename, mmap: bool = False):
+    """Read a UGRID file. With `mmap`, the points and the data of binary files are
+    memory-mapped views into the file instead of being read into memory. (The cells
+    are always copied since UGRID is one-based.)
+    """
     file_type = determine_file_type(filename)
-    with open_file(filename) as f:
-        mesh = read_buffer(f, file_type)
+    with open_file(filename, "rb") as f:
+        mesh = read_buffer(f, file_type, mmap)
     return mesh
 
 
-def _read_section(f, file_type, count, dtype):
+def _read_section(f, file_type, count, dtype, mmap=False):
     if file_type["type"] == "ascii":
         return np.fromfile(f, count=count, dtype=dtype, sep=" ")
-    return np.fromfile(f, count=count, dtype=dtype)
+    return fromfile(f, dtype, count, mmap)
 
 
-def read_buffer(f, file_type):
+def read_buffer(f, file_type, mmap: bool = False):
     cells = []
     cell_data = []
 
@@ -95,9 +99,9 @@ def read_buffer(f, file_type):
         _read_section(f, file_type, count=1, dtype=itype)
 
     nnodes = ugrid_counts["points"][0]
-    points = _read_section(f, file_type, count=nnodes * 3, dtype=ftype).reshape(
-        nnodes, 3
-    )
+    points = _read_section(
+        f, file_type, count=nnodes * 3, dtype=ftype, mmap=mmap
+    ).reshape(nnodes, 3)
 
     for key in ["triangle", "quad"]:
         nitems = ugrid_counts[key][0]
@@ -105,7 +109,7 @@ def read_buffer(f, file_type):
         if nitems == 0:
             continue
         out = _read_section(
-            f, file_type, count=nitems * nvertices, dtype=itype
+            f, file_type, count=nitems * nvertices, dtype=itype, mmap=mmap
         ).reshape(nitems, nvertices)
         # UGRID is one-based
         cells.append(CellBlock(key, out - 1))
@@ -115,7 +119,7 @@ def read_buffer(f, file_type):
         nitems = ugrid_counts[key][0]
         if nitems == 0:
             continue
-        out = _read_section(f, file_type, count=nitems, dtype=itype)
+        out = _read_section(f, file_type, count=nitems, dtype=itype, mmap=mmap)
         cell_data["ugrid:ref"].append(out)
 
     for key in ["tetra", "pyramid", "wedge", "hexahedron"]:
@@ -124,7 +128,7 @@ def read_buffer(f, file_type):
         if nitems == 0:
             continue
         out = _read_section(
-            f, file_type, count=nitems * nvertices, dtype=itype
+            f, file_type, count=nitems * nvertices, dtype=itype, mmap=mmap
         ).reshape(nitems, nvertices)
 
         if key == "pyramid":
@@ -1,29 +1,60 @@
 import pathlib
 
+from .._blocks import blocks_from_mesh
 from .._exceptions import ReadError
 from .._helpers import register_format
+from .._probe import MeshInfo
 from . import _vtk_42, _vtk_51
 
 
-def read(filename):
+def read(filename, mmap: bool = False):
+    """Read a VTK file. With `mmap`, the binary data arrays of a file are memory-mapped
+    views into the file instead of being read into memory.
+    """
     filename = pathlib.Path(filename)
     with open(filename.as_posix(), "rb") as f:
-        mesh = read_buffer(f)
+        mesh = read_buffer(f, mmap)
     return mesh
 
 
-def read_buffer(f):
+def read_buffer(f, mmap: bool = False):
+    if _read_version(f) == "5.1":
+        return _vtk_51.read(f, mmap)
+
+    # this also works for older format versions
+    return _vtk_42.read(f, mmap)
+
+
+def iter_blocks(filename, chunk_size: int):
+    """Read a VTK file chunk by chunk, see meshio.iter_blocks(). Files of format
+    versions before 5.1 are read as a whole.
+    """
+    with open(filename, "rb") as f:
+        if _read_version(f) == "5.1":
+            yield from _vtk_51.iter_blocks(f, chunk_size)
+            return
+        mesh = _vtk_42.read(f, mmap=True)
+    yield from blocks_from_mesh(mesh, chunk_size)
+
+
+def probe(filename):
+    """Summary of a VTK file, see meshio.probe(). Files of format version 5.1 are
+    only read where needed; other files are read as a whole.
+    """
+    with open(filename, "rb") as f:
+        version = _read_version(f)
+        if version == "5.1":
+            return _vtk_51.probe(f)
+        mesh = _vtk_42.read(f, mmap=True)
+    return MeshInfo.from_mesh(mesh, "vtk", version=version)
+
+
+def _read_version(f) -> str:
     # The first line specifies the version
     line = f.readline().decode().strip()
     if not line.startswith("# vtk DataFile Version"):
         raise ReadError("Illegal VTK header")
-
-    version = line[23:]
-    if version == "5.1":
-        return _vtk_51.read(f)
-
-    # this also works for older format versions
-    return _vtk_42.read(f)
+    return line[23:]
 
 
 def write(filename, mesh, fmt_version: str = "5.1", **kwargs):
@@ -43,4 +74,7 @@ register_format(
         "vtk51": _vtk_42.write,
         "vtk": _vtk_51.write,
     },
+    stream_writer_map={"vtk": _vtk_51.VtkStreamWriter},
+    block_reader=iter_blocks,
+    prober=probe,
 )
@@ -9,8 +9,9 @@ import numpy as np
 from ..__about__ import __version__
 from .._common import warn
 from .._exceptions import ReadError, WriteError
-from .._files import open_file
-from .._mesh import Mesh
+from .._files import fromfile, open_file
+from .._mesh import Mesh, fixed_size_cells
+from .._profile import span
 from .._vtk_common import (
     Info,
     meshio_to_vtk_order,
@@ -116,15 +117,16 @@ vtk_sections = [
 ]
 
 
-def read(filename):
+def read(filename, mmap: bool = False):
     with open_file(filename, "rb") as f:
-        out = read_buffer(f)
+        out = read_buffer(f, mmap)
     return out
 
 
-def read_buffer(f):
+def read_buffer(f, mmap: bool = False):
     # initialize output data
     info = Info()
+    info.mmap = mmap
 
     # skip title comment
     f.readline()
@@ -147,16 +149,18 @@ def read_buffer(f):
         info.split = line.split()
         info.section = info.split[0].upper()
 
-        if info.section in vtk_sections:
-            _read_section(f, info)
-        else:
-            _read_subsection(f, info)
+        with span(f"vtk:{info.section}"):
+            if info.section in vtk_sections:
+                _read_section(f, info)
+            else:
+                _read_subsection(f, info)
 
     _check_mesh(info)
 
-    cells, cell_data = translate_cells(
-        info.connectivity, info.types, info.cell_data_raw
-    )
+    with span("vtk:translate_cells", num_cells=len(info.types)):
+        cells, cell_data = translate_cells(
+            info.connectivity, info.types, info.cell_data_raw
+        )
 
     return Mesh(
         info.points,
@@ -185,17 +189,21 @@ def _read_section(f, info):
         info.active = "POINTS"
         info.num_points = int(info.split[1])
         data_type = info.split[2].lower()
-        info.points = _read_points(f, data_type, info.is_ascii, info.num_points)
+        info.points = _read_points(
+            f, data_type, info.is_ascii, info.num_points, info.mmap
+        )
 
     elif info.section == "CELLS":
         info.active = "CELLS"
         info.num_items = int(info.split[2])
-        info.connectivity = _read_int_data(f, info.is_ascii, info.num_items)
+        info.connectivity = _read_int_data(
+            f, info.is_ascii, info.num_items, mmap=info.mmap
+        )
 
     elif info.section == "CELL_TYPES":
         info.active = "CELL_TYPES"
         info.num_items = int(info.split[1])
-        info.types = _read_cell_types(f, info.is_ascii, info.num_items)
+        info.types = _read_cell_types(f, info.is_ascii, info.num_items, info.mmap)
 
     elif info.section == "POINT_DATA":
         info.active = "POINT_DATA"
@@ -234,7 +242,9 @@ def _read_subsection(f, info):
         if info.section[1:] == "_COORDINATES":
             info.num_points = int(info.split[1])
             data_type = info.split[2].lower()
-            d[info.section] = _read_coords(f, data_type, info.is_ascii, info.num_points)
+            d[info.section] = _read_coords(
+                f, data_type, info.is_ascii, info.num_points, info.mmap
+            )
         else:
             if info.section == "DIMENSIONS":
                 d[info.section] = list(map(int, info.split[1:]))
@@ -247,13 +257,19 @@ def _read_subsection(f, info):
                     )
                 )
     elif info.section == "SCALARS":
-        d.update(_read_scalar_field(f, info.num_items, info.split, info.is_ascii))
+        d.update(
+            _read_scalar_field(f, info.num_items, info.split, info.is_ascii, info.mmap)
+        )
     elif info.section == "VECTORS":
-        d.update(_read_field(f, info.num_items, info.split, [3], info.is_ascii))
+        d.update(
+            _read_field(f, info.num_items, info.split, [3], info.is_ascii, info.mmap)
+        )
     elif info.section == "TENSORS":
-        d.update(_read_field(f, info.num_items, info.split, [3, 3], info.is_ascii))
+        d.update(
+            _read_field(f, info.num_items, info.split, [3, 3], info.is_ascii, info.mmap)
+        )
     elif info.section == "FIELD":
-        d.update(_read_fields(f, int(info.split[2]), info.is_ascii))
+        d.update(_read_fields(f, int(info.split[2]), info.is_ascii, info.mmap))
     else:
         raise ReadError(f"Unknown section '{info.section}'.")
 
@@ -349,7 +365,7 @@ def _generate_points(axis):
     return points
 
 
-def _read_coords(f, data_type, is_ascii, num_points):
+def _read_coords(f, data_type, is_ascii, num_points, mmap=False):
     dtype = np.dtype(vtk_to_numpy_dtype_name[data_type])
     if is_ascii:
         coords = np.fromfile(f, count=num_points, sep=" ", dtype=dtype)
@@ -357,14 +373,14 @@ def _read_coords(f, data_type, is_ascii, num_points):
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        coords = np.fromfile(f, count=num_points, dtype=dtype)
+        coords = fromfile(f, dtype, num_points, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
     return coords
 
 
-def _read_points(f, data_type, is_ascii, num_points):
+def _read_points(f, data_type, is_ascii, num_points, mmap=False):
     dtype = np.dtype(vtk_to_numpy_dtype_name[data_type])
     if is_ascii:
         points = np.fromfile(f, count=num_points * 3, sep=" ", dtype=dtype)
@@ -372,31 +388,31 @@ def _read_points(f, data_type, is_ascii, num_points):
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        points = np.fromfile(f, count=num_points * 3, dtype=dtype)
+        points = fromfile(f, dtype, num_points * 3, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
     return points.reshape((num_points, 3))
 
 
-def _read_int_data(f, is_ascii, num_items, dtype=np.dtype("int32")):
+def _read_int_data(f, is_ascii, num_items, dtype=np.dtype("int32"), mmap=False):
     if is_ascii:
         c = np.fromfile(f, count=num_items, sep=" ", dtype=dtype)
     else:
         dtype = dtype.newbyteorder(">")
-        c = np.fromfile(f, count=num_items, dtype=dtype)
+        c = fromfile(f, dtype, num_items, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
     return c
 
 
-def _read_cell_types(f, is_ascii, num_items):
+def _read_cell_types(f, is_ascii, num_items, mmap=False):
     if is_ascii:
         ct = np.fromfile(f, count=int(num_items), sep=" ", dtype=int)
     else:
         # binary
-        ct = np.fromfile(f, count=int(num_items), dtype=">i4")
+        ct = fromfile(f, ">i4", int(num_items), mmap)
         line = f.readline().decode()
         # Sometimes, there's no newline at the end
         if line.strip() != "":
@@ -404,7 +420,7 @@ def _read_cell_types(f, is_ascii, num_items):
     return ct
 
 
-def _read_scalar_field(f, num_data, split, is_ascii):
+def _read_scalar_field(f, num_data, split, is_ascii, mmap=False):
     data_name = split[1]
     data_type = split[2].lower()
     try:
@@ -428,7 +444,7 @@ def _read_scalar_field(f, num_data, split, is_ascii):
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        data = np.fromfile(f, count=num_data * num_comp, dtype=dtype)
+        data = fromfile(f, dtype, num_data * num_comp, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
@@ -437,7 +453,7 @@ def _read_scalar_field(f, num_data, split, is_ascii):
     return {data_name: data}
 
 
-def _read_field(f, num_data, split, shape, is_ascii):
+def _read_field(f, num_data, split, shape, is_ascii, mmap=False):
     data_name = split[1]
     data_type = split[2].lower()
 
@@ -452,7 +468,7 @@ def _read_field(f, num_data, split, shape, is_ascii):
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        data = np.fromfile(f, count=k * num_data, dtype=dtype)
+        data = fromfile(f, dtype, k * num_data, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
@@ -461,7 +477,7 @@ def _read_field(f, num_data, split, shape, is_ascii):
     return {data_name: data}
 
 
-def _read_fields(f, num_fields, is_ascii):
+def _read_fields(f, num_fields, is_ascii, mmap=False):
     data = {}
     for _ in range(num_fields):
         line = f.readline().decode().split()
@@ -481,7 +497,7 @@ def _read_fields(f, num_fields, is_ascii):
             # Binary data is big endian, see
             # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
             dtype = dtype.newbyteorder(">")
-            dat = np.fromfile(f, count=shape0 * shape1, dtype=dtype)
+            dat = fromfile(f, dtype, shape0 * shape1, mmap)
             line = f.readline().decode()
             if line != "\n":
                 raise ReadError()
@@ -586,11 +602,15 @@ def translate_cells(connectivity, types, cell_data_raw):
             n = numnodes[start]
             new_order = vtk_to_meshio_order(types[start], dtype=offsets.dtype)
             if new_order is None:
-                cell_idx = idx0 + np.arange(0, n, dtype=offsets.dtype)
+                # The cells are stored contiguously; take a view instead of a copy
+                # (which matters for memory-mapped connectivity).
+                block = connectivity[
+                    offsets[start] : offsets[start] + (end - start) * (n + 1)
+                ]
+                cells.append((meshio_type, block.reshape(-1, n + 1)[:, idx0:]))
             else:
-                cell_idx = idx0 + new_order
-            indices = np.add.outer(offsets[start:end], cell_idx)
-            cells.append((meshio_type, connectivity[indices]))
+                indices = np.add.outer(offsets[start:end], idx0 + new_order)
+                cells.append((meshio_type, connectivity[indices]))
             for name, d in cell_data_raw.items():
                 if name not in cell_data:
                     cell_data[name] = []
@@ -603,6 +623,9 @@ def write(filename, mesh, binary=True):
     def pad(array):
         return np.pad(array, ((0, 0), (0, 1)), "constant")
 
+    # the vtk format is registered as taking CSR cells, which only version 5.1 writes
+    mesh = fixed_size_cells(mesh, "vtk42")
+
     if mesh.points.shape[1] == 2:
         warn(
             "VTK requires 3D points, but 2D points given. "
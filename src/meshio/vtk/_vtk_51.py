@@ -3,15 +3,21 @@ from functools import reduce
 import numpy as np
 
 from ..__about__ import __version__
+from .._blocks import blocks_from_mesh, chunk_ranges
 from .._common import info, join_strings, replace_space, warn
 from .._exceptions import ReadError, WriteError
-from .._files import open_file
-from .._mesh import Mesh
+from .._files import fromfile, open_file
+from .._mesh import CSRCells, Mesh
+from .._probe import MeshInfo
+from .._profile import span
+from .._stream import StreamWriter
 from .._vtk_common import (
     Info,
     meshio_to_vtk_order,
     meshio_to_vtk_type,
+    vtk_cell_block_sizes,
     vtk_cells_from_data,
+    vtk_polyhedron_faces,
 )
 
 # VTK 5.1 data types
@@ -69,15 +75,86 @@ vtk_sections = [
 ]
 
 
-def read(filename):
+def read(filename, mmap: bool = False):
     with open_file(filename, "rb") as f:
-        out = read_buffer(f)
+        out = read_buffer(f, mmap)
     return out
 
 
-def read_buffer(f):
+def read_buffer(f, mmap: bool = False):
+    return _mesh_from_info(_read_info(f, mmap))
+
+
+def iter_blocks(f, chunk_size: int):
+    """Read the mesh chunk by chunk, see meshio.iter_blocks(). The arrays of binary
+    files are memory-mapped, so only the current chunk is held in memory.
+    """
+    info = _read_info(f, mmap=True)
+    if info.dataset["type"] != "UNSTRUCTURED_GRID":
+        yield from blocks_from_mesh(_mesh_from_info(info), chunk_size)
+        return
+
+    for start, stop in chunk_ranges(len(info.points), chunk_size):
+        yield "points", None, np.array(info.points[start:stop])
+
+    offsets = info.offsets
+    for start, stop in chunk_ranges(len(info.types), chunk_size):
+        first = 0 if start == 0 else offsets[start - 1]
+        cells, cell_data = vtk_cells_from_data(
+            np.array(info.connectivity[first : offsets[stop - 1]]),
+            np.array(offsets[start:stop]) - first,
+            np.array(info.types[start:stop]),
+            {name: data[start:stop] for name, data in info.cell_data_raw.items()},
+        )
+        for k, cell_block in enumerate(cells):
+            yield "cells", None, cell_block
+            for name, data in cell_data.items():
+                yield "cell_data", name, np.array(data[k])
+
+    for name, data in info.point_data.items():
+        for start, stop in chunk_ranges(len(data), chunk_size):
+            yield "point_data", name, np.array(data[start:stop])
+
+
+def probe(f):
+    """Summary of the file, see meshio.probe(). The arrays of binary files are
+    memory-mapped and the numbers of ASCII arrays are skipped without parsing them;
+    only the cell types and offsets are read.
+    """
+    start = f.tell()
+    info = _read_info(f, mmap=True, skip_ascii=True)
+    if info.dataset["type"] != "UNSTRUCTURED_GRID":
+        return MeshInfo.from_mesh(_mesh_from_info(info), "vtk", version="5.1")
+    if np.any(np.asarray(info.types) == 42):
+        # polyhedra are grouped by their number of nodes, which needs the connectivity
+        f.seek(start)
+        mesh = _mesh_from_info(_read_info(f, mmap=True))
+        return MeshInfo.from_mesh(mesh, "vtk", version="5.1")
+
+    def summary(data, n=None):
+        return (len(data) if n is None else n,) + data.shape[1:], data.dtype
+
+    cells = vtk_cell_block_sizes(info.offsets, np.asarray(info.types))
+    # cell data of cells that meshio can't handle is skipped
+    num_cells = int(sum(n for _, n in cells))
+    return MeshInfo(
+        "vtk",
+        info.num_points,
+        [(cell_type, int(n)) for cell_type, n in cells],
+        point_data={name: summary(d) for name, d in info.point_data.items()},
+        cell_data={
+            name: summary(d, num_cells) for name, d in info.cell_data_raw.items()
+        },
+        field_data={name: summary(d) for name, d in info.field_data.items()},
+        version="5.1",
+    )
+
+
+def _read_info(f, mmap: bool = False, skip_ascii: bool = False):
     # initialize output data
     info = Info()
+    info.mmap = mmap
+    info.skip_ascii = skip_ascii
 
     # skip title comment
     f.readline()
@@ -100,16 +177,21 @@ def read_buffer(f):
         info.split = line.split()
         info.section = info.split[0].upper()
 
-        if info.section in vtk_sections:
-            _read_section(f, info)
-        else:
-            _read_subsection(f, info)
+        with span(f"vtk:{info.section}"):
+            if info.section in vtk_sections:
+                _read_section(f, info)
+            else:
+                _read_subsection(f, info)
 
     _check_mesh(info)
+    return info
 
-    cells, cell_data = vtk_cells_from_data(
-        info.connectivity, info.offsets, info.types, info.cell_data_raw
-    )
+
+def _mesh_from_info(info):
+    with span("vtk:translate_cells", num_cells=len(info.types)):
+        cells, cell_data = vtk_cells_from_data(
+            info.connectivity, info.offsets, info.types, info.cell_data_raw
+        )
 
     return Mesh(
         info.points,
@@ -137,7 +219,9 @@ def _read_section(f, info):
         info.active = "POINTS"
         info.num_points = int(info.split[1])
         data_type = info.split[2].lower()
-        info.points = _read_points(f, data_type, info.is_ascii, info.num_points)
+        info.points = _read_points(
+            f, data_type, info.is_ascii, info.num_points, info.mmap, _skip(info)
+        )
 
     elif info.section == "CELLS":
         info.active = "CELLS"
@@ -154,12 +238,14 @@ def _read_section(f, info):
         info.num_offsets = int(info.split[1])
         info.num_items = int(info.split[2])
         dtype = np.dtype(vtk_to_numpy_dtype_name[line.split()[1]])
-        offsets = _read_int_data(f, info.is_ascii, info.num_offsets, dtype)
+        offsets = _read_int_data(f, info.is_ascii, info.num_offsets, dtype, info.mmap)
 
         line = f.readline().decode()
         assert line.startswith("CONNECTIVITY")
         dtype = np.dtype(vtk_to_numpy_dtype_name[line.split()[1]])
-        connectivity = _read_int_data(f, info.is_ascii, info.num_items, dtype)
+        connectivity = _read_int_data(
+            f, info.is_ascii, info.num_items, dtype, info.mmap, _skip(info)
+        )
         info.connectivity = connectivity
         assert offsets[0] == 0
         assert offsets[-1] == len(connectivity)
@@ -168,7 +254,7 @@ def _read_section(f, info):
     elif info.section == "CELL_TYPES":
         info.active = "CELL_TYPES"
         info.num_items = int(info.split[1])
-        info.types = _read_cell_types(f, info.is_ascii, info.num_items)
+        info.types = _read_cell_types(f, info.is_ascii, info.num_items, info.mmap)
 
     elif info.section == "POINT_DATA":
         info.active = "POINT_DATA"
@@ -207,7 +293,9 @@ def _read_subsection(f, info):
         if info.section[1:] == "_COORDINATES":
             info.num_points = int(info.split[1])
             data_type = info.split[2].lower()
-            d[info.section] = _read_coords(f, data_type, info.is_ascii, info.num_points)
+            d[info.section] = _read_coords(
+                f, data_type, info.is_ascii, info.num_points, info.mmap
+            )
         else:
             if info.section == "DIMENSIONS":
                 d[info.section] = list(map(int, info.split[1:]))
@@ -219,13 +307,39 @@ def _read_subsection(f, info):
                     f"Need 3, got {len(d[info.section])}."
                 )
     elif info.section == "SCALARS":
-        d.update(_read_scalar_field(f, info.num_items, info.split, info.is_ascii))
+        d.update(
+            _read_scalar_field(
+                f, info.num_items, info.split, info.is_ascii, info.mmap, _skip(info)
+            )
+        )
     elif info.section == "VECTORS":
-        d.update(_read_field(f, info.num_items, info.split, [3], info.is_ascii))
+        d.update(
+            _read_field(
+                f,
+                info.num_items,
+                info.split,
+                [3],
+                info.is_ascii,
+                info.mmap,
+                _skip(info),
+            )
+        )
     elif info.section == "TENSORS":
-        d.update(_read_field(f, info.num_items, info.split, [3, 3], info.is_ascii))
+        d.update(
+            _read_field(
+                f,
+                info.num_items,
+                info.split,
+                [3, 3],
+                info.is_ascii,
+                info.mmap,
+                _skip(info),
+            )
+        )
     elif info.section == "FIELD":
-        d.update(_read_fields(f, int(info.split[2]), info.is_ascii))
+        d.update(
+            _read_fields(f, int(info.split[2]), info.is_ascii, info.mmap, _skip(info))
+        )
     else:
         raise ReadError(f"Unknown section '{info.section}'.")
 
@@ -321,7 +435,63 @@ def _generate_points(axis):
     return points
 
 
-def _read_coords(f, data_type, is_ascii, num_points):
+def _skip(info) -> bool:
+    # The numbers of ASCII unstructured grids only need to be skipped for probing;
+    # the other datasets are translated into a mesh, which needs the data.
+    return (
+        info.is_ascii
+        and info.skip_ascii
+        and info.dataset.get("type") == "UNSTRUCTURED_GRID"
+    )
+
+
+def _read_ascii(f, dtype, count: int, skip: bool = False):
+    if not skip:
+        return np.fromfile(f, count=count, sep=" ", dtype=dtype)
+    _skip_numbers(f, count)
+    # a placeholder of the right shape and type that takes no memory
+    return np.broadcast_to(np.zeros((), dtype=dtype), (count,))
+
+
+_WHITESPACE = np.frombuffer(b" \t\n\r\v\f", dtype=np.uint8)
+
+
+def _skip_numbers(f, count: int, chunk_size: int = 2**20):
+    """Advance the position of the open file `f` past the next `count`
+    whitespace-separated numbers and the whitespace after them, like
+    np.fromfile(f, sep=" ") does, but without converting the numbers.
+    """
+    if count == 0:
+        return
+    while True:
+        pos = f.tell()
+        chunk = f.read(chunk_size)
+        is_space = np.isin(np.frombuffer(chunk, dtype=np.uint8), _WHITESPACE)
+        if count == 0:
+            starts = np.flatnonzero(~is_space)
+            if len(starts) > 0:
+                f.seek(pos + starts[0])
+                return
+            if len(chunk) < chunk_size:
+                return
+            continue
+        if len(chunk) < chunk_size:
+            # end of file, which also ends the last number
+            is_space = np.append(is_space, True)
+        ends = np.flatnonzero(~is_space[:-1] & is_space[1:]) + 1
+        if len(ends) == 0:
+            if len(chunk) < chunk_size:
+                raise ReadError("Unexpected end of file")
+            raise ReadError("Number too long")
+        # continue after the last complete number of the chunk
+        k = min(count, len(ends))
+        count -= k
+        f.seek(pos + ends[k - 1])
+        if count > 0 and len(chunk) < chunk_size:
+            raise ReadError("Unexpected end of file")
+
+
+def _read_coords(f, data_type, is_ascii, num_points, mmap=False):
     dtype = np.dtype(vtk_to_numpy_dtype_name[data_type])
     if is_ascii:
         coords = np.fromfile(f, count=num_points, sep=" ", dtype=dtype)
@@ -329,46 +499,46 @@ def _read_coords(f, data_type, is_ascii, num_points):
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        coords = np.fromfile(f, count=num_points, dtype=dtype)
+        coords = fromfile(f, dtype, num_points, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
     return coords
 
 
-def _read_points(f, data_type, is_ascii, num_points):
+def _read_points(f, data_type, is_ascii, num_points, mmap=False, skip=False):
     dtype = np.dtype(vtk_to_numpy_dtype_name[data_type])
     if is_ascii:
-        points = np.fromfile(f, count=num_points * 3, sep=" ", dtype=dtype)
+        points = _read_ascii(f, dtype, num_points * 3, skip)
     else:
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        points = np.fromfile(f, count=num_points * 3, dtype=dtype)
+        points = fromfile(f, dtype, num_points * 3, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
     return points.reshape((num_points, 3))
 
 
-def _read_int_data(f, is_ascii, num_items, dtype):
+def _read_int_data(f, is_ascii, num_items, dtype, mmap=False, skip=False):
     if is_ascii:
-        c = np.fromfile(f, count=num_items, sep=" ", dtype=dtype)
+        c = _read_ascii(f, dtype, num_items, skip)
     else:
         dtype = dtype.newbyteorder(">")
-        c = np.fromfile(f, count=num_items, dtype=dtype)
+        c = fromfile(f, dtype, num_items, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError("Expected newline")
     return c
 
 
-def _read_cell_types(f, is_ascii, num_items):
+def _read_cell_types(f, is_ascii, num_items, mmap=False):
     if is_ascii:
         ct = np.fromfile(f, count=int(num_items), sep=" ", dtype=int)
     else:
         # binary
-        ct = np.fromfile(f, count=int(num_items), dtype=">i4")
+        ct = fromfile(f, ">i4", int(num_items), mmap)
         line = f.readline().decode()
         # Sometimes, there's no newline at the end
         if line.strip() != "":
@@ -376,7 +546,7 @@ def _read_cell_types(f, is_ascii, num_items):
     return ct
 
 
-def _read_scalar_field(f, num_data, split, is_ascii):
+def _read_scalar_field(f, num_data, split, is_ascii, mmap=False, skip=False):
     data_name = split[1]
     data_type = split[2].lower()
     try:
@@ -395,12 +565,12 @@ def _read_scalar_field(f, num_data, split, is_ascii):
         raise ReadError()
 
     if is_ascii:
-        data = np.fromfile(f, count=num_data * num_comp, sep=" ", dtype=dtype)
+        data = _read_ascii(f, dtype, num_data * num_comp, skip)
     else:
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        data = np.fromfile(f, count=num_data * num_comp, dtype=dtype)
+        data = fromfile(f, dtype, num_data * num_comp, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
@@ -409,7 +579,7 @@ def _read_scalar_field(f, num_data, split, is_ascii):
     return {data_name: data}
 
 
-def _read_field(f, num_data, split, shape, is_ascii):
+def _read_field(f, num_data, split, shape, is_ascii, mmap=False, skip=False):
     data_name = split[1]
     data_type = split[2].lower()
 
@@ -419,12 +589,12 @@ def _read_field(f, num_data, split, shape, is_ascii):
     k = reduce((lambda x, y: x * y), shape)
 
     if is_ascii:
-        data = np.fromfile(f, count=k * num_data, sep=" ", dtype=dtype)
+        data = _read_ascii(f, dtype, k * num_data, skip)
     else:
         # Binary data is big endian, see
         # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
         dtype = dtype.newbyteorder(">")
-        data = np.fromfile(f, count=k * num_data, dtype=dtype)
+        data = fromfile(f, dtype, k * num_data, mmap)
         line = f.readline().decode()
         if line != "\n":
             raise ReadError()
@@ -433,7 +603,7 @@ def _read_field(f, num_data, split, shape, is_ascii):
     return {data_name: data}
 
 
-def _read_fields(f, num_fields, is_ascii):
+def _read_fields(f, num_fields, is_ascii, mmap=False, skip=False):
     data = {}
     for _ in range(num_fields):
         line = f.readline().decode().split()
@@ -448,12 +618,12 @@ def _read_fields(f, num_fields, is_ascii):
         dtype = np.dtype(vtk_to_numpy_dtype_name[data_type.lower()])
 
         if is_ascii:
-            dat = np.fromfile(f, count=shape0 * shape1, sep=" ", dtype=dtype)
+            dat = _read_ascii(f, dtype, shape0 * shape1, skip)
         else:
             # Binary data is big endian, see
             # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
             dtype = dtype.newbyteorder(">")
-            dat = np.fromfile(f, count=shape0 * shape1, dtype=dtype)
+            dat = fromfile(f, dtype, shape0 * shape1, mmap)
             line = f.readline().decode()
             if line != "\n":
                 raise ReadError()
@@ -570,18 +740,34 @@ def _write_points(f, points, binary):
     f.write(b"\n")
 
 
+def _cell_arrays(cell_block):
+    # The ends of the cells (relative to the block) and the connectivity of a cell
+    # block. Polyhedra are given by their face streams, see vtk_polyhedron_faces().
+    data = cell_block.data
+    if isinstance(data, CSRCells):
+        if data.is_polyhedron:
+            faces, ends = vtk_polyhedron_faces(data)
+            return ends, faces
+        return data.offsets[1:], data.connectivity
+    cell_idx = meshio_to_vtk_order(cell_block.type)
+    if cell_idx is not None:
+        data = data[:, cell_idx]
+    m, n = data.shape
+    return np.arange(n, (m + 1) * n, n), data.reshape(-1)
+
+
 def _write_cells(f, cells, binary):
     total_num_cells = sum(len(c.data) for c in cells)
-    total_num_idx = sum(c.data.size for c in cells)
+    arrays = [_cell_arrays(cell_block) for cell_block in cells]
+    total_num_idx = sum(len(connectivity) for _, connectivity in arrays)
     f.write(f"CELLS {total_num_cells + 1} {total_num_idx}\n".encode())
 
     # offsets
     offsets = [[0]]
     k = 0
-    for cell_block in cells:
-        m, n = cell_block.data.shape
-        offsets.append(np.arange(k + n, k + (m + 1) * n, n))
-        k = offsets[-1][-1]
+    for ends, connectivity in arrays:
+        offsets.append(k + ends)
+        k += len(connectivity)
     offsets = np.concatenate(offsets)
 
     if binary:
@@ -591,13 +777,9 @@ def _write_cells(f, cells, binary):
         f.write(b"\n")
 
         f.write(b"CONNECTIVITY vtktypeint64\n")
-        for cell_block in cells:
-            d = cell_block.data
-            cell_idx = meshio_to_vtk_order(cell_block.type)
-            if cell_idx is not None:
-                d = d[:, cell_idx]
+        for _, connectivity in arrays:
             # force big-endian and int64
-            d.astype(">i8").tofile(f, sep="")
+            connectivity.astype(">i8").tofile(f, sep="")
         f.write(b"\n")
     else:
         # ascii
@@ -606,29 +788,32 @@ def _write_cells(f, cells, binary):
         f.write(b"\n")
 
         f.write(b"CONNECTIVITY vtktypeint64\n")
-        for cell_block in cells:
-            d = cell_block.data
-            cell_idx = meshio_to_vtk_order(cell_block.type)
-            if cell_idx is not None:
-                d = d[:, cell_idx]
-            d.tofile(f, sep="\n")
+        for _, connectivity in arrays:
+            connectivity.tofile(f, sep="\n")
             f.write(b"\n")
 
     # write cell types
     f.write(f"CELL_TYPES {total_num_cells}\n".encode())
     if binary:
         for c in cells:
-            vtk_type = meshio_to_vtk_type[c.type]
+            vtk_type = _vtk_type(c.type)
             np.full(len(c.data), vtk_type, dtype=np.dtype(">i4")).tofile(f, sep="")
         f.write(b"\n")
     else:
         # ascii
         for c in cells:
-            vtk_type = meshio_to_vtk_type[c.type]
+            vtk_type = _vtk_type(c.type)
             np.full(len(c.data), vtk_type).tofile(f, sep="\n")
             f.write(b"\n")
 
 
+def _vtk_type(cell_type):
+    # all polyhedron<n> blocks are VTK polyhedra
+    if cell_type.startswith("polyhedron"):
+        cell_type = "polyhedron"
+    return meshio_to_vtk_type[cell_type]
+
+
 def _write_field_data(f, data, binary):
     f.write((f"FIELD FieldData {len(data)}\n").encode())
     for name, values in data.items():
@@ -653,3 +838,128 @@ def _write_field_data(f, data, binary):
             values.tofile(f, sep=" ")
             # np.savetxt(f, points)
         f.write(b"\n")
+
+
+class VtkStreamWriter(StreamWriter):
+    """Writes a VTK file from chunks, see meshio.open_writer().
+
+    The points are written as they come. The cells begin with their offsets, which
+    are only known on close(), and the data follows the cells, so they are kept in
+    temporary files until then.
+    """
+
+    def __init__(self, filename, binary=True):
+        super().__init__(filename)
+        self.binary = binary
+        if not binary:
+            warn("VTK ASCII files are only meant for debugging.")
+
+    def _write_chunk(self, f, data):
+        if self.binary:
+            # Binary data must be big endian, see
+            # <https://vtk.org/Wiki/VTK/Writing_VTK_files_using_python#.22legacy.22>.
+            data.astype(data.dtype.newbyteorder(">")).tofile(f, sep="")
+        else:
+            data.tofile(f, sep=" ")
+            f.write(b"\n")
+
+    def _write_padded(self, f, key, name):
+        # VTK requires 3D points and vectors
+        if len(self._shape(key)) == 2 and self._shape(key)[1] == 2:
+            warn(
+                f"VTK requires 3D {name}, but 2D {name} given. "
+                "Appending 0 third component."
+            )
+            for chunk in self._chunks(key):
+                self._write_chunk(f, _pad(chunk))
+        else:
+            for chunk in self._chunks(key):
+                self._write_chunk(f, chunk)
+
+    def _layout(self, key):
+        return (0,) if key == "points" else None
+
+    def _begin_output(self, f):
+        f.write(b"# vtk DataFile Version 5.1\n")
+        f.write(f"written by meshio v{__version__}\n".encode())
+        f.write(("BINARY\n" if self.binary else "ASCII\n").encode())
+        f.write(b"DATASET UNSTRUCTURED_GRID\n")
+
+    def _begin_run(self, f, run, prev):
+        if self._shape("points")[1] == 2:
+            warn(
+                "VTK requires 3D points, but 2D points given. "
+                "Appending 0 third component."
+            )
+        dtype = numpy_to_vtk_dtype[self._dtype("points").name]
+        f.write(b"POINTS ")
+        # the number of points, filled in by _finish()
+        run.positions.append(f.tell())
+        f.write(f"{'':20} {dtype}\n".encode())
+
+    def _write_rows(self, f, run, data):
+        self._write_chunk(f, _pad(data) if data.shape[1] == 2 else data)
+
+    def _finish(self, f):
+        if self._runs:
+            self._patch(self._runs[0].positions[0], f"{self.num_points:<20}".encode())
+        else:
+            f.write(b"POINTS 0 double\n")
+        f.write(b"\n")
+
+        self._write_cells(f)
+
+        if self.point_data_names:
+            f.write(f"POINT_DATA {self.num_points}\n".encode())
+            self._write_field_data(f, "point_data", self.point_data_names)
+
+        if self.cell_data_names:
+            f.write(f"CELL_DATA {self.num_cells}\n".encode())
+            self._write_field_data(f, "cell_data", self.cell_data_names)
+
+    def _write_cells(self, f):
+        keys = [("cells", k) for k in range(len(self.cell_blocks))]
+        num_idx = sum(self._shape(key)[0] * self._shape(key)[1] for key in keys)
+        f.write(f"CELLS {self.num_cells + 1} {num_idx}\n".encode())
+
+        f.write(b"OFFSETS vtktypeint64\n")
+        self._write_chunk(f, np.zeros(1, dtype=np.int64))
+        k = 0
+        for key in keys:
+            n = self._shape(key)[1]
+            for chunk in self._chunks(key):
+                self._write_chunk(f, np.arange(k + n, k + (len(chunk) + 1) * n, n))
+                k += len(chunk) * n
+        f.write(b"\n")
+
+        f.write(b"CONNECTIVITY vtktypeint64\n")
+        for key, (cell_type, _) in zip(keys, self.cell_blocks):
+            cell_idx = meshio_to_vtk_order(cell_type)
+            for chunk in self._chunks(key):
+                if cell_idx is not None:
+                    chunk = chunk[:, cell_idx]
+                self._write_chunk(f, chunk.astype(np.int64))
+        f.write(b"\n")
+
+        f.write(f"CELL_TYPES {self.num_cells}\n".encode())
+        for key, (cell_type, _) in zip(keys, self.cell_blocks):
+            vtk_type = meshio_to_vtk_type[cell_type]
+            for chunk in self._chunks(key):
+                self._write_chunk(f, np.full(len(chunk), vtk_type, dtype=np.int32))
+        f.write(b"\n")
+
+    def _write_field_data(self, f, kind, names):
+        f.write((f"FIELD FieldData {len(names)}\n").encode())
+        for name in names:
+            if " " in name:
+                raise WriteError(
+                    f"VTK doesn't support spaces in field names ('{name}')."
+                )
+            shape = self._shape((kind, name))
+            num_components = int(np.prod(shape[1:]))
+            if len(shape) == 2 and shape[1] == 2:
+                num_components = 3
+            vtk_dtype = numpy_to_vtk_dtype[self._dtype((kind, name)).name]
+            f.write(f"{name} {num_components} {shape[0]} {vtk_dtype}\n".encode())
+            self._write_padded(f, (kind, name), "vectors")
+            f.write(b"\n")
@@ -5,18 +5,44 @@ I/O for VTU.
 """
 
 import base64
-import re
+import io
+import os
 import sys
+import threading
+import weakref
 import zlib
+from functools import partial
 
 import numpy as np
 
 from ..__about__ import __version__
-from .._common import info, join_strings, raw_from_cell_data, replace_space, warn
-from .._exceptions import CorruptionError, ReadError
+from .._common import (
+    Selection,
+    info,
+    join_strings,
+    raw_from_cell_data,
+    replace_space,
+    warn,
+    write_table,
+)
+from .._exceptions import CorruptionError, ReadError, WriteError
+from .._files import _CHUNK_SIZE, fromfile
 from .._helpers import register_format
-from .._mesh import CellBlock, Mesh
-from .._vtk_common import meshio_to_vtk_order, meshio_to_vtk_type, vtk_cells_from_data
+from .._lazy import LazyArray, LazyDict, concatenate
+from .._mesh import CellBlock, CSRCells, Mesh
+from .._probe import MeshInfo
+from .._profile import span
+from .._stream import StreamWriter
+from .._vtk_common import (
+    _varying_size_cells,
+    meshio_to_vtk_order,
+    meshio_to_vtk_type,
+    vtk_cell_block_sizes,
+    vtk_cells_from_data,
+    vtk_polyhedron_cells_from_data,
+    vtk_polyhedron_faces,
+    vtk_to_meshio_type,
+)
 
 # Paraview 5.8.1's built-in Python doesn't have lzma.
 try:
@@ -31,78 +57,6 @@ def num_bytes_to_num_base64_chars(num_bytes):
     return -(-num_bytes // 3) * 4
 
 
-def _polyhedron_cells_from_data(offsets, faces, faceoffsets, cell_data_raw):
-    # In general the number of faces will vary between cells, and the
-    # number of nodes vary between faces for each cell. The information
-    # will be stored as a List (one item per cell) of lists (one item
-    # per face of the cell) of np-arrays of node indices.
-
-    cells = {}
-    cell_data = {}
-
-    # The data format for face-cells is:
-    # num_faces_cell_0,
-    #   num_nodes_face_0, node_ind_0, node_ind_1, ..
-    #   num_nodes_face_1, node_ind_0, node_ind_1, ..
-    #   ...
-    # num_faces_cell_1,
-    #   ...
-    # See https://vtk.org/Wiki/VTK/Polyhedron_Support for more.
-
-    # The faceoffsets describes the end of the face description for each
-    # cell. Switch faceoffsets to give start points, not end points
-    faceoffsets = np.append([0], faceoffsets[:-1])
-
-    # Double loop over cells then faces.
-    # This will be slow, but seems necessary to cover all cases
-    for cell_start in faceoffsets:
-        num_faces_this_cell = faces[cell_start]
-        faces_this_cell = []
-        next_face = cell_start + 1
-        for _ in range(num_faces_this_cell):
-            num_nodes_this_face = faces[next_face]
-            faces_this_cell.append(
-                np.array(
-                    faces[next_face + 1 : (next_face + num_nodes_this_face + 1)],
-                    dtype=int,
-                )
-            )
-            # Increase by number of nodes just read, plus the item giving
-            # number of nodes per face
-            next_face += num_nodes_this_face + 1
-
-        # Done with this cell
-        # Find number of nodes for this cell
-        num_nodes_this_cell = np.unique(np.hstack([v for v in faces_this_cell])).size
-
-        key = f"polyhedron{num_nodes_this_cell}"
-        if key not in cells.keys():
-            cells[key] = []
-        cells[key].append(faces_this_cell)
-
-    # The cells will be assigned to blocks according to their number of nodes.
-    # This is potentially a reordering, compared to the ordering in faces.
-    # Cell data must be reorganized accordingly.
-
-    # Start of the cell-node relations
-    start_cn = np.hstack((0, offsets))
-    size = np.diff(start_cn)
-
-    # Loop over all cell sizes, find all cells with this size, and store
-    # cell data.
-    for sz in np.unique(size):
-        # Cells with this number of nodes.
-        items = np.where(size == sz)[0]
-
-        # Store cell data for this set of cells
-        for name, d in cell_data_raw.items():
-            if name not in cell_data:
-                cell_data[name] = []
-            cell_data[name].append(d[items])
-
-    return cells, cell_data
-
-
 def _organize_cells(point_offsets, cells, cell_data_raw):
     if len(point_offsets) != len(cells):
         raise ReadError("Inconsistent data!")
@@ -133,11 +87,11 @@ def _organize_cells(point_offsets, cells, cell_data_raw):
             raise ValueError("Cannot handle combinations of polyhedra with other cells")
 
         # Polyhedra are specified by their faces and faceoffsets; see the function
-        # _polyhedron_cells_from_data for more information.
+        # vtk_polyhedron_cells_from_data for more information.
         faces = cells[0]["faces"]
         faceoffsets = cells[0]["faceoffsets"]
-        cls, cell_data = _polyhedron_cells_from_data(
-            cells[0]["offsets"], faces, faceoffsets, cell_data_raw[0]
+        cls, cell_data = vtk_polyhedron_cells_from_data(
+            faces, faceoffsets, cell_data_raw[0]
         )
         # Organize polyhedra in cell blocks according to the number of nodes per cell.
         for tp, c in cls.items():
@@ -145,12 +99,13 @@ def _organize_cells(point_offsets, cells, cell_data_raw):
 
     else:
         for offset, cls, cdr in zip(point_offsets, cells, cell_data_raw):
-            cls, cell_data = vtk_cells_from_data(
-                cls["connectivity"].ravel(),
-                cls["offsets"].ravel(),
-                cls["types"].ravel(),
-                cdr,
-            )
+            with span("vtk:translate_cells", num_cells=cls["types"].size):
+                cls, cell_data = vtk_cells_from_data(
+                    cls["connectivity"].ravel(),
+                    cls["offsets"].ravel(),
+                    cls["types"].ravel(),
+                    cdr,
+                )
 
         for c in cls:
             out_cells.append(CellBlock(c.type, c.data + offset))
@@ -171,104 +126,174 @@ def get_grid(root):
                 raise ReadError(f"Unknown main tag '{c.tag}'.")
             if appended_data is not None:
                 raise ReadError("More than one AppendedData section found.")
-            if c.attrib["encoding"] != "base64":
-                raise ReadError("")
-            appended_data = c.text.strip()
-            # The appended data always begins with a (meaningless) underscore.
-            if appended_data[0] != "_":
-                raise ReadError()
-            appended_data = appended_data[1:]
+            appended_data = c
 
     if grid is None:
         raise ReadError("No UnstructuredGrid found.")
-    return grid, appended_data
-
-
-def _parse_raw_binary(filename):
-    from xml.etree import ElementTree as ET
-
-    with open(filename, "rb") as f:
-        raw = f.read()
-
-    try:
-        res = re.search(re.compile(b'<AppendedData[^>]+(?:">)'), raw)
-        assert res is not None
-        i_start = res.end()
-        i_stop = raw.find(b"</AppendedData>")
-    except Exception:
-        raise ReadError()
-
-    header = raw[:i_start].decode()
-    footer = raw[i_stop:].decode()
-    data = raw[i_start:i_stop].split(b"_", 1)[1].rsplit(b"\n", 1)[0]
-
-    root = ET.fromstring(header + footer)
-
-    dtype = vtu_to_numpy_type[root.get("header_type", "UInt32")]
-    if "byte_order" in root.attrib:
-        dtype = dtype.newbyteorder(
-            "<" if root.get("byte_order") == "LittleEndian" else ">"
-        )
+    return grid
 
-    appended_data_tag = root.find("AppendedData")
-    assert appended_data_tag is not None
-    appended_data_tag.set("encoding", "base64")
-
-    compressor = root.get("compressor")
-    if compressor is None:
-        arrays = ""
-        i = 0
-        while i < len(data):
-            # The following find() runs into issues if offset is padded with spaces, see
-            # <https://github.com/nschloe/meshio/issues/1135>. It works in ParaView.
-            # Unfortunately, Python's built-in XML tree can't handle regexes, see
-            # <https://stackoverflow.com/a/38810731/353337>.
-            da_tag = root.find(f".//DataArray[@offset='{i}']")
-            if da_tag is None:
-                raise RuntimeError(f"Could not find .//DataArray[@offset='{i}']")
-            da_tag.set("offset", str(len(arrays)))
-
-            block_size = int(np.frombuffer(data[i : i + dtype.itemsize], dtype)[0])
-            arrays += base64.b64encode(
-                data[i : i + block_size + dtype.itemsize]
-            ).decode()
-            i += block_size + dtype.itemsize
 
-    else:
-        c = {"vtkLZMADataCompressor": lzma, "vtkZLibDataCompressor": zlib}[compressor]
-        root.attrib.pop("compressor")
-
-        # raise ReadError("Compressed raw binary VTU files not supported.")
-        arrays = ""
-        i = 0
-        while i < len(data):
-            da_tag = root.find(f".//DataArray[@offset='{i}']")
-            assert da_tag is not None
-            da_tag.set("offset", str(len(arrays)))
-
-            num_blocks = int(np.frombuffer(data[i : i + dtype.itemsize], dtype)[0])
-            num_header_items = 3 + num_blocks
-            num_header_bytes = num_header_items * dtype.itemsize
-            header = np.frombuffer(data[i : i + num_header_bytes], dtype)
-
-            block_data = b""
-            j = 0
-            for k in range(num_blocks):
-                block_size = int(header[k + 3])
-                block_data += c.decompress(
-                    data[
-                        i + j + num_header_bytes : i + j + block_size + num_header_bytes
-                    ]
-                )
-                j += block_size
+class _StopParsing(Exception):
+    pass
 
-            block_size = np.array([len(block_data)]).astype(dtype).tobytes()
-            arrays += base64.b64encode(block_size + block_data).decode()
 
-            i += j + num_header_bytes
+def _parse_structure(f):
+    """Parse the XML of the VTU file `f` into an ElementTree, without holding the data
+    array payloads in memory. Returns the root, the byte range of the text of each
+    DataArray in the file, and the AppendedData element and its position in the file
+    (None if there is none). The raw appended data needn't be valid XML, so parsing
+    stops at the AppendedData tag.
+    """
+    from xml.etree import ElementTree as ET
+    from xml.parsers import expat
+
+    parser = expat.ParserCreate()
+    root = None
+    stack = []
+    text_ranges = {}
+    text_start = None
+    appended = None
+
+    def end_text():
+        nonlocal text_start
+        if text_start is not None:
+            text_ranges[stack[-1]] = (text_start, parser.CurrentByteIndex)
+            text_start = None
+
+    def start_element(tag, attrib):
+        nonlocal root, appended
+        end_text()
+        elem = ET.Element(tag, attrib)
+        if stack:
+            stack[-1].append(elem)
+        else:
+            root = elem
+        stack.append(elem)
+        if tag == "AppendedData":
+            appended = (elem, parser.CurrentByteIndex)
+            raise _StopParsing()
+
+    def end_element(tag):
+        end_text()
+        stack.pop()
+
+    def character_data(data):
+        nonlocal text_start
+        # only the position of the text is recorded, not the text itself
+        if text_start is None and stack[-1].tag == "DataArray":
+            if stack[-1] not in text_ranges:
+                text_start = parser.CurrentByteIndex
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
 
-    appended_data_tag.text = "_" + arrays
-    return root
+    try:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+    except _StopParsing:
+        pass
+    except expat.ExpatError as e:
+        raise ReadError(f"Invalid VTU file: {e}")
+
+    if root is None:
+        raise ReadError("No XML found.")
+    return root, text_ranges, appended
+
+
+def _appended_data_start(f, position):
+    """The position of the appended data after the AppendedData start tag at
+    `position`. The data always begins with a (meaningless) underscore.
+    """
+    f.seek(position)
+    head = f.read(4096)
+    i = head.find(b">")
+    j = head.find(b"_", i)
+    if i < 0 or j < 0 or head[i + 1 : j].strip():
+        raise ReadError("Appended data must begin with an underscore.")
+    return position + j + 1
+
+
+def _skip_whitespace(f):
+    while True:
+        position = f.tell()
+        chunk = f.read(64)
+        stripped = chunk.lstrip()
+        if stripped or not chunk:
+            f.seek(position + len(chunk) - len(stripped))
+            return
+
+
+def _read_base64_chars(f, num_chars):
+    """Read `num_chars` characters of base64 text from `f`, skipping whitespace."""
+    out = b""
+    while len(out) < num_chars:
+        chunk = f.read(num_chars - len(out))
+        if not chunk:
+            raise ReadError("Unexpected end of file")
+        out += chunk.translate(None, b" \t\r\n")
+    return out
+
+
+def _iter_base64(f, num_bytes):
+    """Decode the base64 text of `num_bytes` bytes at the current position of `f` chunk
+    by chunk. Whitespace in the text is skipped.
+    """
+    remaining = num_bytes_to_num_base64_chars(num_bytes)
+    rest = b""
+    while remaining > 0:
+        chunk = f.read(min(_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ReadError("Unexpected end of file")
+        chunk = chunk.translate(None, b" \t\r\n")
+        remaining -= len(chunk)
+        chunk = rest + chunk
+        # decode whole groups of 4 characters only
+        n = len(chunk) if remaining <= 0 else len(chunk) // 4 * 4
+        rest = chunk[n:]
+        yield base64.b64decode(chunk[:n])
+
+
+def _split_blocks(chunks, sizes):
+    """Regroup the bytes in `chunks` into blocks of the given sizes."""
+    chunks = iter(chunks)
+    data = b""
+    pos = 0
+    for size in sizes:
+        parts = []
+        needed = int(size)
+        while needed > 0:
+            if pos == len(data):
+                data = next(chunks, None)
+                pos = 0
+                if data is None:
+                    raise ReadError("Unexpected end of data")
+            n = min(needed, len(data) - pos)
+            parts.append(data[pos : pos + n])
+            pos += n
+            needed -= n
+        yield b"".join(parts)
+
+
+def _fill(out, chunks, skip=0):
+    """Copy the bytes in `chunks` into the byte array `out`, skipping the first `skip`
+    bytes.
+    """
+    k = 0
+    for chunk in chunks:
+        chunk = np.frombuffer(chunk, dtype=np.uint8)
+        if skip > 0:
+            n = min(skip, len(chunk))
+            chunk = chunk[n:]
+            skip -= n
+        n = min(len(chunk), len(out) - k)
+        out[k : k + n] = chunk[:n]
+        k += n
+    if k < len(out):
+        raise ReadError("Unexpected end of data")
 
 
 vtu_to_numpy_type = {
@@ -292,15 +317,23 @@ class VtuReader:
     this class.
     """
 
-    def __init__(self, filename):  # noqa: C901
-        from xml.etree import ElementTree as ET
+    def __init__(self, filename, lazy=False, select=None, jobs=1, mmap=False):
+        self.lazy = lazy
+        # number of threads for the decompression of the blocks
+        self.jobs = jobs
+        # whether raw appended arrays are memory-mapped
+        self.mmap = mmap
+        # unselected data arrays are skipped without decoding them
+        self.select = Selection() if select is None else select
 
-        parser = ET.XMLParser()
-        try:
-            tree = ET.parse(str(filename), parser)
-            root = tree.getroot()
-        except ET.ParseError:
-            root = _parse_raw_binary(str(filename))
+        # The data arrays are read from the open file when they are needed, which may
+        # be after read() in lazy mode. The file is closed with the reader.
+        self._file = open(filename, "rb")
+        self._finalizer = weakref.finalize(self, self._file.close)
+        self._lock = threading.Lock()
+
+        with span("vtu:parse_xml"):
+            root, self.text_ranges, appended = _parse_structure(self._file)
 
         if root.tag != "VTKFile":
             raise ReadError(f"Expected tag 'VTKFile', found {root.tag}")
@@ -337,17 +370,32 @@ class VtuReader:
         except KeyError:
             self.byte_order = None
 
-        grid, self.appended_data = get_grid(root)
+        self.grid = get_grid(root)
+
+        # position and encoding of the appended data
+        self.appended_data = None
+        if appended is not None:
+            tag, position = appended
+            encoding = tag.attrib.get("encoding")
+            if encoding not in ["raw", "base64"]:
+                raise ReadError(f"Unknown AppendedData encoding '{encoding}'.")
+            self.appended_data = (
+                _appended_data_start(self._file, position),
+                encoding,
+            )
 
+    def read(self):  # noqa: C901
         pieces = []
         field_data = {}
-        for c in grid:
+        for c in self.grid:
             if c.tag == "Piece":
                 pieces.append(c)
             elif c.tag == "FieldData":
                 # TODO test field data
                 for data_array in c:
-                    field_data[data_array.attrib["Name"]] = self.read_data(data_array)
+                    name = data_array.attrib["Name"]
+                    if self.select.field_data(name):
+                        field_data[name] = self.read_data(data_array)
             else:
                 raise ReadError(f"Unknown grid subtag '{c.tag}'.")
 
@@ -377,10 +425,13 @@ class VtuReader:
                     if data_array.tag != "DataArray":
                         raise ReadError()
 
-                    pts = self.read_data(data_array)
-
                     num_components = int(data_array.attrib["NumberOfComponents"])
-                    points.append(pts.reshape(num_points, num_components))
+                    if self.lazy:
+                        pts = self.read_data_lazy(data_array, num_points)
+                    else:
+                        pts = self.read_data(data_array)
+                        pts = pts.reshape(num_points, num_components)
+                    points.append(pts)
 
                 elif child.tag == "Cells":
                     for data_array in child:
@@ -401,8 +452,12 @@ class VtuReader:
                     for c in child:
                         if c.tag != "DataArray":
                             raise ReadError()
+                        if not self.select.point_data(c.attrib["Name"]):
+                            continue
                         try:
-                            piece_point_data[c.attrib["Name"]] = self.read_data(c)
+                            piece_point_data[c.attrib["Name"]] = self.read_data_lazy(
+                                c, num_points
+                            )
                         except CorruptionError as e:
                             warn(e.args[0] + " Skipping.")
 
@@ -412,7 +467,11 @@ class VtuReader:
                     for c in child:
                         if c.tag != "DataArray":
                             raise ReadError()
-                        piece_cell_data_raw[c.attrib["Name"]] = self.read_data(c)
+                        if not self.select.cell_data(c.attrib["Name"]):
+                            continue
+                        piece_cell_data_raw[c.attrib["Name"]] = self.read_data_lazy(
+                            c, num_cells
+                        )
 
                     cell_data_raw.append(piece_cell_data_raw)
                 else:
@@ -429,82 +488,189 @@ class VtuReader:
         # Now merge across pieces
         if not points:
             raise ReadError()
-        self.points = np.concatenate(points)
+        points = concatenate(points)
 
         if point_data:
-            self.point_data = {
-                key: np.concatenate([pd[key] for pd in point_data])
+            point_data = {
+                key: concatenate([pd[key] for pd in point_data])
                 for key in point_data[0]
             }
         else:
-            self.point_data = None
+            point_data = None
+
+        cells, cell_data = _organize_cells(point_offsets, cells, cell_data_raw)
+
+        if self.lazy:
+            point_data = LazyDict(point_data or {})
+            cell_data = LazyDict(cell_data)
 
-        self.cells, self.cell_data = _organize_cells(
-            point_offsets, cells, cell_data_raw
+        return Mesh(
+            points,
+            cells,
+            point_data=point_data,
+            cell_data=cell_data,
+            field_data=field_data,
         )
-        self.field_data = field_data
 
-    def read_uncompressed_binary(self, data, dtype):
-        byte_string = base64.b64decode(data)
+    def probe(self):
+        """Summary of the file from the XML structure; of the data arrays, only the
+        cell types are read.
+        """
+        pieces = [c for c in self.grid if c.tag == "Piece"]
+        if not pieces:
+            raise ReadError("No Piece found.")
+
+        def array_info(c, num_tuples):
+            shape = (num_tuples,)
+            if "NumberOfComponents" in c.attrib:
+                shape += (int(c.attrib["NumberOfComponents"]),)
+            return shape, vtu_to_numpy_type.get(c.attrib["type"])
+
+        def merge(arrays, name, shape, dtype):
+            if name in arrays:
+                shape = (arrays[name][0][0] + shape[0],) + shape[1:]
+            arrays[name] = (shape, dtype)
+
+        num_points = 0
+        cells = []
+        point_data = {}
+        cell_data = {}
+        for piece in pieces:
+            n_points = int(piece.attrib["NumberOfPoints"])
+            n_cells = int(piece.attrib["NumberOfCells"])
+            num_points += n_points
+            for child in piece:
+                if child.tag == "Cells":
+                    arrays = {c.attrib["Name"]: c for c in child}
+                    types = self.read_data(arrays["types"])
+                    if np.any(types == 42):
+                        # polyhedra are grouped by their number of nodes
+                        self.lazy = True
+                        mesh = self.read()
+                        return MeshInfo.from_mesh(mesh, "vtu")
+                    offsets = None
+                    if any(
+                        vtk_to_meshio_type.get(t) in _varying_size_cells
+                        for t in np.unique(types)
+                    ):
+                        offsets = self.read_data(arrays["offsets"])
+                    cells += vtk_cell_block_sizes(offsets, types)
+                elif child.tag in ["PointData", "CellData"]:
+                    n = n_points if child.tag == "PointData" else n_cells
+                    arrays = point_data if child.tag == "PointData" else cell_data
+                    for c in child:
+                        merge(arrays, c.attrib["Name"], *array_info(c, n))
+
+        field_data = {}
+        for c in self.grid:
+            if c.tag == "FieldData":
+                for data_array in c:
+                    shape = (int(data_array.attrib.get("NumberOfTuples", 1)),)
+                    field_data[data_array.attrib["Name"]] = array_info(
+                        data_array, shape[0]
+                    )
+
+        return MeshInfo(
+            "vtu",
+            num_points,
+            cells,
+            point_data=point_data,
+            cell_data=cell_data,
+            field_data=field_data,
+        )
+
+    def close(self):
+        self._finalizer()
+
+    def _byte_ordered(self, dtype):
+        if self.byte_order is None:
+            return dtype
+        return dtype.newbyteorder("<" if self.byte_order == "LittleEndian" else ">")
+
+    def read_uncompressed_binary(self, dtype, encoded):
+        """Read the array at the current file position: the number of bytes followed
+        by the data, in base64 if `encoded`.
+        """
+        f = self._file
+        header_dtype = self._byte_ordered(vtu_to_numpy_type[self.header_type])
+        dtype = self._byte_ordered(dtype)
+
+        if not encoded:
+            # raw data, read directly into the array (or mapped with mmap)
+            num_bytes = int(fromfile(f, header_dtype, 1)[0])
+            with span("vtu:read", nbytes=num_bytes):
+                data = fromfile(f, dtype, num_bytes // dtype.itemsize, self.mmap)
+            if data.nbytes < num_bytes:
+                raise ReadError("Unexpected end of file")
+            return data
 
         # the first item is the total_num_bytes, given in header_dtype
-        header_dtype = vtu_to_numpy_type[self.header_type]
-        if self.byte_order is not None:
-            header_dtype = header_dtype.newbyteorder(
-                "<" if self.byte_order == "LittleEndian" else ">"
-            )
-        num_header_bytes = np.dtype(header_dtype).itemsize
-        total_num_bytes = np.frombuffer(byte_string[:num_header_bytes], header_dtype)[0]
+        num_header_bytes = header_dtype.itemsize
+        position = f.tell()
+        byte_string = base64.b64decode(
+            _read_base64_chars(f, num_bytes_to_num_base64_chars(num_header_bytes))
+        )
+        total_num_bytes = int(
+            np.frombuffer(byte_string[:num_header_bytes], header_dtype)[0]
+        )
 
         # Check if block size was decoded separately
         # (so decoding stopped after block size due to padding)
-        if len(byte_string) == num_header_bytes:
-            header_len = len(base64.b64encode(byte_string))
-            byte_string = base64.b64decode(data[header_len:])
-        else:
-            byte_string = byte_string[num_header_bytes:]
+        skip = 0
+        if len(byte_string) != num_header_bytes:
+            f.seek(position)
+            skip = num_header_bytes
+
+        out = np.empty(total_num_bytes, dtype=np.uint8)
+        with span("vtu:base64_decode", nbytes=total_num_bytes):
+            _fill(out, _iter_base64(f, skip + total_num_bytes), skip)
+        return out.view(dtype)
+
+    def read_compressed_binary(self, dtype, encoded):
+        """Read the compressed array at the current file position: the header with
+        the block sizes followed by the compressed blocks, in base64 if `encoded`.
+        The blocks are decompressed in parallel and copied into the output in order.
+        """
+        from .._batch import map_threads
+
+        f = self._file
+        header_dtype = self._byte_ordered(vtu_to_numpy_type[self.header_type])
+        dtype = self._byte_ordered(dtype)
+        num_bytes_per_item = header_dtype.itemsize
 
-        # Read the block data; multiple blocks possible here?
-        if self.byte_order is not None:
-            dtype = dtype.newbyteorder(
-                "<" if self.byte_order == "LittleEndian" else ">"
-            )
-        return np.frombuffer(byte_string[:total_num_bytes], dtype=dtype)
-
-    def read_compressed_binary(self, data, dtype):
         # first read the block size; it determines the size of the header
-        header_dtype = vtu_to_numpy_type[self.header_type]
-        if self.byte_order is not None:
-            header_dtype = header_dtype.newbyteorder(
-                "<" if self.byte_order == "LittleEndian" else ">"
-            )
-        num_bytes_per_item = np.dtype(header_dtype).itemsize
-        num_chars = num_bytes_to_num_base64_chars(num_bytes_per_item)
-        byte_string = base64.b64decode(data[:num_chars])[:num_bytes_per_item]
-        num_blocks = np.frombuffer(byte_string, header_dtype)[0]
-
-        # read the entire header
-        num_header_items = 3 + int(num_blocks)
-        num_header_bytes = num_bytes_per_item * num_header_items
-        num_header_chars = num_bytes_to_num_base64_chars(num_header_bytes)
-        byte_string = base64.b64decode(data[:num_header_chars])
-        header = np.frombuffer(byte_string, header_dtype)
-
-        # num_blocks = header[0]
-        # max_uncompressed_block_size = header[1]
-        # last_compressed_block_size = header[2]
-        block_sizes = header[3:]
-
-        # Read the block data
-        byte_array = base64.b64decode(data[num_header_chars:])
-        if self.byte_order is not None:
-            dtype = dtype.newbyteorder(
-                "<" if self.byte_order == "LittleEndian" else ">"
+        if encoded:
+            position = f.tell()
+            num_chars = num_bytes_to_num_base64_chars(num_bytes_per_item)
+            byte_string = base64.b64decode(_read_base64_chars(f, num_chars))
+            byte_string = byte_string[:num_bytes_per_item]
+            num_blocks = int(np.frombuffer(byte_string, header_dtype)[0])
+            f.seek(position)
+
+            # read the entire header
+            num_header_bytes = num_bytes_per_item * (3 + num_blocks)
+            num_header_chars = num_bytes_to_num_base64_chars(num_header_bytes)
+            byte_string = base64.b64decode(_read_base64_chars(f, num_header_chars))
+            header = np.frombuffer(byte_string[:num_header_bytes], header_dtype)
+            block_sizes = header[3:]
+            blocks = _split_blocks(_iter_base64(f, int(block_sizes.sum())), block_sizes)
+        else:
+            num_blocks = int(fromfile(f, header_dtype, 1)[0])
+            header = np.concatenate(
+                [[num_blocks], fromfile(f, header_dtype, 2 + num_blocks)]
             )
+            block_sizes = header[3:]
+            blocks = (f.read(int(size)) for size in block_sizes)
+
+        if len(block_sizes) != num_blocks:
+            raise ReadError("Unexpected end of file")
 
-        byte_offsets = np.empty(block_sizes.shape[0] + 1, dtype=block_sizes.dtype)
-        byte_offsets[0] = 0
-        np.cumsum(block_sizes, out=byte_offsets[1:])
+        # header[1] is the uncompressed size of all blocks but the last, header[2] the
+        # size of the last one (0 if it's full)
+        num_bytes = 0
+        if num_blocks > 0:
+            last_block_size = int(header[2]) or int(header[1])
+            num_bytes = (num_blocks - 1) * int(header[1]) + last_block_size
 
         assert self.compression is not None
         c = {"vtkLZMADataCompressor": lzma, "vtkZLibDataCompressor": zlib}[
@@ -512,17 +678,48 @@ class VtuReader:
         ]
 
         # process the compressed data
-        block_data = np.concatenate(
-            [
-                np.frombuffer(
-                    c.decompress(byte_array[byte_offsets[k] : byte_offsets[k + 1]]),
-                    dtype=dtype,
+        out = np.empty(num_bytes, dtype=np.uint8)
+        with span(
+            "vtu:decompress",
+            compressor=self.compression,
+            num_blocks=num_blocks,
+            nbytes=int(block_sizes.sum()),
+        ) as s:
+            k = 0
+            for block in map_threads(c.decompress, blocks, self.jobs):
+                if k + len(block) > num_bytes:
+                    raise CorruptionError("VTU file corrupt. Blocks too large.")
+                out[k : k + len(block)] = np.frombuffer(block, dtype=np.uint8)
+                k += len(block)
+            if k != num_bytes:
+                raise CorruptionError("VTU file corrupt. Blocks too small.")
+            s.add(nbytes_uncompressed=num_bytes)
+
+        return out.view(dtype)
+
+    def read_data_lazy(self, c, num_tuples):
+        """Like read_data(), but in lazy mode, only return a placeholder that reads
+        the data when it is first accessed.
+        """
+        if not self.lazy:
+            return self.read_data(c)
+
+        shape = (num_tuples,)
+        if "NumberOfComponents" in c.attrib:
+            shape += (int(c.attrib["NumberOfComponents"]),)
+
+        def loader():
+            data = self.read_data(c)
+            if data.shape != shape:
+                name = c.attrib["Name"]
+                raise CorruptionError(
+                    "VTU file corrupt. "
+                    + f"The shape of the data array '{name}' is {data.shape}, "
+                    + f"expected {shape}."
                 )
-                for k in range(num_blocks)
-            ]
-        )
+            return data
 
-        return block_data
+        return LazyArray(loader, shape, vtu_to_numpy_type.get(c.attrib["type"]))
 
     def read_data(self, c):
         fmt = c.attrib["format"] if "format" in c.attrib else "ascii"
@@ -533,31 +730,36 @@ class VtuReader:
         except KeyError:
             raise ReadError(f"Illegal data type '{data_type}'.")
 
-        if fmt == "ascii":
-            # ascii
-            if c.text.strip() == "":
-                # https://github.com/numpy/numpy/issues/18435
-                data = np.empty((0,), dtype=dtype)
+        reader = (
+            self.read_uncompressed_binary
+            if self.compression is None
+            else self.read_compressed_binary
+        )
+        f = self._file
+        with self._lock:
+            if fmt == "ascii":
+                start, stop = self.text_ranges.get(c, (0, 0))
+                f.seek(start)
+                text = f.read(stop - start).decode()
+                if text.strip() == "":
+                    # https://github.com/numpy/numpy/issues/18435
+                    data = np.empty((0,), dtype=dtype)
+                else:
+                    data = np.fromstring(text, dtype=dtype, sep=" ")
+            elif fmt == "binary":
+                if c not in self.text_ranges:
+                    raise ReadError(f"No data in DataArray '{c.attrib.get('Name')}'.")
+                f.seek(self.text_ranges[c][0])
+                _skip_whitespace(f)
+                data = reader(dtype, encoded=True)
+            elif fmt == "appended":
+                if self.appended_data is None:
+                    raise ReadError("No AppendedData found.")
+                start, encoding = self.appended_data
+                f.seek(start + int(c.attrib["offset"]))
+                data = reader(dtype, encoded=encoding == "base64")
             else:
-                data = np.fromstring(c.text, dtype=dtype, sep=" ")
-        elif fmt == "binary":
-            reader = (
-                self.read_uncompressed_binary
-                if self.compression is None
-                else self.read_compressed_binary
-            )
-            data = reader(c.text.strip(), dtype)
-        elif fmt == "appended":
-            offset = int(c.attrib["offset"])
-            reader = (
-                self.read_uncompressed_binary
-                if self.compression is None
-                else self.read_compressed_binary
-            )
-            assert self.appended_data is not None
-            data = reader(self.appended_data[offset:], dtype)
-        else:
-            raise ReadError(f"Unknown data format '{fmt}'.")
+                raise ReadError(f"Unknown data format '{fmt}'.")
 
         if "NumberOfComponents" in c.attrib:
             nc = int(c.attrib["NumberOfComponents"])
@@ -573,25 +775,203 @@ class VtuReader:
         return data
 
 
-def read(filename):
+def read(filename, lazy=False, select=None, jobs=1, mmap=False):
+    """Read a VTU file. Compressed data blocks are decompressed in `jobs` threads
+    (None: the number of CPUs). With `mmap`, uncompressed raw appended arrays are
+    memory-mapped views into the file.
+    """
+    reader = VtuReader(filename, lazy=lazy, select=select, jobs=jobs, mmap=mmap)
+    try:
+        return reader.read()
+    finally:
+        if not lazy:
+            reader.close()
+
+
+def probe(filename):
     reader = VtuReader(filename)
-    return Mesh(
-        reader.points,
-        reader.cells,
-        point_data=reader.point_data,
-        cell_data=reader.cell_data,
-        field_data=reader.field_data,
-    )
+    try:
+        return reader.probe()
+    finally:
+        reader.close()
 
 
-def _chunk_it(array, n):
-    k = 0
-    while k * n < len(array):
-        yield array[k * n : (k + 1) * n]
-        k += 1
+# TODO lz4 <https://vtk.org/doc/nightly/html/classvtkDataCompressor.html>
+compressors = {
+    "lzma": "vtkLZMADataCompressor",
+    "zlib": "vtkZLibDataCompressor",
+}
+
+
+def _chunk_bytes(chunks, n):
+    """Split the data of the arrays `chunks` into blocks of `n` bytes (the last one may
+    be shorter). Only the blocks which straddle two chunks are copied.
+    """
+    rest = b""
+    for chunk in chunks:
+        data = np.ascontiguousarray(chunk).reshape(-1).view(np.uint8)
+        if rest:
+            num_missing = n - len(rest)
+            rest += data[:num_missing].tobytes()
+            data = data[num_missing:]
+            if len(rest) < n:
+                continue
+            yield rest
+        num_full = len(data) // n * n
+        for k in range(0, num_full, n):
+            yield data[k : k + n]
+        rest = data[num_full:].tobytes()
+    if rest:
+        yield rest
+
+
+def _compressed_blocks(chunks, num_bytes, compression, header_dtype, jobs=1):
+    """The header and an iterator over the compressed blocks of the `num_bytes` bytes of
+    data in `chunks`, in the VTK binary layout. The block sizes in the header are filled
+    in as the blocks are compressed, in `jobs` threads.
+    """
+    from .._batch import map_threads
 
+    max_block_size = 32768
+    # round up
+    num_blocks = -int(-num_bytes // max_block_size)
+    last_block_size = num_bytes - (num_blocks - 1) * max_block_size
 
-def write(filename, mesh, binary=True, compression="zlib", header_type=None):
+    header = np.zeros(3 + num_blocks, dtype=header_dtype)
+    header[:3] = [num_blocks, max_block_size, last_block_size]
+
+    c = {"lzma": lzma, "zlib": zlib}[compression]
+
+    def blocks():
+        # This compress is the slowest part of the writer
+        compressed = map_threads(c.compress, _chunk_bytes(chunks, max_block_size), jobs)
+        for k, block in enumerate(compressed):
+            header[3 + k] = len(block)
+            yield block
+
+    return header, blocks()
+
+
+def _binary_blocks(data, compression, header_dtype, jobs=1):
+    """The header and the data blocks of an array in the VTK binary layout: the number
+    of bytes followed by the raw data or, if compressed, the block sizes followed by the
+    compressed blocks. Uncompressed data is a view of the array buffer.
+    """
+    data = np.ascontiguousarray(data)
+    if not compression:
+        return np.array(data.nbytes, dtype=header_dtype), [data]
+
+    # The header needs the sizes of all blocks, so they are kept in memory.
+    header, blocks = _compressed_blocks(
+        [data], data.nbytes, compression, header_dtype, jobs
+    )
+    blocks = list(blocks)
+    return header, blocks
+
+
+# Placeholder for the offset attribute of the appended data arrays in the XML passed to
+# _write_appended(). NUL can't occur in an XML document, so it doesn't clash with data
+# names. If the offsets are only known after the data has been written, room for
+# offsets of up to _OFFSET_WIDTH digits is reserved. The offsets themselves are never
+# padded: older meshio versions look the arrays up by the exact offset string.
+_OFFSET_PLACEHOLDER = "\0"
+_OFFSET_WIDTH = 20
+# the space VtuStreamWriter reserves for the XML in front of the appended data
+_XML_ROOM = 2**16
+_APPENDED_START = b'<AppendedData encoding="raw">\n_'
+
+
+def _write_appended(f, xml, arrays, compression, header_dtype, jobs=1):
+    """Write `xml`, the XML of a VTKFile without its closing tag, followed by the raw
+    appended data of `arrays` to the binary file `f`. `arrays` are `(num_bytes, chunks)`
+    with a function `chunks` which yields the data of the array.
+
+    Compressed arrays are written block by block as they are compressed; space for the
+    block sizes and the XML with the offsets is reserved and filled in afterwards, the
+    XML followed by blanks where it is shorter. If `f` isn't seekable, the compressed
+    arrays are kept in memory instead.
+    """
+    stream = compression and f.seekable()
+
+    payloads = None
+    offsets = None
+    if not compression:
+        payloads = [
+            (
+                np.array(num_bytes, dtype=header_dtype),
+                (np.ascontiguousarray(chunk) for chunk in chunks()),
+            )
+            for num_bytes, chunks in arrays
+        ]
+        sizes = [header_dtype.itemsize + num_bytes for num_bytes, _ in arrays]
+    elif not stream:
+        payloads = []
+        for num_bytes, chunks in arrays:
+            header, blocks = _compressed_blocks(
+                chunks(), num_bytes, compression, header_dtype, jobs
+            )
+            payloads.append((header, list(blocks)))
+        sizes = [
+            header.nbytes + sum(len(block) for block in blocks)
+            for header, blocks in payloads
+        ]
+    if payloads is not None:
+        offsets = np.cumsum([0] + sizes[:-1])
+
+    pieces = xml.split(_OFFSET_PLACEHOLDER)
+    if len(pieces) != len(arrays) + 1:
+        raise WriteError("VTU data names must not contain NUL characters.")
+
+    def xml_with_offsets():
+        tail = "".join(f"{offset}{piece}" for offset, piece in zip(offsets, pieces[1:]))
+        return (pieces[0] + tail).encode()
+
+    if stream:
+        xml_position = f.tell()
+        room = sum(len(piece.encode()) for piece in pieces)
+        f.write((room + len(arrays) * _OFFSET_WIDTH) * b" ")
+    else:
+        f.write(xml_with_offsets())
+
+    f.write(_APPENDED_START)
+    if stream:
+        start = f.tell()
+        offsets = []
+        for num_bytes, chunks in arrays:
+            header_position = f.tell()
+            offsets.append(header_position - start)
+            header, blocks = _compressed_blocks(
+                chunks(), num_bytes, compression, header_dtype, jobs
+            )
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+            end = f.tell()
+            f.seek(header_position)
+            f.write(header)
+            f.seek(end)
+    else:
+        for header, blocks in payloads:
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+    f.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+    if stream:
+        f.seek(xml_position)
+        f.write(xml_with_offsets())
+        f.seek(0, os.SEEK_END)
+
+
+def write(
+    filename,
+    mesh,
+    binary=True,
+    compression="zlib",
+    header_type=None,
+    appended=False,
+    jobs=1,
+):
     # Writing XML with an etree required first transforming the (potentially large)
     # arrays into string, which are much larger in memory still. This makes this writer
     # very memory hungry. See <https://stackoverflow.com/q/59272477/353337>.
@@ -615,6 +995,8 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
                 )
 
     if not binary:
+        if appended:
+            raise ValueError("VTU appended data must be binary")
         warn("VTU ASCII files are only meant for debugging.")
 
     if mesh.points.shape[1] == 2:
@@ -660,13 +1042,8 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
     assert header_type is not None
 
     if binary and compression:
-        # TODO lz4 <https://vtk.org/doc/nightly/html/classvtkDataCompressor.html>
-        compressions = {
-            "lzma": "vtkLZMADataCompressor",
-            "zlib": "vtkZLibDataCompressor",
-        }
-        assert compression in compressions
-        vtk_file.set("compressor", compressions[compression])
+        assert compression in compressors
+        vtk_file.set("compressor", compressors[compression])
 
     # swap the data to match the system byteorder
     # Don't use byteswap to make sure that the dtype is changed; see
@@ -675,18 +1052,20 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
     for k, cell_block in enumerate(mesh.cells):
         cell_type = cell_block.type
         data = cell_block.data
-        # Treatment of polyhedra is different from other types
-        if is_polyhedron_grid:
-            new_cell_info = []
-            for cell_info in data:
-                new_face_info = []
-                for face_info in cell_info:
-                    face_info = np.asarray(face_info)
-                    new_face_info.append(
-                        face_info.astype(face_info.dtype.newbyteorder("="), copy=False)
-                    )
-                new_cell_info.append(new_face_info)
-            mesh.cells[k] = CellBlock(cell_type, new_cell_info)
+        # Treatment of polyhedra and polygons in CSR format is different from other
+        # types
+        if isinstance(data, CSRCells) or is_polyhedron_grid:
+            if not isinstance(data, CSRCells):
+                data = CSRCells.from_list(data, polyhedron=True)
+            conn = data.connectivity
+            mesh.cells[k] = CellBlock(
+                cell_type,
+                CSRCells(
+                    data.offsets,
+                    conn.astype(conn.dtype.newbyteorder("="), copy=False),
+                    data.face_offsets,
+                ),
+            )
         else:
             mesh.cells[k] = CellBlock(
                 cell_type, data.astype(data.dtype.newbyteorder("="), copy=False)
@@ -700,94 +1079,44 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
     for key, data in mesh.field_data.items():
         mesh.field_data[key] = data.astype(data.dtype.newbyteorder("="), copy=False)
 
+    # (number of bytes, chunks) of the appended data arrays
+    appended_arrays = []
+
     def numpy_to_xml_array(parent, name, data):
         vtu_type = numpy_to_vtu_type[data.dtype]
-        fmt = "{:.11e}" if vtu_type.startswith("Float") else "{:d}"
+        fmt = "%.11e" if vtu_type.startswith("Float") else "%d"
         da = ET.SubElement(parent, "DataArray", type=vtu_type, Name=name)
         if len(data.shape) == 2:
             da.set("NumberOfComponents", f"{data.shape[1]}")
 
-        def text_writer_compressed(f):
-            max_block_size = 32768
-            data_bytes = data.tobytes()
-
-            # round up
-            num_blocks = -int(-len(data_bytes) // max_block_size)
-            last_block_size = len(data_bytes) - (num_blocks - 1) * max_block_size
-
-            # It's too bad that we have to keep all blocks in memory. This is
-            # necessary because the header, written first, needs to know the
-            # lengths of all blocks. Also, the blocks are encoded _after_ having
-            # been concatenated.
-            c = {"lzma": lzma, "zlib": zlib}[compression]
-            compressed_blocks = [
-                # This compress is the slowest part of the writer
-                c.compress(block)
-                for block in _chunk_it(data_bytes, max_block_size)
-            ]
-
-            # collect header
-            header = np.array(
-                [num_blocks, max_block_size, last_block_size]
-                + [len(b) for b in compressed_blocks],
-                dtype=vtu_to_numpy_type[header_type],
+        def text_writer_binary(f):
+            header, blocks = _binary_blocks(
+                data, compression, vtu_to_numpy_type[header_type], jobs
             )
-            f.write(base64.b64encode(header.tobytes()).decode())
-            f.write(base64.b64encode(b"".join(compressed_blocks)).decode())
-
-        def text_writer_uncompressed(f):
-            data_bytes = data.tobytes()
-            # collect header
-            header = np.array(len(data_bytes), dtype=vtu_to_numpy_type[header_type])
-            f.write(base64.b64encode(header.tobytes() + data_bytes).decode())
+            if compression:
+                # the header and the blocks are encoded separately
+                f.write(base64.b64encode(header.tobytes()).decode())
+                f.write(base64.b64encode(b"".join(blocks)).decode())
+            else:
+                f.write(base64.b64encode(b"".join([header, *blocks])).decode())
 
         def text_writer_ascii(f):
-            # This write() loop is the bottleneck for the write. Alternatives:
-            # savetxt is super slow:
-            #   np.savetxt(f, data.reshape(-1), fmt=fmt)
-            # joining and writing is a bit faster, but consumes huge amounts of
-            # memory:
-            #   f.write("\n".join(map(fmt.format, data.reshape(-1))))
-            for item in data.reshape(-1):
-                f.write((fmt + "\n").format(item))
-
-        if binary:
+            # one item per line
+            write_table(f, data.reshape(-1), fmt + "\n")
+
+        if appended:
+            # The arrays are written in the AppendedData section at the end of the
+            # file, directly from the array buffers.
+            appended_arrays.append((data.nbytes, lambda: [data]))
+            da.set("format", "appended")
+            da.set("offset", _OFFSET_PLACEHOLDER)
+        elif binary:
             da.set("format", "binary")
-            da.text_writer = (
-                text_writer_compressed if compression else text_writer_uncompressed
-            )
+            da.text_writer = text_writer_binary
         else:
             da.set("format", "ascii")
             da.text_writer = text_writer_ascii
 
-    def _polyhedron_face_cells(face_cells):
-        # Define the faces of each cell on the format specified for VTU Polyhedron
-        # cells. These are defined in Mesh.polyhedron_faces, as block data. The block
-        # consists of a nested list (outer list represents cell, inner is faces for this
-        # cells), where the items of the inner list are the nodes of specific faces.
-        #
-        # The output format is specified at https://vtk.org/Wiki/VTK/Polyhedron_Support
-
-        # Initialize array for size of data per cell.
-        data_size_per_cell = np.zeros(len(face_cells), dtype=int)
-
-        # The data itself is of unknown size, and cannot be initialized
-        data = []
-        for ci, cell in enumerate(face_cells):
-            # Number of faces for this cell
-            data.append(len(cell))
-            for face in cell:
-                # Number of nodes for this face
-                data.append(face.size)
-                # The nodes themselves
-                data += face.tolist()
-
-            data_size_per_cell[ci] = len(data)
-
-        # The returned data corresponds to the faces and faceoffsets fields in the
-        # vtu polyhedron data format
-        return data, data_size_per_cell.tolist()
-
     comment = ET.Comment(f"This file was created by meshio v{__version__}")
     vtk_file.insert(1, comment)
 
@@ -809,75 +1138,44 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
     if mesh.cells is not None and len(mesh.cells) > 0:
         cls = ET.SubElement(piece, "Cells")
 
-        faces = None
-        faceoffsets = None
-
         if is_polyhedron_grid:
             # The VTK polyhedron format requires both Cell-node connectivity, and a
             # definition of faces. The cell-node relation must be recoved from the
             # cell-face-nodes currently in CellBlocks.
-            # NOTE: If polyhedral cells are implemented for more mesh types, this code
-            # block may be useful for those as well.
-            con = []
-            num_nodes_per_cell = []
-            for block in mesh.cells:
-                for cell in block.data:
-                    nodes_this_cell = []
-                    for face in cell:
-                        nodes_this_cell += face.tolist()
-                    unique_nodes = np.unique(nodes_this_cell).tolist()
-
-                    con += unique_nodes
-                    num_nodes_per_cell.append(len(unique_nodes))
-
-            connectivity = np.array(con)
-            # offsets = np.hstack(([0], np.cumsum(num_nodes_per_cell)[:-1]))
-            offsets = np.cumsum(num_nodes_per_cell)
-
-            # Initialize data structures for polyhedral cells
-            faces = []
-            faceoffsets = []
+            polyhedra = CSRCells.concatenate([block.data for block in mesh.cells])
+            cell_node_offsets, connectivity = polyhedra.cell_nodes()
+            offsets = cell_node_offsets[1:]
+            faces, faceoffsets = vtk_polyhedron_faces(polyhedra)
 
         else:
             # create connectivity, offset, type arrays
             connectivity = []
+            # offset (points to the first element of the next cell)
+            offsets = []
             for v in mesh.cells:
+                if isinstance(v.data, CSRCells):
+                    # polygons with a varying number of nodes
+                    connectivity.append(v.data.connectivity)
+                    offsets.append(v.data.offsets[1:])
+                    continue
                 d = v.data
                 new_order = meshio_to_vtk_order(v.type)
                 if new_order is not None:
                     d = d[:, new_order]
                 connectivity.append(d.flatten())
+                offsets.append(d.shape[1] * np.arange(1, d.shape[0] + 1))
             connectivity = np.concatenate(connectivity)
 
-            # offset (points to the first element of the next cell)
-            offsets = [
-                v.data.shape[1]
-                * np.arange(1, v.data.shape[0] + 1, dtype=connectivity.dtype)
-                for v in mesh.cells
-            ]
             for k in range(1, len(offsets)):
-                offsets[k] += offsets[k - 1][-1]
-            offsets = np.concatenate(offsets)
+                offsets[k] = offsets[k] + offsets[k - 1][-1]
+            offsets = np.concatenate(offsets).astype(connectivity.dtype)
 
         # types
         types_array = []
         for cell_block in mesh.cells:
             key = cell_block.type
-            # some adaptions for polyhedron
             if key.startswith("polyhedron"):
-                # Get face-cell relation on the vtu format. See comments in helper
-                # function for more information of how to specify this.
-                faces_loc, faceoffsets_loc = _polyhedron_face_cells(cell_block.data)
-                # Adjust offsets to global numbering
-                assert faceoffsets is not None
-                if len(faceoffsets) > 0:
-                    faceoffsets_loc = [fi + faceoffsets[-1] for fi in faceoffsets_loc]
-
-                assert faces is not None
-                faces += faces_loc
-                faceoffsets += faceoffsets_loc
                 key = "polyhedron"
-
             types_array.append(np.full(len(cell_block), meshio_to_vtk_type[key]))
 
         types = np.concatenate(
@@ -891,8 +1189,8 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
 
         if is_polyhedron_grid:
             # Also store face-node relation
-            numpy_to_xml_array(cls, "faces", np.array(faces, dtype=int))
-            numpy_to_xml_array(cls, "faceoffsets", np.array(faceoffsets, dtype=int))
+            numpy_to_xml_array(cls, "faces", faces)
+            numpy_to_xml_array(cls, "faceoffsets", faceoffsets)
 
     if mesh.point_data:
         pd = ET.SubElement(piece, "PointData")
@@ -904,9 +1202,292 @@ def write(filename, mesh, binary=True, compression="zlib", header_type=None):
         for name, data in raw_from_cell_data(mesh.cell_data).items():
             numpy_to_xml_array(cd, name, data)
 
+    if appended:
+        xml = io.StringIO()
+        xml.write('<?xml version="1.0"?>\n')
+        vtk_file.write(xml)
+        xml = xml.getvalue()
+        with open(filename, "wb") as f:
+            _write_appended(
+                f,
+                xml[: xml.rindex("</VTKFile>")],
+                appended_arrays,
+                compression if binary else None,
+                vtu_to_numpy_type[header_type],
+                jobs,
+            )
+        return
+
     # write_xml(filename, vtk_file, pretty_xml)
     tree = ET.ElementTree(vtk_file)
     tree.write(filename)
 
 
-register_format("vtu", [".vtu"], read, {"vtu": write})
+class VtuStreamWriter(StreamWriter):
+    """Writes a VTU file from chunks, see meshio.open_writer(). The data arrays are
+    stored as raw binary appended data.
+
+    Uncompressed arrays are written as they come, after room for the XML header, which
+    is filled in on close(). Compressed arrays are kept in temporary files until then,
+    since the sizes of the blocks precede them; their blocks are written as they are
+    compressed (in `jobs` threads), and their sizes are filled in afterwards.
+    """
+
+    # 64-bit headers, since the arrays can be larger than 4 GB
+    header_type = "UInt64"
+
+    def __init__(self, filename, binary=True, compression="zlib", jobs=1):
+        if not binary:
+            raise WriteError("The VTU stream writer only writes binary appended data.")
+        if compression is not None and compression not in compressors:
+            raise WriteError(f"Unknown VTU compression '{compression}'.")
+        super().__init__(filename)
+        self.compression = compression
+        self.jobs = jobs
+
+    def _arrays(self):
+        """For each data array, the parent element, the DataArray attributes, the
+        dtype, the number of items, a function which yields the data in chunks, and the
+        key of the chunks (None for the arrays derived from the cell blocks).
+        """
+        keys = [("cells", k) for k in range(len(self.cell_blocks))]
+        rows_per_chunk = _CHUNK_SIZE // 8
+
+        def points():
+            for chunk in self._chunks("points"):
+                if chunk.shape[1] == 2:
+                    chunk = np.column_stack([chunk, np.zeros_like(chunk[:, 0])])
+                yield chunk
+
+        def connectivity():
+            for key, (cell_type, _) in zip(keys, self.cell_blocks):
+                new_order = meshio_to_vtk_order(cell_type)
+                for chunk in self._chunks(key):
+                    if new_order is not None:
+                        chunk = chunk[:, new_order]
+                    yield chunk
+
+        def offsets():
+            k = 0
+            for key, (_, num_cells) in zip(keys, self.cell_blocks):
+                n = self._shape(key)[1]
+                for start in range(0, num_cells, rows_per_chunk):
+                    stop = min(start + rows_per_chunk, num_cells)
+                    yield k + n * np.arange(start + 1, stop + 1)
+                k += num_cells * n
+
+        def types():
+            for cell_type, num_cells in self.cell_blocks:
+                vtk_type = meshio_to_vtk_type[cell_type]
+                for start in range(0, num_cells, rows_per_chunk):
+                    yield np.full(min(rows_per_chunk, num_cells - start), vtk_type)
+
+        arrays = []
+        if self.num_points > 0:
+            if self._shape("points")[1] == 2:
+                warn(
+                    "VTU requires 3D points, but 2D points given. "
+                    "Appending 0 third component."
+                )
+            attrib = {"Name": "Points", "NumberOfComponents": "3"}
+            num_items = self.num_points * 3
+            arrays.append(
+                ("Points", attrib, self._dtype("points"), num_items, points, "points")
+            )
+
+        if self.cell_blocks:
+            int64 = np.dtype(np.int64)
+            uint8 = np.dtype(np.uint8)
+            num_items = sum(self._shape(key)[0] * self._shape(key)[1] for key in keys)
+            arrays += [
+                (
+                    "Cells",
+                    {"Name": "connectivity"},
+                    int64,
+                    num_items,
+                    connectivity,
+                    "cells",
+                ),
+                ("Cells", {"Name": "offsets"}, int64, self.num_cells, offsets, None),
+                ("Cells", {"Name": "types"}, uint8, self.num_cells, types, None),
+            ]
+
+        for parent, kind, names in [
+            ("PointData", "point_data", self.point_data_names),
+            ("CellData", "cell_data", self.cell_data_names),
+        ]:
+            for name in names:
+                key = (kind, name)
+                shape = self._shape(key)
+                attrib = {"Name": name}
+                if len(shape) == 2:
+                    attrib["NumberOfComponents"] = f"{shape[1]}"
+                arrays.append(
+                    (
+                        parent,
+                        attrib,
+                        self._dtype(key),
+                        int(np.prod(shape)),
+                        partial(self._chunks, key),
+                        key,
+                    )
+                )
+        return arrays
+
+    def _xml(self, arrays):
+        """The XML of the file without its closing tag, with _OFFSET_PLACEHOLDER for
+        the offsets of the `arrays`.
+        """
+        from xml.etree import ElementTree as ET
+
+        vtk_file = ET.Element(
+            "VTKFile",
+            type="UnstructuredGrid",
+            version="0.1",
+            byte_order=("LittleEndian" if sys.byteorder == "little" else "BigEndian"),
+            header_type=self.header_type,
+        )
+        vtk_file.append(ET.Comment(f"This file was created by meshio v{__version__}"))
+        grid = ET.SubElement(vtk_file, "UnstructuredGrid")
+        piece = ET.SubElement(
+            grid,
+            "Piece",
+            NumberOfPoints=f"{self.num_points}",
+            NumberOfCells=f"{self.num_cells}",
+        )
+
+        if self.compression is not None:
+            vtk_file.set("compressor", compressors[self.compression])
+
+        parents = {}
+        for parent, attrib, dtype, *_ in arrays:
+            if parent not in parents:
+                parents[parent] = ET.SubElement(piece, parent)
+            ET.SubElement(
+                parents[parent],
+                "DataArray",
+                type=numpy_to_vtu_type[dtype.newbyteorder("=")],
+                format="appended",
+                offset=_OFFSET_PLACEHOLDER,
+                **attrib,
+            )
+
+        xml = ET.tostring(vtk_file).decode()
+        # the appended data goes before the closing tag
+        return xml[: xml.rindex("</VTKFile>")]
+
+    def _layout(self, key):
+        return self._file_order(key) if self.compression is None else None
+
+    def _begin_output(self, f):
+        # room for the XML, see _finish()
+        f.write(b" " * (_XML_ROOM - len(_APPENDED_START)) + _APPENDED_START)
+
+    def _begin_run(self, f, run, prev):
+        if prev is not None and self._file_order(prev.key)[0] == 1:
+            # the cell blocks make up one connectivity array
+            if self._file_order(run.key)[0] == 1:
+                return
+        # the size of the array in bytes, filled in by _finish()
+        run.positions.append(f.tell())
+        f.write(bytes(vtu_to_numpy_type[self.header_type].itemsize))
+
+    def _write_rows(self, f, run, data):
+        if run.key == "points":
+            if data.shape[1] == 2:
+                data = np.column_stack([data, np.zeros_like(data[:, 0])])
+        elif run.key[0] == "cells":
+            new_order = meshio_to_vtk_order(self.cell_blocks[run.key[1]][0])
+            if new_order is not None:
+                data = data[:, new_order]
+            data = data.astype(np.int64)
+        # data is written in the native byte order
+        np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("=")).tofile(f)
+
+    def _finish(self, f):
+        # the arrays written in place
+        positions = {}
+        for run in self._runs:
+            if run.positions:
+                key = "cells" if self._file_order(run.key)[0] == 1 else run.key
+                positions[key] = run.positions[0]
+
+        header_dtype = vtu_to_numpy_type[self.header_type]
+        arrays = self._arrays()
+        offsets = []
+        for _, _, dtype, num_items, chunks, key in arrays:
+            dtype = dtype.newbyteorder("=")
+            header = np.array(num_items * dtype.itemsize, dtype=header_dtype).tobytes()
+            if key in positions:
+                self._patch(positions[key], header)
+                offsets.append(positions[key] - self._data_start)
+            else:
+                offsets.append(f.tell() - self._data_start)
+                f.write(header)
+                for chunk in _native_chunks(chunks, dtype):
+                    chunk.tofile(f)
+        f.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+        pieces = self._xml(arrays).split(_OFFSET_PLACEHOLDER)
+        if len(pieces) != len(arrays) + 1:
+            raise WriteError("VTU data names must not contain NUL characters.")
+        xml = "".join(f"{offset}{piece}" for offset, piece in zip(offsets, pieces[1:]))
+        xml = (pieces[0] + xml).encode()
+        room = self._data_start - len(_APPENDED_START)
+        if len(xml) > room:
+            _shift_tail(f, self._data_start, len(xml) - room)
+            xml += _APPENDED_START
+        f.seek(0)
+        f.write(xml)
+        f.seek(0, os.SEEK_END)
+
+    def _write(self):
+        if self.compression is None:
+            super()._write()
+            return
+
+        arrays = self._arrays()
+        appended_arrays = [
+            (
+                num_items * dtype.itemsize,
+                # data is written in the native byte order
+                partial(_native_chunks, chunks, dtype.newbyteorder("=")),
+            )
+            for _, _, dtype, num_items, chunks, _ in arrays
+        ]
+        self._output_started = True
+        with open(self.filename, "wb") as f:
+            _write_appended(
+                f,
+                self._xml(arrays),
+                appended_arrays,
+                self.compression,
+                vtu_to_numpy_type[self.header_type],
+                self.jobs,
+            )
+
+
+def _shift_tail(f, start, shift):
+    """Move the bytes of the file `f` from `start` on by `shift` bytes to the back."""
+    end = f.seek(0, os.SEEK_END)
+    for stop in range(end, start, -_CHUNK_SIZE):
+        k = max(start, stop - _CHUNK_SIZE)
+        f.seek(k)
+        data = f.read(stop - k)
+        f.seek(k + shift)
+        f.write(data)
+
+
+def _native_chunks(chunks, dtype):
+    for chunk in chunks():
+        yield np.ascontiguousarray(chunk, dtype=dtype)
+
+
+register_format(
+    "vtu",
+    [".vtu"],
+    read,
+    {"vtu": write},
+    stream_writer_map={"vtu": VtuStreamWriter},
+    prober=probe,
+)
@@ -5,15 +5,26 @@ https://xdmf.org/index.php/XDMF_Model_and_Format
 
 import os
 import pathlib
-from io import BytesIO
+from io import StringIO
 from xml.etree import ElementTree as ET
 
 import numpy as np
 
-from .._common import cell_data_from_raw, raw_from_cell_data, write_xml
+from .._common import (
+    Selection,
+    cell_data_from_raw,
+    raw_from_cell_data,
+    write_table,
+    write_xml,
+)
 from .._exceptions import ReadError, WriteError
+from .._files import is_buffer
 from .._helpers import register_format
+from .._lazy import LazyArray, LazyDict
 from .._mesh import CellBlock, Mesh
+from .._probe import MeshInfo
+from .._profile import span
+from .._stream import StreamWriter
 from .common import (
     attribute_type,
     dtype_to_format_string,
@@ -26,23 +37,38 @@ from .common import (
 )
 
 
-def read(filename):
-    return XdmfReader(filename).read()
+def read(filename, lazy=False, select=None):
+    return XdmfReader(filename, lazy=lazy, select=select).read()
+
+
+def probe(filename):
+    # In lazy mode, only the shapes of the HDF5 and binary data are read. Mixed
+    # topologies are read in full since they hold the cell types.
+    reader = XdmfReader(filename, lazy=True)
+    mesh = reader.read()
+    return MeshInfo.from_mesh(mesh, "xdmf", version=reader.version)
 
 
 class XdmfReader:
-    def __init__(self, filename):
+    def __init__(self, filename, lazy=False, select=None):
         self.filename = filename
+        # In lazy mode, binary and HDF5 data is only read when first accessed.
+        self.lazy = lazy
+        # unselected attributes are skipped without reading them
+        self.select = Selection() if select is None else select
+        self.version = None
 
     def read(self):
-        parser = ET.XMLParser()
-        tree = ET.parse(self.filename, parser)
-        root = tree.getroot()
+        with span("xdmf:parse_xml"):
+            parser = ET.XMLParser()
+            tree = ET.parse(self.filename, parser)
+            root = tree.getroot()
 
         if root.tag != "Xdmf":
             raise ReadError()
 
         version = root.attrib["Version"]
+        self.version = version
 
         if version.split(".")[0] == "2":
             return self.read_xdmf2(root)
@@ -88,13 +114,21 @@ class XdmfReader:
                 # https://github.com/numpy/numpy/issues/18435
                 data = np.empty((0,), dtype=dtype)
             else:
-                data = np.fromstring(data_item.text, dtype=dtype, sep=" ")
+                with span("xdmf:parse_text", nbytes=len(data_item.text)):
+                    data = np.fromstring(data_item.text, dtype=dtype, sep=" ")
             return data.reshape(dims)
 
         elif fmt == "Binary":
-            return np.fromfile(
-                data_item.text.strip(), dtype=xdmf_to_numpy_type[(data_type, precision)]
-            ).reshape(dims)
+            bin_filename = data_item.text.strip()
+            dtype = xdmf_to_numpy_type[(data_type, precision)]
+
+            def load_binary():
+                with span("xdmf:read_binary", filename=bin_filename) as s:
+                    data = np.fromfile(bin_filename, dtype=dtype).reshape(dims)
+                    s.add(nbytes=data.nbytes)
+                return data
+
+            return LazyArray(load_binary, dims, dtype) if self.lazy else load_binary()
 
         if fmt != "HDF":
             raise ReadError(f"Unknown XDMF Format '{fmt}'.")
@@ -103,19 +137,31 @@ class XdmfReader:
         filename, h5path = info.split(":")
 
         # The HDF5 file path is given with respect to the XDMF (XML) file.
-        dirname = pathlib.Path(self.filename).resolve().parent
+        if is_buffer(self.filename, "r"):
+            dirname = pathlib.Path.cwd()
+        else:
+            dirname = pathlib.Path(self.filename).resolve().parent
         full_hdf5_path = dirname / filename
 
-        f = h5py.File(full_hdf5_path, "r")
-
         # Some files don't contain the leading slash /.
         if h5path[0] == "/":
             h5path = h5path[1:]
 
-        for key in h5path.split("/"):
-            f = f[key]
-        # `[()]` gives a np.ndarray
-        return f[()]
+        def load_hdf5():
+            with span("xdmf:read_hdf5", dataset=h5path) as s:
+                with h5py.File(full_hdf5_path, "r") as f:
+                    # `[()]` gives a np.ndarray
+                    data = f[h5path][()]
+                s.add(nbytes=data.nbytes)
+            return data
+
+        if not self.lazy:
+            return load_hdf5()
+
+        with h5py.File(full_hdf5_path, "r") as f:
+            dataset = f[h5path]
+            shape, dtype = dataset.shape, dataset.dtype
+        return LazyArray(load_hdf5, shape, dtype)
 
     def read_information(self, c_data):
         field_data = {}
@@ -206,13 +252,13 @@ class XdmfReader:
                 if len(data_items) != 1:
                     raise ReadError()
 
-                data = self._read_data_item(data_items[0])
-
                 name = c.attrib["Name"]
                 if c.attrib["Center"] == "Node":
-                    point_data[name] = data
+                    if self.select.point_data(name):
+                        point_data[name] = self._read_data_item(data_items[0])
                 elif c.attrib["Center"] == "Cell":
-                    cell_data_raw[name] = data
+                    if self.select.cell_data(name):
+                        cell_data_raw[name] = self._read_data_item(data_items[0])
                 else:
                     # TODO field data?
                     if c.attrib["Center"] != "Grid":
@@ -221,6 +267,9 @@ class XdmfReader:
                 raise ReadError(f"Unknown section '{c.tag}'.")
 
         cell_data = cell_data_from_raw(cells, cell_data_raw)
+        if self.lazy:
+            point_data = LazyDict(point_data)
+            cell_data = LazyDict(cell_data)
 
         return Mesh(
             points,
@@ -270,7 +319,7 @@ class XdmfReader:
                     cell_type = c.attrib["TopologyType"]
 
                 if cell_type == "Mixed":
-                    cells = translate_mixed_cells(data)
+                    cells = translate_mixed_cells(np.asarray(data))
                 else:
                     cells.append(CellBlock(xdmf_to_meshio_type[cell_type], data))
 
@@ -307,21 +356,23 @@ class XdmfReader:
                     raise ReadError()
                 data_item = data_items[0]
 
-                data = self._read_data_item(data_item)
-
                 if c.attrib["Center"] not in ["Node", "Cell"]:
                     raise ReadError(f"Unknown center '{c.attrib['Center']}'.")
 
                 name = c.attrib["Name"]
                 if c.attrib["Center"] == "Node":
-                    point_data[name] = data
-                else:
-                    cell_data_raw[name] = data
+                    if self.select.point_data(name):
+                        point_data[name] = self._read_data_item(data_item)
+                elif self.select.cell_data(name):
+                    cell_data_raw[name] = self._read_data_item(data_item)
 
             else:
                 raise ReadError(f"Unknown section '{c.tag}'.")
 
         cell_data = cell_data_from_raw(cells, cell_data_raw)
+        if self.lazy:
+            point_data = LazyDict(point_data)
+            cell_data = LazyDict(cell_data)
 
         return Mesh(
             points,
@@ -334,17 +385,25 @@ class XdmfReader:
 
 class XdmfWriter:
     def __init__(
-        self, filename, mesh, data_format="HDF", compression="gzip", compression_opts=4
+        self, filename, mesh, data_format=None, compression="gzip", compression_opts=4
     ):
         import h5py
 
+        # buffers can only hold the XML data format, the others need more files
+        if data_format is None:
+            data_format = "XML" if is_buffer(filename, "w") else "HDF"
         if data_format not in ["XML", "Binary", "HDF"]:
             raise WriteError(
                 "Unknown XDMF data format "
                 f"'{data_format}' (use 'XML', 'Binary', or 'HDF'.)"
             )
+        if data_format != "XML" and is_buffer(filename, "w"):
+            raise WriteError(
+                f"XDMF data format '{data_format}' needs a file name "
+                "(use 'XML' for buffers)"
+            )
 
-        self.filename = pathlib.Path(filename)
+        self.filename = None if is_buffer(filename, "w") else pathlib.Path(filename)
         self.data_format = data_format
         self.data_counter = 0
         self.compression = compression
@@ -374,10 +433,11 @@ class XdmfWriter:
 
     def numpy_to_xml_string(self, data):
         if self.data_format == "XML":
-            s = BytesIO()
+            s = StringIO()
             fmt = dtype_to_format_string[data.dtype.name]
-            np.savetxt(s, data, fmt)
-            return "\n" + s.getvalue().decode()
+            num_columns = data.shape[1] if data.ndim > 1 else 1
+            write_table(s, data, " ".join([fmt] * num_columns) + "\n")
+            return "\n" + s.getvalue()
         elif self.data_format == "Binary":
             base = os.path.splitext(self.filename)[0]
             bin_filename = f"{base}{self.data_counter}.bin"
@@ -547,10 +607,160 @@ def write(*args, **kwargs):
     XdmfWriter(*args, **kwargs)
 
 
+class XdmfStreamWriter(StreamWriter):
+    """Writes an XDMF file with HDF5 data from chunks, see meshio.open_writer().
+
+    Points and data are appended to resizable HDF5 datasets right away. The cells are
+    kept in temporary files until close() since the topology of several cell blocks
+    must be written as one (mixed) dataset.
+    """
+
+    def __init__(self, filename, compression="gzip", compression_opts=4):
+        import h5py
+
+        super().__init__(filename)
+        self.compression = compression
+        self.compression_opts = None if compression is None else compression_opts
+        self.h5_filename = self.filename.with_suffix(".h5")
+        self.h5_file = h5py.File(self.h5_filename, "w")
+        self._datasets = {}
+
+    def _create_dataset(self, dtype, shape, maxshape=None):
+        name = f"data{len(self.h5_file)}"
+        return self.h5_file.create_dataset(
+            name,
+            shape=shape,
+            maxshape=maxshape,
+            dtype=dtype,
+            compression=self.compression,
+            compression_opts=self.compression_opts,
+        )
+
+    def _append(self, key, data):
+        if key[0] == "cells":
+            super()._append(key, data)
+            return
+        if key not in self._datasets:
+            self._datasets[key] = self._create_dataset(
+                data.dtype, (0,) + data.shape[1:], (None,) + data.shape[1:]
+            )
+        dataset = self._datasets[key]
+        if data.shape[1:] != dataset.shape[1:]:
+            raise WriteError(
+                f"Inconsistent chunk shape {data.shape} "
+                f"(expected (:, {', '.join(map(str, dataset.shape[1:]))}))."
+            )
+        n = dataset.shape[0]
+        dataset.resize(n + len(data), axis=0)
+        dataset[n:] = data
+
+    def _length(self, key):
+        if key in self._datasets:
+            return self._datasets[key].shape[0]
+        return super()._length(key)
+
+    def _data_item(self, parent, dataset):
+        dt, prec = numpy_to_xdmf_dtype[dataset.dtype.name]
+        data_item = ET.SubElement(
+            parent,
+            "DataItem",
+            DataType=dt,
+            Dimensions=" ".join(str(s) for s in dataset.shape),
+            Format="HDF",
+            Precision=prec,
+        )
+        data_item.text = os.path.basename(self.h5_filename) + ":/" + dataset.name[1:]
+
+    def _write_topology(self, grid):
+        keys = [("cells", k) for k in range(len(self.cell_blocks))]
+        if len(keys) == 1:
+            cell_type, num_cells = self.cell_blocks[0]
+            shape = self._shape(keys[0])
+            dataset = self._create_dataset(self._dtype(keys[0]), shape)
+            k = 0
+            for chunk in self._chunks(keys[0]):
+                dataset[k : k + len(chunk)] = chunk
+                k += len(chunk)
+            topo = ET.SubElement(
+                grid,
+                "Topology",
+                TopologyType=meshio_to_xdmf_type[cell_type][0],
+                NumberOfElements=str(num_cells),
+                NodesPerElement=str(shape[1]),
+            )
+            self._data_item(topo, dataset)
+            return
+
+        dtype = np.result_type(*[self._dtype(key) for key in keys])
+        dataset = self._create_dataset(dtype, (0,), (None,))
+        for key, (cell_type, _) in zip(keys, self.cell_blocks):
+            for chunk in self._chunks(key):
+                cd = np.hstack(
+                    [
+                        np.full(
+                            (len(chunk), 2 if cell_type in {"vertex", "line"} else 1),
+                            meshio_type_to_xdmf_index[cell_type],
+                        ),
+                        chunk,
+                    ]
+                ).flatten()
+                n = dataset.shape[0]
+                dataset.resize(n + len(cd), axis=0)
+                dataset[n:] = cd
+        topo = ET.SubElement(
+            grid,
+            "Topology",
+            TopologyType="Mixed",
+            NumberOfElements=str(self.num_cells),
+        )
+        self._data_item(topo, dataset)
+
+    def _write(self):
+        xdmf_file = ET.Element("Xdmf", Version="3.0")
+        domain = ET.SubElement(xdmf_file, "Domain")
+        grid = ET.SubElement(domain, "Grid", Name="Grid")
+
+        if self.num_points > 0:
+            points = self._datasets["points"]
+            if points.shape[1] > 3:
+                raise WriteError("Can only write points up to dimension 3.")
+            geo = ET.SubElement(grid, "Geometry", GeometryType="XYZ"[: points.shape[1]])
+            self._data_item(geo, points)
+
+        if self.cell_blocks:
+            self._write_topology(grid)
+
+        for kind, names, center in [
+            ("point_data", self.point_data_names, "Node"),
+            ("cell_data", self.cell_data_names, "Cell"),
+        ]:
+            for name in names:
+                dataset = self._datasets[(kind, name)]
+                att = ET.SubElement(
+                    grid,
+                    "Attribute",
+                    Name=name,
+                    AttributeType=attribute_type(dataset),
+                    Center=center,
+                )
+                self._data_item(att, dataset)
+
+        self.h5_file.close()
+        self._output_started = True
+        write_xml(self.filename, xdmf_file)
+
+    def _abort(self):
+        super()._abort()
+        self.h5_file.close()
+        self.h5_filename.unlink()
+
+
 # TODO register all xdmf except hdf outside this try block
 register_format(
     "xdmf",
     [".xdmf", ".xmf"],
     read,
     {"xdmf": write},
+    stream_writer_map={"xdmf": XdmfStreamWriter},
+    prober=probe,
 )
@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import os
 import pathlib
-from io import BytesIO
+from io import StringIO
 from xml.etree import ElementTree as ET
 
 import numpy as np
 from numpy.typing import ArrayLike
 
-from .._common import cell_data_from_raw, raw_from_cell_data, write_xml
+from .._common import cell_data_from_raw, raw_from_cell_data, write_table, write_xml
 from .._exceptions import ReadError, WriteError
 from .._mesh import CellBlock
 from .common import (
@@ -319,10 +319,10 @@ class TimeSeriesWriter:
 
     def numpy_to_xml_string(self, data):
         if self.data_format == "XML":
-            s = BytesIO()
+            s = StringIO()
             fmt = dtype_to_format_string[data.dtype.name]
-            np.savetxt(s, data.flatten(), fmt)
-            return s.getvalue().decode()
+            write_table(s, data.reshape(-1), fmt + "\n")
+            return s.getvalue()
         elif self.data_format == "Binary":
             bin_filename = f"{self.filename.stem}{self.data_counter}.bin"
             self.data_counter += 1
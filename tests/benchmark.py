@@ -0,0 +1,390 @@
+"""
+Benchmark reading and writing of all formats on synthetic meshes (NumPy only):
+
+    python tests/benchmark.py --sizes 1e4 1e5 1e6 --output results.json
+    python tests/benchmark.py --sizes 1e4 1e5 1e6 --baseline results.json
+
+Each writer is run with the option combinations from WRITER_OPTIONS (default options
+otherwise) on a mesh of tetrahedra, hexahedra, and boundary triangles with point data,
+cell data, and sets; surface-only formats get a triangle mesh. Wall time, throughput,
+peak memory (tracemalloc), and file size go to the JSON output. The run fails (exit
+code 1) if a case scales superlinearly with the mesh size or, with --baseline, got
+slower than --tolerance times the time of the baseline run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import meshio
+
+# option combinations per writer
+WRITER_OPTIONS = {
+    "ansys": [{"binary": True}, {"binary": False}],
+    "flac3d": [{"binary": True}, {"binary": False}],
+    "gmsh": [{"binary": True}, {"binary": False}],
+    "gmsh22": [{"binary": True}, {"binary": False}],
+    "ply": [{"binary": True}, {"binary": False}],
+    "stl": [{"binary": True}, {"binary": False}],
+    "vtk": [{"binary": True}, {"binary": False}],
+    "vtk42": [{"binary": True}, {"binary": False}],
+    "vtk51": [{"binary": True}, {"binary": False}],
+    "vtu": [
+        {"compression": None},
+        {"compression": "zlib"},
+        {"compression": "lzma"},
+        {"binary": False},
+    ],
+    "xdmf": [
+        {"data_format": "HDF", "compression": None},
+        {"data_format": "HDF", "compression": "gzip"},
+        {"data_format": "Binary"},
+        {"data_format": "XML"},
+    ],
+}
+
+# formats that only hold surface meshes
+SURFACE_FORMATS = ["neuroglancer", "obj", "off", "ply", "stl", "svg", "wkt"]
+
+# writers that can't be benchmarked, with the reason
+SKIP = {
+    # the reader doesn't accept exponents (1e-05) and backtracks exponentially
+    "wkt": "reader hangs on floats in exponent notation",
+}
+
+
+def volume_mesh(num_cells: int, seed: int = 0) -> meshio.Mesh:
+    """About `num_cells` cells on a cube: half of the hexahedra of a regular grid, the
+    other half split into six tetrahedra each, and triangles on the bottom face.
+    """
+    # 1/2 + 6/2 cells per hexahedron
+    m = max(2, round((num_cells / 3.5) ** (1 / 3)))
+    n = m + 1
+    x = np.linspace(0.0, 1.0, n)
+    points = np.stack(np.meshgrid(x, x, x, indexing="ij"), axis=-1)
+    points = points.transpose(2, 1, 0, 3).reshape(-1, 3)
+    # jitter for realistic compression ratios
+    rng = np.random.default_rng(seed)
+    points += rng.uniform(-0.1 / m, 0.1 / m, points.shape)
+
+    i, j, k = np.meshgrid(np.arange(m), np.arange(m), np.arange(m), indexing="ij")
+    base = (i + n * (j + n * k)).T.reshape(-1)
+    corners = np.array([0, 1, 1 + n, n, n * n, 1 + n * n, 1 + n + n * n, n + n * n])
+    hexahedra = base[:, None] + corners
+    num_hex = len(hexahedra) // 2
+    tetra = hexahedra[num_hex:][
+        :,
+        [
+            [0, 1, 2, 6],
+            [0, 2, 3, 6],
+            [0, 3, 7, 6],
+            [0, 7, 4, 6],
+            [0, 4, 5, 6],
+            [0, 5, 1, 6],
+        ],
+    ].reshape(-1, 4)
+    hexahedra = hexahedra[:num_hex]
+
+    quads = base[: m * m, None] + corners[:4]
+    triangles = quads[:, [[0, 1, 2], [0, 2, 3]]].reshape(-1, 3)
+
+    cells = [("triangle", triangles), ("tetra", tetra), ("hexahedron", hexahedra)]
+    return _add_data(meshio.Mesh(points, cells), bottom=points[:, 2] < 0.5 / m)
+
+
+def surface_mesh(num_cells: int, seed: int = 0) -> meshio.Mesh:
+    """About `num_cells` triangles on a wavy square."""
+    m = max(1, round(math.sqrt(num_cells / 2)))
+    n = m + 1
+    x, y = np.meshgrid(np.linspace(0.0, 1.0, n), np.linspace(0.0, 1.0, n))
+    rng = np.random.default_rng(seed)
+    z = 0.1 * np.sin(4 * x) * np.cos(3 * y) + rng.uniform(-1e-3, 1e-3, x.shape)
+    points = np.column_stack([x.reshape(-1), y.reshape(-1), z.reshape(-1)])
+
+    i, j = np.meshgrid(np.arange(m), np.arange(m))
+    base = (i + n * j).reshape(-1)
+    quads = base[:, None] + np.array([0, 1, 1 + n, n])
+    triangles = quads[:, [[0, 1, 2], [0, 2, 3]]].reshape(-1, 3)
+    return _add_data(meshio.Mesh(points, [("triangle", triangles)]), bottom=y == 0.0)
+
+
+def _add_data(mesh: meshio.Mesh, bottom) -> meshio.Mesh:
+    points = mesh.points
+    mesh.point_data = {"T": points.sum(axis=1), "u": points.copy()}
+    mesh.cell_data = {
+        "rho": [np.linspace(1.0, 2.0, len(c)) for c in mesh.cells],
+        "material": [
+            np.full(len(c), k, dtype=np.int32) for k, c in enumerate(mesh.cells)
+        ],
+    }
+    mesh.point_sets = {"bottom": np.flatnonzero(bottom)}
+    mesh.cell_sets = {"first": [np.arange(min(10, len(c))) for c in mesh.cells]}
+    return mesh
+
+
+def _add_gmsh_tags(mesh: meshio.Mesh) -> meshio.Mesh:
+    """The entity tags the Gmsh 4.1 writer needs for more than one cell type: one
+    geometrical entity per cell block, all of which appear in the node entities.
+    """
+    mesh = mesh.copy()
+    dim_tags = np.array([[c.dim, k + 1] for k, c in enumerate(mesh.cells)])
+    mesh.point_data["gmsh:dim_tags"] = dim_tags[
+        np.arange(len(mesh.points)) % len(mesh.cells)
+    ]
+    tags = [np.full(len(c), k + 1) for k, c in enumerate(mesh.cells)]
+    mesh.cell_data["gmsh:physical"] = tags
+    mesh.cell_data["gmsh:geometrical"] = tags
+    return mesh
+
+
+def cases(writers: list[str] | None = None) -> list[dict]:
+    """All writer and option combinations of the built-in formats."""
+    out = []
+    for format_name, spec in meshio._formats.builtin_formats.items():
+        extension = spec["extensions"][0] if spec["extensions"] else ".out"
+        for writer in spec.get("writers", [format_name]):
+            if writers is not None and writer not in writers:
+                continue
+            for options in WRITER_OPTIONS.get(writer, [{}]):
+                name = writer
+                if options:
+                    name += "[" + ",".join(f"{k}={v}" for k, v in options.items()) + "]"
+                out.append(
+                    {
+                        "case": name,
+                        "writer": writer,
+                        "format": format_name if spec.get("reader", True) else None,
+                        "extension": extension,
+                        "options": options,
+                        "surface": format_name in SURFACE_FORMATS,
+                    }
+                )
+    return out
+
+
+def _measure(fun, setup, repeat: int, memory: bool):
+    """Minimum wall time of `fun(setup())` over `repeat` runs and the peak memory of
+    one more run.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        fun(arg)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        arg = setup()
+        tracemalloc.start()
+        try:
+            fun(arg)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def run_case(case: dict, mesh: meshio.Mesh, repeat: int = 3, memory: bool = True):
+    result = {
+        "case": case["case"],
+        "num_points": len(mesh.points),
+        "num_cells": sum(len(c) for c in mesh.cells),
+    }
+    if case["writer"] in SKIP:
+        result["error"] = f"skipped: {SKIP[case['writer']]}"
+        return result
+    if case["format"] == "gmsh":
+        mesh = _add_gmsh_tags(mesh)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = pathlib.Path(tmpdir) / ("out" + case["extension"])
+        try:
+            result["write_time"], result["write_peak_memory"] = _measure(
+                lambda m: meshio.write(
+                    filename, m, file_format=case["writer"], **case["options"]
+                ),
+                # some writers modify the mesh
+                mesh.copy,
+                repeat,
+                memory,
+            )
+            # all files the writer created, e.g., the HDF5 file of XDMF
+            result["file_size"] = sum(
+                os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir)
+            )
+            if case["format"] is not None:
+                result["read_time"], result["read_peak_memory"] = _measure(
+                    lambda _: meshio.read(filename, file_format=case["format"]),
+                    lambda: None,
+                    repeat,
+                    memory,
+                )
+        except Exception as e:
+            # formats that can't hold the mesh, missing optional dependencies etc.
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+    mb = result["file_size"] / 2**20
+    for key in ["write", "read"]:
+        if result.get(f"{key}_time"):
+            result[f"{key}_throughput"] = mb / result[f"{key}_time"]
+    return result
+
+
+def run(sizes, writers=None, repeat: int = 3, memory: bool = True, verbose=False):
+    results = []
+    for num_cells in sizes:
+        meshes = {}
+        for case in cases(writers):
+            if case["surface"] not in meshes:
+                make = surface_mesh if case["surface"] else volume_mesh
+                meshes[case["surface"]] = make(num_cells)
+            result = run_case(case, meshes[case["surface"]], repeat, memory)
+            if verbose:
+                _print_result(result)
+            results.append(result)
+    return {
+        "meta": {
+            "meshio": meshio.__version__,
+            "numpy": np.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: dict,
+    baseline: dict | None = None,
+    tolerance: float = 1.25,
+    scaling_tolerance: float = 1.5,
+    min_time: float = 0.01,
+) -> list[str]:
+    """Regressions of `results`: cases which got slower than `tolerance` times the
+    baseline, and cases whose time per cell grows by more than `scaling_tolerance`
+    from the smallest to the largest mesh. Times below `min_time` seconds are too
+    noisy to compare.
+    """
+    findings = []
+    keys = ["write_time", "read_time"]
+
+    if baseline is not None:
+        base = {(r["case"], r["num_cells"]): r for r in baseline["results"]}
+        for r in results["results"]:
+            b = base.get((r["case"], r["num_cells"]))
+            if b is None:
+                continue
+            for key in keys:
+                if key not in r or key not in b or r[key] < min_time:
+                    continue
+                if r[key] > tolerance * b[key]:
+                    findings.append(
+                        f"{r['case']} ({r['num_cells']} cells): {key} {r[key]:.3g} s, "
+                        f"baseline {b[key]:.3g} s"
+                    )
+
+    by_case = {}
+    for r in results["results"]:
+        by_case.setdefault(r["case"], []).append(r)
+    for case, rs in by_case.items():
+        rs = sorted(rs, key=lambda r: r["num_cells"])
+        small, large = rs[0], rs[-1]
+        if large["num_cells"] <= small["num_cells"]:
+            continue
+        for key in keys:
+            if key not in small or key not in large or large[key] < min_time:
+                continue
+            growth = (large[key] / small[key]) / (
+                large["num_cells"] / small["num_cells"]
+            )
+            if growth > scaling_tolerance:
+                findings.append(
+                    f"{case}: {key} per cell grows {growth:.2f}x from "
+                    f"{small['num_cells']} to {large['num_cells']} cells"
+                )
+    return findings
+
+
+def _print_result(r):
+    if "error" in r:
+        print(f"{r['case']:<44} {r['num_cells']:>9}  {r['error']}")
+        return
+
+    def fmt(value, scale=1.0):
+        return "-" if value is None else f"{value / scale:10.3f}"
+
+    print(
+        f"{r['case']:<44} {r['num_cells']:>9}"
+        f" {fmt(r['write_time'])} {fmt(r.get('read_time'))}"
+        f" {fmt(r.get('write_throughput'))} {fmt(r.get('read_throughput'))}"
+        f" {fmt(r['file_size'], 2**20)}"
+        f" {fmt(r['write_peak_memory'], 2**20)} {fmt(r.get('read_peak_memory'), 2**20)}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=lambda s: int(float(s)),
+        default=[10_000],
+        help="approximate numbers of cells (default: 1e4)",
+    )
+    parser.add_argument("--writers", nargs="+", help="writers to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="don't measure peak memory"
+    )
+    parser.add_argument("--output", "-o", help="JSON file for the results")
+    parser.add_argument("--baseline", "-b", help="JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="maximum ratio of times to the baseline (default: 1.25)",
+    )
+    parser.add_argument(
+        "--scaling-tolerance",
+        type=float,
+        default=1.5,
+        help="maximum growth of the time per cell over the sizes (default: 1.5)",
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'case':<44} {'cells':>9} {'write (s)':>10} {'read (s)':>10}"
+        f" {'w (MB/s)':>10} {'r (MB/s)':>10} {'size (MB)':>10}"
+        f" {'w mem (MB)':>10} {'r mem (MB)':>10}"
+    )
+    results = run(args.sizes, args.writers, args.repeat, not args.no_memory, True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    findings = compare(results, baseline, args.tolerance, args.scaling_tolerance)
+    for finding in findings:
+        print(finding)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -76,3 +76,22 @@ def test_elset(tmp_path):
     for k, v in mesh_ref.cell_sets.items():
         for ic in range(len(mesh_ref.cells)):
             assert np.allclose(v[ic], mesh.cell_sets[k][ic])
+
+
+def test_node_ids(tmp_path):
+    # node IDs which aren't 1, 2, ...
+    filepath = tmp_path / "test.inp"
+    filepath.write_text(
+        "*NODE\n"
+        "10, 0.0, 0.0, 0.0\n"
+        "20, 1.0, 0.0, 0.0\n"
+        "5, 0.0, 1.0, 0.0\n"
+        "*ELEMENT, TYPE=S3\n"
+        "1, 10, 20, 5\n"
+        "2, 5, 20, 10\n"
+        "*NSET, NSET=N\n"
+        "5, 20\n"
+    )
+    mesh = meshio.abaqus.read(filepath)
+    assert np.array_equal(mesh.cells[0].data, [[0, 1, 2], [2, 1, 0]])
+    assert np.array_equal(mesh.point_sets["N"], [2, 1])
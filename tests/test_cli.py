@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 import meshio
 
@@ -18,6 +19,7 @@ def test_info(tmp_path):
     infile = tmp_path / "out.msh"
     meshio.write(infile, helpers.tri_mesh, file_format="gmsh")
     meshio._cli.main(["info", str(infile), "--input-format", "gmsh"])
+    meshio._cli.main(["info", str(infile), "--validate"])
 
 
 def test_convert(tmp_path):
@@ -50,6 +52,46 @@ def test_convert(tmp_path):
         assert np.allclose(cells0.data, cells1.data)
 
 
+def test_convert_many(tmp_path, capsys):
+    for k in range(3):
+        meshio.write(tmp_path / f"in{k}.vtu", helpers.tri_mesh)
+    (tmp_path / "in3.vtu").write_text("not a mesh")
+
+    outfile = str(tmp_path / "out" / "{stem}.vtk")
+    (tmp_path / "out").mkdir()
+    args = ["convert", str(tmp_path / "in*.vtu"), outfile, "--jobs", "2"]
+    assert meshio._cli.main(args) == 1
+
+    for k in range(3):
+        mesh = meshio.read(tmp_path / "out" / f"in{k}.vtk")
+        assert is_same_mesh(helpers.tri_mesh, mesh, atol=1.0e-15)
+    assert not (tmp_path / "out" / "in3.vtk").exists()
+
+    # patterns that don't match anything are reported
+    args = ["convert", str(tmp_path / "none*.vtu"), outfile]
+    assert meshio._cli.main(args) == 1
+    assert "no input files match" in capsys.readouterr().err
+
+    # several input files need an output template
+    infiles = [str(tmp_path / f"in{k}.vtu") for k in range(2)]
+    assert meshio._cli.main(["convert", *infiles, str(tmp_path / "out.vtk")]) == 1
+
+
+@pytest.mark.parametrize("jobs", [[], ["-j", "1"]])
+def test_convert_int_data_to_sets(jobs, tmp_path):
+    mesh = helpers.add_point_data(helpers.tri_mesh, 1, dtype=int)
+    mesh = helpers.add_cell_data(mesh, [("c", (), int)])
+    infile = tmp_path / "in.vtu"
+    meshio.write(infile, mesh)
+
+    # Abaqus keeps the sets
+    outfile = tmp_path / "out.inp"
+    assert not meshio._cli.main(["convert", "-d", *jobs, str(infile), str(outfile)])
+    out = meshio.read(outfile)
+    assert len(out.point_sets) > 0
+    assert len(out.cell_sets) > 0
+
+
 def test_compress(tmp_path):
     input_mesh = helpers.tri_mesh
 
@@ -1,5 +1,7 @@
+import io
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 import meshio
@@ -44,3 +46,721 @@ def test_write_buffer(mesh, tmpdir):
     with open(tmp_path, "w") as f:
         meshio.write(f, mesh, "ply")
     assert Path(tmp_path).is_file()
+
+
+@pytest.mark.parametrize(
+    "file_format, kwargs",
+    [
+        ("gmsh", {}),
+        ("ansys", {}),
+        ("vtk", {}),
+        ("vtu", {}),
+        ("xdmf", {}),
+        ("stl", {"binary": True}),
+        ("stl", {"binary": False}),
+        ("ply", {}),
+        ("medit", {}),
+        ("abaqus", {}),
+        ("h5m", {}),
+        ("exodus", {}),
+    ],
+)
+def test_sniff(file_format, kwargs, tmp_path):
+    from . import helpers
+
+    filename = tmp_path / "mesh.unknown"
+    meshio.write(filename, helpers.tri_mesh, file_format=file_format, **kwargs)
+    assert meshio._helpers._filetype_from_file(filename) == file_format
+    meshio.read(filename)
+
+
+@pytest.mark.parametrize("file_format", ["ansys", "gmsh"])
+def test_sniff_ambiguous_extension(file_format, tmp_path):
+    from . import helpers
+
+    filename = tmp_path / "mesh.msh"
+    meshio.write(filename, helpers.tri_mesh, file_format=file_format)
+    assert meshio._helpers._filetype_from_file(filename) == file_format
+
+
+def test_sniff_fail(tmp_path):
+    filename = tmp_path / "mesh.unknown"
+    filename.write_text("some text")
+    with pytest.raises(meshio.ReadError):
+        meshio.read(filename)
+
+    # no sys.exit() if the reader fails
+    filename = tmp_path / "mesh.msh"
+    filename.write_text("some text")
+    with pytest.raises(meshio.ReadError):
+        meshio.read(filename)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "mesh.inp.gz",
+        "mesh.obj.bz2",
+        "mesh.ply.xz",
+        "mesh.msh.gz",
+        "mesh.vtk.xz",
+        "mesh.vtu.bz2",
+        "mesh.stl.gz",
+        "mesh.meshb.gz",
+        "mesh.h5m.gz",
+    ],
+)
+def test_compression(filename, tmp_path):
+    from . import helpers
+
+    mesh = helpers.tri_mesh
+    filename = tmp_path / filename
+    meshio.write(filename, mesh)
+    assert meshio._files.compression_from_head(filename.read_bytes()) is not None
+    out = meshio.read(filename)
+    assert np.allclose(out.points[:, :2], mesh.points[:, :2])
+    assert np.array_equal(out.get_cells_type("triangle"), mesh.cells[0].data)
+
+
+def test_compression_xdmf(tmp_path):
+    import gzip
+
+    from . import helpers
+
+    pytest.importorskip("h5py")
+
+    mesh = helpers.add_point_data(helpers.tri_mesh, 1)
+    # the data is inline by default, there's no HDF5 file to lose
+    filename = tmp_path / "mesh.xdmf.gz"
+    meshio.write(filename, mesh)
+    assert list(tmp_path.iterdir()) == [filename]
+    out = meshio.read(filename)
+    assert np.allclose(out.points, mesh.points)
+    assert np.allclose(out.point_data["a"], mesh.point_data["a"])
+
+    with pytest.raises(meshio.WriteError):
+        meshio.write(filename, mesh, data_format="HDF")
+
+    # HDF5 files are found next to the compressed XDMF file
+    meshio.write(tmp_path / "hdf.xdmf", mesh, data_format="HDF")
+    filename = tmp_path / "hdf.xdmf.gz"
+    filename.write_bytes(gzip.compress((tmp_path / "hdf.xdmf").read_bytes()))
+    (tmp_path / "hdf.xdmf").unlink()
+    out = meshio.read(filename)
+    assert np.allclose(out.point_data["a"], mesh.point_data["a"])
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "hdf.h5",
+        "hdf.xdmf.gz",
+        "mesh.xdmf.gz",
+    ]
+
+
+def test_compression_multiple_files(tmp_path):
+    from . import helpers
+
+    with pytest.raises(meshio.WriteError):
+        meshio.write(tmp_path / "mesh.node.gz", helpers.tet_mesh)
+
+    mesh = helpers.add_cell_data(helpers.tri_mesh, [("a", (), np.float64)])
+    with pytest.raises(meshio.WriteError):
+        meshio.write(tmp_path / "mesh.xml.gz", mesh, file_format="dolfin-xml")
+
+
+def test_compression_spill(tmp_path, monkeypatch):
+    from . import helpers
+
+    # a file which doesn't fit into the in-memory buffer
+    monkeypatch.setattr(meshio._files, "_SPILL_SIZE", 100)
+    meshio.write(tmp_path / "mesh.post.gz", helpers.tri_mesh)
+    out = meshio.read(tmp_path / "mesh.post.gz")
+    assert np.allclose(out.points, helpers.tri_mesh.points)
+
+
+def test_compression_magic(tmp_path):
+    import gzip
+
+    from . import helpers
+
+    # a compressed file without a compression suffix
+    filename = tmp_path / "mesh.vtk"
+    meshio.write(filename, helpers.tri_mesh)
+    filename.write_bytes(gzip.compress(filename.read_bytes()))
+    out = meshio.read(filename)
+    assert np.allclose(out.points, helpers.tri_mesh.points)
+
+
+def test_compression_zstd(tmp_path):
+    pytest.importorskip("zstandard")
+    from . import helpers
+
+    filename = tmp_path / "mesh.obj.zst"
+    meshio.write(filename, helpers.tri_mesh)
+    out = meshio.read(filename)
+    assert np.allclose(out.points[:, :2], helpers.tri_mesh.points[:, :2])
+
+
+def _is_memory_mapped(arr) -> bool:
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = getattr(arr, "base", None)
+    return False
+
+
+@pytest.mark.parametrize(
+    "filename,file_format,kwargs,mapped_points",
+    [
+        ("mesh.stl", "stl", {"binary": True}, False),
+        ("mesh.vtk", "vtk42", {"binary": True}, True),
+        ("mesh.vtk", "vtk", {"binary": True}, True),
+        ("mesh.msh", "gmsh22", {"binary": True}, False),
+        ("mesh.msh", "gmsh", {"binary": True}, False),
+        ("mesh.lb8.ugrid", "ugrid", {}, True),
+        ("mesh.meshb", "medit", {}, True),
+    ],
+)
+def test_mmap(filename, file_format, kwargs, mapped_points, tmp_path):
+    from . import helpers
+
+    mesh = helpers.tri_mesh
+    filename = tmp_path / filename
+    meshio.write(filename, mesh, file_format=file_format, **kwargs)
+    ref = meshio.read(filename)
+    out = meshio.read(filename, mmap=True)
+    assert _is_memory_mapped(out.points) == mapped_points
+    assert np.array_equal(out.points, ref.points)
+    assert len(out.cells) == len(ref.cells)
+    for block, ref_block in zip(out.cells, ref.cells):
+        assert block.type == ref_block.type
+        assert np.array_equal(block.data, ref_block.data)
+
+
+@pytest.mark.parametrize(
+    "filename,kwargs",
+    [
+        ("mesh.vtu", {}),
+        ("mesh.vtu", {"compression": None}),
+        ("mesh.vtu", {"compression": "lzma", "jobs": 2}),
+        ("mesh.vtk", {}),
+        ("mesh.vtk", {"binary": False}),
+        ("mesh.msh", {}),
+        ("mesh.msh", {"binary": False}),
+        ("mesh.xdmf", {}),
+    ],
+)
+def test_open_writer(filename, kwargs, tmp_path):
+    from . import helpers
+
+    if filename.endswith(".xdmf"):
+        pytest.importorskip("h5py")
+
+    mesh = helpers.tri_quad_mesh
+    num_cells = sum(len(c) for c in mesh.cells)
+    cell_data = np.arange(3.0 * num_cells).reshape(-1, 3)
+    filename = tmp_path / filename
+    with meshio.open_writer(filename, **kwargs) as writer:
+        for k in range(0, len(mesh.points), 3):
+            points = mesh.points[k : k + 3]
+            writer.add_points(points)
+            writer.add_point_data("a", np.arange(k, k + len(points)))
+        for cell_block in mesh.cells:
+            for cells in np.array_split(cell_block.data, 2):
+                writer.add_cells(cell_block.type, cells)
+        writer.add_cell_data("b", cell_data[:2])
+        writer.add_cell_data("b", cell_data[2:])
+
+    out = meshio.read(filename)
+    assert np.allclose(out.points, mesh.points)
+    assert [c.type for c in out.cells] == [c.type for c in mesh.cells]
+    for block, ref_block in zip(out.cells, mesh.cells):
+        assert np.array_equal(block.data, ref_block.data)
+    assert np.allclose(out.point_data["a"], np.arange(len(mesh.points)))
+    assert np.allclose(np.concatenate(out.cell_data["b"]), cell_data)
+    # no temporary files left behind
+    assert sorted(p.suffix for p in tmp_path.iterdir()) in (
+        [".h5", ".xdmf"],
+        [filename.suffix],
+    )
+
+
+@pytest.mark.parametrize(
+    "filename,kwargs,in_place",
+    [
+        ("mesh.vtu", {}, False),
+        ("mesh.vtu", {"compression": None}, True),
+        ("mesh.vtk", {}, False),
+        ("mesh.msh", {}, True),
+        ("mesh.msh", {"binary": False}, True),
+    ],
+)
+def test_open_writer_order(filename, kwargs, in_place, tmp_path):
+    from . import helpers
+
+    mesh = helpers.tri_quad_mesh
+    point_data = np.arange(len(mesh.points))
+    filename = tmp_path / filename
+
+    # in file order, some formats need no temporary files
+    with meshio.open_writer(filename, **kwargs) as writer:
+        writer.add_points(mesh.points[:3])
+        writer.add_points(mesh.points[3:])
+        for cell_block in mesh.cells:
+            writer.add_cells(cell_block.type, cell_block.data)
+        writer.add_point_data("a", point_data)
+        assert (list(tmp_path.iterdir()) == [filename]) == in_place
+
+    out = meshio.read(filename)
+    assert np.allclose(out.points, mesh.points)
+    assert np.array_equal(out.point_data["a"], point_data)
+
+    # against file order
+    with meshio.open_writer(filename, **kwargs) as writer:
+        writer.add_point_data("a", point_data[:2])
+        writer.add_cells(mesh.cells[0].type, mesh.cells[0].data)
+        writer.add_points(mesh.points[:3])
+        writer.add_point_data("a", point_data[2:])
+        writer.add_cells(mesh.cells[1].type, mesh.cells[1].data)
+        writer.add_points(mesh.points[3:])
+
+    out = meshio.read(filename)
+    assert np.allclose(out.points, mesh.points)
+    for block, ref_block in zip(out.cells, mesh.cells):
+        assert np.array_equal(block.data, ref_block.data)
+    assert np.array_equal(out.point_data["a"], point_data)
+    assert list(tmp_path.iterdir()) == [filename]
+
+
+def test_open_writer_errors(tmp_path):
+    filename = tmp_path / "mesh.vtu"
+    with pytest.raises(meshio.WriteError):
+        with meshio.open_writer(filename) as writer:
+            writer.add_points(np.zeros((3, 3)))
+            writer.add_cells("triangle", [[0, 1, 2]])
+            writer.add_point_data("a", np.zeros(2))
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(meshio.WriteError):
+        with meshio.open_writer(tmp_path / "mesh.vtu") as writer:
+            writer.add_cells("triangle", [[0, 1]])
+
+    with pytest.raises(meshio.WriteError):
+        meshio.open_writer(tmp_path / "mesh.stl")
+
+    with pytest.raises(meshio.WriteError):
+        meshio.open_writer(tmp_path / "mesh.vtu", binary=False)
+
+
+def test_open_writer_keeps_file(tmp_path):
+    pytest.importorskip("h5py")
+
+    # an error before the output file is opened leaves an existing file alone
+    filename = tmp_path / "mesh.xdmf"
+    filename.write_text("previous")
+    with pytest.raises(meshio.WriteError):
+        with meshio.open_writer(filename) as writer:
+            writer.add_points(np.zeros((3, 4)))
+    assert filename.read_text() == "previous"
+
+
+@pytest.mark.parametrize(
+    "filename,file_format,kwargs",
+    [
+        ("mesh.msh", "gmsh", {"binary": True}),
+        ("mesh.msh", "gmsh22", {"binary": True}),
+        ("mesh.vtk", "vtk", {"binary": True}),
+        ("mesh.vtk", "vtk", {"binary": False}),
+        ("mesh.vtk", "vtk42", {"binary": True}),
+        ("mesh.inp", "abaqus", {}),
+        ("mesh.inp.gz", "abaqus", {}),
+        ("mesh.vtu", "vtu", {}),
+    ],
+)
+def test_iter_blocks(filename, file_format, kwargs, tmp_path):
+    from . import helpers
+
+    mesh = helpers.tri_quad_mesh
+    if file_format.startswith("gmsh"):
+        # Gmsh needs entity information for more than one cell block
+        mesh = helpers.tri_mesh
+    filename = tmp_path / filename
+    meshio.write(filename, mesh, file_format=file_format, **kwargs)
+    ref = meshio.read(filename)
+
+    points = []
+    cells = []
+    for kind, _, data in meshio.iter_blocks(filename, chunk_size=1):
+        assert len(data) <= 1
+        if kind == "points":
+            points.append(data)
+        elif kind == "cells":
+            cells.append(data)
+
+    assert np.allclose(np.concatenate(points), ref.points)
+    assert [c.type for c in cells] == [c.type for c in ref.cells for _ in range(len(c))]
+    assert np.array_equal(
+        np.concatenate([c.data.flatten() for c in cells]),
+        np.concatenate([c.data.flatten() for c in ref.cells]),
+    )
+
+
+def test_iter_blocks_data(tmp_path):
+    from . import helpers
+
+    mesh = helpers.add_point_data(helpers.tri_quad_mesh, 1)
+    mesh = helpers.add_cell_data(mesh, [("a", (3,), np.float64)])
+    filename = tmp_path / "mesh.vtk"
+    meshio.write(filename, mesh)
+
+    point_data = {}
+    cell_data = {}
+    for kind, name, data in meshio.iter_blocks(filename, chunk_size=2):
+        if kind == "point_data":
+            point_data.setdefault(name, []).append(data)
+        elif kind == "cell_data":
+            cell_data.setdefault(name, []).append(data)
+
+    for name, data in mesh.point_data.items():
+        assert np.allclose(np.concatenate(point_data[name]), data)
+    assert np.allclose(
+        np.concatenate(cell_data["a"]), np.concatenate(mesh.cell_data["a"])
+    )
+
+
+@pytest.mark.parametrize("filename", ["mesh.vtu", "mesh.xdmf", "mesh.e", "mesh.vtk"])
+def test_read_select(filename, tmp_path):
+    from . import helpers
+
+    if filename.endswith((".xdmf", ".e")):
+        pytest.importorskip("h5py" if filename.endswith(".xdmf") else "netCDF4")
+
+    mesh = helpers.tri_mesh.copy()
+    mesh.point_data = {"a": np.arange(4.0), "b": np.ones(4)}
+    mesh.cell_data = {"c": [np.arange(2.0)], "d": [np.ones(2)]}
+    filename = tmp_path / filename
+    meshio.write(filename, mesh)
+
+    out = meshio.read(filename, point_data="a", cell_data=lambda name: name != "c")
+    assert list(out.point_data) == ["a"]
+    assert np.allclose(out.point_data["a"], mesh.point_data["a"])
+    assert set(out.cell_data) <= {"d"}
+
+    out = meshio.read(filename, point_data=[], cell_data=[])
+    assert out.point_data == {}
+    assert out.cell_data == {}
+
+
+@pytest.mark.parametrize(
+    "filename, kwargs",
+    [
+        ("mesh.vtu", {}),
+        ("mesh.xdmf", {}),
+        ("mesh.msh", {}),
+        ("mesh.msh", {"binary": False}),
+        ("mesh.vtk", {}),
+        ("mesh.vtk", {"binary": False}),
+        ("mesh.vtk", {"file_format": "vtk42"}),
+        ("mesh.mesh", {}),
+    ],
+)
+def test_probe(filename, kwargs, tmp_path):
+    from meshio._probe import MeshInfo
+
+    from . import helpers
+
+    if filename.endswith(".xdmf"):
+        pytest.importorskip("h5py")
+
+    mesh = helpers.tri_quad_mesh.copy()
+    if "binary" not in kwargs or filename.endswith(".vtk"):
+        # the ASCII gmsh files only get the mesh
+        mesh = helpers.add_point_data(mesh, 3)
+        mesh = helpers.add_cell_data(mesh, [("c", (), np.float64)])
+    filename = tmp_path / filename
+    meshio.write(filename, mesh, **kwargs)
+
+    info = meshio.probe(filename)
+    ref = MeshInfo.from_mesh(meshio.read(filename), info.file_format, info.version)
+    assert info.num_points == ref.num_points
+    assert info.cells == ref.cells
+    assert info.num_cells == sum(len(c) for c in mesh.cells)
+    assert info.point_data == ref.point_data
+    assert info.cell_data == ref.cell_data
+    assert info.field_data == ref.field_data
+    assert info.cell_sets == ref.cell_sets
+    # plain ints, so that `meshio info` prints them as such
+    assert type(info.num_points) is int
+    assert all(type(n) is int for _, n in info.cells)
+    for data in [info.point_data, info.cell_data, info.field_data]:
+        assert all(type(n) is int for shape, _ in data.values() for n in shape)
+    if info.file_format == "vtu":
+        # the version attribute of VTU files is the one of the XML layout
+        assert info.version is None
+
+
+def test_profile(tmp_path):
+    import json
+
+    from . import helpers
+
+    filename = tmp_path / "mesh.vtu"
+    with meshio.profile() as recorder:
+        meshio.write(filename, helpers.tri_mesh)
+        meshio.read(filename)
+    assert meshio._profile._profiler is None
+
+    names = [span.name for span in recorder.spans]
+    assert {"write", "read", "reader", "vtu:decompress", "mesh:validate"} <= set(names)
+    # nested spans are reported first
+    assert names.index("reader") < names.index("read")
+    read_span = recorder.spans[names.index("read")]
+    assert read_span.info["filename"] == str(filename)
+
+    trace = json.loads(recorder.to_chrome_trace())
+    assert len(trace["traceEvents"]) == len(names)
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    assert len(json.loads(recorder.to_json())) == len(names)
+
+    spans = []
+    assert meshio.set_profiler(spans.append) is None
+    try:
+        meshio.read(filename)
+    finally:
+        assert meshio.set_profiler(None) == spans.append
+    assert spans[-1].name == "read"
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_read_many(tmp_path, processes):
+    from . import helpers
+
+    filenames = []
+    for k in range(5):
+        filenames.append(tmp_path / f"in{k}.vtu")
+        mesh = helpers.tri_mesh.copy()
+        mesh.points = mesh.points + k
+        meshio.write(filenames[-1], mesh)
+    filenames.append(tmp_path / "missing.vtu")
+
+    results = list(meshio.read_many(filenames, jobs=2, processes=processes))
+    assert sorted(r[0] for r in results) == sorted(filenames)
+    for filename, mesh, error in results:
+        if filename.name == "missing.vtu":
+            assert mesh is None
+            assert isinstance(error, meshio.ReadError)
+        else:
+            assert error is None
+            k = int(filename.stem[2:])
+            assert np.allclose(mesh.points, helpers.tri_mesh.points + k)
+
+    # bounded concurrency: a consumer that stops early
+    for _ in meshio.read_many(filenames, jobs=1):
+        break
+
+
+def test_convert_many(tmp_path):
+    from . import helpers
+
+    for k in range(3):
+        meshio.write(tmp_path / f"in{k}.vtu.gz", helpers.tri_mesh)
+    infiles = sorted(tmp_path.glob("in*.vtu.gz"))
+
+    results = list(meshio.convert_many(infiles, str(tmp_path / "{stem}.mesh"), jobs=2))
+    assert sorted(outfile for _, outfile, _ in results) == [
+        str(tmp_path / f"in{k}.mesh") for k in range(3)
+    ]
+    assert all(error is None for _, _, error in results)
+    mesh = meshio.read(tmp_path / "in1.mesh")
+    assert np.allclose(mesh.points, helpers.tri_mesh.points)
+
+    with pytest.raises(ValueError):
+        list(meshio.convert_many(infiles, str(tmp_path / "out.vtk")))
+
+
+def test_aread_awrite(tmp_path):
+    import asyncio
+
+    from . import helpers
+
+    class AsyncFile:
+        def __init__(self, data=b""):
+            self.data = data
+
+        async def read(self, size=-1):
+            size = len(self.data) if size < 0 else size
+            chunk, self.data = self.data[:size], self.data[size:]
+            return chunk
+
+        async def write(self, chunk):
+            self.data += chunk
+
+    async def chunks(data):
+        for k in range(0, len(data), 100):
+            yield data[k : k + 100]
+
+    async def main():
+        filename = tmp_path / "out.vtu"
+        await meshio.awrite(filename, helpers.tri_mesh)
+        mesh = await meshio.aread(filename)
+        assert np.allclose(mesh.points, helpers.tri_mesh.points)
+
+        f = AsyncFile()
+        await meshio.awrite(f, helpers.tri_mesh, file_format="gmsh", binary=True)
+        meshes = await asyncio.gather(
+            meshio.aread(AsyncFile(f.data)),
+            meshio.aread(chunks(f.data), file_format="gmsh"),
+        )
+        for mesh in meshes:
+            assert np.allclose(mesh.points, helpers.tri_mesh.points)
+
+        # XDMF is written with its data inline
+        f = AsyncFile()
+        await meshio.awrite(f, helpers.tri_mesh, file_format="xdmf")
+        mesh = meshio.read(io.BytesIO(f.data), file_format="xdmf")
+        assert np.allclose(mesh.points, helpers.tri_mesh.points)
+
+        with pytest.raises(meshio.WriteError):
+            await meshio.awrite(AsyncFile(), helpers.tri_mesh)
+        mesh = helpers.add_cell_data(helpers.tri_mesh, [("a", (), np.int32)])
+        with pytest.raises(meshio.WriteError):
+            await meshio.awrite(AsyncFile(), mesh, file_format="dolfin-xml")
+
+    asyncio.run(main())
+
+
+def test_cancellable(tmp_path):
+    import threading
+
+    from . import helpers
+
+    filename = tmp_path / "out.vtu"
+    meshio.write(filename, helpers.tri_mesh)
+
+    cancelled = threading.Event()
+    with meshio._profile.cancellable(cancelled):
+        meshio.read(filename)
+        cancelled.set()
+        with pytest.raises(meshio._profile.Cancelled):
+            meshio.read(filename)
+    # other reads aren't affected
+    meshio.read(filename)
+
+
+@pytest.mark.parametrize(
+    "file_format,kwargs",
+    [
+        ("vtu", {}),
+        ("vtk", {}),
+        ("gmsh", {"binary": True}),
+        ("xdmf", {}),
+        ("exodus", {}),
+        ("med", {}),
+        ("h5m", {}),
+        ("abaqus", {}),
+        ("ply", {"binary": True}),
+        ("stl", {"binary": True}),
+    ],
+)
+def test_bytes(file_format, kwargs):
+    from . import helpers
+
+    data = meshio.write_bytes(helpers.tri_mesh, file_format, **kwargs)
+    assert isinstance(data, bytes)
+
+    for file_format_ in [file_format, None]:
+        mesh = meshio.read(data, file_format=file_format_)
+        assert np.allclose(mesh.points, helpers.tri_mesh.points)
+        assert np.array_equal(mesh.cells[0].data, helpers.tri_mesh.cells[0].data)
+
+    mesh = meshio.read(io.BytesIO(data))
+    assert np.allclose(mesh.points, helpers.tri_mesh.points)
+
+
+def test_memory_file():
+    with meshio._files.memory_file("test.txt", b"abc") as path:
+        with open(path, "rb") as f:
+            assert f.read() == b"abc"
+        with open(path, "wb") as f:
+            f.write(b"defg")
+        with open(path, "rb") as f:
+            assert f.read() == b"defg"
+
+
+def test_parse_ascii():
+    from meshio._common import parse_numbers, parse_ragged, parse_table
+
+    a = parse_numbers(["1, 2.5,", "", "-3e2, 4"], delimiter=",")
+    assert np.array_equal(a, [1.0, 2.5, -300.0, 4.0])
+    assert parse_numbers([], int).shape == (0,)
+
+    a = parse_table(["1 2 3", "4 5", "6"], 3, int)
+    assert np.array_equal(a, [[1, 2, 3], [4, 5, 6]])
+    with pytest.raises(meshio.ReadError):
+        parse_table(["1 2 3", "4"], 3, int)
+    with pytest.raises(meshio.ReadError):
+        parse_numbers("1 two 3", int)
+
+    values, offsets = parse_ragged(
+        ["3 1 2 3\n", "\n", "\t4 1 2 3 4", "2, 5, 6"], delimiter=","
+    )
+    assert np.array_equal(values, [3, 1, 2, 3, 4, 1, 2, 3, 4, 2, 5, 6])
+    assert np.array_equal(offsets, [0, 4, 4, 9, 12])
+
+
+def test_write_table():
+    import io
+
+    from meshio._common import format_numbers, write_table
+
+    f = io.StringIO()
+    write_table(f, np.array([[0.1, 2.0], [3.0, 4e-7]]), "v %r %r\n")
+    assert f.getvalue() == "v 0.1 2.0\nv 3.0 4e-07\n"
+
+    f = io.BytesIO()
+    write_table(
+        f,
+        [np.array([1, 2]), np.array(["a", "b"]), np.array([0.5, 1.5])],
+        "%d %s %.1f\n",
+    )
+    assert f.getvalue() == b"1 a 0.5\n2 b 1.5\n"
+
+    # many chunks
+    f = io.StringIO()
+    data = np.arange(300000)
+    write_table(f, data, "%d\n")
+    assert np.array_equal(np.fromstring(f.getvalue(), dtype=int, sep=" "), data)
+
+    assert format_numbers([1.0, 0.25], "%.2e") == ["1.00e+00", "2.50e-01"]
+
+
+def test_benchmark():
+    import json
+
+    from . import benchmark
+
+    results = benchmark.run([200], writers=["vtu", "vtk"], repeat=1)
+    cases = [r["case"] for r in results["results"]]
+    assert "vtu[compression=zlib]" in cases
+    assert "vtk[binary=False]" in cases
+    for r in results["results"]:
+        assert "error" not in r
+        assert r["file_size"] > 0
+        assert r["write_peak_memory"] > 0
+
+    assert benchmark.compare(results, results, min_time=0.0) == []
+
+    slower = json.loads(json.dumps(results))
+    for r in slower["results"]:
+        r["read_time"] *= 2
+    findings = benchmark.compare(slower, results, min_time=0.0)
+    assert len(findings) == len(cases)
+    assert all("read_time" in finding for finding in findings)
+
+    # quadratic growth of the time with the number of cells
+    larger = json.loads(json.dumps(results["results"]))
+    for r in larger:
+        r["num_cells"] *= 10
+        r["write_time"] *= 100
+        r["read_time"] *= 100
+    results["results"] += larger
+    findings = benchmark.compare(results, min_time=0.0)
+    assert len(findings) == 2 * len(cases)
@@ -25,6 +25,46 @@ def test_cells_dict():
     assert_equal(mesh.cell_data_dict, {"a": {"triangle": [0.5, 1.3]}})
 
 
+def test_cells_dict_cache():
+    mesh = meshio.Mesh(
+        [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]],
+        [("triangle", [[0, 1, 2]]), ("line", [[0, 1], [1, 2]])],
+        cell_data={"a": [[0.5], [1.3, 2.1]]},
+        cell_sets={"s": [[0], [1]]},
+    )
+    # single blocks aren't copied, but the views are read-only
+    assert np.shares_memory(mesh.cells_dict["triangle"], mesh.cells[0].data)
+    with pytest.raises(ValueError):
+        mesh.cells_dict["triangle"][0, 0] = 3
+    with pytest.raises(ValueError):
+        mesh.cell_data_dict["a"]["line"][0] = 3.0
+    with pytest.raises(ValueError):
+        mesh.cell_sets_dict["s"]["line"][0] = 1
+    # the mesh itself stays writable
+    mesh.cells[0].data[0, 0] = 3
+    assert mesh.cells_dict["triangle"][0, 0] == 3
+    mesh.cells[0].data[0, 0] = 0
+    # cached
+    assert mesh.cells_dict["triangle"] is mesh.cells_dict["triangle"]
+    assert mesh.cell_data_dict["a"]["line"] is mesh.cell_data_dict["a"]["line"]
+
+    # changes are detected
+    mesh.cells.append(meshio.CellBlock("triangle", [[0, 2, 3]]))
+    mesh.cell_data["a"] = [*mesh.cell_data["a"], np.array([7.0])]
+    mesh.cell_sets["s"] = [*mesh.cell_sets["s"], np.array([0])]
+    assert_equal(mesh.cells_dict["triangle"], [[0, 1, 2], [0, 2, 3]])
+    assert_equal(mesh.cell_data_dict["a"]["triangle"], [0.5, 7.0])
+    assert_equal(mesh.cell_sets_dict["s"]["triangle"], [0, 1])
+
+    mesh.cells[0] = meshio.CellBlock("triangle", [[1, 2, 3]])
+    assert_equal(mesh.cells_dict["triangle"], [[1, 2, 3], [0, 2, 3]])
+
+    # in-place modifications need an explicit refresh()
+    mesh.cells[0].data[0, 0] = 0
+    mesh.refresh()
+    assert_equal(mesh.cells_dict["triangle"], [[0, 2, 3], [0, 2, 3]])
+
+
 def test_sets_to_int_data():
     mesh = helpers.tri_mesh_5
     mesh = helpers.add_point_sets(mesh)
@@ -50,6 +90,20 @@ def test_sets_to_int_data():
     assert_equal(mesh.point_sets, {"fixed": [0, 1, 2], "loose": [3, 4, 5, 6]})
 
 
+def test_sets_to_int_data_overlap():
+    # points and cells in more than one set get the last one
+    mesh = meshio.Mesh(
+        [[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]],
+        {"triangle": [[0, 1, 2], [1, 2, 3], [0, 2, 3]]},
+        point_sets={"a": [0, 1, 2, 3], "b": [2, 3, 2], "c": [3, 0]},
+        cell_sets={"d": [[0, 1, 2]], "e": [[1]], "f": [[2, 1]]},
+    )
+    mesh.point_sets_to_data()
+    mesh.cell_sets_to_data()
+    assert_equal(mesh.point_data, {"a-b-c": [2, 0, 1, 2]})
+    assert_equal(mesh.cell_data, {"d-e-f": [[0, 2, 2]]})
+
+
 @pytest.mark.skip
 def test_sets_to_int_data_warning():
     mesh = meshio.Mesh(
@@ -106,3 +160,161 @@ def test_copy():
 
     assert np.all(mesh.points == mesh2.points)
     assert not np.may_share_memory(mesh.points, mesh2.points)
+
+
+def test_shallow_copy():
+    mesh = helpers.add_point_data(helpers.tri_mesh, 2)
+    mesh = helpers.add_cell_data(mesh, [("c", (), np.float64)])
+    mesh2 = mesh.copy(deep=False)
+
+    assert np.may_share_memory(mesh.points, mesh2.points)
+    assert np.may_share_memory(mesh.cells[0].data, mesh2.cells[0].data)
+    assert np.may_share_memory(mesh.point_data["a"], mesh2.point_data["a"])
+    assert np.may_share_memory(mesh.cell_data["c"][0], mesh2.cell_data["c"][0])
+
+    # in-place writes to the shared arrays aren't possible, through either mesh
+    with pytest.raises(ValueError):
+        mesh2.points[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        mesh2.cells[0].data[0, 0] = 1
+    with pytest.raises(ValueError):
+        mesh.points[0, 0] = 42.0
+    with pytest.raises(ValueError):
+        mesh.point_data["a"][0] = 1.0
+    with pytest.raises(ValueError):
+        mesh.cell_data["c"][0][0] = 1.0
+    assert np.all(mesh2.points == helpers.tri_mesh.points)
+
+    # replacing arrays in the original doesn't affect the copy
+    point_data = mesh2.point_data["a"].copy()
+    mesh.point_data["a"] = np.zeros(len(mesh.points))
+    assert np.all(mesh2.point_data["a"] == point_data)
+
+    # replacing arrays and modifying the containers doesn't affect the original
+    mesh2.points = mesh2.points + 1.0
+    mesh2.point_data["a"] = np.ones(len(mesh2.points))
+    mesh2.cell_data["d"] = [np.ones(2)]
+    mesh2.cells.append(meshio.CellBlock("line", [[0, 1]]))
+    assert np.all(mesh.points == helpers.tri_mesh.points)
+    assert np.all(mesh.point_data["a"] == 0.0)
+    assert "d" not in mesh.cell_data
+    assert len(mesh.cells) == 1
+
+
+def test_shallow_copy_lazy(tmp_path):
+    mesh = helpers.add_point_data(helpers.tri_mesh, 1)
+    filename = tmp_path / "test.vtu"
+    meshio.write(filename, mesh)
+    mesh = meshio.read(filename, lazy=True)
+    mesh2 = mesh.copy(deep=False)
+
+    # arrays loaded after the copy are read-only, too
+    with pytest.raises(ValueError):
+        mesh.point_data["a"][0] = 1.0
+    with pytest.raises(ValueError):
+        mesh2.point_data["a"][0] = 1.0
+
+
+def test_csr_cells():
+    polyhedra = [
+        [[0, 1, 2], [0, 1, 3], [1, 2, 3], [0, 2, 3]],
+        [[0, 1, 2, 3], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]],
+    ]
+    block = meshio.CellBlock("polyhedron5", polyhedra)
+    assert isinstance(block.data, meshio.CSRCells)
+    assert len(block) == 2
+    assert block.data.tolist() == polyhedra
+    assert_equal(block.data[1][0], [0, 1, 2, 3])
+
+    sub = block.data.take([1])
+    assert sub.tolist() == polyhedra[1:]
+    assert block.data[1:].tolist() == polyhedra[1:]
+
+    # the form of polyhedron data before CSRCells
+    cells = block.data.to_list()
+    assert len(cells) == 2
+    assert all(isinstance(face, np.ndarray) for cell in cells for face in cell)
+    assert [[face.tolist() for face in cell] for cell in cells] == polyhedra
+
+    offsets, nodes = block.data.cell_nodes()
+    assert_equal(offsets, [0, 4, 9])
+    assert_equal(nodes, [0, 1, 2, 3, 0, 1, 2, 3, 4])
+
+    polygons = meshio.CSRCells.from_list([[0, 1, 2], [0, 2, 3, 4]])
+    assert [p.tolist() for p in polygons] == [[0, 1, 2], [0, 2, 3, 4]]
+    both = meshio.CSRCells.concatenate([polygons, polygons.take([0])])
+    assert both.tolist() == [[0, 1, 2], [0, 2, 3, 4], [0, 1, 2]]
+
+
+def test_csr_cells_dict():
+    polygons = meshio.CSRCells.from_list([[0, 1, 2], [0, 2, 3, 4]])
+    mesh = meshio.Mesh(
+        np.zeros((5, 3)),
+        [
+            ("polygon", polygons),
+            ("polygon", polygons.take([1])),
+            ("polygon", [[1, 2, 3]]),
+        ],
+    )
+    ref = [[0, 1, 2], [0, 2, 3, 4], [0, 2, 3, 4], [1, 2, 3]]
+    assert mesh.cells_dict["polygon"].tolist() == ref
+    assert mesh.get_cells_type("polygon").tolist() == ref
+
+
+def test_fixed_size_cells(tmp_path):
+    polygons = [[0, 1, 2], [1, 2, 3], [0, 2, 3, 4], [1, 2, 4]]
+    mesh = meshio.Mesh(
+        np.zeros((5, 3)),
+        [("line", [[0, 1]]), ("polygon", meshio.CSRCells.from_list(polygons))],
+        cell_data={"a": [np.array([0.0]), np.array([1.0, 2.0, 3.0, 4.0])]},
+        cell_sets={"s": [None, np.array([1, 2])]},
+    )
+    mesh2 = meshio._mesh.fixed_size_cells(mesh, "vtk")
+    assert [c.type for c in mesh2.cells] == ["line", "polygon", "polygon", "polygon"]
+    assert [c.data.tolist() for c in mesh2.cells[1:]] == [
+        polygons[:2],
+        polygons[2:3],
+        polygons[3:],
+    ]
+    assert [a.tolist() for a in mesh2.cell_data["a"]] == [
+        [0.0],
+        [1.0, 2.0],
+        [3.0],
+        [4.0],
+    ]
+    assert [None if s is None else s.tolist() for s in mesh2.cell_sets["s"]] == [
+        None,
+        [1],
+        [0],
+        [],
+    ]
+
+    # the writers get the split mesh
+    meshio.write(tmp_path / "test.vtk", mesh)
+    mesh3 = meshio.read(tmp_path / "test.vtk")
+    assert mesh3.cells_dict["polygon"].tolist() == polygons
+
+    polyhedra = meshio.CellBlock("polyhedron", [[[0, 1, 2], [0, 1, 3], [1, 2, 3]]])
+    with pytest.raises(meshio.WriteError):
+        meshio._mesh.fixed_size_cells(meshio.Mesh(np.zeros((4, 3)), [polyhedra]), "vtk")
+
+
+def test_int_data_to_sets_many_tags():
+    rng = np.random.default_rng(0)
+    data = [rng.integers(0, 50, 100), rng.integers(20, 80, 30)]
+    mesh = meshio.Mesh(
+        np.zeros((100, 3)),
+        [("vertex", np.arange(100)[:, None]), ("line", np.zeros((30, 2), dtype=int))],
+        cell_data={"mat": [d.copy() for d in data]},
+    )
+    mesh.cell_data_to_sets("mat")
+    tags = np.unique(np.concatenate(data))
+    assert len(mesh.cell_sets) == len(tags)
+    for tag in tags:
+        members = mesh.cell_sets[f"set-mat-{tag}"]
+        for d, m in zip(data, members):
+            assert_equal(m, np.where(d == tag)[0])
+
+    mesh.cell_sets_to_data("mat")
+    ref = [np.searchsorted(tags, d) for d in data]
+    assert_equal(mesh.cell_data["mat"], ref)
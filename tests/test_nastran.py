@@ -67,3 +67,30 @@ def test_long_format():
     # points
     assert len(mesh.points) == 1
     assert np.isclose(mesh.points.sum(), 1.5)
+
+
+def test_float_format():
+    from meshio.nastran._nastran import _floats_to_nastran_strings
+
+    rng = np.random.default_rng(0)
+    x = (1.0 + rng.random(1000)) * 10.0 ** rng.integers(-9, 9, 1000)
+    # at most 16 characters
+    negative = -np.round(x[x < 1.0e6], 3)
+    x = np.concatenate([x, negative, [0.0, -0.0, 1.0, 0.5, 9.999999999995]])
+    ref = [
+        np.format_float_scientific(val, exp_digits=1, precision=11).replace("e", "E")
+        for val in x
+    ]
+    assert _floats_to_nastran_strings(x).tolist() == ref
+
+
+@pytest.mark.parametrize("cell_format", ["free", "fixed-small"])
+def test_cell_format(cell_format, tmp_path):
+    filename = tmp_path / "out.nas"
+    mesh = helpers.add_cell_data(helpers.hex_mesh, [("nastran:ref", (), int)])
+    meshio.nastran.write(filename, mesh, cell_format=cell_format)
+    mesh2 = meshio.read(filename)
+    assert np.array_equal(mesh2.cells[0].data, mesh.cells[0].data)
+    assert np.array_equal(
+        mesh2.cell_data["nastran:ref"][0], mesh.cell_data["nastran:ref"][0]
+    )
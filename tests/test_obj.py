@@ -25,6 +25,18 @@ def test_obj(mesh, tmp_path):
     helpers.write_read(tmp_path, meshio.obj.write, meshio.obj.read, mesh, 1.0e-12)
 
 
+def test_weld(tmp_path):
+    mesh = meshio.Mesh(
+        [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [1.0, 1.0, 1.0e-10]],
+        [("triangle", [[0, 1, 2], [0, 1, 3]])],
+    )
+    filename = tmp_path / "test.obj"
+    meshio.write(filename, mesh)
+    mesh = meshio.obj.read(filename, weld_atol=1.0e-8)
+    assert len(mesh.points) == 3
+    assert np.array_equal(mesh.cells[0].data, [[0, 1, 2], [0, 1, 2]])
+
+
 @pytest.mark.skip("Fails point data consistency check.")
 @pytest.mark.parametrize(
     "filename, ref_sum, ref_num_cells", [("elephav.obj", 3.678372172450000e05, 1148)]
@@ -1,6 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
 import meshio
 
 
 def test_public_attributes():
     # Just make sure this is here
     meshio.extension_to_filetypes
+
+
+def test_lazy_import():
+    # `import meshio` must neither import any of the format modules nor rich
+    code = """
+import sys
+import meshio
+print(len([m for m in sys.modules if m.startswith("meshio")]))
+print("rich" in sys.modules)
+"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    out = result.stdout.split()
+    assert int(out[0]) <= 10
+    assert out[1] == "False"
+
+    # The cumulative import times in microseconds, see `python -X importtime`. Without
+    # numpy, importing meshio takes a few milliseconds; the bound is generous, so that
+    # it only fails if a heavy import slips in, not on a slow machine.
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative[fields[2].strip()] = int(fields[1])
+    assert cumulative["meshio"] - cumulative.get("numpy", 0) < 500_000
+
+
+@pytest.mark.parametrize("format_name", sorted(meshio._formats.builtin_formats))
+def test_builtin_formats(format_name):
+    # The format table must match what the module registers on import, i.e., all
+    # placeholders from meshio._helpers must have been replaced.
+    spec = meshio._formats.builtin_formats[format_name]
+    getattr(meshio, spec["module"])
+    reader = meshio._helpers.reader_map.get(format_name)
+    if spec.get("reader", True):
+        assert reader.__module__ != "meshio._helpers"
+    else:
+        assert reader is None
+    for name in spec.get("writers", [format_name]):
+        assert meshio._helpers._writer_map[name].__module__ != "meshio._helpers"
+    if spec.get("sniffer", False):
+        sniffer = meshio._helpers._sniffer_map[format_name]
+        assert sniffer.__module__ != "meshio._helpers"
+    for name in spec.get("stream_writers", []):
+        stream_writer = meshio._helpers._stream_writer_map[name]
+        assert stream_writer.__module__ != "meshio._helpers"
+    if spec.get("block_reader", False):
+        block_reader = meshio._helpers._block_reader_map[format_name]
+        assert block_reader.__module__ != "meshio._helpers"
+    if spec.get("prober", False):
+        prober = meshio._helpers._prober_map[format_name]
+        assert prober.__module__ != "meshio._helpers"
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import meshio
@@ -22,3 +23,58 @@ def test_stl(mesh, binary, tol, tmp_path):
         return meshio.stl.write(*args, binary=binary, **kwargs)
 
     helpers.write_read(tmp_path, writer, meshio.stl.read, mesh, tol)
+
+
+def test_weld(tmp_path):
+    # two triangles with a crack of 1.0e-9 between them
+    eps = 1.0e-9
+    points = np.array(
+        [
+            [0.0, 0.0, 0.0],
+            [1.0, 0.0, 0.0],
+            [1.0, 1.0, 0.0],
+            [0.0, 0.0, eps],
+            [1.0, 1.0, -eps],
+            [0.0, 1.0, 0.0],
+        ]
+    )
+    mesh = meshio.Mesh(points, [("triangle", [[0, 1, 2], [3, 4, 5]])])
+    filename = tmp_path / "test.stl"
+    meshio.write(filename, mesh, binary=False)
+
+    mesh = meshio.read(filename)
+    assert len(mesh.points) == 6
+
+    mesh = meshio.read(filename, weld_atol=1.0e-6)
+    assert len(mesh.points) == 4
+    assert np.array_equal(mesh.cells[0].data, [[0, 1, 2], [0, 2, 3]])
+
+    mesh = meshio.read(filename, weld_rtol=1.0e-6)
+    assert len(mesh.points) == 4
+
+
+def test_weld_points():
+    rng = np.random.default_rng(0)
+    points = rng.random((1000, 3))
+    # perturbed copies, in shuffled order
+    perm = rng.permutation(1000)
+    noisy = points[perm] + 1.0e-8 * (rng.random((1000, 3)) - 0.5)
+    idx, inv = meshio._common.weld_points(np.vstack([points, noisy]), atol=1.0e-7)
+    assert np.array_equal(idx, np.arange(1000))
+    assert np.array_equal(inv[:1000], np.arange(1000))
+    assert np.array_equal(inv[1000:], perm)
+
+
+def test_weld_points_chain():
+    # Merging is transitive: points spaced just under the tolerance end up in one
+    # group, although the ends of the chain are much further apart.
+    points = np.zeros((10, 3))
+    points[:, 0] = 0.99 * np.arange(10)
+    idx, inv = meshio._common.weld_points(points[::-1], atol=1.0)
+    assert np.array_equal(idx, [0])
+    assert np.array_equal(inv, np.zeros(10))
+
+    # points further than twice the tolerance apart are never merged
+    points[:, 0] = 2.01 * np.arange(10)
+    idx, inv = meshio._common.weld_points(points, atol=1.0)
+    assert np.array_equal(idx, np.arange(10))
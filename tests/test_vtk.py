@@ -38,7 +38,17 @@ test_set = {
 }
 
 
-@pytest.mark.parametrize("mesh", test_set.union({helpers.lagrange_high_order_mesh}))
+@pytest.mark.parametrize(
+    "mesh",
+    test_set.union(
+        {
+            helpers.lagrange_high_order_mesh,
+            # polyhedra are only written in version 5.1
+            helpers.polyhedron_mesh,
+            helpers.add_cell_data(helpers.polyhedron_mesh, [("a", (2,), ">f4")]),
+        }
+    ),
+)
 @pytest.mark.parametrize("binary", [True, False])
 def test(mesh, binary, tmp_path):
     def writer(*args, **kwargs):
@@ -56,6 +66,29 @@ def test_vtk42(mesh, binary, tmp_path):
     helpers.write_read(tmp_path, writer, meshio.vtk.read, mesh, 1.0e-15)
 
 
+def test_polyhedra_with_other_cells(tmp_path):
+    # unlike VTU, legacy files can mix polyhedra with other cells
+    mesh = meshio.Mesh(
+        helpers.polyhedron_mesh.points,
+        [("tetra", [[0, 1, 2, 4]])] + helpers.polyhedron_mesh.cells,
+        cell_data={"a": [np.array([1.0]), np.array([2.0, 3.0]), np.array([4.0, 5.0])]},
+    )
+    meshio.write(tmp_path / "mesh.vtk", mesh)
+
+    out = meshio.read(tmp_path / "mesh.vtk")
+    assert [c.type for c in out.cells] == [c.type for c in mesh.cells]
+    for c, ref in zip(out.cells, mesh.cells):
+        assert c.data.tolist() == ref.data.tolist()
+    for d, ref in zip(out.cell_data["a"], mesh.cell_data["a"]):
+        assert np.array_equal(d, ref)
+
+    info = meshio.probe(tmp_path / "mesh.vtk")
+    assert info.cells == [("tetra", 1), ("polyhedron4", 2), ("polyhedron5", 2)]
+
+    with pytest.raises(meshio.WriteError):
+        meshio.vtk.write(tmp_path / "mesh42.vtk", mesh, fmt_version="4.2")
+
+
 def test_generic_io(tmp_path):
     helpers.generic_io(tmp_path / "test.vtk")
     # With additional, insignificant suffix:
@@ -119,3 +152,23 @@ def test_color_scalars(filename, ref_num_points, ref_num_cells):
     mesh = meshio.read(filename)
     assert len(mesh.points) == ref_num_points
     assert len(mesh.cells) == ref_num_cells
+
+
+@pytest.mark.parametrize("chunk_size", [6, 7, 8, 100])
+def test_skip_numbers(chunk_size):
+    import io
+
+    from meshio.vtk._vtk_51 import _skip_numbers
+
+    f = io.BytesIO(b"1.5 -2e3\n 30  4\n\n5 6")
+    _skip_numbers(f, 4, chunk_size)
+    # the whitespace after the numbers is skipped, too
+    assert f.read() == b"5 6"
+
+    f.seek(0)
+    _skip_numbers(f, 6, chunk_size)
+    assert f.read() == b""
+
+    f.seek(0)
+    with pytest.raises(meshio.ReadError):
+        _skip_numbers(f, 7, chunk_size)
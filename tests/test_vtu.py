@@ -1,4 +1,6 @@
+import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
@@ -41,13 +43,23 @@ test_set = [
 
 @pytest.mark.parametrize("mesh", test_set)
 @pytest.mark.parametrize(
-    "data_type", [(False, None), (True, None), (True, "lzma"), (True, "zlib")]
+    "data_type",
+    [
+        (False, None, False),
+        (True, None, False),
+        (True, "lzma", False),
+        (True, "zlib", False),
+        (True, None, True),
+        (True, "zlib", True),
+    ],
 )
 def test(mesh, data_type, tmp_path):
-    binary, compression = data_type
+    binary, compression, appended = data_type
 
     def writer(*args, **kwargs):
-        return meshio.vtu.write(*args, binary=binary, compression=compression, **kwargs)
+        return meshio.vtu.write(
+            *args, binary=binary, compression=compression, appended=appended, **kwargs
+        )
 
     # ASCII files are only meant for debugging, VTK stores only 11 digits
     # <https://gitlab.kitware.com/vtk/vtk/-/issues/17038#note_264052>
@@ -78,3 +90,236 @@ def test_read_from_file(filename, ref_cells, ref_num_cells, ref_num_pnt):
     assert ref_cells == mesh.cells[0].type
     assert len(mesh.cells[0].data) == ref_num_cells
     assert len(mesh.points) == ref_num_pnt
+
+
+def test_csr_polygons(tmp_path):
+    polygons = [[0, 1, 2], [0, 2, 3, 4], [1, 2, 5, 6, 4]]
+    mesh = meshio.Mesh(
+        np.random.default_rng(0).random((7, 3)),
+        [("polygon", meshio.CSRCells.from_list(polygons))],
+        cell_data={"a": [np.array([1.0, 2.0, 3.0])]},
+    )
+    filename = tmp_path / "test.vtu"
+    meshio.write(filename, mesh)
+    mesh2 = meshio.read(filename)
+    # polygons are read in blocks of equal size
+    assert [c.data.tolist() for c in mesh2.cells] == [[p] for p in polygons]
+    assert np.allclose(np.concatenate(mesh2.cell_data["a"]), [1.0, 2.0, 3.0])
+
+
+def test_lazy(tmp_path):
+    mesh = helpers.add_point_data(helpers.tri_quad_mesh, 2)
+    mesh = helpers.add_cell_data(mesh, [("c", (), np.float64)])
+    filename = tmp_path / "test.vtu"
+    meshio.write(filename, mesh)
+
+    lazy_mesh = meshio.read(filename, lazy=True)
+    assert isinstance(lazy_mesh._points, meshio._lazy.LazyArray)
+    assert not lazy_mesh._points.is_loaded
+    # repr only needs the shapes
+    repr(lazy_mesh)
+    assert isinstance(lazy_mesh._points, meshio._lazy.LazyArray)
+
+    assert np.allclose(lazy_mesh.points, mesh.points)
+    assert isinstance(lazy_mesh.points, np.ndarray)
+    assert np.allclose(lazy_mesh.point_data["a"], mesh.point_data["a"])
+    assert np.allclose(lazy_mesh.cell_data["c"][1], mesh.cell_data["c"][1])
+    for c0, c1 in zip(mesh.cells, lazy_mesh.cells):
+        assert c0.type == c1.type
+        assert np.array_equal(c0.data, c1.data)
+
+
+@pytest.mark.parametrize("compression", ["lzma", "zlib"])
+@pytest.mark.parametrize("appended", [False, True])
+def test_jobs(compression, appended, tmp_path):
+    # many blocks, so they are (de)compressed in several threads
+    points = np.random.rand(20_000, 3)
+    mesh = meshio.Mesh(
+        points, helpers.tri_mesh.cells, point_data={"b": np.random.rand(20_000, 3)}
+    )
+
+    files = []
+    for jobs in [1, 4]:
+        filename = tmp_path / f"test{jobs}.vtu"
+        meshio.vtu.write(
+            filename, mesh, compression=compression, appended=appended, jobs=jobs
+        )
+        files.append(filename.read_bytes())
+    assert files[0] == files[1]
+
+    mesh2 = meshio.vtu.read(filename, jobs=4)
+    assert np.array_equal(mesh2.points, mesh.points)
+    assert np.array_equal(mesh2.point_data["b"], mesh.point_data["b"])
+    assert np.array_equal(mesh2.cells[0].data, mesh.cells[0].data)
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_appended_pipe(compression, tmp_path):
+    # a pipe isn't seekable, so the compressed blocks are kept in memory
+    mesh = helpers.add_point_data(helpers.tri_quad_mesh, 3)
+    fifo = tmp_path / "fifo.vtu"
+    os.mkfifo(fifo)
+    with ThreadPoolExecutor(1) as executor:
+        content = executor.submit(fifo.read_bytes)
+        meshio.vtu.write(fifo, mesh, compression=compression, appended=True)
+    filename = tmp_path / "test.vtu"
+    filename.write_bytes(content.result())
+
+    mesh2 = meshio.vtu.read(filename)
+    assert np.array_equal(mesh2.points, mesh.points)
+    assert np.array_equal(mesh2.point_data["a"], mesh.point_data["a"])
+    for c0, c1 in zip(mesh.cells, mesh2.cells):
+        assert np.array_equal(c0.data, c1.data)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_appended_names(compression, tmp_path):
+    # data names may contain anything that can be written to XML
+    mesh = meshio.Mesh(
+        helpers.tri_mesh.points,
+        helpers.tri_mesh.cells,
+        point_data={"T{offset}": np.arange(len(helpers.tri_mesh.points), dtype=float)},
+    )
+    filename = tmp_path / "test.vtu"
+    meshio.vtu.write(filename, mesh, compression=compression, appended=True)
+    mesh2 = meshio.read(filename)
+    assert np.array_equal(mesh2.point_data["T{offset}"], mesh.point_data["T{offset}"])
+
+    mesh.point_data = {"T\0": mesh.point_data["T{offset}"]}
+    with pytest.raises(meshio.WriteError):
+        meshio.vtu.write(filename, mesh, compression=compression, appended=True)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+@pytest.mark.parametrize("stream", [False, True])
+def test_appended_offsets(compression, stream, tmp_path):
+    from xml.etree import ElementTree as ET
+
+    mesh = helpers.add_point_data(helpers.tri_mesh, 2)
+    filename = tmp_path / "test.vtu"
+    if stream:
+        with meshio.open_writer(filename, compression=compression) as writer:
+            writer.add_points(mesh.points)
+            writer.add_cells("triangle", mesh.cells[0].data)
+            writer.add_point_data("a", mesh.point_data["a"])
+    else:
+        meshio.vtu.write(filename, mesh, compression=compression, appended=True)
+
+    # The header is well-formed XML, and the offsets are plain numbers; older meshio
+    # versions look up the arrays by the exact offset string.
+    raw = filename.read_bytes()
+    root = ET.fromstring(raw[: raw.index(b"<AppendedData")] + b"</VTKFile>")
+    offsets = [data_array.get("offset") for data_array in root.iter("DataArray")]
+    assert len(offsets) >= 5
+    assert all(offset == str(int(offset)) for offset in offsets)
+    assert min(map(int, offsets)) == 0
+
+    mesh2 = meshio.read(filename)
+    assert np.array_equal(mesh2.points, mesh.points)
+    assert np.array_equal(mesh2.point_data["a"], mesh.point_data["a"])
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_open_writer_chunks(compression, tmp_path):
+    # uneven chunks and several cell blocks, which straddle the compression blocks
+    points = np.random.rand(20_000, 3)
+    triangles = np.random.randint(0, len(points), (30_000, 3))
+    quads = np.random.randint(0, len(points), (20_000, 4))
+    filename = tmp_path / "test.vtu"
+    with meshio.open_writer(filename, compression=compression) as writer:
+        for k in range(0, len(points), 1234):
+            writer.add_points(points[k : k + 1234])
+        for k in range(0, len(triangles), 777):
+            writer.add_cells("triangle", triangles[k : k + 777])
+        writer.add_cells("quad", quads)
+
+    mesh = meshio.read(filename)
+    assert np.array_equal(mesh.points, points)
+    assert np.array_equal(mesh.cells[0].data, triangles)
+    assert np.array_equal(mesh.cells[1].data, quads)
+
+
+def test_open_writer_large_header(tmp_path):
+    # more XML than the room reserved in front of the data
+    points = np.random.rand(10, 3)
+    filename = tmp_path / "test.vtu"
+    with meshio.open_writer(filename, compression=None) as writer:
+        writer.add_points(points)
+        writer.add_cells("triangle", [[0, 1, 2]])
+        for k in range(2000):
+            writer.add_point_data(f"a{k}", np.full(len(points), k))
+
+    mesh = meshio.read(filename)
+    assert np.array_equal(mesh.points, points)
+    for k in range(2000):
+        assert np.all(mesh.point_data[f"a{k}"] == k)
+
+
+def test_mmap(tmp_path):
+    mesh = helpers.add_point_data(helpers.tri_quad_mesh, 2)
+    filename = tmp_path / "test.vtu"
+    meshio.vtu.write(filename, mesh, compression=None, appended=True)
+
+    mesh2 = meshio.read(filename, mmap=True)
+    # raw appended arrays are views into the file
+    assert isinstance(mesh2.points.base, np.memmap)
+    assert np.array_equal(mesh2.points, mesh.points)
+    assert np.array_equal(mesh2.point_data["a"], mesh.point_data["a"])
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_base64_line_breaks(compression, tmp_path):
+    # some writers break the base64 text into lines
+    mesh = helpers.add_point_data(helpers.tri_quad_mesh, 2)
+    filename = tmp_path / "test.vtu"
+    meshio.vtu.write(filename, mesh, compression=compression)
+    lines = []
+    for line in filename.read_text().splitlines():
+        if not line.startswith("<"):
+            line = "\n".join(line[k : k + 7] for k in range(0, len(line), 7))
+        lines.append(line)
+    filename.write_text("\n".join(lines))
+
+    mesh2 = meshio.read(filename)
+    assert np.array_equal(mesh2.points, mesh.points)
+    assert np.array_equal(mesh2.point_data["a"], mesh.point_data["a"])
+    for c0, c1 in zip(mesh.cells, mesh2.cells):
+        assert np.array_equal(c0.data, c1.data)
+
+
+def test_separate_header(tmp_path):
+    # VTK encodes the header and the data separately
+    import base64
+
+    def data_array(name, data, num_components=None):
+        data = np.asarray(data)
+        text = base64.b64encode(np.uint32(data.nbytes).tobytes()).decode()
+        text += base64.b64encode(data.tobytes()).decode()
+        nc = "" if num_components is None else f' NumberOfComponents="{num_components}"'
+        vtu_type = meshio.vtu._vtu.numpy_to_vtu_type[data.dtype]
+        return (
+            f'<DataArray type="{vtu_type}" Name="{name}" format="binary"{nc}>\n'
+            f"  {text}\n"
+            "</DataArray>"
+        )
+
+    points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    byte_order = "LittleEndian" if np.little_endian else "BigEndian"
+    filename = tmp_path / "test.vtu"
+    filename.write_text(
+        f'<VTKFile type="UnstructuredGrid" version="0.1" byte_order="{byte_order}">\n'
+        "<UnstructuredGrid>\n"
+        '<Piece NumberOfPoints="3" NumberOfCells="1">\n'
+        f"<Points>{data_array('Points', points, 3)}</Points>\n"
+        "<Cells>\n"
+        + data_array("connectivity", np.array([0, 1, 2], dtype=np.int64))
+        + data_array("offsets", np.array([3], dtype=np.int64))
+        + data_array("types", np.array([5], dtype=np.uint8))
+        + "</Cells>\n</Piece>\n</UnstructuredGrid>\n</VTKFile>\n"
+    )
+
+    mesh = meshio.read(filename)
+    assert np.array_equal(mesh.points, points)
+    assert mesh.cells[0].type == "triangle"
+    assert np.array_equal(mesh.cells[0].data, [[0, 1, 2]])
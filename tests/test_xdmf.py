@@ -60,6 +60,24 @@ def test_generic_io(tmp_path):
     helpers.generic_io(tmp_path / "test.0.xdmf")
 
 
+@pytest.mark.parametrize("data_format", ["HDF", "Binary"])
+def test_lazy(data_format, tmp_path):
+    mesh = helpers.add_point_data(helpers.tri_mesh, 2)
+    mesh = helpers.add_cell_data(mesh, [("c", (), np.float64)])
+    filename = tmp_path / "test.xdmf"
+    meshio.xdmf.write(filename, mesh, data_format=data_format)
+
+    lazy_mesh = meshio.read(filename, lazy=True)
+    assert isinstance(lazy_mesh._points, meshio._lazy.LazyArray)
+    assert lazy_mesh._points.shape == mesh.points.shape
+    assert len(lazy_mesh.cells[0]) == 2
+
+    assert np.allclose(lazy_mesh.points, mesh.points)
+    assert np.allclose(lazy_mesh.point_data["b"], mesh.point_data["b"])
+    assert np.allclose(lazy_mesh.cell_data["c"][0], mesh.cell_data["c"][0])
+    assert np.array_equal(lazy_mesh.cells[0].data, mesh.cells[0].data)
+
+
 def test_time_series():
     # write the data
     filename = "out.xdmf"